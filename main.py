@@ -4,13 +4,85 @@ Neural Network Adventure RPG
 Main game entry point
 """
 
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
 import pygame
 import sys
 from src.game import Game
 from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, FPS
 
+def run_headless(seconds):
+    """Simulate ``seconds`` of game time with no window, as fast as the CPU allows"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    game = Game(screen, SCREEN_WIDTH, SCREEN_HEIGHT)
+
+    start = time.perf_counter()
+    game.simulate(seconds)
+    elapsed = time.perf_counter() - start
+    game.shutdown()
+    print(f"Simulated {game.time:.1f}s of game time in {elapsed:.2f}s ({game.time / max(elapsed, 1e-9):.0f}x real time)")
+    pygame.quit()
+
+async def run_async():
+    """The game loop as an asyncio task.
+
+    Instead of blocking in ``clock.tick``, each frame awaits the rest of its
+    time slot, so tasks started through ``Game.start_task`` (narration,
+    grading, loading) run in the idle time between frames on the same thread.
+    """
+    pygame.init()
+
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Neural Network Adventure")
+
+    game = Game(screen, SCREEN_WIDTH, SCREEN_HEIGHT)
+    game.loop = asyncio.get_running_loop()
+
+    frame_time = 1.0 / FPS
+    previous = time.perf_counter()
+    running = True
+    while running:
+        start = time.perf_counter()
+        dt = start - previous
+        previous = start
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            else:
+                game.handle_event(event)
+
+        game.update(dt)
+        game.render()
+        pygame.display.flip()
+        game.run_tasks()
+
+        await asyncio.sleep(max(0.0, frame_time - (time.perf_counter() - start)))
+
+    game.cancel_tasks()
+    game.shutdown()
+    pygame.quit()
+
 def main():
     """Initialize and run the game"""
+    parser = argparse.ArgumentParser(description="Neural Network Adventure")
+    parser.add_argument("--headless", type=float, metavar="SECONDS",
+                        help="simulate SECONDS of game time without a window and exit")
+    parser.add_argument("--asyncio", action="store_true",
+                        help="run the game loop as an asyncio task so background work can be awaited")
+    args = parser.parse_args()
+    if args.headless is not None:
+        run_headless(args.headless)
+        return
+    if args.asyncio:
+        asyncio.run(run_async())
+        sys.exit()
+
     pygame.init()
     
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -20,7 +92,7 @@ def main():
     # Initialize game
     game = Game(screen, SCREEN_WIDTH, SCREEN_HEIGHT)
     
-    # Game loop
+    # Game loop; Game.update turns the frame time into fixed simulation steps
     running = True
     while running:
         dt = clock.tick(FPS) / 1000.0  # Delta time in seconds
@@ -34,9 +106,14 @@ def main():
         game.update(dt)
         game.render()
         pygame.display.flip()
+        # Leftover frame time goes to time-sliced tasks before clock.tick waits
+        game.run_tasks()
     
+    game.shutdown()
     pygame.quit()
     sys.exit()
 
 if __name__ == "__main__":
+    # Cross-validation spawns worker processes; needed for frozen builds
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -2,6 +2,7 @@
 Speech synthesis system for narration and dialogue
 """
 
+import asyncio
 import threading
 import queue
 import time
@@ -12,6 +13,19 @@ except ImportError:
     SPEECH_AVAILABLE = False
     print("⚠️  pyttsx3 not available - speech disabled")
 
+def _resolve(future):
+    """Finish an asyncio future from any thread; None (a plain ``speak``) is ignored"""
+    if future is None:
+        return
+    def finish():
+        if not future.done():
+            future.set_result(None)
+    try:
+        future.get_loop().call_soon_threadsafe(finish)
+    except RuntimeError:
+        # The loop has already shut down; nobody is waiting any more
+        pass
+
 class SpeechSystem:
     def __init__(self):
         self.enabled = SPEECH_AVAILABLE
@@ -46,18 +60,40 @@ class SpeechSystem:
     
     def speak(self, text, character="narrator", priority=False):
         """Add text to speech queue"""
+        self._enqueue(text, character, priority, None)
+
+    async def speak_async(self, text, character="narrator", priority=False):
+        """Queue text and wait until it has been spoken (or dropped by ``stop_speech``).
+
+        Meant for the asyncio runner: the speech thread resolves the future
+        through the loop, so awaiting it never blocks a frame. Returns
+        immediately when speech is disabled.
+        """
+        future = asyncio.get_running_loop().create_future()
+        if self._enqueue(text, character, priority, future):
+            await future
+
+    def _enqueue(self, text, character, priority, future):
         if not self.enabled or not text.strip():
-            return
+            return False
         
         # Clean text for speech
         clean_text = self._clean_text_for_speech(text, character)
         
         if priority:
             # Clear queue and speak immediately
-            with self.speech_queue.mutex:
-                self.speech_queue.queue.clear()
+            self._clear_queue()
         
-        self.speech_queue.put((clean_text, character))
+        self.speech_queue.put((clean_text, character, future))
+        return True
+
+    def _clear_queue(self):
+        """Drop queued speech; anyone awaiting it is released"""
+        with self.speech_queue.mutex:
+            dropped = list(self.speech_queue.queue)
+            self.speech_queue.queue.clear()
+        for _, _, future in dropped:
+            _resolve(future)
     
     def _clean_text_for_speech(self, text, character):
         """Clean text for better speech synthesis"""
@@ -89,13 +125,16 @@ class SpeechSystem:
         """Background thread for speech synthesis"""
         while True:
             try:
-                text, character = self.speech_queue.get(timeout=1)
-                if text:
-                    self.is_speaking = True
-                    self.engine.say(text)
-                    self.engine.runAndWait()
-                    self.is_speaking = False
-                    time.sleep(0.2)  # Brief pause between speeches
+                text, character, future = self.speech_queue.get(timeout=1)
+                try:
+                    if text:
+                        self.is_speaking = True
+                        self.engine.say(text)
+                        self.engine.runAndWait()
+                        self.is_speaking = False
+                        time.sleep(0.2)  # Brief pause between speeches
+                finally:
+                    _resolve(future)
             except queue.Empty:
                 continue
             except Exception as e:
@@ -113,8 +152,7 @@ class SpeechSystem:
         
         try:
             self.engine.stop()
-            with self.speech_queue.mutex:
-                self.speech_queue.queue.clear()
+            self._clear_queue()
             self.is_speaking = False
         except:
             pass
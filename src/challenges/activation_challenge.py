@@ -4,11 +4,11 @@ Activation Functions Challenge - Level 3: The Sigmoid Sorcerer
 
 import pygame
 import numpy as np
-import math
 import random
 from .base_challenge import BaseChallenge
 from ..visualization.neural_viz import NeuralNetworkVisualizer
 from ..game_story import GameStory
+from ..nn.activations import activate
 # Audio removed for better performance
 from ..ui.modern_ui import ModernButton, ProgressBar, DialogueBox, ParticleSystem
 
@@ -246,18 +246,8 @@ class ActivationChallenge(BaseChallenge):
             # Audio removed
     
     def _compute_activation(self, x, function_name):
-        """Compute activation function output"""
-        if function_name == "ReLU":
-            return max(0, x)
-        elif function_name == "Sigmoid":
-            return 1 / (1 + math.exp(-x))
-        elif function_name == "Tanh":
-            return math.tanh(x)
-        elif function_name == "Leaky ReLU":
-            return x if x > 0 else 0.01 * x
-        elif function_name == "Swish":
-            return x / (1 + math.exp(-x))
-        return x
+        """Compute activation function output (scalar or whole array of inputs)"""
+        return activate(function_name, x)
     
     def update(self, dt):
         self.visualizer.update_animation(dt)
@@ -305,7 +295,7 @@ class ActivationChallenge(BaseChallenge):
         
         # Always render dialogue box and particles
         self.dialogue_box.render(screen, pygame.font.Font(None, 28), pygame.font.Font(None, 32))
-        self.particles.render(screen)
+        self.particles.render(screen, self.game.interpolation)
     
     def _render_intro_theory(self, screen):
         """Render introduction and theory phase"""
@@ -522,16 +512,14 @@ class ActivationChallenge(BaseChallenge):
         colors = [(255, 100, 100), (100, 255, 100), (100, 100, 255), (255, 255, 100), (255, 100, 255)]
         
         for i, func_name in enumerate(self.functions):
-            points = []
-            for px in range(width):
-                input_val = (px / width) * 10 - 5  # Range from -5 to 5
-                output_val = self._compute_activation(input_val, func_name)
-                
-                # Scale output to fit in graph
-                py = y + height - int((output_val + 2) / 4 * height)  # Assuming output range roughly -2 to 2
-                py = max(y, min(y + height, py))
-                
-                points.append((x + px, py))
+            input_vals = (np.arange(width) / width) * 10 - 5  # Range from -5 to 5
+            output_vals = self._compute_activation(input_vals, func_name)
+            
+            # Scale output to fit in graph
+            pys = y + height - ((output_vals + 2) / 4 * height).astype(int)  # Assuming output range roughly -2 to 2
+            pys = np.clip(pys, y, y + height)
+            
+            points = list(zip(range(x, x + width), pys.tolist()))
             
             if len(points) > 1:
                 pygame.draw.lines(screen, colors[i], False, points, 2)
@@ -556,18 +544,14 @@ class ActivationChallenge(BaseChallenge):
         
         # Current function curve
         func_name = self.functions[self.selected_function]
-        points = []
+        input_vals = (np.arange(width - 40) / (width - 40)) * 10 - 5  # Range from -5 to 5
+        output_vals = self._compute_activation(input_vals, func_name)
         
-        for px in range(width - 40):
-            input_val = (px / (width - 40)) * 10 - 5  # Range from -5 to 5
-            output_val = self._compute_activation(input_val, func_name)
-            
-            # Scale to graph
-            graph_x = x + 20 + px
-            graph_y = center_y - int(output_val * 50)  # Scale output
-            graph_y = max(y + 20, min(y + height - 20, graph_y))
-            
-            points.append((graph_x, graph_y))
+        # Scale to graph
+        graph_ys = center_y - (output_vals * 50).astype(int)  # Scale output
+        graph_ys = np.clip(graph_ys, y + 20, y + height - 20)
+        
+        points = list(zip(range(x + 20, x + width - 20), graph_ys.tolist()))
         
         if len(points) > 1:
             pygame.draw.lines(screen, (0, 255, 255), False, points, 3)
@@ -652,17 +636,14 @@ class ActivationChallenge(BaseChallenge):
         pygame.draw.line(screen, (150, 150, 150), (center_x, graph_y), (center_x, graph_y + graph_h), 1)  # Y-axis
         
         # Draw function curve
-        points = []
-        for i in range(graph_w):
-            input_val = (i - graph_w // 2) / 20.0  # Scale input
-            output_val = self._compute_activation(input_val, function_name)
-            
-            # Scale output to fit graph
-            screen_x = graph_x + i
-            screen_y = center_y - int(output_val * 20)  # Scale output
-            screen_y = max(graph_y, min(graph_y + graph_h, screen_y))  # Clamp
-            
-            points.append((screen_x, screen_y))
+        input_vals = (np.arange(graph_w) - graph_w // 2) / 20.0  # Scale input
+        output_vals = self._compute_activation(input_vals, function_name)
+        
+        # Scale output to fit graph
+        screen_ys = center_y - (output_vals * 20).astype(int)  # Scale output
+        screen_ys = np.clip(screen_ys, graph_y, graph_y + graph_h)  # Clamp
+        
+        points = list(zip(range(graph_x, graph_x + graph_w), screen_ys.tolist()))
         
         if len(points) > 1:
             pygame.draw.lines(screen, (0, 255, 255), False, points, 2)
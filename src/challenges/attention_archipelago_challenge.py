@@ -0,0 +1,347 @@
+"""
+Attention Archipelago Challenge - Level 15: The Focus Fiend
+Aim four attention heads across hundreds of islands and watch every attention map update live
+"""
+
+import time
+import pygame
+import numpy as np
+from .base_challenge import BaseChallenge
+from ..nn.attention import AttentionHeads
+from ..ui.modern_ui import DialogueBox, ParticleSystem
+
+ISLAND_TYPES = ("sand", "palm", "reef", "lighthouse", "volcano", "harbor", "jungle", "cliff")
+ISLAND_COLORS = ((230, 210, 150), (90, 200, 110), (80, 190, 220), (255, 245, 120),
+                 (240, 90, 60), (170, 140, 230), (40, 150, 80), (150, 150, 160))
+LIGHTHOUSE, VOLCANO = ISLAND_TYPES.index("lighthouse"), ISLAND_TYPES.index("volcano")
+BATCH = 4
+HEADS = 4
+SEQUENCE_CHOICES = (128, 256, 512)
+# Each head's query and key is a positional part (sinusoids) and a content part (island type)
+FREQUENCIES = 24
+CONTENT_DIMS = 16
+HEAD_DIM = 2 * FREQUENCIES + CONTENT_DIMS
+FOCUS_LEVELS = (0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0)
+MAX_OFFSET = 16
+# (quest, kind, target): an offset quest wants query i to look at island i - target,
+# a type quest wants all attention on islands of that type
+HEAD_QUESTS = (
+    ("Look back one island", "offset", 1),
+    ("Spot every lighthouse", "type", LIGHTHOUSE),
+    ("Scout four islands ahead", "offset", -4),
+    ("Track the volcanoes", "type", VOLCANO),
+)
+VICTORY_MASS = 0.8
+# Seconds per frame spent recomputing stale heads
+REFRESH_BUDGET = 0.006
+
+def _positions(indices):
+    """Unit-length sinusoidal codes; p(i) . p(j) only depends on i - j and peaks at i == j"""
+    rates = np.pi * (1 / 128) ** (np.arange(FREQUENCIES) / (FREQUENCIES - 1))
+    angles = np.asarray(indices, dtype=np.float64)[..., None] * rates
+    return np.concatenate((np.cos(angles), np.sin(angles)), axis=-1) / np.sqrt(FREQUENCIES)
+
+class AttentionChallenge(BaseChallenge):
+    def __init__(self, game):
+        super().__init__(game)
+        self.particles = ParticleSystem()
+        self.dialogue_box = DialogueBox(50, game.height - 150, game.width - 100, 120)
+
+        self.title_font = pygame.font.Font(None, 48)
+        self.header_font = pygame.font.Font(None, 28)
+        self.body_font = pygame.font.Font(None, 22)
+        self.small_font = pygame.font.Font(None, 18)
+
+        # Phases: intro -> focus -> victory
+        self.phase = "intro"
+        self.intro_step = 0
+        self.intro_lines = [
+            "The Focus Fiend scatters your attention across the Attention Archipelago.",
+            "Every island asks a query, and every island answers with a key. Their dot product says how well they match.",
+            "Softmax turns a row of matches into attention weights that sum to 1 - bright pixels in the maps above.",
+            "A head can match by position (an offset) or by content (an island type), and its focus sharpens the softmax.",
+            f"Tune all {HEADS} heads until each puts {VICTORY_MASS:.0%} of its attention where its quest demands!"
+        ]
+
+        self._rng = np.random.default_rng(15)
+        # Orthonormal island-type codes, so different types never partly match
+        self.type_codes = np.linalg.qr(self._rng.standard_normal((CONTENT_DIMS, len(ISLAND_TYPES))))[0].T
+
+        self.selected_head = 0
+        self.offsets = [0] * HEADS
+        self.targets = [None] * HEADS
+        self.focus_index = [1] * HEADS
+        self.shown_batch = 0
+        self.inspect_row = 0
+        self.length_index = SEQUENCE_CHOICES.index(256)
+        self.scores = [0.0] * HEADS
+        self.last_refresh_ms = 0.0
+
+        self.boss_hp = 100
+        self.victory_celebration = False
+        self._new_voyage()
+
+    def initialize(self):
+        self.phase = "intro"
+        self.intro_step = 0
+        self.dialogue_box.set_dialogue(self.intro_lines[0], "Tensor")
+
+    # Voyages and heads
+
+    @property
+    def steps(self):
+        return SEQUENCE_CHOICES[self.length_index]
+
+    def _new_voyage(self):
+        """Fresh islands; keys and values of every head change, so every map is rebuilt"""
+        steps = self.steps
+        self.islands = self._rng.integers(0, len(ISLAND_TYPES), (BATCH, steps))
+        self.attention = AttentionHeads(BATCH, HEADS, steps, HEAD_DIM)
+        contents = self.type_codes[self.islands]                                   # (b, t, c)
+        positions = np.broadcast_to(_positions(np.arange(steps)), (BATCH, steps, 2 * FREQUENCIES))
+        keys = np.concatenate((positions, contents), axis=-1)
+        values = np.concatenate((np.zeros_like(positions), contents), axis=-1)
+        for head in range(HEADS):
+            self.attention.set_keys(head, keys)
+            self.attention.set_values(head, values)
+            self._set_query(head)
+
+        self.inspect_row = min(self.inspect_row, steps - 1)
+        self._heatmaps = [pygame.Surface((steps, steps)) for _ in range(HEADS)]
+        self._drawn = [None] * HEADS
+        self._scaled = [None] * HEADS
+
+    def _set_query(self, head):
+        """Build one head's queries from its knobs; only this head's map goes stale"""
+        steps = self.steps
+        gain = FOCUS_LEVELS[self.focus_index[head]] * np.sqrt(HEAD_DIM)
+        position = np.zeros((steps, 2 * FREQUENCIES))
+        if self.offsets[head]:
+            position = _positions(np.arange(steps) - self.offsets[head])
+        content = np.zeros(CONTENT_DIMS) if self.targets[head] is None else self.type_codes[self.targets[head]]
+        queries = gain * np.concatenate((position, np.broadcast_to(content, (steps, CONTENT_DIMS))), axis=-1)
+        self.attention.set_queries(head, queries)
+
+    def _score(self, head):
+        """Mean attention mass on the islands the head's quest asks for"""
+        _, kind, target = HEAD_QUESTS[head]
+        weights = self.attention.weights[:, head]
+        if kind == "type":
+            wanted = (self.islands == target).astype(weights.dtype)
+            return float(np.mean(np.matmul(weights, wanted[..., None])))
+        rows = np.arange(max(target, 0), self.steps + min(target, 0))
+        return float(np.mean(weights[:, rows, rows - target]))
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return "exit"
+
+            if self.phase == "intro":
+                if event.key == pygame.K_SPACE:
+                    self._advance_intro()
+            elif self.phase == "focus":
+                self._handle_focus_key(event.key)
+            elif self.phase == "victory":
+                if event.key == pygame.K_SPACE:
+                    return "completed"
+
+        elif event.type == pygame.MOUSEMOTION and self.phase in ("focus", "victory"):
+            for head in range(HEADS):
+                plot = self._plot_rect(self._map_rect(head))
+                if plot.collidepoint(event.pos):
+                    self.inspect_row = int((event.pos[1] - plot.y) * self.steps / plot.height)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and self.phase == "focus":
+            for head in range(HEADS):
+                if self._map_rect(head).collidepoint(event.pos):
+                    self.selected_head = head
+
+        return None
+
+    def _handle_focus_key(self, key):
+        head = self.selected_head
+        if key in (pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4):
+            self.selected_head = key - pygame.K_1
+        elif key in (pygame.K_LEFT, pygame.K_RIGHT):
+            step = 1 if key == pygame.K_LEFT else -1
+            self.offsets[head] = int(np.clip(self.offsets[head] + step, -MAX_OFFSET, MAX_OFFSET))
+            self._set_query(head)
+        elif key in (pygame.K_UP, pygame.K_DOWN):
+            step = 1 if key == pygame.K_UP else -1
+            self.focus_index[head] = int(np.clip(self.focus_index[head] + step, 0, len(FOCUS_LEVELS) - 1))
+            self._set_query(head)
+        elif key == pygame.K_t:
+            target = self.targets[head]
+            self.targets[head] = 0 if target is None else (None if target == len(ISLAND_TYPES) - 1 else target + 1)
+            self._set_query(head)
+        elif key == pygame.K_b:
+            self.shown_batch = (self.shown_batch + 1) % BATCH
+            self._drawn = [None] * HEADS
+        elif key == pygame.K_l:
+            self.length_index = (self.length_index + 1) % len(SEQUENCE_CHOICES)
+            self._new_voyage()
+        elif key == pygame.K_n:
+            self._new_voyage()
+            self.dialogue_box.set_dialogue("New islands rise from the sea. The keys changed, so every map is redrawn.", "Tensor")
+        elif key in (pygame.K_LEFTBRACKET, pygame.K_RIGHTBRACKET):
+            step = 1 if key == pygame.K_RIGHTBRACKET else -1
+            self.inspect_row = int(np.clip(self.inspect_row + step, 0, self.steps - 1))
+
+    def _advance_intro(self):
+        self.intro_step += 1
+        if self.intro_step < len(self.intro_lines):
+            self.dialogue_box.set_dialogue(self.intro_lines[self.intro_step], "Tensor")
+        else:
+            self.phase = "focus"
+            self.dialogue_box.set_dialogue(
+                "1-4: pick a head. LEFT/RIGHT: offset. T: island type. UP/DOWN: focus. B: next voyage in the batch. "
+                "L: length. Hover a map to inspect a row.", "Tensor")
+
+    # Incremental attention
+
+    def update(self, dt):
+        self.dialogue_box.update(dt)
+        self.particles.update(dt)
+
+        if self.victory_celebration and np.random.random() < 0.2:
+            self.particles.create_explosion(np.random.randint(100, self.game.width - 100),
+                                            np.random.randint(100, 300),
+                                            (np.random.randint(180, 255), 230, 120), 12)
+
+    def frame_update(self):
+        if self.attention.stale:
+            start = time.perf_counter()
+            for head in self.attention.forward(budget=REFRESH_BUDGET):
+                self.scores[head] = self._score(head)
+            self.last_refresh_ms = (time.perf_counter() - start) * 1000
+            if not self.attention.stale:
+                self._check_victory()
+        self._update_heatmaps()
+
+    def _check_victory(self):
+        if self.phase != "focus":
+            return
+        progress = np.mean([min(score / VICTORY_MASS, 1.0) for score in self.scores])
+        self.boss_hp = int(round(100 * (1 - progress)))
+        if all(score >= VICTORY_MASS for score in self.scores):
+            self.phase = "victory"
+            self.victory_celebration = True
+            self.dialogue_box.set_dialogue(
+                "Every head finds exactly what it seeks! The Focus Fiend loses its grip on your attention. SPACE to continue.",
+                "Tensor")
+
+    def _update_heatmaps(self):
+        """Redraw a head's map only when its version (or the shown voyage) changed"""
+        for head in range(HEADS):
+            version = (self.attention.versions[head], self.shown_batch)
+            if self._drawn[head] == version or self.attention.is_stale(head):
+                continue
+            weights = self.attention.weights[self.shown_batch, head]
+            # Rows sum to 1 over hundreds of keys; scale each row by its peak so faint rows stay visible
+            brightness = weights * (1 / np.maximum(weights.max(axis=1, keepdims=True), 1e-12))
+            color = ISLAND_COLORS[HEAD_QUESTS[head][2]] if HEAD_QUESTS[head][1] == "type" else (120, 200, 255)
+            # pixels3d indexes (x, y): key -> x, query -> y. Writing one channel at a time
+            # avoids building a (steps, steps, 3) temporary and is several times faster
+            pixels = pygame.surfarray.pixels3d(self._heatmaps[head])
+            for channel, value in enumerate(color):
+                np.multiply(brightness.T, value, out=pixels[..., channel], casting='unsafe')
+            del pixels
+            self._drawn[head] = version
+            self._scaled[head] = None
+
+    # Rendering
+
+    def render(self, screen):
+        screen.fill((14, 24, 40))
+
+        title = self.title_font.render("Attention Archipelago", True, (140, 210, 255))
+        screen.blit(title, title.get_rect(center=(self.game.width // 2, 40)))
+
+        if self.phase in ("focus", "victory"):
+            hp_rect = pygame.Rect(self.game.width // 2 - 200, 68, 400, 14)
+            pygame.draw.rect(screen, (25, 40, 70), hp_rect)
+            pygame.draw.rect(screen, (110, 180, 255), (hp_rect.x, hp_rect.y, hp_rect.width * self.boss_hp // 100, hp_rect.height))
+            pygame.draw.rect(screen, (255, 255, 255), hp_rect, 1)
+            boss_text = self.small_font.render(f"Focus Fiend HP: {self.boss_hp}", True, (255, 255, 255))
+            screen.blit(boss_text, boss_text.get_rect(center=(hp_rect.centerx, hp_rect.bottom + 10)))
+
+            for head in range(HEADS):
+                self._render_map(screen, head)
+            self._render_row(screen, pygame.Rect(30, 366, self.game.width - 60, 110))
+            self._render_stats(screen, pygame.Rect(30, 484, self.game.width - 60, 122))
+
+        self.particles.render(screen, self.game.interpolation)
+        self.dialogue_box.render(screen, self.body_font, self.header_font)
+
+    def _map_rect(self, head):
+        width = (self.game.width - 60 - 3 * 10) // HEADS
+        return pygame.Rect(30 + head * (width + 10), 100, width, 258)
+
+    def _plot_rect(self, rect):
+        size = min(rect.width - 20, rect.height - 34)
+        return pygame.Rect(rect.centerx - size // 2, rect.y + 26, size, size)
+
+    def _panel(self, screen, rect, label, highlight=False):
+        pygame.draw.rect(screen, (20, 34, 56), rect, border_radius=8)
+        pygame.draw.rect(screen, (255, 220, 120) if highlight else (90, 140, 200), rect, 2, border_radius=8)
+        screen.blit(self.small_font.render(label, True, (220, 235, 255)), (rect.x + 10, rect.y + 6))
+
+    def _render_map(self, screen, head):
+        rect = self._map_rect(head)
+        done = f"{self.scores[head]:.0%}"
+        self._panel(screen, rect, f"Head {head + 1}: {HEAD_QUESTS[head][0]} ({done})", head == self.selected_head)
+        plot = self._plot_rect(rect)
+        if self._scaled[head] is None:
+            self._scaled[head] = pygame.transform.smoothscale(self._heatmaps[head], plot.size)
+        screen.blit(self._scaled[head], plot.topleft)
+        y = plot.y + (self.inspect_row + 0.5) * plot.height / self.steps
+        pygame.draw.line(screen, (255, 255, 255), (plot.x - 6, y), (plot.x - 1, y), 2)
+
+    def _render_row(self, screen, rect):
+        """The inspected query's attention over every key of the selected head, bars colored by island type"""
+        head, batch, row = self.selected_head, self.shown_batch, self.inspect_row
+        decoded = self.attention.outputs[batch, head, row, 2 * FREQUENCIES:] @ self.type_codes.T
+        sees = ISLAND_TYPES[int(np.argmax(decoded))]
+        self._panel(screen, rect, f"Head {head + 1}, island {row} ({ISLAND_TYPES[self.islands[batch, row]]}) "
+                                  f"attends to... its output mostly carries '{sees}'")
+        plot = pygame.Rect(rect.x + 10, rect.y + 24, rect.width - 20, rect.height - 44)
+        weights = self.attention.weights[batch, head, row]
+        width = plot.width / self.steps
+        peak = max(float(weights.max()), 1e-6)
+        for key in np.flatnonzero(weights > peak * 0.01).tolist():
+            height = max(1, int(weights[key] / peak * plot.height))
+            pygame.draw.rect(screen, ISLAND_COLORS[self.islands[batch, key]],
+                             (plot.x + key * width, plot.bottom - height, max(1, width), height))
+
+        strip = pygame.Rect(plot.x, plot.bottom + 4, plot.width, 10)
+        for key, island in enumerate(self.islands[batch].tolist()):
+            pygame.draw.rect(screen, ISLAND_COLORS[island], (strip.x + key * width, strip.y, max(1, width), strip.height))
+        x = strip.x + (row + 0.5) * width
+        pygame.draw.polygon(screen, (255, 255, 255), ((x, strip.y - 1), (x - 4, strip.y - 7), (x + 4, strip.y - 7)))
+
+    def _render_stats(self, screen, rect):
+        self._panel(screen, rect, "Head controls")
+        head = self.selected_head
+        offset = self.offsets[head]
+        where = "off" if offset == 0 else (f"{offset} back" if offset > 0 else f"{-offset} ahead")
+        target = "none" if self.targets[head] is None else ISLAND_TYPES[self.targets[head]]
+        left = [
+            (f"Selected head: {head + 1} (1-4, or click a map)", (255, 220, 120)),
+            (f"Position offset: {where} (LEFT/RIGHT)", (120, 200, 255)),
+            (f"Island type: {target} (T)", (120, 255, 160)),
+            (f"Focus: x{FOCUS_LEVELS[self.focus_index[head]]:g} (UP/DOWN)", (255, 160, 200)),
+        ]
+        attention = self.attention
+        right = [
+            (f"{BATCH} voyages x {HEADS} heads x {self.steps} islands (L: length, B: voyage {self.shown_batch + 1})",
+             (200, 215, 235)),
+            (f"{BATCH * HEADS * self.steps ** 2:,} attention weights, {attention.nbytes / 1e6:.1f} MB of buffers",
+             (200, 215, 235)),
+            (f"Last refresh: {self.last_refresh_ms:.1f} ms (only edited heads are recomputed)", (150, 170, 200)),
+            ("  ".join(f"H{i + 1} {score:.0%}" for i, score in enumerate(self.scores)) + f"  (goal {VICTORY_MASS:.0%})",
+             (255, 230, 150)),
+        ]
+        for i, (line, color) in enumerate(left):
+            screen.blit(self.small_font.render(line, True, color), (rect.x + 12, rect.y + 28 + i * 22))
+        for i, (line, color) in enumerate(right):
+            screen.blit(self.small_font.render(line, True, color), (rect.x + 340, rect.y + 28 + i * 22))
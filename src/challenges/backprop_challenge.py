@@ -0,0 +1,393 @@
+"""
+Backprop Badlands Challenge - Level 7: The Gradient Golem
+Run full backpropagation on a multi-layer network in the background and watch it learn live
+"""
+
+import os
+import tempfile
+import time
+import pygame
+import numpy as np
+from .base_challenge import BaseChallenge
+from ..nn.network import Network
+from ..nn.trainer import BackgroundTrainer
+from ..ui.modern_ui import DialogueBox, ParticleSystem
+from ..visualization.telemetry_panel import TelemetryPanel
+
+CHECKPOINT_PATH = os.path.join(tempfile.gettempdir(), "neural_network_adventure", "backprop_badlands.npz")
+
+LAYER_SIZES = [2, 16, 16, 2]
+ACTIVATIONS = ['tanh', 'tanh', 'linear']
+POINTS_PER_ARM = 300
+# Accuracy on the spirals that shatters the Gradient Golem
+VICTORY_ACCURACY = 0.98
+# Resolution of the decision-region heatmap before it is scaled up
+HEATMAP_CELLS = 72
+# The heatmap is redrawn at most this often (seconds), however fast training runs
+HEATMAP_INTERVAL = 0.05
+# Steps of full-resolution telemetry kept; the curves cover the whole run regardless
+HISTORY_STEPS = 1 << 20
+
+CLASS_COLORS = np.array([[255, 120, 110], [110, 170, 255]], dtype=np.float64)
+
+def _two_spirals(points_per_arm, rng, turns=2.0, noise=0.04):
+    """Two interleaved spiral arms in [-1, 1]^2, the classic backprop stress test"""
+    t = np.sqrt(rng.random(points_per_arm)) * turns * 2 * np.pi
+    arm = np.column_stack((t * np.cos(t), t * np.sin(t))) / (turns * 2 * np.pi)
+    features = np.concatenate([arm, -arm]) + rng.normal(0.0, noise, (2 * points_per_arm, 2))
+    labels = np.repeat([0, 1], points_per_arm)
+    return features, labels
+
+class BackpropChallenge(BaseChallenge):
+    def __init__(self, game):
+        super().__init__(game)
+        self.particles = ParticleSystem()
+        self.dialogue_box = DialogueBox(50, game.height - 150, game.width - 100, 120)
+
+        self.title_font = pygame.font.Font(None, 48)
+        self.header_font = pygame.font.Font(None, 28)
+        self.body_font = pygame.font.Font(None, 22)
+        self.small_font = pygame.font.Font(None, 18)
+
+        # Phases: intro -> training -> victory
+        self.phase = "intro"
+        self.intro_step = 0
+        self.intro_lines = [
+            "The Gradient Golem guards the Badlands. Only a network trained by backpropagation can beat it.",
+            "Backprop runs the forward pass, measures the loss, then sends gradients backwards layer by layer.",
+            "Every weight is nudged against its gradient. Repeat thousands of times and the network learns.",
+            "Our network must separate two interleaved spirals - no straight line can do it!",
+            f"Training runs in the background. Reach {int(VICTORY_ACCURACY * 100)}% accuracy to shatter the Golem!"
+        ]
+
+        self.features, self.labels = _two_spirals(POINTS_PER_ARM, np.random.default_rng(7))
+        self.learning_rate = 0.1
+        self.model = None
+        self.trainer = None
+
+        # UI-side copy of the network, refreshed from the trainer's telemetry ring
+        self.shadow = Network(LAYER_SIZES, ACTIVATIONS, capacity=HEATMAP_CELLS ** 2)
+        axis = np.linspace(-1.2, 1.2, HEATMAP_CELLS)
+        grid_x, grid_y = np.meshgrid(axis, axis[::-1], indexing='ij')
+        self._grid = np.column_stack((grid_x.ravel(), grid_y.ravel()))
+        self._telemetry_seen = -1
+        self._heatmap = None
+        self._heatmap_scaled = None
+        self._heatmap_time = 0.0
+        self._pending_parameters = None
+        self._points_layer = None
+
+        # Curves sampled from the ring each frame
+        self.telemetry_panel = TelemetryPanel([("loss", (255, 140, 110), "log"),
+                                               ("accuracy", (130, 230, 140), (0.0, 1.0)),
+                                               ("weight_norm", (120, 180, 255), "linear")],
+                                              max_history=HISTORY_STEPS)
+        self._sequence = 0
+        self.latest_accuracy = 0.0
+        self.latest_loss = None
+        self.grad_norms = np.zeros(len(LAYER_SIZES) - 1)
+        self.max_gradient = 0.0
+        self.steps_per_second = 0.0
+        self._rate_sample = None
+
+        self.boss_hp = 100
+        self.victory_celebration = False
+        self._build_trainer()
+
+    def initialize(self):
+        self.phase = "intro"
+        self.intro_step = 0
+        self.dialogue_box.set_dialogue(self.intro_lines[0], "Tensor")
+
+    def _build_trainer(self):
+        """Fresh network and trainer; the whole dataset is one batch (full-batch gradient descent)"""
+        self.model = Network(LAYER_SIZES, ACTIVATIONS, capacity=len(self.labels))
+        self.trainer = BackgroundTrainer(self.model, self._epoch_batches, self.learning_rate,
+                                         publish_every=250, telemetry_capacity=2048,
+                                         record_parameters=True)
+        self.shadow.set_flat_parameters(self.model.flat_parameters())
+        self._pending_parameters = None
+        self._telemetry_seen = -1
+        self._sequence = 0
+        self._heatmap = None
+        self.telemetry_panel.reset()
+        self.latest_loss = None
+        self.latest_accuracy = 0.0
+        self.grad_norms[:] = 0
+        self.max_gradient = 0.0
+        self._rate_sample = None
+
+    def _epoch_batches(self):
+        return iter([(self.features, self.labels)])
+
+    def close(self):
+        """Stop the training worker"""
+        self.trainer.stop(wait=False)
+
+    # Controls
+
+    def _toggle_training(self):
+        trainer = self.trainer
+        if not trainer.running:
+            trainer.resume()
+            trainer.start()
+            self.dialogue_box.set_dialogue("Backprop is running: forward, loss, backward, update... thousands of times a second!", "Tensor")
+        elif trainer.paused:
+            trainer.resume()
+            self.dialogue_box.set_dialogue("Training resumed.", "Tensor")
+        else:
+            trainer.pause()
+            self.dialogue_box.set_dialogue("Paused. S steps one update at a time, SPACE resumes.", "Tensor")
+
+    def _single_step(self):
+        self.trainer.step_once()
+        self.dialogue_box.set_dialogue("One step: a forward pass, a backward pass and one weight update.", "Tensor")
+
+    def _save_checkpoint(self):
+        try:
+            os.makedirs(os.path.dirname(CHECKPOINT_PATH), exist_ok=True)
+            self.trainer.save_checkpoint(CHECKPOINT_PATH)
+        except OSError as e:
+            self.dialogue_box.set_dialogue(f"Could not save the checkpoint: {e}", "Tensor")
+            return
+        self.dialogue_box.set_dialogue(f"Checkpoint saved at step {self.trainer.step:,}. L restores it.", "Tensor")
+
+    def _load_checkpoint(self):
+        try:
+            self.trainer.load_checkpoint(CHECKPOINT_PATH)
+            self.shadow.load(CHECKPOINT_PATH)
+        except (OSError, ValueError, KeyError) as e:
+            self.dialogue_box.set_dialogue(f"No usable checkpoint: {e}", "Tensor")
+            return
+        self.learning_rate = self.trainer.learning_rate
+        self._pending_parameters = None
+        self._heatmap = None
+        self.dialogue_box.set_dialogue(f"Checkpoint restored - back at step {self.trainer.step:,}.", "Tensor")
+
+    def _reset(self):
+        self.trainer.stop()
+        self._build_trainer()
+        self.boss_hp = 100
+        self.dialogue_box.set_dialogue("Weights re-randomized. SPACE to train from scratch.", "Tensor")
+
+    def _adjust_learning_rate(self, factor):
+        self.learning_rate = float(np.clip(self.learning_rate * factor, 0.005, 2.0))
+        self.trainer.learning_rate = self.learning_rate
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return "exit"
+
+            if self.phase == "intro":
+                if event.key == pygame.K_SPACE:
+                    self._advance_intro()
+            elif self.phase == "training":
+                if event.key == pygame.K_SPACE:
+                    self._toggle_training()
+                elif event.key == pygame.K_s:
+                    self._single_step()
+                elif event.key == pygame.K_c:
+                    self._save_checkpoint()
+                elif event.key == pygame.K_l:
+                    self._load_checkpoint()
+                elif event.key == pygame.K_r:
+                    self._reset()
+                elif event.key == pygame.K_UP:
+                    self._adjust_learning_rate(2.0)
+                elif event.key == pygame.K_DOWN:
+                    self._adjust_learning_rate(0.5)
+            elif self.phase == "victory":
+                if event.key == pygame.K_SPACE:
+                    return "completed"
+
+        return None
+
+    def _advance_intro(self):
+        self.intro_step += 1
+        if self.intro_step < len(self.intro_lines):
+            self.dialogue_box.set_dialogue(self.intro_lines[self.intro_step], "Tensor")
+        else:
+            self.phase = "training"
+            self.dialogue_box.set_dialogue(
+                "SPACE train/pause, S single step, C checkpoint, L load, R reset, UP/DOWN learning rate.", "Tensor")
+
+    # Sampling the telemetry ring
+
+    def update(self, dt):
+        self.dialogue_box.update(dt)
+        self.particles.update(dt)
+        self._sample_telemetry()
+
+        if self.trainer.error is not None and self.phase == "training":
+            self.dialogue_box.set_dialogue(f"Training failed: {self.trainer.error}", "Tensor")
+            self.trainer.error = None
+
+        if self.victory_celebration and np.random.random() < 0.2:
+            self.particles.create_explosion(np.random.randint(100, self.game.width - 100),
+                                            np.random.randint(100, 300),
+                                            (255, np.random.randint(150, 220), 80), 12)
+
+    def _sample_telemetry(self):
+        """Pull every record published since the last frame; never blocks the worker"""
+        telemetry = self.trainer.telemetry
+        count = telemetry.count
+        if count == self._telemetry_seen:
+            return
+        self._telemetry_seen = count
+
+        # Fields are read one after another, so line them up on the sequence range they all cover
+        reads = {name: telemetry.read(name, since=self._sequence)
+                 for name in ('step', 'loss', 'accuracy', 'weight_norms')}
+        start = max(first for first, _ in reads.values())
+        end = min(first + len(values) for first, values in reads.values())
+        rows = max(0, end - start)
+        self._sequence = max(self._sequence, end)
+        if rows:
+            steps, losses, accuracies, weight_norms = (values[start - first:end - first]
+                                                       for first, values in reads.values())
+            self.telemetry_panel.extend(steps, loss=losses, accuracy=accuracies,
+                                        weight_norm=np.sqrt(np.sum(weight_norms ** 2, axis=1)))
+            self.latest_loss = float(losses[rows - 1])
+
+            now = time.perf_counter()
+            if self._rate_sample is not None and now > self._rate_sample[0] + 0.25:
+                self.steps_per_second = (steps[rows - 1] - self._rate_sample[1]) / (now - self._rate_sample[0])
+                self._rate_sample = (now, steps[rows - 1])
+            elif self._rate_sample is None:
+                self._rate_sample = (now, steps[rows - 1])
+
+        accuracy = telemetry.latest('accuracy')
+        norms = telemetry.latest('grad_norms')
+        parameters = telemetry.latest('parameters')
+        gradients = telemetry.latest('gradients')
+        if accuracy is not None:
+            self.latest_accuracy = float(accuracy)
+            self.grad_norms = norms
+            self.max_gradient = float(np.max(np.abs(gradients)))
+            self._pending_parameters = parameters
+            self._update_boss()
+
+    def _update_boss(self):
+        if self.phase != "training":
+            return
+        # Chance level leaves the Golem untouched, the victory target shatters it
+        progress = (self.latest_accuracy - 0.5) / (VICTORY_ACCURACY - 0.5)
+        self.boss_hp = int(np.clip(100 * (1 - progress), 0, 100))
+        if self.latest_accuracy >= VICTORY_ACCURACY:
+            self.phase = "victory"
+            self.victory_celebration = True
+            self.trainer.stop(wait=False)
+            self.dialogue_box.set_dialogue(
+                f"The Gradient Golem shatters! Backprop untangled the spirals to {self.latest_accuracy:.1%} accuracy. SPACE to continue.",
+                "Tensor")
+
+    # Rendering
+
+    def render(self, screen):
+        screen.fill((30, 22, 18))
+
+        title = self.title_font.render("Backprop Badlands", True, (255, 190, 120))
+        screen.blit(title, title.get_rect(center=(self.game.width // 2, 40)))
+
+        if self.phase in ("training", "victory"):
+            self._render_training(screen)
+
+        self.particles.render(screen, self.game.interpolation)
+        self.dialogue_box.render(screen, self.body_font, self.header_font)
+
+    def _render_training(self, screen):
+        width = self.game.width
+
+        hp_rect = pygame.Rect(width // 2 - 200, 70, 400, 18)
+        pygame.draw.rect(screen, (60, 30, 0), hp_rect)
+        pygame.draw.rect(screen, (220, 140, 60), (hp_rect.x, hp_rect.y, hp_rect.width * self.boss_hp // 100, hp_rect.height))
+        pygame.draw.rect(screen, (255, 255, 255), hp_rect, 2)
+        boss_text = self.small_font.render(f"Gradient Golem HP: {self.boss_hp}", True, (255, 255, 255))
+        screen.blit(boss_text, boss_text.get_rect(center=(hp_rect.centerx, hp_rect.bottom + 12)))
+
+        side = min(300, self.game.height - 460)
+        self._render_decision_regions(screen, pygame.Rect(30, 110, side, side))
+        self._render_stats(screen, pygame.Rect(30, 120 + side, side, self.game.height - 290 - side))
+        right_x, right_width = 50 + side, width - 80 - side
+        self.telemetry_panel.render(screen, pygame.Rect(right_x, 110, right_width, 220), self.small_font)
+        self._render_grad_norms(screen, pygame.Rect(right_x, 340, right_width, self.game.height - 510))
+
+    def _render_decision_regions(self, screen, rect):
+        if self._pending_parameters is not None and time.perf_counter() - self._heatmap_time >= HEATMAP_INTERVAL:
+            self.shadow.set_flat_parameters(self._pending_parameters)
+            self._pending_parameters = None
+            self._heatmap = None
+        if self._heatmap is None:
+            # One batched forward pass of the shadow network over the whole grid
+            logits = self.shadow.forward(self._grid)
+            shifted = logits - logits.max(axis=1, keepdims=True)
+            probabilities = np.exp(shifted)
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+            colors = probabilities @ CLASS_COLORS * 0.6
+            pixels = colors.reshape(HEATMAP_CELLS, HEATMAP_CELLS, 3).astype(np.uint8)
+            self._heatmap = pygame.Surface((HEATMAP_CELLS, HEATMAP_CELLS))
+            self._heatmap_time = time.perf_counter()
+            pygame.surfarray.blit_array(self._heatmap, pixels)
+            self._heatmap_scaled = None
+        if self._heatmap_scaled is None or self._heatmap_scaled.get_size() != rect.size:
+            self._heatmap_scaled = pygame.transform.smoothscale(self._heatmap, rect.size)
+        screen.blit(self._heatmap_scaled, rect.topleft)
+
+        if self._points_layer is None or self._points_layer.get_size() != rect.size:
+            self._points_layer = self._draw_points(rect.size)
+        screen.blit(self._points_layer, rect.topleft)
+        pygame.draw.rect(screen, (220, 160, 100), rect, 2)
+
+    def _draw_points(self, size):
+        """The spirals never move, so they are drawn once onto a transparent layer"""
+        layer = pygame.Surface(size, pygame.SRCALPHA)
+        scale = np.array(size) / 2.4
+        positions = ((self.features * [1, -1] + 1.2) * scale).astype(int)
+        for (x, y), label in zip(positions.tolist(), self.labels.tolist()):
+            pygame.draw.circle(layer, CLASS_COLORS[label].astype(int).tolist(), (x, y), 2)
+        return layer
+
+    def _render_stats(self, screen, rect):
+        pygame.draw.rect(screen, (45, 32, 25), rect, border_radius=8)
+        pygame.draw.rect(screen, (220, 160, 100), rect, 2, border_radius=8)
+
+        trainer = self.trainer
+        if not trainer.running:
+            status = "STOPPED"
+        elif trainer.paused:
+            status = "PAUSED"
+        else:
+            status = "TRAINING"
+        loss_text = f"{self.latest_loss:.4f}" if self.latest_loss is not None else "-"
+        lines = [
+            (f"Status: {status}", (255, 220, 100)),
+            (f"Step {trainer.step:,}  ({self.steps_per_second:,.0f} steps/s)", (230, 230, 230)),
+            (f"Loss: {loss_text}", (255, 160, 140)),
+            (f"Accuracy: {self.latest_accuracy:.1%}", (160, 220, 255)),
+            (f"Largest |gradient|: {self.max_gradient:.2e}", (230, 230, 230)),
+            (f"Learning rate: {self.learning_rate:.3f} (UP/DOWN)", (230, 230, 230)),
+        ]
+        for i, (line, color) in enumerate(lines):
+            if 10 + (i + 1) * 21 > rect.height:
+                break
+            screen.blit(self.small_font.render(line, True, color), (rect.x + 12, rect.y + 10 + i * 21))
+
+    def _render_grad_norms(self, screen, rect):
+        pygame.draw.rect(screen, (40, 30, 25), rect, border_radius=8)
+        pygame.draw.rect(screen, (220, 160, 100), rect, 2, border_radius=8)
+        label = self.small_font.render("Gradient norm per layer (log scale, input -> output)", True, (230, 200, 160))
+        screen.blit(label, (rect.x + 12, rect.y + 8))
+
+        norms = np.log10(np.maximum(self.grad_norms, 1e-8))
+        count = len(norms)
+        bar_area = pygame.Rect(rect.x + 20, rect.y + 32, rect.width - 40, rect.height - 50)
+        bar_width = bar_area.width // count
+        for i, norm in enumerate(norms.tolist()):
+            # -8 .. +1 in log10 maps to an empty .. full bar
+            fill = float(np.clip((norm + 8) / 9, 0, 1))
+            bar = pygame.Rect(bar_area.x + i * bar_width + 10, 0, bar_width - 20, int(fill * (bar_area.height - 20)))
+            bar.bottom = bar_area.bottom - 16
+            pygame.draw.rect(screen, (230, 150, 70), bar)
+            text = self.small_font.render(f"L{i + 1}: {10 ** norm:.2e}", True, (230, 230, 230))
+            screen.blit(text, text.get_rect(midtop=(bar.centerx, bar_area.bottom - 14)))
@@ -23,10 +23,22 @@ class BaseChallenge:
         """Update challenge logic"""
         pass
     
+    def frame_update(self):
+        """Wall-clock work with a per-frame time budget (training, unrolling); runs once per frame, not per step"""
+        pass
+    
     def render(self, screen):
         """Render challenge interface"""
         pass
     
+    def close(self):
+        """Release worker processes and other resources; called whenever the challenge is left"""
+        pass
+    
     def check_solution(self, code):
         """Check if the provided code solves the challenge"""
-        return False
\ No newline at end of file
+        return False
+
+    async def grade(self, code):
+        """Awaitable ``check_solution`` for the asyncio runner; override to yield between test cases"""
+        return self.check_solution(code)
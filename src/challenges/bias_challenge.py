@@ -8,6 +8,7 @@ import math
 from .base_challenge import BaseChallenge
 from ..visualization.neural_viz import NeuralNetworkVisualizer
 from ..game_story import GameStory
+from ..nn.layers import neuron_output
 
 class BiasChallenge(BaseChallenge):
     def __init__(self, game):
@@ -102,14 +103,9 @@ class BiasChallenge(BaseChallenge):
                 
         return None
     
-    def _step_function(self, x):
-        """Step activation function"""
-        return 1.0 if x > 0 else 0.0
-    
     def _compute_output(self, inputs, weights, bias):
         """Compute neuron output"""
-        weighted_sum = sum(w * x for w, x in zip(weights, inputs)) + bias
-        return self._step_function(weighted_sum)
+        return neuron_output(inputs, weights, bias, activation="step")
     
     def _check_scenario_solution(self):
         """Check if current bias setting solves the scenario"""
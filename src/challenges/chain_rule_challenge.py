@@ -9,6 +9,7 @@ import random
 from .base_challenge import BaseChallenge
 from ..visualization.neural_viz import NeuralNetworkVisualizer
 from ..game_story import GameStory
+from ..nn.autodiff import ChainTape
 # Audio removed for better performance
 from ..ui.modern_ui import ModernButton, ProgressBar, DialogueBox, ParticleSystem
 
@@ -30,6 +31,16 @@ class ChainRuleChallenge(BaseChallenge):
             {"name": "Hidden 2", "value": 0.0, "derivative": 0.0, "weight": 0.8, "activation": "relu"},
             {"name": "Output", "value": 0.0, "derivative": 0.0, "weight": 0.3, "activation": "linear"}
         ]
+        self.tape = ChainTape([layer["activation"] for layer in self.network_layers[1:]],
+                              [layer["weight"] for layer in self.network_layers[1:]])
+        
+        # Deep chain mode - same engine, hundreds of layers
+        self.deep_mode = False
+        self.deep_depth = 120
+        self.deep_input = 1.0
+        self.deep_units = ("linear", "relu", "sigmoid")
+        self.deep_tape = ChainTape.random(self.deep_depth, self.deep_units)
+        self._run_deep_chain()
         
         # Boss battle - Chain rule calculation challenges
         self.boss_hp = 100
@@ -93,6 +104,12 @@ class ChainRuleChallenge(BaseChallenge):
                 if event.key == pygame.K_SPACE and self.understanding_bar.current_value >= 80:
                     self.phase = "boss"
                     self._start_boss_battle()
+                elif event.key == pygame.K_d:  # D toggles the deep chain view
+                    self.deep_mode = not self.deep_mode
+                    if self.deep_mode:
+                        self._start_deep_chain()
+                elif self.deep_mode:
+                    self._handle_deep_chain_key(event.key)
                 elif event.key == pygame.K_f or event.key == pygame.K_RIGHT:  # F for Forward or RIGHT arrow
                     self._update_network_forward()
                     self._randomize_network()  # Add new values after each pass
@@ -165,78 +182,59 @@ class ChainRuleChallenge(BaseChallenge):
         self.dialogue_box.set_dialogue(battle_text, "Derivative Dragon")
         # Audio removed
     
+    def _sync_tape(self):
+        """Copy the editable layer weights into the recorded chain"""
+        self.tape.weights[:] = [layer["weight"] for layer in self.network_layers[1:]]
+    
     def _update_network_forward(self):
-        """Update network forward pass"""
-        if len(self.network_layers) <= 1:
-            return
-            
-        for i in range(1, len(self.network_layers)):
-            if i >= len(self.network_layers) or i-1 < 0:
-                continue
-                
-            layer = self.network_layers[i]
-            prev_layer = self.network_layers[i-1]
-            
-            # Safety checks
-            if "value" not in prev_layer or "weight" not in layer:
-                continue
-            
-            try:
-                # Compute forward pass
-                weighted_input = prev_layer["value"] * layer["weight"]
-                # Clamp input to prevent numerical issues
-                weighted_input = max(-50, min(50, weighted_input))
-                
-                if layer.get("activation") == "sigmoid":
-                    layer["value"] = 1 / (1 + math.exp(-weighted_input))
-                elif layer.get("activation") == "relu":
-                    layer["value"] = max(0, weighted_input)
-                else:  # linear
-                    layer["value"] = weighted_input
-                    
-                # Clamp output values
-                layer["value"] = max(-10.0, min(10.0, layer["value"]))
-            except (OverflowError, ValueError, TypeError):
-                layer["value"] = 0.0
+        """Update network forward pass by replaying the recorded chain"""
+        self._sync_tape()
+        self.tape.forward(self.network_layers[0]["value"])
+        for layer, value in zip(self.network_layers, self.tape.values[:, 0].tolist()):
+            layer["value"] = value
     
     def _update_network_backward(self):
         """Update network backward pass (chain rule)"""
-        if len(self.network_layers) == 0:
+        # Replay forward first so every local derivative uses consistent values
+        self._update_network_forward()
+        self.tape.backward(1.0)
+        for layer, derivative in zip(self.network_layers, self.tape.grad_values[:, 0].tolist()):
+            layer["derivative"] = derivative
+    
+    def _start_deep_chain(self):
+        """Explain the deep chain view"""
+        deep_text = "A chain of dozens of layers! Multiply many small derivatives and the gradient vanishes; many large ones and it explodes."
+        self.dialogue_box.set_dialogue(deep_text, "Tensor")
+        self.understanding_bar.set_value(min(100, self.understanding_bar.current_value + 2))
+    
+    def _handle_deep_chain_key(self, key):
+        """Controls for the deep chain view"""
+        if key == pygame.K_UP:
+            self.deep_tape.weights *= 1.1
+        elif key == pygame.K_DOWN:
+            self.deep_tape.weights /= 1.1
+        elif key == pygame.K_RIGHT:
+            self.deep_depth = min(400, self.deep_depth + 20)
+            self.deep_tape = ChainTape.random(self.deep_depth, self.deep_units)
+        elif key == pygame.K_LEFT:
+            self.deep_depth = max(20, self.deep_depth - 20)
+            self.deep_tape = ChainTape.random(self.deep_depth, self.deep_units)
+        elif key == pygame.K_r:
+            self.deep_tape = ChainTape.random(self.deep_depth, self.deep_units)
+        elif key == pygame.K_s:
+            # Sigmoid derivatives are at most 0.25, so they make gradients vanish fast
+            self.deep_units = ("linear", "relu") if "sigmoid" in self.deep_units else ("linear", "relu", "sigmoid")
+            self.deep_tape = ChainTape.random(self.deep_depth, self.deep_units)
+        else:
             return
-            
-        # Start from output with gradient of 1.0
-        self.network_layers[-1]["derivative"] = 1.0
-        
-        # Propagate backward
-        for i in range(len(self.network_layers) - 2, -1, -1):
-            if i < 0 or i >= len(self.network_layers):
-                continue
-                
-            current_layer = self.network_layers[i]
-            next_layer = self.network_layers[i + 1]
-            
-            # Safety check
-            if "value" not in next_layer or "weight" not in next_layer:
-                continue
-            
-            # Compute local derivative based on activation
-            try:
-                if next_layer.get("activation") == "sigmoid":
-                    sigmoid_val = next_layer["value"]
-                    # Clamp sigmoid value to prevent numerical issues
-                    sigmoid_val = max(0.001, min(0.999, sigmoid_val))
-                    local_derivative = sigmoid_val * (1 - sigmoid_val)
-                elif next_layer.get("activation") == "relu":
-                    local_derivative = 1.0 if next_layer["value"] > 0 else 0.0
-                else:  # linear
-                    local_derivative = 1.0
-                
-                # Chain rule: multiply by weight and local derivative
-                derivative_value = next_layer.get("derivative", 0.0) * next_layer["weight"] * local_derivative
-                # Clamp to prevent numerical explosion
-                current_layer["derivative"] = max(-10.0, min(10.0, derivative_value))
-            except (KeyError, TypeError, ValueError):
-                current_layer["derivative"] = 0.0
+        self._run_deep_chain()
+        self.understanding_bar.set_value(min(100, self.understanding_bar.current_value + 1))
+    
+    def _run_deep_chain(self):
+        """Forward and backward through the deep chain"""
+        self.deep_tape.forward(self.deep_input)
+        self.deep_tape.backward(1.0)
+        self.deep_magnitudes = self.deep_tape.gradient_magnitudes()
     
     def _randomize_network(self):
         """Randomize network values for practice"""
@@ -375,7 +373,7 @@ class ChainRuleChallenge(BaseChallenge):
         # Render dialogue only when not overlapping with instructions
         if self.phase != "practice":
             self.dialogue_box.render(screen, pygame.font.Font(None, 28), pygame.font.Font(None, 32))
-        self.particles.render(screen)
+        self.particles.render(screen, self.game.interpolation)
     
     def _render_intro_theory(self, screen):
         """Render intro and theory phases"""
@@ -403,7 +401,10 @@ class ChainRuleChallenge(BaseChallenge):
         self.understanding_bar.render(screen, pygame.font.Font(None, 24))
         
         # Network visualization
-        self._render_network_with_gradients(screen, 100, 100, 800, 400)
+        if self.deep_mode:
+            self._render_deep_chain(screen, 100, 100, 800, 300)
+        else:
+            self._render_network_with_gradients(screen, 100, 100, 800, 400)
         
         # Instructions with better positioning to avoid overlap
         inst_rect = pygame.Rect(50, 420, 700, 80)
@@ -411,9 +412,13 @@ class ChainRuleChallenge(BaseChallenge):
         pygame.draw.rect(screen, (100, 150, 200), inst_rect, 2)
         
         font = pygame.font.Font(None, 20)
+        if self.deep_mode:
+            controls = "Deep chain: UP/DOWN = Scale Weights, LEFT/RIGHT = Depth, R = New Chain, S = Sigmoids, D = Back"
+        else:
+            controls = "Controls: F/RIGHT = Forward Pass, B/LEFT = Backward Pass, R = Reset"
         instructions = [
-            "Controls: F/RIGHT = Forward Pass, B/LEFT = Backward Pass, R = Reset",
-            "UP/DOWN = Adjust Weights, Watch gradients flow backward!",
+            controls,
+            "UP/DOWN = Adjust Weights, D = Deep Chain, Watch gradients flow backward!",
             f"Understanding: {int(self.understanding_bar.current_value)}% - Values change each pass!"
         ]
         
@@ -568,6 +573,49 @@ class ChainRuleChallenge(BaseChallenge):
                     (arrow_end[0] - 10, arrow_end[1] + 5)
                 ])
     
+    def _render_deep_chain(self, screen, x, y, width, height):
+        """Plot log10 |d output / d layer| across every layer of the deep chain"""
+        pygame.draw.rect(screen, (30, 30, 50), (x, y, width, height), border_radius=15)
+        plot = pygame.Rect(x + 60, y + 40, width - 90, height - 70)
+        pygame.draw.rect(screen, (20, 20, 35), plot)
+        
+        # Fixed scale of 10^-20 .. 10^20 so vanishing and exploding both stay on screen
+        limit = 20.0
+        magnitudes = np.clip(self.deep_magnitudes, -limit, limit)
+        xs = plot.left + np.linspace(0, plot.width - 1, len(magnitudes))
+        ys = plot.centery - magnitudes * (plot.height / (2 * limit))
+        
+        font = pygame.font.Font(None, 18)
+        for exponent in (-limit, -10, 0, 10, limit):
+            grid_y = int(plot.centery - exponent * (plot.height / (2 * limit)))
+            color = (120, 120, 160) if exponent == 0 else (50, 50, 75)
+            pygame.draw.line(screen, color, (plot.left, grid_y), (plot.right, grid_y))
+            label = font.render(f"1e{int(exponent)}", True, (180, 180, 200))
+            screen.blit(label, label.get_rect(midright=(plot.left - 5, grid_y)))
+        
+        if len(magnitudes) > 1:
+            pygame.draw.lines(screen, (255, 200, 80), False, np.column_stack((xs, ys)).tolist(), 2)
+        
+        # Readout of the gradient that reaches the input
+        input_gradient = float(self.deep_tape.grad_values[0, 0])
+        log_gradient = self.deep_magnitudes[0]
+        if log_gradient < -6:
+            status, color = "VANISHING", (120, 160, 255)
+        elif log_gradient > 6:
+            status, color = "EXPLODING", (255, 100, 100)
+        else:
+            status, color = "HEALTHY", (100, 255, 100)
+        
+        title_font = pygame.font.Font(None, 24)
+        title = title_font.render(f"Deep chain: {self.deep_tape.depth} layers, mean weight {self.deep_tape.weights.mean():.2f}",
+                                  True, (255, 255, 255))
+        screen.blit(title, (x + 20, y + 12))
+        readout = title_font.render(f"∂out/∂input = {input_gradient:.3e}  {status}", True, color)
+        screen.blit(readout, (x + 20, y + height - 26))
+        
+        axis = font.render("input ← layer → output", True, (180, 180, 200))
+        screen.blit(axis, axis.get_rect(midtop=(plot.centerx, plot.bottom + 2)))
+    
     def _render_network_with_gradients(self, screen, x, y, width, height):
         """Render network with gradient visualization"""
         # Background
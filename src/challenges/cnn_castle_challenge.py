@@ -0,0 +1,348 @@
+"""
+CNN Castle Challenge - Level 11: The Feature Phantom
+Paint convolution kernels and watch the feature maps of 64x64 images update live
+"""
+
+import time
+import pygame
+import numpy as np
+from .base_challenge import BaseChallenge
+from ..nn.conv import Conv2D, Pool2D
+from ..ui.modern_ui import DialogueBox, ParticleSystem
+
+IMAGE_SIZE = 64
+KERNEL_SIZE = 5
+CHANNELS = 4
+# Kernel cells change by this much per click, and stay within +/- KERNEL_LIMIT
+PAINT_STEP = 0.25
+KERNEL_LIMIT = 2.0
+# Time per frame spent recomputing stale channels; at least one channel is always done
+CHANNEL_BUDGET = 0.004
+# Similarity to the Phantom's feature map that reveals (and defeats) it
+VICTORY_SIMILARITY = 0.9
+
+CHANNEL_COLORS = [(255, 200, 90), (110, 200, 255), (150, 255, 150), (230, 140, 255)]
+
+def _centered(kernel):
+    """Pad a 3x3 kernel to KERNEL_SIZE x KERNEL_SIZE"""
+    pad = (KERNEL_SIZE - 3) // 2
+    return np.pad(np.array(kernel, dtype=np.float64), pad)
+
+PRESETS = {
+    pygame.K_1: ("vertical edges", _centered([[-1, 0, 1], [-2, 0, 2], [-1, 0, 1]])),
+    pygame.K_2: ("horizontal edges", _centered([[-1, -2, -1], [0, 0, 0], [1, 2, 1]])),
+    pygame.K_3: ("blur", np.full((KERNEL_SIZE, KERNEL_SIZE), 1.0 / KERNEL_SIZE ** 2)),
+    pygame.K_4: ("sharpen", _centered([[0, -1, 0], [-1, 5, -1], [0, -1, 0]])),
+}
+
+# The Phantom only shows up under a diagonal-edge detector
+PHANTOM_KERNEL = np.array([[2, 1, 0, 0, 0],
+                           [1, 2, 1, 0, 0],
+                           [0, 1, 0, -1, 0],
+                           [0, 0, -1, -2, -1],
+                           [0, 0, 0, -1, -2]], dtype=np.float64)
+
+def _castle_images():
+    """Four procedurally drawn 64x64 grayscale test images in [0, 1], as (names, (4, 1, 64, 64))"""
+    names = ["Castle", "Moat", "Banners", "Runes"]
+    surfaces = [pygame.Surface((IMAGE_SIZE, IMAGE_SIZE)) for _ in names]
+
+    castle = surfaces[0]
+    castle.fill((30, 30, 30))
+    pygame.draw.rect(castle, (200, 200, 200), (10, 28, 44, 30))
+    for x in (6, 26, 46):
+        pygame.draw.rect(castle, (230, 230, 230), (x, 14, 12, 44))
+        for notch in range(3):
+            pygame.draw.rect(castle, (230, 230, 230), (x + notch * 5, 9, 3, 5))
+    pygame.draw.rect(castle, (20, 20, 20), (26, 42, 12, 16))
+    pygame.draw.polygon(castle, (160, 160, 160), [(0, 63), (63, 63), (63, 58)])
+
+    moat = surfaces[1]
+    moat.fill((0, 0, 0))
+    for radius, shade in ((30, 220), (22, 60), (14, 200), (6, 40)):
+        pygame.draw.circle(moat, (shade, shade, shade), (32, 32), radius)
+
+    banners = surfaces[2]
+    banners.fill((40, 40, 40))
+    for offset in range(-64, 64, 12):
+        pygame.draw.line(banners, (230, 230, 230), (offset, 0), (offset + 63, 63), 4)
+
+    runes = surfaces[3]
+    runes.fill((10, 10, 10))
+    font = pygame.font.Font(None, 40)
+    text = font.render("CNN", True, (240, 240, 240))
+    runes.blit(text, text.get_rect(center=(32, 32)))
+
+    # surfarray is (x, y); the convolution works on (row, column)
+    images = np.stack([pygame.surfarray.array3d(s).mean(axis=2).T / 255.0 for s in surfaces])
+    return names, images[:, None]
+
+class CNNChallenge(BaseChallenge):
+    def __init__(self, game):
+        super().__init__(game)
+        self.particles = ParticleSystem()
+        self.dialogue_box = DialogueBox(50, game.height - 150, game.width - 100, 120)
+
+        self.title_font = pygame.font.Font(None, 48)
+        self.header_font = pygame.font.Font(None, 28)
+        self.body_font = pygame.font.Font(None, 22)
+        self.small_font = pygame.font.Font(None, 18)
+
+        # Phases: intro -> paint -> victory
+        self.phase = "intro"
+        self.intro_step = 0
+        self.intro_lines = [
+            "CNN Castle is haunted by the Feature Phantom, visible only through the right filter.",
+            "A convolution slides a small kernel over the image and records how well each patch matches.",
+            "Each kernel produces one feature map. Pooling then keeps the strongest response in every 2x2 block.",
+            "Paint kernels with the mouse: left click raises a cell, right click lowers it.",
+            "Find the kernel whose feature maps trace the Phantom's outline to banish it!"
+        ]
+
+        self.image_names, self.images = _castle_images()
+        self.image_index = 0
+
+        # One conv layer over all four images at once: every channel sees the whole batch
+        self.conv = Conv2D(1, CHANNELS, KERNEL_SIZE, padding=KERNEL_SIZE // 2, activation="relu")
+        for channel, key in enumerate((pygame.K_1, pygame.K_2, pygame.K_3)):
+            self.conv.kernels[channel + 1, 0] = PRESETS[key][1]
+        self.conv.set_input(self.images)
+        self.pool = Pool2D(2)
+
+        phantom = Conv2D(1, 1, KERNEL_SIZE, padding=KERNEL_SIZE // 2, activation="relu")
+        phantom.kernels[0, 0] = PHANTOM_KERNEL
+        self.phantom_maps = phantom.forward(self.images)[:, 0].copy()
+        self._phantom_surfaces = [self._map_surface(m, (200, 200, 255), 192) for m in self.phantom_maps]
+
+        self.selected_channel = 0
+        # Channels whose kernel changed since their maps were last computed
+        self.stale_channels = list(range(CHANNELS))
+        self.similarities = np.zeros(CHANNELS)
+        self._map_cache = [None] * CHANNELS
+        self._image_surfaces = [self._map_surface(image[0], (255, 255, 255), 192) for image in self.images]
+        self.last_compute_ms = 0.0
+
+        self.kernel_rect = pygame.Rect(250, 110, 200, 200)
+        self.painting = 0
+        self._painted_cell = None
+
+        self.boss_hp = 100
+        self.victory_celebration = False
+
+    def initialize(self):
+        self.phase = "intro"
+        self.intro_step = 0
+        self.dialogue_box.set_dialogue(self.intro_lines[0], "Tensor")
+
+    # Kernels and feature maps
+
+    def _kernel_changed(self, channel):
+        if channel not in self.stale_channels:
+            self.stale_channels.append(channel)
+
+    def _paint(self, pos, direction):
+        """Raise or lower the kernel cell under pos for the selected channel"""
+        if not self.kernel_rect.collidepoint(pos):
+            return
+        cell_size = self.kernel_rect.width // KERNEL_SIZE
+        col = (pos[0] - self.kernel_rect.x) // cell_size
+        row = (pos[1] - self.kernel_rect.y) // cell_size
+        if (row, col) == self._painted_cell:
+            return
+        self._painted_cell = (row, col)
+        kernel = self.conv.kernels[self.selected_channel, 0]
+        kernel[row, col] = np.clip(kernel[row, col] + direction * PAINT_STEP, -KERNEL_LIMIT, KERNEL_LIMIT)
+        self._kernel_changed(self.selected_channel)
+
+    def _apply_preset(self, key):
+        name, kernel = PRESETS[key]
+        self.conv.kernels[self.selected_channel, 0] = kernel
+        self._kernel_changed(self.selected_channel)
+        self.dialogue_box.set_dialogue(f"Channel {self.selected_channel + 1} now detects {name}.", "Tensor")
+
+    def _compute_stale_channels(self):
+        """Recompute stale channels for the whole image batch, within a per-frame time budget"""
+        start = time.perf_counter()
+        while self.stale_channels:
+            channel = self.stale_channels.pop(0)
+            maps = self.conv.forward_channel(channel)
+            pooled = self.pool.forward(maps)
+            self.similarities[channel] = self._similarity(maps)
+            self._map_cache[channel] = [
+                (self._map_surface(maps[i], CHANNEL_COLORS[channel], 128),
+                 self._map_surface(pooled[i], CHANNEL_COLORS[channel], 64))
+                for i in range(len(maps))
+            ]
+            if time.perf_counter() - start > CHANNEL_BUDGET:
+                break
+        self.last_compute_ms = (time.perf_counter() - start) * 1000
+
+    def _similarity(self, maps):
+        """Cosine similarity between a channel's maps and the Phantom's, over every image"""
+        a, b = maps.ravel(), self.phantom_maps.ravel()
+        norm = np.linalg.norm(a) * np.linalg.norm(b)
+        return float(a @ b / norm) if norm > 0 else 0.0
+
+    @staticmethod
+    def _map_surface(values, color, size):
+        """Normalize a (rows, cols) map to a tinted surface scaled to size x size"""
+        peak = float(np.max(np.abs(values)))
+        levels = np.abs(values) / peak if peak > 0 else np.zeros_like(values)
+        pixels = (levels.T[:, :, None] * np.array(color, dtype=np.float64)).astype(np.uint8)
+        return pygame.transform.scale(pygame.surfarray.make_surface(pixels), (size, size))
+
+    # Events
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return "exit"
+
+            if self.phase == "intro":
+                if event.key == pygame.K_SPACE:
+                    self._advance_intro()
+            elif self.phase == "paint":
+                if event.key == pygame.K_TAB:
+                    self.selected_channel = (self.selected_channel + 1) % CHANNELS
+                elif event.key == pygame.K_n:
+                    self.image_index = (self.image_index + 1) % len(self.images)
+                elif event.key in PRESETS:
+                    self._apply_preset(event.key)
+                elif event.key == pygame.K_0:
+                    self.conv.kernels[self.selected_channel].fill(0)
+                    self._kernel_changed(self.selected_channel)
+                elif event.key == pygame.K_f:
+                    # Flip the kernel: turns a detector for one edge direction into its opposite
+                    kernel = self.conv.kernels[self.selected_channel, 0]
+                    kernel[...] = -kernel
+                    self._kernel_changed(self.selected_channel)
+            elif self.phase == "victory":
+                if event.key == pygame.K_SPACE:
+                    return "completed"
+
+        elif self.phase == "paint":
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button in (1, 3):
+                self.painting = 1 if event.button == 1 else -1
+                self._painted_cell = None
+                self._paint(event.pos, self.painting)
+            elif event.type == pygame.MOUSEBUTTONUP and event.button in (1, 3):
+                self.painting = 0
+            elif event.type == pygame.MOUSEMOTION and self.painting:
+                self._paint(event.pos, self.painting)
+
+        return None
+
+    def _advance_intro(self):
+        self.intro_step += 1
+        if self.intro_step < len(self.intro_lines):
+            self.dialogue_box.set_dialogue(self.intro_lines[self.intro_step], "Tensor")
+        else:
+            self.phase = "paint"
+            self.dialogue_box.set_dialogue(
+                "TAB picks a channel, 1-4 load presets, 0 clears, F flips, N shows the next image.", "Tensor")
+
+    def update(self, dt):
+        self.dialogue_box.update(dt)
+        self.particles.update(dt)
+
+        best = float(self.similarities.max())
+        if self.phase == "paint":
+            self.boss_hp = int(np.clip(100 * (1 - best / VICTORY_SIMILARITY), 0, 100))
+            if best >= VICTORY_SIMILARITY and not self.stale_channels:
+                self.phase = "victory"
+                self.victory_celebration = True
+                channel = int(np.argmax(self.similarities))
+                self.dialogue_box.set_dialogue(
+                    f"Channel {channel + 1} traces the Phantom with {best:.0%} similarity - it is banished! SPACE to continue.",
+                    "Tensor")
+
+        if self.victory_celebration and np.random.random() < 0.2:
+            self.particles.create_explosion(np.random.randint(100, self.game.width - 100),
+                                            np.random.randint(100, 300),
+                                            (200, 200, np.random.randint(200, 255)), 12)
+
+    def frame_update(self):
+        if self.stale_channels:
+            self._compute_stale_channels()
+
+    # Rendering
+
+    def render(self, screen):
+        screen.fill((22, 20, 32))
+
+        title = self.title_font.render("CNN Castle", True, (200, 200, 255))
+        screen.blit(title, title.get_rect(center=(self.game.width // 2, 40)))
+
+        if self.phase in ("paint", "victory"):
+            self._render_workshop(screen)
+
+        self.particles.render(screen, self.game.interpolation)
+        self.dialogue_box.render(screen, self.body_font, self.header_font)
+
+    def _render_workshop(self, screen):
+        width = self.game.width
+        hp_rect = pygame.Rect(width // 2 - 200, 68, 400, 14)
+        pygame.draw.rect(screen, (30, 30, 70), hp_rect)
+        pygame.draw.rect(screen, (160, 160, 255), (hp_rect.x, hp_rect.y, hp_rect.width * self.boss_hp // 100, hp_rect.height))
+        pygame.draw.rect(screen, (255, 255, 255), hp_rect, 1)
+        boss_text = self.small_font.render(f"Feature Phantom HP: {self.boss_hp}", True, (255, 255, 255))
+        screen.blit(boss_text, boss_text.get_rect(center=(hp_rect.centerx, hp_rect.bottom + 10)))
+
+        index = self.image_index
+        screen.blit(self._image_surfaces[index], (30, 110))
+        pygame.draw.rect(screen, (150, 150, 200), (30, 110, 192, 192), 1)
+        screen.blit(self.small_font.render(f"Input: {self.image_names[index]} (N)", True, (220, 220, 220)), (30, 306))
+        screen.blit(self._phantom_surfaces[index], (30, 330))
+        pygame.draw.rect(screen, (150, 150, 200), (30, 330, 192, 192), 1)
+        screen.blit(self.small_font.render("The Phantom's outline", True, (200, 200, 255)), (30, 526))
+
+        self._render_kernel(screen)
+        self._render_feature_maps(screen, 480, 110)
+
+    def _render_kernel(self, screen):
+        channel = self.selected_channel
+        kernel = self.conv.kernels[channel, 0]
+        cell = self.kernel_rect.width // KERNEL_SIZE
+        color = np.array(CHANNEL_COLORS[channel])
+        for row in range(KERNEL_SIZE):
+            for col in range(KERNEL_SIZE):
+                value = kernel[row, col]
+                level = min(1.0, abs(value) / KERNEL_LIMIT)
+                fill = color * level if value > 0 else np.array((255, 80, 80)) * level
+                rect = pygame.Rect(self.kernel_rect.x + col * cell, self.kernel_rect.y + row * cell, cell - 2, cell - 2)
+                pygame.draw.rect(screen, fill.astype(int).tolist(), rect)
+                pygame.draw.rect(screen, (90, 90, 120), rect, 1)
+                text = self.small_font.render(f"{value:+.2f}", True, (240, 240, 240))
+                screen.blit(text, text.get_rect(center=rect.center))
+
+        lines = [
+            (f"Painting channel {channel + 1} (TAB)", tuple(CHANNEL_COLORS[channel])),
+            ("Left click +, right click -", (200, 200, 200)),
+            ("1 vertical  2 horizontal  3 blur", (200, 200, 200)),
+            ("4 sharpen  0 clear  F flip", (200, 200, 200)),
+            (f"Recompute: {self.last_compute_ms:.2f} ms", (150, 150, 170)),
+        ]
+        for i, (line, line_color) in enumerate(lines):
+            screen.blit(self.small_font.render(line, True, line_color), (self.kernel_rect.x, self.kernel_rect.bottom + 12 + i * 20))
+
+    def _render_feature_maps(self, screen, x, y):
+        for channel in range(CHANNELS):
+            cx = x + channel * 130
+            cached = self._map_cache[channel]
+            color = CHANNEL_COLORS[channel]
+            if cached is not None:
+                full, pooled = cached[self.image_index]
+                screen.blit(full, (cx, y))
+                screen.blit(pooled, (cx + 32, y + 150))
+            if channel in self.stale_channels:
+                pending = self.small_font.render("computing...", True, (200, 200, 200))
+                screen.blit(pending, pending.get_rect(center=(cx + 64, y + 64)))
+            border = 3 if channel == self.selected_channel else 1
+            pygame.draw.rect(screen, color, (cx, y, 128, 128), border)
+            pygame.draw.rect(screen, color, (cx + 32, y + 150, 64, 64), 1)
+            screen.blit(self.small_font.render(f"Channel {channel + 1}", True, color), (cx, y + 132))
+            similarity = self.small_font.render(f"match {self.similarities[channel]:.0%}", True, (220, 220, 220))
+            screen.blit(similarity, (cx + 20, y + 220))
+
+        note = self.small_font.render("Feature maps (ReLU) above, 2x2 max-pooled maps below", True, (170, 170, 200))
+        screen.blit(note, (x, y + 250))
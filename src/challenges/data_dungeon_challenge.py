@@ -0,0 +1,365 @@
+"""
+Data Dungeons Challenge - Level 9: The Noise Nightmare
+Train a network on a real on-disk dataset streamed through memory mapping
+"""
+
+import os
+import shutil
+import tempfile
+import pygame
+import numpy as np
+from .base_challenge import BaseChallenge
+from ..visualization.neural_viz import NeuralNetworkVisualizer
+from ..nn.network import Network
+from ..nn.data import open_dataset, write_dataset, minibatches, iterate_chunks
+from ..nn.trainer import BackgroundTrainer
+from ..ui.modern_ui import ProgressBar, DialogueBox, ParticleSystem
+
+# The dungeon dataset lives on disk and is only ever streamed, never loaded whole
+DATASET_PATH = os.path.join(tempfile.gettempdir(), "neural_network_adventure", "data_dungeons")
+DATASET_ROWS = 1_000_000
+DATASET_FEATURES = 8
+DATASET_CLASSES = 3
+LABEL_NOISE = 0.15
+CHUNK_ROWS = 32_768
+
+# Share of rows (at the end of the file) held out for validation
+VALIDATION_SHARE = 0.05
+# Rows of the held-out tail scored on each evaluation; a fixed slice keeps it cheaper than the training in between
+VALIDATION_ROWS = 8_192
+# Validation accuracy that defeats the Noise Nightmare
+VICTORY_ACCURACY = 0.75
+
+def _dungeon_chunks(rng, chunk_rows=CHUNK_ROWS):
+    """Endless stream of labelled sensor readings with label noise, one chunk at a time"""
+    # Overlapping classes: even a perfect model tops out around 77% before the label noise is removed
+    centers = np.random.default_rng(9).normal(0.0, 0.7, (DATASET_CLASSES, DATASET_FEATURES))
+    while True:
+        labels = rng.integers(0, DATASET_CLASSES, chunk_rows)
+        features = centers[labels] + rng.normal(0.0, 1.0, (chunk_rows, DATASET_FEATURES))
+        noisy = rng.random(chunk_rows) < LABEL_NOISE
+        labels[noisy] = rng.integers(0, DATASET_CLASSES, int(noisy.sum()))
+        yield features.astype(np.float32), labels.astype(np.int8)
+
+class DataDungeonChallenge(BaseChallenge):
+    def __init__(self, game):
+        super().__init__(game)
+        self.visualizer = NeuralNetworkVisualizer(game.width, game.height)
+        self.particles = ParticleSystem()
+        self.dialogue_box = DialogueBox(50, game.height - 150, game.width - 100, 120)
+
+        self.title_font = pygame.font.Font(None, 48)
+        self.header_font = pygame.font.Font(None, 28)
+        self.body_font = pygame.font.Font(None, 22)
+        self.small_font = pygame.font.Font(None, 18)
+
+        # Phases: intro -> forge (write dataset to disk) -> training -> victory
+        self.phase = "intro"
+        self.intro_step = 0
+        self.intro_lines = [
+            "Welcome to the Data Dungeons! Real datasets are far too big to fit in memory.",
+            f"This dungeon holds {DATASET_ROWS:,} sensor readings on disk. We never load them all at once.",
+            "The file is memory-mapped: we stream shuffled mini-batches chunk by chunk straight from disk.",
+            f"Beware the Noise Nightmare! {int(LABEL_NOISE * 100)}% of the labels are corrupted.",
+            f"Reach {int(VICTORY_ACCURACY * 100)}% validation accuracy to banish it!"
+        ]
+
+        # Dataset
+        self.dataset_path = DATASET_PATH
+        self.features = None
+        self.labels = None
+        self.forge_rows = 0
+        self.forge_total = DATASET_ROWS
+        self.forge_job = None
+        self.forge_bar = ProgressBar(game.width // 2 - 250, 300, 500, 30, 100)
+
+        # Training
+        self.model = None
+        self.trainer = None
+        self.batch_size = 64
+        self.learning_rate = 0.01
+        self.train_stop = 0
+        self.validation_stop = 0
+        self.latest = None
+        self.history = {'loss': [], 'accuracy': [], 'val_accuracy': []}
+        self.history_length = 240
+        self.rows_per_second = 0.0
+        self._rate_sample = None
+
+        # Boss
+        self.boss_hp = 100
+        self.victory_celebration = False
+
+    def initialize(self):
+        self.phase = "intro"
+        self.intro_step = 0
+        self.dialogue_box.set_dialogue(self.intro_lines[0], "Tensor")
+
+    # Dataset forging
+
+    def _dataset_ready(self):
+        """True if a complete dataset is already on disk"""
+        try:
+            features, labels = open_dataset(self.dataset_path)
+        except (OSError, ValueError, KeyError):
+            return False
+        return len(labels) > 0
+
+    def _start_forge(self):
+        """Write the dungeon dataset to disk in the background (or reuse an existing one)"""
+        self.phase = "forge"
+        if self._dataset_ready():
+            self._open_dataset()
+            return
+
+        self.dialogue_box.set_dialogue("Forging the dungeon dataset on disk, one chunk at a time...", "Tensor")
+        self.forge_job = self.game.jobs.submit(self._forge_dataset, owner=self, pass_stop=True,
+                                               on_done=self._forge_finished, on_error=self._forge_failed)
+
+    def _forge_dataset(self, stop):
+        """Runs on a job thread; returns whether the dataset was completed"""
+        partial_path = self.dataset_path + ".partial"
+        chunks = _dungeon_chunks(np.random.default_rng())
+        for written in write_dataset(partial_path, chunks, DATASET_ROWS, DATASET_FEATURES):
+            self.forge_rows = written
+            if stop.is_set():
+                # Leaving the dungeon mid-forge; the partial file is never opened
+                return False
+        # Only a fully written dataset gets the real name
+        if os.path.isdir(self.dataset_path):
+            shutil.rmtree(self.dataset_path)
+        os.replace(partial_path, self.dataset_path)
+        return True
+
+    def _forge_finished(self, completed):
+        self.forge_job = None
+        if completed:
+            self._open_dataset()
+
+    def _forge_failed(self, error):
+        self.forge_job = None
+        self.dialogue_box.set_dialogue(f"The forge failed: {error}", "Tensor")
+
+    def _open_dataset(self):
+        """Memory-map the dataset and build a network sized for it"""
+        self.features, self.labels = open_dataset(self.dataset_path)
+        rows, n_features = self.features.shape
+        classes = max(2, int(np.max(self.labels)) + 1)
+        self.train_stop = int(rows * (1 - VALIDATION_SHARE))
+        self.validation_stop = min(rows, self.train_stop + VALIDATION_ROWS)
+
+        self.model = Network([n_features, 16, 12, classes], ['relu', 'relu', 'linear'],
+                             capacity=self.batch_size)
+        self.trainer = BackgroundTrainer(self.model, self._epoch_batches, self.learning_rate,
+                                         evaluate=self._evaluate, publish_every=25, evaluate_every=100)
+
+        self.phase = "training"
+        file_mb = (self.features.nbytes + self.labels.nbytes) / 2**20
+        chunk_mb = CHUNK_ROWS * (self.features.itemsize * n_features + 8) / 2**20
+        ready_text = (f"{rows:,} rows ({file_mb:.0f} MB) mapped from disk, but only a {chunk_mb:.1f} MB chunk "
+                      "is ever in memory. Press SPACE to train!")
+        self.dialogue_box.set_dialogue(ready_text, "Tensor")
+
+    # Training (runs on the trainer's worker thread)
+
+    def _epoch_batches(self):
+        return minibatches(self.features, self.labels, self.batch_size,
+                           chunk_rows=CHUNK_ROWS, stop=self.train_stop)
+
+    def _evaluate(self, network):
+        """Validation accuracy on the first VALIDATION_ROWS rows of the held-out tail of the file"""
+        correct = 0
+        for features, labels in iterate_chunks(self.features, self.labels, CHUNK_ROWS,
+                                               start=self.train_stop, stop=self.validation_stop):
+            correct += int(np.count_nonzero(np.argmax(network.forward(features), axis=1) == labels))
+        return correct / max(1, self.validation_stop - self.train_stop)
+
+    def _toggle_training(self):
+        if self.trainer.running:
+            self.trainer.stop(wait=False)
+            self.dialogue_box.set_dialogue("Training paused. SPACE to resume.", "Tensor")
+        else:
+            self.trainer.start()
+            self._rate_sample = None
+            self.dialogue_box.set_dialogue("Streaming mini-batches from disk... watch the Noise Nightmare weaken!", "Tensor")
+
+    def _adjust_learning_rate(self, factor):
+        self.learning_rate = float(np.clip(self.learning_rate * factor, 0.001, 1.0))
+        if self.trainer is not None:
+            self.trainer.learning_rate = self.learning_rate
+
+    def close(self):
+        """Stop the training worker"""
+        if self.trainer is not None:
+            self.trainer.stop(wait=False)
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return "exit"
+
+            if self.phase == "intro":
+                if event.key == pygame.K_SPACE:
+                    self._advance_intro()
+            elif self.phase == "training":
+                if event.key == pygame.K_SPACE:
+                    self._toggle_training()
+                elif event.key == pygame.K_UP:
+                    self._adjust_learning_rate(2.0)
+                elif event.key == pygame.K_DOWN:
+                    self._adjust_learning_rate(0.5)
+            elif self.phase == "victory":
+                if event.key == pygame.K_SPACE:
+                    return "completed"
+
+        return None
+
+    def _advance_intro(self):
+        self.intro_step += 1
+        if self.intro_step < len(self.intro_lines):
+            self.dialogue_box.set_dialogue(self.intro_lines[self.intro_step], "Tensor")
+        else:
+            self._start_forge()
+
+    def update(self, dt):
+        self.dialogue_box.update(dt)
+        self.particles.update(dt)
+
+        if self.phase == "forge" and self.forge_job is not None:
+            self.forge_bar.set_value(100 * self.forge_rows / self.forge_total)
+            self.forge_bar.update(dt)
+
+        if self.trainer is not None:
+            self._apply_updates(self.trainer.drain())
+
+        if self.victory_celebration and np.random.random() < 0.2:
+            self.particles.create_explosion(np.random.randint(100, self.game.width - 100),
+                                            np.random.randint(100, 300),
+                                            (255, np.random.randint(150, 255), 100), 12)
+
+    def _apply_updates(self, updates):
+        """Fold a batch of worker updates into the charts in one go"""
+        if not updates:
+            return
+        for update in updates:
+            if 'error' in update:
+                self.dialogue_box.set_dialogue(f"Training failed: {update['error']}", "Tensor")
+                continue
+            self.history['loss'].append(update['loss'])
+            self.history['accuracy'].append(update['accuracy'])
+            if 'val_accuracy' in update:
+                self.history['val_accuracy'].append(update['val_accuracy'])
+            self.latest = update
+        for key, values in self.history.items():
+            del values[:-self.history_length]
+
+        if self.latest is not None:
+            now, rows = self.latest['time'], self.latest['rows']
+            if self._rate_sample is not None and now > self._rate_sample[0]:
+                self.rows_per_second = (rows - self._rate_sample[1]) / (now - self._rate_sample[0])
+            self._rate_sample = (now, rows)
+
+        if self.history['val_accuracy'] and self.phase == "training":
+            val_accuracy = self.history['val_accuracy'][-1]
+            # Chance level leaves the boss untouched, the victory target defeats it
+            chance = 1.0 / max(2, self.model.layer_sizes[-1])
+            progress = (val_accuracy - chance) / (VICTORY_ACCURACY - chance)
+            self.boss_hp = int(np.clip(100 * (1 - progress), 0, 100))
+            if val_accuracy >= VICTORY_ACCURACY:
+                self.phase = "victory"
+                self.victory_celebration = True
+                self.trainer.stop(wait=False)
+                self.dialogue_box.set_dialogue(
+                    f"The Noise Nightmare is banished! {val_accuracy:.1%} validation accuracy on data that never fit in memory! SPACE to continue.",
+                    "Tensor")
+
+    # Rendering
+
+    def render(self, screen):
+        screen.fill((20, 18, 30))
+
+        title = self.title_font.render("Data Dungeons", True, (200, 160, 255))
+        screen.blit(title, title.get_rect(center=(self.game.width // 2, 40)))
+
+        if self.phase == "forge":
+            self._render_forge(screen)
+        elif self.phase in ("training", "victory") and self.trainer is not None:
+            self._render_training(screen)
+
+        self.particles.render(screen, self.game.interpolation)
+        self.dialogue_box.render(screen, self.body_font, self.header_font)
+
+    def _render_forge(self, screen):
+        self.forge_bar.render(screen, self.body_font)
+        text = self.body_font.render(f"Writing rows to disk: {self.forge_rows:,} / {self.forge_total:,}",
+                                     True, (220, 220, 220))
+        screen.blit(text, text.get_rect(center=(self.game.width // 2, 270)))
+        path_text = self.small_font.render(self.dataset_path, True, (150, 150, 170))
+        screen.blit(path_text, path_text.get_rect(center=(self.game.width // 2, 350)))
+
+    def _render_training(self, screen):
+        width = self.game.width
+
+        # Boss HP
+        hp_rect = pygame.Rect(width // 2 - 200, 70, 400, 18)
+        pygame.draw.rect(screen, (60, 0, 30), hp_rect)
+        pygame.draw.rect(screen, (200, 60, 160), (hp_rect.x, hp_rect.y, hp_rect.width * self.boss_hp // 100, hp_rect.height))
+        pygame.draw.rect(screen, (255, 255, 255), hp_rect, 2)
+        boss_text = self.small_font.render(f"Noise Nightmare HP: {self.boss_hp}", True, (255, 255, 255))
+        screen.blit(boss_text, boss_text.get_rect(center=(hp_rect.centerx, hp_rect.bottom + 12)))
+
+        self._render_stats(screen, pygame.Rect(30, 110, 300, 230))
+        self._render_curves(screen, pygame.Rect(350, 110, width - 380, 230))
+
+        if self.latest is not None:
+            sizes = self.model.layer_sizes
+            self.visualizer.draw_simple_network(screen, 30, 360, width - 60, 240, self.latest['weights'],
+                                                self.latest['biases'], [np.zeros(n) for n in sizes], zoom=0.6)
+
+    def _render_stats(self, screen, rect):
+        pygame.draw.rect(screen, (35, 30, 50), rect, border_radius=8)
+        pygame.draw.rect(screen, (150, 110, 220), rect, 2, border_radius=8)
+
+        rows, n_features = self.features.shape
+        chunk_mb = CHUNK_ROWS * (self.features.itemsize * n_features + 8) / 2**20
+        latest = self.latest or {}
+        val = self.history['val_accuracy'][-1] if self.history['val_accuracy'] else None
+        status = "TRAINING" if self.trainer.running else "PAUSED"
+        lines = [
+            (f"Status: {status}", (255, 220, 100)),
+            (f"Dataset: {rows:,} rows x {n_features} features", (220, 220, 220)),
+            (f"On disk: {(self.features.nbytes + self.labels.nbytes) / 2**20:.0f} MB (mmap)", (220, 220, 220)),
+            (f"In memory: {chunk_mb:.1f} MB chunk", (150, 255, 150)),
+            (f"Epoch {latest.get('epoch', 0)}  step {latest.get('step', 0):,}", (220, 220, 220)),
+            (f"Rows streamed: {latest.get('rows', 0):,}", (220, 220, 220)),
+            (f"Throughput: {self.rows_per_second:,.0f} rows/s", (220, 220, 220)),
+            (f"Learning rate: {self.learning_rate:.3f} (UP/DOWN)", (220, 220, 220)),
+            (f"Batch loss: {latest['loss']:.3f}" if 'loss' in latest else "Batch loss: -", (255, 160, 160)),
+            (f"Val accuracy: {val:.1%}" if val is not None else "Val accuracy: -", (160, 200, 255)),
+        ]
+        for i, (line, color) in enumerate(lines):
+            screen.blit(self.small_font.render(line, True, color), (rect.x + 12, rect.y + 10 + i * 21))
+
+    def _render_curves(self, screen, rect):
+        pygame.draw.rect(screen, (30, 28, 45), rect, border_radius=8)
+        pygame.draw.rect(screen, (150, 110, 220), rect, 2, border_radius=8)
+        plot = rect.inflate(-30, -40)
+        plot.y += 10
+
+        # Victory line
+        target_y = plot.bottom - VICTORY_ACCURACY * plot.height
+        pygame.draw.line(screen, (90, 80, 120), (plot.left, target_y), (plot.right, target_y), 1)
+
+        max_loss = max(self.history['loss'], default=1.0) or 1.0
+        series = [
+            (self.history['loss'], 1.0 / max_loss, (255, 120, 120), "loss"),
+            (self.history['accuracy'], 1.0, (120, 255, 120), "train acc"),
+            (self.history['val_accuracy'], 1.0, (120, 170, 255), "val acc"),
+        ]
+        for i, (values, scale, color, name) in enumerate(series):
+            if len(values) > 1:
+                xs = plot.left + np.linspace(0, plot.width, len(values))
+                ys = plot.bottom - np.clip(np.asarray(values) * scale, 0, 1) * plot.height
+                pygame.draw.lines(screen, color, False, np.column_stack((xs, ys)).tolist(), 2)
+            label = self.small_font.render(name, True, color)
+            screen.blit(label, (rect.x + 12 + i * 90, rect.y + 8))
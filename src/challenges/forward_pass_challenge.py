@@ -9,6 +9,8 @@ import random
 from .base_challenge import BaseChallenge
 from ..visualization.neural_viz import NeuralNetworkVisualizer
 from ..game_story import GameStory
+from ..nn.network import Network
+from ..visualization.figure_service import FigureService
 # Audio removed for better performance
 from ..ui.modern_ui import ModernButton, ProgressBar, DialogueBox, ParticleSystem
 try:
@@ -79,24 +81,20 @@ class ForwardPassChallenge(BaseChallenge):
         ]
         self.question_index = 0
         
-        # Multi-layer network
+        # Multi-layer network - parameters and activations live in preallocated
+        # buffers of the shared nn core; the dicts below are views onto them
+        self.model = Network([3, 4, 3, 2], ['relu', 'sigmoid', 'softmax'])
+        self.model.set_input([1.0, 0.5, -0.3])
+        activations = [values[0] for values in self.model.activations]
         self.network = {
             'layers': [
-                {'size': 3, 'name': 'Input', 'activations': [1.0, 0.5, -0.3]},
-                {'size': 4, 'name': 'Hidden 1', 'activations': [0.0, 0.0, 0.0, 0.0], 'activation_func': 'relu'},
-                {'size': 3, 'name': 'Hidden 2', 'activations': [0.0, 0.0, 0.0], 'activation_func': 'sigmoid'},
-                {'size': 2, 'name': 'Output', 'activations': [0.0, 0.0], 'activation_func': 'softmax'}
+                {'size': 3, 'name': 'Input', 'activations': activations[0]},
+                {'size': 4, 'name': 'Hidden 1', 'activations': activations[1], 'activation_func': 'relu'},
+                {'size': 3, 'name': 'Hidden 2', 'activations': activations[2], 'activation_func': 'sigmoid'},
+                {'size': 2, 'name': 'Output', 'activations': activations[3], 'activation_func': 'softmax'}
             ],
-            'weights': [
-                np.random.randn(3, 4) * 0.5,  # Input to Hidden 1
-                np.random.randn(4, 3) * 0.5,  # Hidden 1 to Hidden 2
-                np.random.randn(3, 2) * 0.5   # Hidden 2 to Output
-            ],
-            'biases': [
-                np.random.randn(4) * 0.1,
-                np.random.randn(3) * 0.1,
-                np.random.randn(2) * 0.1
-            ]
+            'weights': self.model.weights,  # Input->Hidden 1, Hidden 1->Hidden 2, Hidden 2->Output
+            'biases': self.model.biases
         }
         
         # Animation and flow visualization
@@ -113,6 +111,10 @@ class ForwardPassChallenge(BaseChallenge):
         self.race_progress = 0
         self.boss_progress = 0
         
+        # Text surfaces cached per label; only labels whose value changed get re-rendered
+        self._label_cache = {}
+        self._label_fonts = {}
+        
         # Interactive elements
         self.selected_weight = None
         self.selected_connection = None
@@ -156,6 +158,10 @@ class ForwardPassChallenge(BaseChallenge):
         # Hint system
         self.show_hint = False
         
+        # Matplotlib weight histogram, rendered in a worker process
+        self.figures = FigureService()
+        self.show_weight_chart = False
+        
         # Time pressure mechanics
         self.time_pressure = False
         self.current_time = 0.0
@@ -172,7 +178,11 @@ class ForwardPassChallenge(BaseChallenge):
         intro_text = "I am the Flow Guardian! Master of information flow through neural networks! Can you match my speed in forward propagation?"
         self.dialogue_box.set_dialogue(intro_text, "Flow Guardian")
         # Audio removed
-    
+
+    def close(self):
+        """Shut down the chart worker process"""
+        self.figures.close()
+
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
             if self.phase == "intro":
@@ -197,6 +207,8 @@ class ForwardPassChallenge(BaseChallenge):
                     self.show_calculations = not self.show_calculations
                 elif event.key == pygame.K_a:
                     self.auto_advance = not self.auto_advance
+                elif event.key == pygame.K_w:
+                    self.show_weight_chart = not self.show_weight_chart
                 elif event.key == pygame.K_1:
                     self._answer_question(1)
                 elif event.key == pygame.K_2:
@@ -221,13 +233,9 @@ class ForwardPassChallenge(BaseChallenge):
             elif self.phase == "victory":
                 if event.key == pygame.K_f:
                     return "completed"
-                elif event.key == pygame.K_ESCAPE:
-                    return "exit"
             elif self.phase == "defeat":
                 if event.key == pygame.K_r:
                     self._retry_boss_battle()
-                elif event.key == pygame.K_ESCAPE:
-                    return "exit"
             
             if event.key == pygame.K_ESCAPE:
                 return "exit"
@@ -316,65 +324,29 @@ class ForwardPassChallenge(BaseChallenge):
         if layer_idx >= len(self.network['weights']):
             return
         
-        # Get current layer activations
-        current_activations = np.array(self.network['layers'][layer_idx]['activations'])
-        
-        # Get weights and biases
-        weights = self.network['weights'][layer_idx]
-        biases = self.network['biases'][layer_idx]
-        
         # Show the calculation step by step
         layer_name = self.network['layers'][layer_idx]['name']
         next_layer_name = self.network['layers'][layer_idx + 1]['name']
         
         self.current_calculation = f"Computing {layer_name} → {next_layer_name}:"
         
-        # Compute weighted sum
-        z = np.dot(current_activations, weights) + biases
+        # Compute weighted sum and activation in place (updates the next layer's activations)
+        self.model.forward_layer(layer_idx)
         
-        # Apply activation function
         next_layer = self.network['layers'][layer_idx + 1]
         if next_layer['activation_func'] == 'relu':
-            activations = np.maximum(0, z)
             self.current_calculation += f"\nz = Wx + b, then ReLU(z) = max(0, z)"
         elif next_layer['activation_func'] == 'sigmoid':
-            activations = 1 / (1 + np.exp(-np.clip(z, -500, 500)))
             self.current_calculation += f"\nz = Wx + b, then σ(z) = 1/(1+e^(-z))"
         elif next_layer['activation_func'] == 'softmax':
-            exp_z = np.exp(z - np.max(z))
-            activations = exp_z / np.sum(exp_z)
             self.current_calculation += f"\nz = Wx + b, then softmax(z) = e^z / Σe^z"
         else:
-            activations = z
             self.current_calculation += f"\nz = Wx + b (linear activation)"
-        
-        # Update layer activations
-        next_layer['activations'] = activations.tolist()
     
     def _execute_forward_pass(self):
         """Execute a complete forward pass through the network"""
-        # Perform forward propagation through all layers
-        for layer_idx in range(len(self.network['weights'])):
-            # Get current layer activations
-            current_activations = np.array(self.network['layers'][layer_idx]['activations'])
-            
-            # Matrix multiplication with weights and add bias
-            weighted_sum = np.dot(current_activations, self.network['weights'][layer_idx]) + self.network['biases'][layer_idx]
-            
-            # Apply activation function
-            next_layer = self.network['layers'][layer_idx + 1]
-            if next_layer['activation_func'] == 'relu':
-                activations = np.maximum(0, weighted_sum)
-            elif next_layer['activation_func'] == 'sigmoid':
-                activations = 1 / (1 + np.exp(-np.clip(weighted_sum, -500, 500)))
-            elif next_layer['activation_func'] == 'softmax':
-                exp_vals = np.exp(weighted_sum - np.max(weighted_sum))
-                activations = exp_vals / np.sum(exp_vals)
-            else:
-                activations = weighted_sum
-            
-            # Update next layer activations
-            self.network['layers'][layer_idx + 1]['activations'] = activations.tolist()
+        # Perform forward propagation through all layers (writes every layer's activations)
+        self.model.forward()
         
         # Update stats
         self.total_passes += 1
@@ -396,11 +368,10 @@ class ForwardPassChallenge(BaseChallenge):
         self.current_layer_processing = -1
         
         # Reset to original input values
-        self.network['layers'][0]['activations'] = [1.0, 0.5, -0.3]
+        self.network['layers'][0]['activations'][:] = [1.0, 0.5, -0.3]
         
         # Clear other layers
-        for layer in self.network['layers'][1:]:
-            layer['activations'] = [0.0] * layer['size']
+        self.model.reset_activations()
         
         self.current_calculation = "Ready to start forward pass"
         self.data_flow_particles = []
@@ -542,6 +513,7 @@ class ForwardPassChallenge(BaseChallenge):
         """Randomize input values"""
         for i in range(len(self.network['layers'][0]['activations'])):
             self.network['layers'][0]['activations'][i] = random.uniform(-2, 2)
+        self.model.mark_dirty(0)
     
     def _handle_mouse_down(self, pos):
         """Handle mouse down for weight selection and dragging"""
@@ -567,6 +539,8 @@ class ForwardPassChallenge(BaseChallenge):
             self.network['weights'][layer_idx][from_idx][to_idx] = np.clip(
                 self.network['weights'][layer_idx][from_idx][to_idx], -3, 3
             )
+            # Only layers after the edited weight need recomputing
+            self.model.mark_dirty(layer_idx)
             
             self.drag_start_pos = pos
     
@@ -627,6 +601,19 @@ class ForwardPassChallenge(BaseChallenge):
             self.network['weights'][layer_idx][from_idx][to_idx] = np.clip(
                 self.network['weights'][layer_idx][from_idx][to_idx], -3, 3
             )
+            self.model.mark_dirty(layer_idx)
+    
+    def _render_label(self, key, text, size, color):
+        """Return a cached text surface, re-rendering it only when the text changes"""
+        cached = self._label_cache.get(key)
+        if cached and cached[0] == (text, size, color):
+            return cached[1]
+        font = self._label_fonts.get(size)
+        if font is None:
+            font = self._label_fonts[size] = pygame.font.Font(None, size)
+        surface = font.render(text, True, color)
+        self._label_cache[key] = ((text, size, color), surface)
+        return surface
     
     def _render_current_question(self, screen):
         """Render the current question with options"""
@@ -1007,14 +994,14 @@ class ForwardPassChallenge(BaseChallenge):
     
     def _start_question_timer(self):
         """Start timer for current question"""
-        self.question_start_time = pygame.time.get_ticks() / 1000.0
+        self.question_start_time = self.game.time
     
     def _answer_boss_question(self, answer_num):
         """Handle boss question answers with time pressure"""
         if not self.current_question:
             return
         
-        current_time = pygame.time.get_ticks() / 1000.0
+        current_time = self.game.time
         time_taken = current_time - getattr(self, 'question_start_time', current_time)
         
         # Check if answer is correct
@@ -1146,6 +1133,9 @@ class ForwardPassChallenge(BaseChallenge):
         self.speed_bar.update(dt)
         self.particles.update(dt)
         
+        # Live update after weight edits: recompute only the layers downstream of the change
+        self.model.refresh()
+        
         # Update feedback timer
         if self.feedback_timer > 0:
             self.feedback_timer -= dt
@@ -1207,7 +1197,7 @@ class ForwardPassChallenge(BaseChallenge):
         
         # Always render dialogue and particles
         self.dialogue_box.render(screen, pygame.font.Font(None, 28), pygame.font.Font(None, 32))
-        self.particles.render(screen)
+        self.particles.render(screen, self.game.interpolation)
     
     def _render_intro_theory(self, screen):
         """Render introduction and theory with responsive layout"""
@@ -1305,7 +1295,7 @@ class ForwardPassChallenge(BaseChallenge):
             inst_text = "🎉 Ready for boss battle! Press F to face the Flow Guardian!"
             color = (100, 255, 100)
         else:
-            inst_text = "Press F to execute forward pass • Press 1-4 to answer questions"
+            inst_text = "Press F to execute forward pass • Press 1-4 to answer questions • W: weight chart"
             color = (255, 255, 100)
         
         inst_surface = inst_font.render(inst_text, True, color)
@@ -1317,8 +1307,10 @@ class ForwardPassChallenge(BaseChallenge):
         pygame.draw.rect(screen, color, bg_rect, 1, border_radius=5)
         screen.blit(inst_surface, inst_rect)
         
-        # Question area - positioned in remaining space
-        if hasattr(self, 'current_question') and self.current_question:
+        # Question area - positioned in remaining space (W swaps it for the weight chart)
+        if self.show_weight_chart:
+            self._render_weight_chart(screen, pygame.Rect(self.game.width // 2 - 300, inst_y + 40, 600, 170))
+        elif hasattr(self, 'current_question') and self.current_question:
             question_y = inst_y + 50
             self._render_compact_question(screen, question_y)
         
@@ -1326,6 +1318,21 @@ class ForwardPassChallenge(BaseChallenge):
         if self.feedback_timer > 0:
             self._render_center_feedback(screen)
     
+    def _render_weight_chart(self, screen, rect):
+        """Histogram of every layer's weights; re-rendered off-thread only after a weight is dragged"""
+        pygame.draw.rect(screen, (20, 26, 40), rect, border_radius=6)
+        weights = {f"{self.network['layers'][i]['name']} -> {self.network['layers'][i + 1]['name']}": w
+                   for i, w in enumerate(self.model.weights)}
+        surface = self.figures.request("weight_histogram", (rect.width - 10, rect.height - 10), weights=weights,
+                                       bins=12, title="Weights by layer")
+        if surface is not None:
+            screen.blit(surface, (rect.x + 5, rect.y + 5))
+        else:
+            message = "matplotlib unavailable" if not self.figures.enabled else "Rendering chart..."
+            text = pygame.font.Font(None, 18).render(message, True, (180, 180, 180))
+            screen.blit(text, text.get_rect(center=rect.center))
+        pygame.draw.rect(screen, (100, 150, 200), rect, 1, border_radius=6)
+    
     def _render_boss_battle(self, screen):
         """Render clean boss battle layout"""
         # Boss title at top
@@ -1425,7 +1432,7 @@ class ForwardPassChallenge(BaseChallenge):
         
         # Timer bar at top of question
         if hasattr(self, 'question_start_time') and hasattr(self, 'current_time_limit'):
-            current_time = pygame.time.get_ticks() / 1000.0
+            current_time = self.game.time
             time_elapsed = current_time - self.question_start_time
             time_remaining = max(0, self.current_time_limit - time_elapsed)
             timer_progress = time_remaining / self.current_time_limit
@@ -1686,9 +1693,7 @@ class ForwardPassChallenge(BaseChallenge):
                     mid_x = (start_pos[0] + end_pos[0]) // 2
                     mid_y = (start_pos[1] + end_pos[1]) // 2
                     
-                    weight_text = f"{weight:.2f}"
-                    weight_font = pygame.font.Font(None, 14)
-                    weight_surface = weight_font.render(weight_text, True, (255, 255, 255))
+                    weight_surface = self._render_label(('weight', layer_idx, i, j), f"{weight:.2f}", 14, (255, 255, 255))
                     
                     # Background for weight text
                     text_rect = weight_surface.get_rect(center=(mid_x, mid_y))
@@ -1741,9 +1746,8 @@ class ForwardPassChallenge(BaseChallenge):
                 pygame.draw.circle(screen, (255, 255, 255), (int(pos[0]), int(pos[1])), radius, 3)
                 
                 # Large, clear activation value
-                act_text = f"{activation:.3f}"
-                act_font = pygame.font.Font(None, 18)
-                act_surface = act_font.render(act_text, True, (255, 255, 255))
+                act_surface = self._render_label(('activation', layer_idx, neuron_idx),
+                                                 f"{activation:.3f}", 18, (255, 255, 255))
                 act_rect = act_surface.get_rect(center=(pos[0], pos[1]))
                 
                 # Black background for text readability
@@ -1758,8 +1762,7 @@ class ForwardPassChallenge(BaseChallenge):
                 if layer_idx > 0:
                     layer_name += f" ({layer.get('activation_func', 'linear')})"
                 
-                label_font = pygame.font.Font(None, 20)
-                label_text = label_font.render(layer_name, True, (255, 255, 200))
+                label_text = self._render_label(('layer', layer_idx), layer_name, 20, (255, 255, 200))
                 label_rect = label_text.get_rect(center=label_pos)
                 
                 # Background for label
@@ -1771,9 +1774,7 @@ class ForwardPassChallenge(BaseChallenge):
         if len(self.network['layers']) > 0:
             output_positions = layer_positions[-1]
             for i, (pos, target) in enumerate(zip(output_positions, self.target_output)):
-                target_text = f"Target: {target:.3f}"
-                target_font = pygame.font.Font(None, 16)
-                target_surface = target_font.render(target_text, True, (255, 255, 100))
+                target_surface = self._render_label(('target', i), f"Target: {target:.3f}", 16, (255, 255, 100))
                 target_rect = target_surface.get_rect(center=(pos[0], pos[1] + 40))
                 
                 bg_rect = target_rect.inflate(6, 3)
@@ -1831,9 +1832,7 @@ class ForwardPassChallenge(BaseChallenge):
                         mid_x = (start_pos[0] + end_pos[0]) // 2
                         mid_y = (start_pos[1] + end_pos[1]) // 2
                         
-                        weight_text = f"{weight:.2f}"
-                        weight_font = pygame.font.Font(None, 12)
-                        weight_surface = weight_font.render(weight_text, True, (255, 255, 255))
+                        weight_surface = self._render_label(('weight', layer_idx, i, j), f"{weight:.2f}", 12, (255, 255, 255))
                         
                         # Background for weight text
                         text_rect = weight_surface.get_rect(center=(mid_x, mid_y))
@@ -1893,9 +1892,8 @@ class ForwardPassChallenge(BaseChallenge):
                 
                 # Activation value - larger for current layer
                 font_size = 20 if is_current_layer else 16
-                act_text = f"{activation:.3f}"
-                act_font = pygame.font.Font(None, font_size)
-                act_surface = act_font.render(act_text, True, (255, 255, 255))
+                act_surface = self._render_label(('activation', layer_idx, neuron_idx),
+                                                 f"{activation:.3f}", font_size, (255, 255, 255))
                 act_rect = act_surface.get_rect(center=(pos[0], pos[1]))
                 
                 # Black background for text readability
@@ -1914,9 +1912,9 @@ class ForwardPassChallenge(BaseChallenge):
                 if is_current_layer:
                     layer_name = f">>> {layer_name} <<<"
                 
-                label_font = pygame.font.Font(None, 22 if is_current_layer else 18)
                 label_color = (255, 255, 100) if is_current_layer else (200, 200, 255)
-                label_text = label_font.render(layer_name, True, label_color)
+                label_text = self._render_label(('layer', layer_idx), layer_name,
+                                                22 if is_current_layer else 18, label_color)
                 label_rect = label_text.get_rect(center=label_pos)
                 
                 # Background for label
@@ -0,0 +1,44 @@
+"""
+The game's own text - story, level descriptions and docs - as a corpus for language challenges
+"""
+
+import os
+from ..constants import GameState
+from ..game_story import GameStory
+
+DOCS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "docs")
+
+def game_texts(game):
+    """Every piece of text the game knows: story beats, level intros and concepts, and the docs"""
+    story = GameStory()
+    texts = []
+    for beat in story.story_beats.values():
+        texts += [beat["title"]] + beat["text"]
+
+    world_map = game.states.get(GameState.WORLD_MAP)
+    for level in getattr(world_map, "levels", []):
+        texts += story.get_level_intro(level["name"], level["boss"])
+        texts += story.get_victory_message(level["name"], level["boss"])
+        texts += story.get_hint_system(level["name"])
+        texts.append(level["concept"])
+
+    level_state = game.states.get(GameState.LEVEL)
+    for content in getattr(level_state, "level_content", {}).values():
+        texts += content["story"] + [content["concept"]]
+
+    for root, _, files in os.walk(DOCS_DIR):
+        for name in sorted(files):
+            if name.endswith(".md"):
+                try:
+                    with open(os.path.join(root, name), encoding="utf-8") as handle:
+                        texts.append(handle.read())
+                except (OSError, UnicodeDecodeError):
+                    continue
+    return texts
+
+def character_text(texts, alphabet):
+    """Texts joined into one lower-case string over ``alphabet``; anything else becomes a single space"""
+    allowed = set(alphabet)
+    text = " ".join(texts).lower()
+    cleaned = "".join(char if char in allowed else " " for char in text)
+    return " ".join(cleaned.split())
@@ -0,0 +1,420 @@
+"""
+GPT Citadel Challenge - Level 17: The GPT Overlord
+Forge a tiny character-level GPT from the game's own words, then coax it into saying what you want
+"""
+
+import os
+import queue
+import re
+import tempfile
+import time
+from collections import Counter
+import pygame
+import numpy as np
+from .base_challenge import BaseChallenge
+from .game_corpus import game_texts, character_text
+from ..nn.activations import softmax
+from ..nn.gpt import CharGPT, Adam, KVCache
+from ..nn.ring_buffer import RingBuffer
+from ..ui.modern_ui import DialogueBox, ParticleSystem
+
+ALPHABET = " abcdefghijklmnopqrstuvwxyz0123456789.,'!?-:()"
+D_MODEL = 64
+HEADS = 4
+LAYERS = 2
+CONTEXT = 64
+D_FF = 128
+# Forging runs once as a background job (~30 s); the weights are then reused from the checkpoint
+FORGE_STEPS = 2000
+FORGE_BATCH = 8
+LEARNING_RATE = 4e-3
+WARMUP_STEPS = 100
+SAMPLE_EVERY = 250
+CHECKPOINT_PATH = os.path.join(tempfile.gettempdir(), "neural_network_adventure", "gpt_citadel.npz")
+# Generated characters are streamed at a readable pace rather than as fast as the cache allows
+MAX_TOKENS = 160
+TOKEN_INTERVAL = 1 / 40
+TEMPERATURES = (0.0, 0.3, 0.5, 0.7, 1.0, 1.3)
+TOP_CHARS = 10
+WORDS_TO_WIN = 3
+TARGET_POOL = 40
+
+class GPTCitadelChallenge(BaseChallenge):
+    def __init__(self, game):
+        super().__init__(game)
+        self.particles = ParticleSystem()
+        self.dialogue_box = DialogueBox(50, game.height - 150, game.width - 100, 120)
+
+        self.title_font = pygame.font.Font(None, 48)
+        self.header_font = pygame.font.Font(None, 28)
+        self.body_font = pygame.font.Font(None, 22)
+        self.small_font = pygame.font.Font(None, 18)
+
+        # Phases: intro -> forge (first visit only) -> command -> victory
+        self.phase = "intro"
+        self.intro_step = 0
+        self.intro_lines = [
+            "The GPT Overlord rules the Citadel. It speaks one character at a time, each chosen from all that came before.",
+            f"It is a tiny GPT: {LAYERS} causal transformer blocks, {HEADS} heads, a window of {CONTEXT} characters.",
+            "Generating naively re-runs the whole prefix for every character. The Overlord keeps a KV cache instead...",
+            "...each block's keys and values are stored once, so a new character only attends to them: O(context) per token.",
+            f"Give it a prompt and a temperature. Make it say {WORDS_TO_WIN} of the words it fears - without saying them yourself!"
+        ]
+
+        self.text = character_text(game_texts(game), ALPHABET)
+        self.model = None
+        self.load_ms = 0.0
+        self.checkpoint_bytes = 0
+
+        # Forging
+        self.forge_job = None
+        self.losses = RingBuffer(FORGE_STEPS, {'loss': ()})
+        self.forge_seconds = 0.0
+        self.forge_error = None
+        self._samples = queue.Queue()
+        self._loss_surface = None
+        self._loss_count = -1
+
+        # Generation
+        self.prompt = "the neural "
+        self.temperature_index = 2
+        self._tokens = queue.Queue()
+        self._generation = None
+        self.completion = ""
+        self.probabilities = None
+        self.cached_us = 0.0
+        self.uncached_us = 0.0
+        self.cache_bytes = 0
+
+        self._rng = np.random.default_rng(17)
+        words = Counter(self.text.split())
+        self.target_pool = [word for word, _ in words.most_common() if len(word) >= 5 and word.isalpha()][:TARGET_POOL]
+        self.target = None
+        self.spoken = []
+        self.boss_hp = 100
+        self.victory_celebration = False
+
+    def initialize(self):
+        self.phase = "intro"
+        self.intro_step = 0
+        self.dialogue_box.set_dialogue(self.intro_lines[0], "Tensor")
+
+    @property
+    def temperature(self):
+        return TEMPERATURES[self.temperature_index]
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return "exit"
+
+            if self.phase == "intro":
+                if event.key == pygame.K_SPACE:
+                    self._advance_intro()
+            elif self.phase == "command":
+                self._handle_command_key(event)
+            elif self.phase == "victory":
+                if event.key == pygame.K_SPACE:
+                    return "completed"
+
+        return None
+
+    def _handle_command_key(self, event):
+        if event.key == pygame.K_RETURN:
+            self._speak()
+        elif event.key == pygame.K_BACKSPACE:
+            self.prompt = self.prompt[:-1]
+        elif event.key in (pygame.K_UP, pygame.K_DOWN):
+            step = 1 if event.key == pygame.K_UP else -1
+            self.temperature_index = int(np.clip(self.temperature_index + step, 0, len(TEMPERATURES) - 1))
+        elif event.key == pygame.K_TAB:
+            self._new_target()
+        elif event.unicode and event.unicode.lower() in ALPHABET and len(self.prompt) < CONTEXT // 2:
+            self.prompt += event.unicode.lower()
+
+    def _advance_intro(self):
+        self.intro_step += 1
+        if self.intro_step < len(self.intro_lines):
+            self.dialogue_box.set_dialogue(self.intro_lines[self.intro_step], "Tensor")
+        elif self._load_model():
+            self._begin_command()
+        else:
+            self.phase = "forge"
+            # Both jobs belong to the challenge, so leaving it any way stops them
+            self.forge_job = self.game.jobs.submit(self._train, owner=self, pass_stop=True,
+                                                   on_done=self._finish_forging, on_error=self._forge_failed)
+            self.dialogue_box.set_dialogue(
+                f"No Overlord has been forged yet. Training one on the game's {len(self.text):,} characters of text...",
+                "Tensor")
+
+    # Forging, on a job thread
+
+    def _load_model(self):
+        """Memory-map a previously forged checkpoint; False if there is none matching this level"""
+        start = time.perf_counter()
+        try:
+            model = CharGPT.load(CHECKPOINT_PATH)
+        except (OSError, ValueError, KeyError):
+            return False
+        expected = CharGPT(ALPHABET, D_MODEL, HEADS, LAYERS, CONTEXT, D_FF)
+        if model.alphabet != ALPHABET or not np.array_equal(model.config, expected.config):
+            return False
+        self.model = model
+        self.load_ms = (time.perf_counter() - start) * 1000
+        self.checkpoint_bytes = os.path.getsize(CHECKPOINT_PATH)
+        return True
+
+    def _train(self, stop):
+        start = time.perf_counter()
+        model = CharGPT(ALPHABET, D_MODEL, HEADS, LAYERS, CONTEXT, D_FF)
+        model.initialize(np.random.default_rng(17))
+        optimizer = Adam(model.parameters(), LEARNING_RATE)
+        rng = np.random.default_rng(18)
+        ids = model.encode(self.text)
+        window = np.arange(CONTEXT + 1)
+        for step in range(FORGE_STEPS):
+            if stop.is_set():
+                return
+            # Linear warm-up, then a linear decay to a tenth of the rate
+            optimizer.learning_rate = LEARNING_RATE * min(1.0, (step + 1) / WARMUP_STEPS) * (1 - 0.9 * step / FORGE_STEPS)
+            batch = ids[rng.integers(0, len(ids) - CONTEXT - 1, FORGE_BATCH)[:, None] + window]
+            self.losses.append(loss=model.train_step(batch[:, :-1], batch[:, 1:], optimizer))
+            if (step + 1) % SAMPLE_EVERY == 0:
+                self._samples.put((step + 1, "".join(model.generate("the ", 60, temperature=0.6, rng=rng))))
+            # Give the render thread a turn at the GIL
+            time.sleep(0)
+
+        os.makedirs(os.path.dirname(CHECKPOINT_PATH), exist_ok=True)
+        partial = CHECKPOINT_PATH + ".partial.npz"
+        model.save(partial)
+        os.replace(partial, CHECKPOINT_PATH)
+        self.forge_seconds = time.perf_counter() - start
+
+    def _forge_failed(self, error):
+        self.forge_error = error
+        self._finish_forging()
+
+    def _finish_forging(self, _=None):
+        self.forge_job = None
+        if self.forge_error is not None or not self._load_model():
+            self.dialogue_box.set_dialogue(f"The forge failed: {self.forge_error or 'checkpoint unreadable'}. ESC to leave.",
+                                           "Tensor")
+            return
+        self._begin_command()
+
+    def _begin_command(self):
+        self.phase = "command"
+        self._new_target()
+
+    def _new_target(self):
+        choices = [word for word in self.target_pool if word not in self.spoken and word != self.target]
+        self.target = str(self._rng.choice(choices))
+        self.dialogue_box.set_dialogue(
+            f"The Overlord must say \"{self.target}\" - but not in your prompt. Type a prompt, ENTER to let it speak. "
+            "UP/DOWN: temperature. TAB: another word.", "Tensor")
+
+    # Generation, streamed from a job thread
+
+    def _speak(self):
+        if self.target in self.prompt:
+            self.dialogue_box.set_dialogue(f"No cheating - \"{self.target}\" is already in your prompt!", "Tensor")
+            return
+        # The old generation is only told to stop; it keeps writing to its own queue, which is dropped here
+        self._stop_generation()
+        self._tokens = queue.Queue()
+        self.completion = ""
+        self.dialogue_box.set_dialogue(self.prompt, "GPT Overlord")
+        self._generation = self.game.jobs.submit(self._generate, self.prompt, self.temperature, self._tokens,
+                                                 np.random.default_rng(self._rng.integers(2 ** 32)),
+                                                 owner=self, pass_stop=True)
+
+    def _stop_generation(self):
+        if self._generation is not None:
+            self._generation.cancel()
+            self._generation = None
+
+    def _generate(self, prompt, temperature, tokens, rng, stop):
+        model = self.model
+        cache = KVCache(model)
+        count = 0
+        elapsed = 0.0
+        start = time.perf_counter()
+        for char in model.generate(prompt, MAX_TOKENS, temperature=temperature, rng=rng, cache=cache):
+            elapsed += time.perf_counter() - start
+            count += 1
+            tokens.put((char, softmax(cache.logits.astype(np.float64)), elapsed / count * 1e6))
+            if stop.wait(TOKEN_INTERVAL):
+                return
+            start = time.perf_counter()
+
+        # Without the cache every character would re-run the whole window through every block
+        scratch = KVCache(model)
+        start = time.perf_counter()
+        model.prefill(np.zeros(model.context, dtype=np.int64), scratch)
+        self.uncached_us = (time.perf_counter() - start) * 1e6
+        self.cache_bytes = cache.nbytes
+        tokens.put(None)
+
+    def _drain_tokens(self):
+        finished = False
+        while True:
+            try:
+                item = self._tokens.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                finished = True
+                continue
+            char, self.probabilities, self.cached_us = item
+            self.completion += char
+            self.dialogue_box.append_text(char)
+        if re.search(rf"\b{self.target}\b", self.completion):
+            self._word_spoken()
+        elif finished:
+            self._generation = None
+
+    def _word_spoken(self):
+        self.spoken.append(self.target)
+        self.boss_hp = max(0, 100 - len(self.spoken) * 100 // WORDS_TO_WIN)
+        self.completion = ""
+        self.particles.create_explosion(self.game.width // 2, 200, (255, 120, 200), 24)
+        if len(self.spoken) >= WORDS_TO_WIN:
+            self.phase = "victory"
+            self.victory_celebration = True
+            self._stop_generation()
+            self.target = None
+            self.dialogue_box.append_text(
+                f"  ...the Overlord has spoken {', '.join(self.spoken)} at your command! SPACE to continue.")
+            return
+        spoken = self.target
+        self.target = str(self._rng.choice([word for word in self.target_pool if word not in self.spoken]))
+        self.dialogue_box.append_text(f"  [It said \"{spoken}\"! Next: \"{self.target}\"]")
+
+    def update(self, dt):
+        self.dialogue_box.update(dt)
+        self.particles.update(dt)
+
+        if self.phase == "forge":
+            while not self._samples.empty():
+                step, sample = self._samples.get_nowait()
+                self.dialogue_box.set_dialogue(f"Step {step}: {sample}", "GPT Overlord")
+        elif self.phase == "command" and self._generation is not None:
+            self._drain_tokens()
+
+        if self.victory_celebration and np.random.random() < 0.2:
+            self.particles.create_explosion(np.random.randint(100, self.game.width - 100),
+                                            np.random.randint(100, 300),
+                                            (255, np.random.randint(80, 180), 220), 12)
+
+    # Rendering
+
+    def render(self, screen):
+        screen.fill((25, 18, 32))
+
+        title = self.title_font.render("GPT Citadel", True, (240, 160, 255))
+        screen.blit(title, title.get_rect(center=(self.game.width // 2, 40)))
+
+        if self.phase in ("forge", "command", "victory"):
+            hp_rect = pygame.Rect(self.game.width // 2 - 200, 68, 400, 14)
+            pygame.draw.rect(screen, (55, 30, 60), hp_rect)
+            pygame.draw.rect(screen, (220, 100, 240), (hp_rect.x, hp_rect.y, hp_rect.width * self.boss_hp // 100, hp_rect.height))
+            pygame.draw.rect(screen, (255, 255, 255), hp_rect, 1)
+            boss_text = self.small_font.render(f"GPT Overlord HP: {self.boss_hp}", True, (255, 255, 255))
+            screen.blit(boss_text, boss_text.get_rect(center=(hp_rect.centerx, hp_rect.bottom + 10)))
+
+            self._render_forge(screen, pygame.Rect(30, 100, 460, 260))
+            self._render_next_char(screen, pygame.Rect(500, 100, self.game.width - 530, 260))
+            self._render_command(screen, pygame.Rect(30, 370, self.game.width - 60, 236))
+
+        self.particles.render(screen, self.game.interpolation)
+        self.dialogue_box.render(screen, self.body_font, self.header_font)
+
+    def _panel(self, screen, rect, label):
+        pygame.draw.rect(screen, (40, 28, 50), rect, border_radius=8)
+        pygame.draw.rect(screen, (190, 120, 220), rect, 2, border_radius=8)
+        screen.blit(self.small_font.render(label, True, (240, 225, 250)), (rect.x + 10, rect.y + 6))
+
+    def _render_forge(self, screen, rect):
+        self._panel(screen, rect, "The forge: cross-entropy per character")
+        plot = pygame.Rect(rect.x + 14, rect.y + 28, rect.width - 28, rect.height - 96)
+        count = self.losses.count
+        if count != self._loss_count:
+            # Redrawn only when the worker has published new steps
+            self._loss_count = count
+            self._loss_surface = self._loss_curve(plot.size)
+        if self._loss_surface is not None:
+            screen.blit(self._loss_surface, plot.topleft)
+        pygame.draw.rect(screen, (110, 80, 130), plot, 1)
+
+        if self.model is None:
+            lines = [f"Step {count:,}/{FORGE_STEPS:,}, batch {FORGE_BATCH} x {CONTEXT} characters"]
+            latest = self.losses.latest('loss')
+            if latest is not None:
+                lines.append(f"Loss {float(latest):.3f} (uniform guessing: {np.log(len(ALPHABET)):.3f})")
+        else:
+            parameters = sum(array.size for array in self.model.parameters().values())
+            lines = [f"{parameters:,} weights, {self.checkpoint_bytes / 1e3:.0f} KB checkpoint",
+                     f"Memory-mapped from .npz in {self.load_ms:.1f} ms" +
+                     (f" (forged in {self.forge_seconds:.0f} s)" if self.forge_seconds else "")]
+        for i, line in enumerate(lines):
+            screen.blit(self.small_font.render(line, True, (230, 210, 240)), (rect.x + 14, plot.bottom + 10 + i * 22))
+
+    def _loss_curve(self, size):
+        _, losses = self.losses.read('loss')
+        if len(losses) < 2:
+            return None
+        surface = pygame.Surface(size)
+        surface.fill((30, 22, 40))
+        top = max(float(losses.max()), np.log(len(ALPHABET)))
+        x = np.linspace(0, size[0] - 1, len(losses))
+        y = (size[1] - 1) * (1 - losses / top)
+        pygame.draw.lines(surface, (220, 130, 250), False, np.column_stack([x, y]).tolist(), 1)
+        return surface
+
+    def _render_next_char(self, screen, rect):
+        self._panel(screen, rect, f"Next character (temperature {self.temperature:g})")
+        if self.probabilities is None:
+            hint = "Distribution over the next character" if self.model is not None else "Waiting for the forge..."
+            screen.blit(self.small_font.render(hint, True, (160, 140, 170)), (rect.x + 14, rect.y + 34))
+            return
+        top = np.argsort(self.probabilities)[::-1][:TOP_CHARS]
+        row_height = (rect.height - 40) // TOP_CHARS
+        width = rect.width - 110
+        for i, index in enumerate(top):
+            y = rect.y + 30 + i * row_height
+            char = self.model.alphabet[index]
+            label = self.body_font.render("' '" if char == " " else char, True, (240, 225, 250))
+            screen.blit(label, (rect.x + 14, y))
+            bar = int(width * float(self.probabilities[index]))
+            pygame.draw.rect(screen, (200, 110, 240), (rect.x + 50, y + 3, bar, row_height - 6))
+            value = self.small_font.render(f"{self.probabilities[index]:.0%}", True, (200, 190, 210))
+            screen.blit(value, (rect.x + 56 + bar, y + 2))
+
+    def _render_command(self, screen, rect):
+        self._panel(screen, rect, "Command the Overlord")
+        if self.phase == "forge":
+            lines = ["The Overlord is being forged. Its babbling above improves every few hundred steps.",
+                     "Training runs on a worker thread; the game keeps drawing at full speed."]
+            for i, line in enumerate(lines):
+                screen.blit(self.body_font.render(line, True, (230, 210, 240)), (rect.x + 14, rect.y + 34 + i * 26))
+            return
+
+        box = pygame.Rect(rect.x + 14, rect.y + 30, rect.width - 28, 34)
+        pygame.draw.rect(screen, (60, 42, 72), box, border_radius=6)
+        pygame.draw.rect(screen, (220, 160, 255), box, 2, border_radius=6)
+        screen.blit(self.header_font.render(self.prompt + "_", True, (255, 255, 255)), (box.x + 10, box.y + 6))
+
+        target = f"Make it say \"{self.target}\"" if self.target else "The Overlord is silenced"
+        lines = [
+            (f"{target}   Spoken: {', '.join(self.spoken) or '-'} ({len(self.spoken)}/{WORDS_TO_WIN})", (255, 220, 120)),
+            (f"Temperature {self.temperature:g}" + (" (greedy)" if self.temperature == 0 else ""), (230, 210, 240)),
+        ]
+        if self.cached_us:
+            lines.append((f"With the KV cache: {self.cached_us:.0f} us per character", (140, 255, 170)))
+        if self.uncached_us:
+            lines.append((f"Re-running the full {CONTEXT}-character window instead: {self.uncached_us:.0f} us per character",
+                          (255, 150, 140)))
+            lines.append((f"Cache: {LAYERS} layers x {HEADS} heads x {CONTEXT} positions of keys + values = "
+                          f"{self.cache_bytes / 1e3:.0f} KB", (200, 190, 210)))
+        for i, (line, color) in enumerate(lines):
+            screen.blit(self.body_font.render(line, True, color), (rect.x + 14, rect.y + 76 + i * 28))
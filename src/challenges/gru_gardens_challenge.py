@@ -0,0 +1,300 @@
+"""
+GRU Gardens Challenge - Level 13: The Gate Keeper
+Tune the update and reset gates of a wide GRU and watch every gate of every step as a heatmap
+"""
+
+import time
+import pygame
+import numpy as np
+from .base_challenge import BaseChallenge
+from ..nn.recurrent import GRU
+from ..nn.ring_buffer import RingBuffer
+from ..ui.modern_ui import DialogueBox, ParticleSystem
+
+SEQUENCE_STEPS = 400
+BATCH = 32
+HIDDEN = 128
+# The bell rings every BELL_MIN..BELL_MAX steps; the garden must hum the note sung at the last bell
+BELL_MIN, BELL_MAX = 30, 80
+UPDATE_BIASES = np.arange(-2.0, 6.5, 1.0)
+BELL_STRENGTHS = np.arange(0.0, 12.5, 2.0)
+# Held-out R^2 of the linear readout that opens the Gate Keeper's gate
+VICTORY_SCORE = 0.95
+RIDGE = 1e-2
+# Seconds per frame spent unrolling stale steps
+UNROLL_BUDGET = 0.006
+
+def _garden_song(rng):
+    """Notes in [-1, 1] every step, bells at random intervals, and the note held since the last bell"""
+    notes = rng.uniform(-1.0, 1.0, (SEQUENCE_STEPS, BATCH))
+    bells = np.zeros((SEQUENCE_STEPS, BATCH), dtype=bool)
+    for row in range(BATCH):
+        step = rng.integers(0, BELL_MIN)
+        while step < SEQUENCE_STEPS:
+            bells[step, row] = True
+            step += rng.integers(BELL_MIN, BELL_MAX + 1)
+    latest = np.maximum.accumulate(np.where(bells, np.arange(SEQUENCE_STEPS)[:, None], -1), axis=0)
+    heard = latest >= 0
+    targets = np.where(heard, notes[np.maximum(latest, 0), np.arange(BATCH)], 0.0)
+    return np.stack((notes, bells), axis=-1), targets, heard
+
+class GRUChallenge(BaseChallenge):
+    def __init__(self, game):
+        super().__init__(game)
+        self.particles = ParticleSystem()
+        self.dialogue_box = DialogueBox(50, game.height - 150, game.width - 100, 120)
+
+        self.title_font = pygame.font.Font(None, 48)
+        self.header_font = pygame.font.Font(None, 28)
+        self.body_font = pygame.font.Font(None, 22)
+        self.small_font = pygame.font.Font(None, 18)
+
+        # Phases: intro -> tune -> victory
+        self.phase = "intro"
+        self.intro_step = 0
+        self.intro_lines = [
+            "The Gate Keeper tends the GRU Gardens, where every cell has two gates.",
+            "The update gate decides how much of the old memory to keep. The reset gate decides how much of it shapes the new one.",
+            f"A note is sung every step, and a bell rings every {BELL_MIN}-{BELL_MAX} steps.",
+            "The garden must hum the note sung at the last bell - and ignore every note in between.",
+            f"Tune the gates of all {HIDDEN} cells until the hum matches (R^2 {VICTORY_SCORE}) and the Keeper opens the gate!"
+        ]
+
+        self._rng = np.random.default_rng(13)
+        # The heatmaps follow one held-out sequence
+        self.log_row = BATCH // 2
+        self.gate_log = RingBuffer(SEQUENCE_STEPS, {'update': (HIDDEN,), 'reset': (HIDDEN,)}, dtype=np.float16)
+        self.gru = GRU(2, HIDDEN, dtype=np.float32, rng=np.random.default_rng(14),
+                       gate_log=self.gate_log, log_row=self.log_row)
+        self._base_weights = self.gru.input_weights.copy()
+        self._base_bias = self.gru.bias.copy()
+
+        self.update_index = int(np.searchsorted(UPDATE_BIASES, 0.0))
+        self.bell_index = 0
+        self.score = None
+        self.prediction = None
+        self.last_unroll_ms = 0.0
+
+        # One pixel per (step, cell); columns are written straight into the surfaces as steps arrive
+        self.heatmaps = {name: pygame.Surface((SEQUENCE_STEPS, HIDDEN)) for name in ('update', 'reset')}
+        self._heat_colors = {'update': np.array([90, 255, 140]), 'reset': np.array([255, 110, 220])}
+        self._scaled = {}
+        self._log_seen = 0
+
+        self.boss_hp = 100
+        self.victory_celebration = False
+        self._new_song()
+
+    def initialize(self):
+        self.phase = "intro"
+        self.intro_step = 0
+        self.dialogue_box.set_dialogue(self.intro_lines[0], "Tensor")
+
+    # Garden edits
+
+    def _new_song(self):
+        self.inputs, self.targets, self.heard = _garden_song(self._rng)
+        self.gru.set_sequences(self.inputs)
+        self._apply_gates()
+
+    def _apply_gates(self):
+        """Write the knobs into the GRU; every step (and the gate history) goes stale"""
+        gru = self.gru
+        gru.input_weights[...] = self._base_weights
+        gru.bias[...] = self._base_bias
+        gru.bias[:HIDDEN] += UPDATE_BIASES[self.update_index]
+        # The bell pulls both the update and the reset gate shut, flushing the old memory
+        gru.input_weights[1, :2 * HIDDEN] = -BELL_STRENGTHS[self.bell_index]
+        gru.mark_dirty(0)
+        self.gate_log.clear()
+        self._log_seen = 0
+        self.score = None
+        self.prediction = None
+        for surface in self.heatmaps.values():
+            surface.fill((20, 24, 20))
+        self._scaled = {}
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return "exit"
+
+            if self.phase == "intro":
+                if event.key == pygame.K_SPACE:
+                    self._advance_intro()
+            elif self.phase == "tune":
+                if event.key in (pygame.K_UP, pygame.K_DOWN):
+                    step = 1 if event.key == pygame.K_UP else -1
+                    self.update_index = int(np.clip(self.update_index + step, 0, len(UPDATE_BIASES) - 1))
+                    self._apply_gates()
+                elif event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                    step = 1 if event.key == pygame.K_RIGHT else -1
+                    self.bell_index = int(np.clip(self.bell_index + step, 0, len(BELL_STRENGTHS) - 1))
+                    self._apply_gates()
+                elif event.key == pygame.K_n:
+                    self._new_song()
+                    self.dialogue_box.set_dialogue("A new song drifts through the garden.", "Tensor")
+            elif self.phase == "victory":
+                if event.key == pygame.K_SPACE:
+                    return "completed"
+
+        return None
+
+    def _advance_intro(self):
+        self.intro_step += 1
+        if self.intro_step < len(self.intro_lines):
+            self.dialogue_box.set_dialogue(self.intro_lines[self.intro_step], "Tensor")
+        else:
+            self.phase = "tune"
+            self.dialogue_box.set_dialogue(
+                "UP/DOWN: update-gate bias (how long cells remember). LEFT/RIGHT: how hard the bell slams the gates. N: new song.",
+                "Tensor")
+
+    # Incremental unrolling
+
+    def update(self, dt):
+        self.dialogue_box.update(dt)
+        self.particles.update(dt)
+
+        if self.victory_celebration and np.random.random() < 0.2:
+            self.particles.create_explosion(np.random.randint(100, self.game.width - 100),
+                                            np.random.randint(100, 300),
+                                            (np.random.randint(90, 200), 255, 140), 12)
+
+    def frame_update(self):
+        gru = self.gru
+        if gru.valid_steps < gru.steps:
+            start = time.perf_counter()
+            gru.unroll(budget=UNROLL_BUDGET)
+            self.last_unroll_ms = (time.perf_counter() - start) * 1000
+            if gru.valid_steps == gru.steps:
+                self._score()
+        self._update_heatmaps()
+
+    def _score(self):
+        """Fit a ridge readout on half the sequences and score it (R^2) on the other half"""
+        states = self.gru.states[1:]
+        half = BATCH // 2
+        fit, test = slice(0, half), slice(half, BATCH)
+        # The Gram matrix is built in float32 (the GRU's own dtype); only the small solve runs in float64
+        fit_states = states[:, fit][self.heard[:, fit]]
+        features = np.concatenate((fit_states, np.ones((len(fit_states), 1), dtype=fit_states.dtype)), axis=1)
+        targets = self.targets[:, fit][self.heard[:, fit]]
+        gram = (features.T @ features).astype(np.float64) + RIDGE * np.eye(features.shape[1])
+        weights = np.linalg.solve(gram, features.T @ targets.astype(features.dtype)).astype(features.dtype)
+
+        predictions = states[:, test] @ weights[:-1] + weights[-1]
+        heard, expected = self.heard[:, test], self.targets[:, test]
+        residual = np.sum((predictions - expected)[heard] ** 2)
+        spread = np.sum((expected[heard] - expected[heard].mean()) ** 2)
+        self.score = float(1 - residual / spread)
+        self.prediction = predictions[:, 0]
+
+        if self.phase == "tune":
+            self.boss_hp = int(np.clip(100 * (1 - max(self.score, 0) / VICTORY_SCORE), 0, 100))
+            if self.score >= VICTORY_SCORE:
+                self.phase = "victory"
+                self.victory_celebration = True
+                self.dialogue_box.set_dialogue(
+                    f"The garden hums every bell's note (R^2 {self.score:.3f})! The Gate Keeper swings the gate open. SPACE to continue.",
+                    "Tensor")
+
+    def _update_heatmaps(self):
+        """Paint the gate values logged since the last frame into their columns"""
+        first, updates = self.gate_log.read('update', since=self._log_seen)
+        if not len(updates):
+            return
+        _, resets = self.gate_log.read('reset', since=first)
+        rows = min(len(updates), len(resets))
+        for name, values in (('update', updates[:rows]), ('reset', resets[:rows])):
+            # pixels3d is a direct (x, y, rgb) view of the surface: step -> x, cell -> y
+            pixels = pygame.surfarray.pixels3d(self.heatmaps[name])
+            colors = values.astype(np.float32)[..., None] * self._heat_colors[name]
+            pixels[first:first + rows] = colors.astype(np.uint8)
+            del pixels
+        self._log_seen = first + rows
+        self._scaled = {}
+
+    # Rendering
+
+    def render(self, screen):
+        screen.fill((18, 26, 18))
+
+        title = self.title_font.render("GRU Gardens", True, (150, 255, 170))
+        screen.blit(title, title.get_rect(center=(self.game.width // 2, 40)))
+
+        if self.phase in ("tune", "victory"):
+            hp_rect = pygame.Rect(self.game.width // 2 - 200, 68, 400, 14)
+            pygame.draw.rect(screen, (25, 55, 30), hp_rect)
+            pygame.draw.rect(screen, (120, 230, 140), (hp_rect.x, hp_rect.y, hp_rect.width * self.boss_hp // 100, hp_rect.height))
+            pygame.draw.rect(screen, (255, 255, 255), hp_rect, 1)
+            boss_text = self.small_font.render(f"Gate Keeper HP: {self.boss_hp}", True, (255, 255, 255))
+            screen.blit(boss_text, boss_text.get_rect(center=(hp_rect.centerx, hp_rect.bottom + 10)))
+
+            width = self.game.width - 60
+            self._render_heatmap(screen, 'update', pygame.Rect(30, 100, width, 150),
+                                 f"Update gate z of all {HIDDEN} cells over {SEQUENCE_STEPS} steps (bright = keep memory)")
+            self._render_heatmap(screen, 'reset', pygame.Rect(30, 258, width, 150),
+                                 "Reset gate r (bright = old memory shapes the new candidate)")
+            self._render_song(screen, pygame.Rect(30, 416, width, 100))
+            self._render_stats(screen, pygame.Rect(30, 524, width, 82))
+
+        self.particles.render(screen, self.game.interpolation)
+        self.dialogue_box.render(screen, self.body_font, self.header_font)
+
+    def _plot_rect(self, rect):
+        return pygame.Rect(rect.x + 10, rect.y + 24, rect.width - 20, rect.height - 30)
+
+    def _render_heatmap(self, screen, name, rect, label):
+        pygame.draw.rect(screen, (26, 36, 26), rect, border_radius=8)
+        pygame.draw.rect(screen, (110, 190, 120), rect, 2, border_radius=8)
+        screen.blit(self.small_font.render(label, True, (210, 240, 210)), (rect.x + 12, rect.y + 6))
+        plot = self._plot_rect(rect)
+        if name not in self._scaled:
+            self._scaled[name] = pygame.transform.scale(self.heatmaps[name], plot.size)
+        screen.blit(self._scaled[name], plot.topleft)
+        self._render_bells(screen, plot)
+
+    def _render_bells(self, screen, plot):
+        scale = plot.width / SEQUENCE_STEPS
+        for step in np.flatnonzero(self.inputs[:, self.log_row, 1]).tolist():
+            x = plot.x + step * scale
+            pygame.draw.line(screen, (255, 210, 100), (x, plot.y - 4), (x, plot.y), 2)
+
+    def _render_song(self, screen, rect):
+        pygame.draw.rect(screen, (26, 36, 26), rect, border_radius=8)
+        pygame.draw.rect(screen, (110, 190, 120), rect, 2, border_radius=8)
+        screen.blit(self.small_font.render("Note to hum (gold) and the garden's hum (green)", True, (210, 240, 210)),
+                    (rect.x + 12, rect.y + 6))
+        plot = self._plot_rect(rect)
+        xs = plot.x + (np.arange(SEQUENCE_STEPS) + 0.5) * plot.width / SEQUENCE_STEPS
+        notes = self.inputs[:, self.log_row, 0]
+        ys = plot.centery - notes * plot.height / 2
+        for x, y in zip(xs[::2].tolist(), ys[::2].tolist()):
+            screen.set_at((int(x), int(y)), (90, 110, 90))
+        target = plot.centery - self.targets[:, self.log_row] * plot.height / 2
+        pygame.draw.lines(screen, (255, 210, 100), False, np.column_stack((xs, target)).tolist(), 2)
+        if self.prediction is not None:
+            hum = plot.centery - np.clip(self.prediction, -1.2, 1.2) * plot.height / 2
+            pygame.draw.lines(screen, (120, 255, 150), False, np.column_stack((xs, hum)).tolist(), 2)
+        self._render_bells(screen, plot)
+
+    def _render_stats(self, screen, rect):
+        pygame.draw.rect(screen, (26, 36, 26), rect, border_radius=8)
+        pygame.draw.rect(screen, (110, 190, 120), rect, 2, border_radius=8)
+        gru = self.gru
+        score = f"{self.score:.3f}" if self.score is not None else f"growing... {gru.valid_steps}/{gru.steps}"
+        left = [
+            (f"Update-gate bias: {UPDATE_BIASES[self.update_index]:+.1f} (UP/DOWN)", (120, 255, 150)),
+            (f"Bell strength: {BELL_STRENGTHS[self.bell_index]:.0f} (LEFT/RIGHT)", (255, 130, 220)),
+            (f"Hum accuracy R^2: {score}", (255, 220, 120)),
+        ]
+        right = [
+            (f"{BATCH} sequences x {HIDDEN} cells, one fused multiply per step", (200, 220, 200)),
+            (f"Gate log: {self.gate_log.count:,} steps, float16 ring", (200, 220, 200)),
+            (f"Last unroll slice: {self.last_unroll_ms:.1f} ms", (150, 170, 150)),
+        ]
+        for i, (line, color) in enumerate(left):
+            screen.blit(self.small_font.render(line, True, color), (rect.x + 12, rect.y + 8 + i * 24))
+        for i, (line, color) in enumerate(right):
+            screen.blit(self.small_font.render(line, True, color), (rect.centerx + 20, rect.y + 8 + i * 24))
@@ -0,0 +1,385 @@
+"""
+LSTM Labyrinth Challenge - Level 12: The Vanishing Gradient Vampire
+Train a plain RNN and an LSTM side by side with truncated backpropagation through time on an endless stream
+"""
+
+import time
+import pygame
+import numpy as np
+from .base_challenge import BaseChallenge
+from ..nn.activations import sigmoid
+from ..nn.recurrent import RNN, LSTM
+from ..ui.modern_ui import DialogueBox, ParticleSystem
+
+BATCH = 64
+HIDDEN = 24
+# A torch is lit every GAP_MIN..GAP_MAX steps; the network must remember which way it pointed
+GAP_MIN, GAP_MAX = 20, 50
+# Only steps at least this long after the last torch count as long-term memory
+LONG_MEMORY = 20
+WINDOW_CHOICES = (10, 20, 40, 60, 80)
+LEARNING_RATE = 2.0
+MAX_GRADIENT_NORM = 1.0
+# Long-memory accuracy of the LSTM that destroys the Vampire
+VICTORY_ACCURACY = 0.95
+# Seconds per frame spent on training windows (at least one window always runs)
+TRAIN_BUDGET = 0.008
+# The gradient-flow probe (an extra backward pass) runs at most this often, in seconds
+PROBE_INTERVAL = 0.25
+HISTORY_POINTS = 600
+
+class _TorchStream:
+    """Endless stream of noisy values with occasional torch triggers.
+
+    Input channel 0 is a fresh N(0, 1) value every step, channel 1 is 1 when
+    a torch is lit. The target is the sign of the value seen at the most
+    recent torch, held until the next one.
+    """
+
+    def __init__(self, batch, rng):
+        self.batch = batch
+        self.rng = rng
+        self.next_torch = rng.integers(0, GAP_MAX, batch)
+        self.held = rng.choice([-1.0, 1.0], batch)
+        self.age = np.full(batch, GAP_MAX)
+        self.steps = 0
+
+    def window(self, steps):
+        """Next (steps, batch, 2) inputs with their (steps, batch) targets in {0, 1} and torch ages"""
+        rng, batch = self.rng, self.batch
+        values = rng.standard_normal((steps, batch))
+        torches = np.zeros((steps, batch), dtype=bool)
+        due = np.flatnonzero(self.next_torch < steps)
+        while len(due):
+            torches[self.next_torch[due], due] = True
+            self.next_torch[due] += rng.integers(GAP_MIN, GAP_MAX + 1, len(due))
+            due = due[self.next_torch[due] < steps]
+        self.next_torch -= steps
+
+        # Index of the latest torch at or before each step, -1 if none in this window yet
+        t = np.arange(steps)[:, None]
+        latest = np.maximum.accumulate(np.where(torches, t, -1), axis=0)
+        lit = latest >= 0
+        columns = np.arange(batch)
+        held = np.where(lit, np.sign(values[np.maximum(latest, 0), columns]), self.held)
+        age = np.where(lit, t - latest, self.age + t + 1)
+        self.held, self.age = held[-1], age[-1]
+        self.steps += steps
+
+        inputs = np.stack((values, torches), axis=-1)
+        return inputs, held > 0, age
+
+class _Learner:
+    """A recurrent model plus a logistic readout, trained window by window"""
+
+    def __init__(self, name, model, color, rng):
+        self.name = name
+        self.model = model
+        self.color = color
+        self.readout = (rng.standard_normal(HIDDEN) * 0.1).astype(model.dtype)
+        self.readout_bias = 0.0
+        self.accuracy = 0.5
+        self.history = []
+        self.gradient_profile = None
+        self.predictions = None
+        self._state_grads = None
+
+    def train(self, inputs, targets, ages, probe=False):
+        model = self.model
+        if isinstance(model, LSTM):
+            model.set_sequences(inputs, model.states[-1], model.cells[-1])
+        else:
+            model.set_sequences(inputs, model.states[-1])
+        model.unroll()
+        states = model.states[1:]
+        probabilities = sigmoid(states @ self.readout + self.readout_bias)
+
+        if self._state_grads is None or self._state_grads.shape != states.shape:
+            self._state_grads = np.zeros(states.shape, dtype=model.dtype)
+        grads = self._state_grads
+        if probe:
+            # Gradient of the last step's output alone, traced back through the window
+            grads.fill(0)
+            grads[-1] = self.readout
+            model.backward(grads)
+            norms = model.step_gradient_norms[::-1]
+            self.gradient_profile = norms / max(norms[0], 1e-30)
+
+        error = (probabilities - targets) / probabilities.size
+        np.multiply(error[..., None], self.readout, out=grads)
+        readout_grad = np.einsum('tb,tbh->h', error, states)
+        model.backward(grads)
+        model.apply_gradients(LEARNING_RATE, MAX_GRADIENT_NORM)
+        self.readout -= LEARNING_RATE * readout_grad
+        self.readout_bias -= LEARNING_RATE * float(error.sum())
+
+        remembered = ages >= LONG_MEMORY
+        if remembered.any():
+            correct = (probabilities > 0.5) == targets
+            self.accuracy = 0.9 * self.accuracy + 0.1 * float(correct[remembered].mean())
+        self.predictions = probabilities[:, 0]
+
+class LSTMChallenge(BaseChallenge):
+    def __init__(self, game):
+        super().__init__(game)
+        self.particles = ParticleSystem()
+        self.dialogue_box = DialogueBox(50, game.height - 150, game.width - 100, 120)
+
+        self.title_font = pygame.font.Font(None, 48)
+        self.header_font = pygame.font.Font(None, 28)
+        self.body_font = pygame.font.Font(None, 22)
+        self.small_font = pygame.font.Font(None, 18)
+
+        # Phases: intro -> training -> victory
+        self.phase = "intro"
+        self.intro_step = 0
+        self.intro_lines = [
+            "The Vanishing Gradient Vampire drains the error signal from every network that enters the Labyrinth.",
+            f"Torches flare every {GAP_MIN}-{GAP_MAX} steps. The network must remember which way the last one pointed.",
+            "A plain RNN multiplies its gradient by the same matrix at every step back - it fades to nothing.",
+            "An LSTM's cell state is a gradient highway: the forget gate lets the signal pass untouched.",
+            "Both train on the same endless stream with truncated backprop. Teach the LSTM to remember and defeat the Vampire!"
+        ]
+
+        self.window = 40
+        self.running = False
+        self.last_window_ms = 0.0
+        self._probe_time = 0.0
+        self._windows = 0
+        self._reset_models()
+
+        self.boss_hp = 100
+        self.victory_celebration = False
+
+    def initialize(self):
+        self.phase = "intro"
+        self.intro_step = 0
+        self.dialogue_box.set_dialogue(self.intro_lines[0], "Tensor")
+
+    def _reset_models(self):
+        rng = np.random.default_rng(12)
+        self.stream = _TorchStream(BATCH, rng)
+        self.learners = [
+            _Learner("RNN", RNN(2, HIDDEN, dtype=np.float32, rng=rng, weight_scale=0.5), (255, 120, 120), rng),
+            _Learner("LSTM", LSTM(2, HIDDEN, dtype=np.float32, rng=rng), (120, 230, 200), rng),
+        ]
+        self.last_inputs = None
+        self.last_targets = None
+        self._windows = 0
+
+    # Controls
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return "exit"
+
+            if self.phase == "intro":
+                if event.key == pygame.K_SPACE:
+                    self._advance_intro()
+            elif self.phase == "training":
+                if event.key == pygame.K_SPACE:
+                    self.running = not self.running
+                    if self.running:
+                        self.dialogue_box.set_dialogue("Streaming the Labyrinth... watch the gradient reach back through time.", "Tensor")
+                    else:
+                        self.dialogue_box.set_dialogue("Paused. SPACE resumes.", "Tensor")
+                elif event.key in (pygame.K_UP, pygame.K_DOWN):
+                    self._change_window(1 if event.key == pygame.K_UP else -1)
+                elif event.key == pygame.K_r:
+                    self._reset_models()
+                    self.boss_hp = 100
+                    self.dialogue_box.set_dialogue("Both networks re-randomized. SPACE to train.", "Tensor")
+            elif self.phase == "victory":
+                if event.key == pygame.K_SPACE:
+                    return "completed"
+
+        return None
+
+    def _change_window(self, direction):
+        index = WINDOW_CHOICES.index(self.window)
+        index = int(np.clip(index + direction, 0, len(WINDOW_CHOICES) - 1))
+        self.window = WINDOW_CHOICES[index]
+        self.dialogue_box.set_dialogue(
+            f"Truncation window: {self.window} steps. Backprop only looks that far back, and memory only grows with the window.",
+            "Tensor")
+
+    def _advance_intro(self):
+        self.intro_step += 1
+        if self.intro_step < len(self.intro_lines):
+            self.dialogue_box.set_dialogue(self.intro_lines[self.intro_step], "Tensor")
+        else:
+            self.phase = "training"
+            self.dialogue_box.set_dialogue(
+                "SPACE train/pause, UP/DOWN truncation window, R reset both networks.", "Tensor")
+
+    # Training
+
+    def update(self, dt):
+        self.dialogue_box.update(dt)
+        self.particles.update(dt)
+
+        if self.victory_celebration and np.random.random() < 0.2:
+            self.particles.create_explosion(np.random.randint(100, self.game.width - 100),
+                                            np.random.randint(100, 300),
+                                            (120, np.random.randint(200, 255), 200), 12)
+
+    def frame_update(self):
+        if self.phase == "training" and self.running:
+            self._train(time.perf_counter() + TRAIN_BUDGET)
+
+    def _train(self, deadline):
+        """Train both networks on fresh windows of the stream until the frame budget is spent"""
+        while True:
+            start = time.perf_counter()
+            probe = start - self._probe_time >= PROBE_INTERVAL
+            if probe:
+                self._probe_time = start
+            inputs, targets, ages = self.stream.window(self.window)
+            for learner in self.learners:
+                learner.train(inputs, targets, ages, probe)
+            self.last_inputs, self.last_targets = inputs[:, 0], targets[:, 0]
+            self._windows += 1
+            if self._windows % 4 == 0:
+                for learner in self.learners:
+                    learner.history.append((self.stream.steps, learner.accuracy))
+                    del learner.history[:-HISTORY_POINTS]
+            now = time.perf_counter()
+            self.last_window_ms = (now - start) * 1000
+            if now + (now - start) > deadline:
+                break
+        self._update_boss()
+
+    def _update_boss(self):
+        lstm = self.learners[1]
+        progress = (lstm.accuracy - 0.5) / (VICTORY_ACCURACY - 0.5)
+        self.boss_hp = int(np.clip(100 * (1 - progress), 0, 100))
+        if lstm.accuracy >= VICTORY_ACCURACY:
+            self.phase = "victory"
+            self.running = False
+            self.victory_celebration = True
+            rnn = self.learners[0]
+            self.dialogue_box.set_dialogue(
+                f"The LSTM remembers {lstm.accuracy:.0%} of torches, the RNN only {rnn.accuracy:.0%}. "
+                "The Vanishing Gradient Vampire crumbles to dust! SPACE to continue.", "Tensor")
+
+    # Rendering
+
+    def render(self, screen):
+        screen.fill((16, 24, 24))
+
+        title = self.title_font.render("LSTM Labyrinth", True, (140, 240, 210))
+        screen.blit(title, title.get_rect(center=(self.game.width // 2, 40)))
+
+        if self.phase in ("training", "victory"):
+            width = self.game.width
+            hp_rect = pygame.Rect(width // 2 - 200, 68, 400, 14)
+            pygame.draw.rect(screen, (20, 50, 45), hp_rect)
+            pygame.draw.rect(screen, (120, 230, 200), (hp_rect.x, hp_rect.y, hp_rect.width * self.boss_hp // 100, hp_rect.height))
+            pygame.draw.rect(screen, (255, 255, 255), hp_rect, 1)
+            boss_text = self.small_font.render(f"Vanishing Gradient Vampire HP: {self.boss_hp}", True, (255, 255, 255))
+            screen.blit(boss_text, boss_text.get_rect(center=(hp_rect.centerx, hp_rect.bottom + 10)))
+
+            half = (width - 80) // 2
+            self._render_gradient_flow(screen, pygame.Rect(30, 105, half, 230))
+            self._render_accuracy(screen, pygame.Rect(50 + half, 105, half, 230))
+            self._render_window(screen, pygame.Rect(30, 350, width - 60, 90))
+            self._render_stats(screen, pygame.Rect(30, 455, width - 60, 150))
+
+        self.particles.render(screen, self.game.interpolation)
+        self.dialogue_box.render(screen, self.body_font, self.header_font)
+
+    def _panel(self, screen, rect, label):
+        pygame.draw.rect(screen, (24, 36, 36), rect, border_radius=8)
+        pygame.draw.rect(screen, (100, 190, 170), rect, 2, border_radius=8)
+        screen.blit(self.small_font.render(label, True, (200, 240, 230)), (rect.x + 12, rect.y + 8))
+
+    def _render_gradient_flow(self, screen, rect):
+        self._panel(screen, rect, "Gradient reaching each step back (log10, relative)")
+        plot = pygame.Rect(rect.x + 40, rect.y + 30, rect.width - 55, rect.height - 55)
+        floor = -8.0
+        for level in range(0, int(floor) - 1, -2):
+            y = plot.top + level / floor * plot.height
+            pygame.draw.line(screen, (45, 65, 65), (plot.left, y), (plot.right, y), 1)
+            tick = self.small_font.render(str(level), True, (140, 170, 165))
+            screen.blit(tick, tick.get_rect(midright=(plot.left - 6, y)))
+        screen.blit(self.small_font.render("now", True, (140, 170, 165)), (plot.left, plot.bottom + 4))
+        back = self.small_font.render(f"{self.window} steps back", True, (140, 170, 165))
+        screen.blit(back, back.get_rect(topright=(plot.right, plot.bottom + 4)))
+
+        for i, learner in enumerate(self.learners):
+            profile = learner.gradient_profile
+            if profile is None or len(profile) < 2:
+                continue
+            values = np.clip(np.log10(np.maximum(profile, 1e-30)), floor, 0)
+            xs = plot.left + np.linspace(0, plot.width, len(values))
+            ys = plot.top + values / floor * plot.height
+            pygame.draw.lines(screen, learner.color, False, np.column_stack((xs, ys)).tolist(), 2)
+            screen.blit(self.small_font.render(learner.name, True, learner.color), (rect.right - 60, rect.y + 8 + i * 16))
+
+    def _render_accuracy(self, screen, rect):
+        self._panel(screen, rect, f"Long-memory accuracy ({LONG_MEMORY}+ steps after a torch)")
+        plot = pygame.Rect(rect.x + 40, rect.y + 30, rect.width - 55, rect.height - 55)
+        target_y = plot.bottom - (VICTORY_ACCURACY - 0.4) / 0.6 * plot.height
+        pygame.draw.line(screen, (180, 160, 90), (plot.left, target_y), (plot.right, target_y), 1)
+        for value in (0.5, 1.0):
+            y = plot.bottom - (value - 0.4) / 0.6 * plot.height
+            tick = self.small_font.render(f"{value:.0%}", True, (140, 170, 165))
+            screen.blit(tick, tick.get_rect(midright=(plot.left - 4, y)))
+
+        for learner in self.learners:
+            if len(learner.history) < 2:
+                continue
+            history = np.array(learner.history)
+            steps, accuracy = history[:, 0], history[:, 1]
+            span = max(steps[-1] - steps[0], 1)
+            xs = plot.left + (steps - steps[0]) / span * plot.width
+            ys = plot.bottom - np.clip((accuracy - 0.4) / 0.6, 0, 1) * plot.height
+            pygame.draw.lines(screen, learner.color, False, np.column_stack((xs, ys)).tolist(), 2)
+
+    def _render_window(self, screen, rect):
+        self._panel(screen, rect, "Latest window, one sequence: torches, remembered direction, predictions")
+        if self.last_inputs is None:
+            return
+        strip = pygame.Rect(rect.x + 12, rect.y + 28, rect.width - 24, rect.height - 38)
+        steps = len(self.last_targets)
+        cell = strip.width / steps
+        for t, (target, (_, torch)) in enumerate(zip(self.last_targets.tolist(), self.last_inputs.tolist())):
+            x = strip.x + t * cell
+            color = (120, 60, 50) if target else (45, 60, 110)
+            pygame.draw.rect(screen, color, (x, strip.y, max(1, cell - 1), strip.height))
+            if torch:
+                pygame.draw.rect(screen, (255, 210, 100), (x, strip.y - 4, max(2, cell - 1), strip.height + 8))
+        for learner in self.learners:
+            if learner.predictions is None or len(learner.predictions) != steps:
+                continue
+            xs = strip.x + (np.arange(steps) + 0.5) * cell
+            ys = strip.bottom - learner.predictions * strip.height
+            pygame.draw.lines(screen, learner.color, False, np.column_stack((xs, ys)).tolist(), 2)
+
+    def _render_stats(self, screen, rect):
+        pygame.draw.rect(screen, (24, 36, 36), rect, border_radius=8)
+        pygame.draw.rect(screen, (100, 190, 170), rect, 2, border_radius=8)
+
+        rnn, lstm = self.learners
+        buffer_bytes = rnn.model.nbytes + lstm.model.nbytes
+        # What keeping every step for full backprop through the whole stream would cost
+        full_bytes = buffer_bytes / max(self.window, 1) * self.stream.steps
+        status = "TRAINING" if self.running else ("DONE" if self.phase == "victory" else "PAUSED")
+        lines = [
+            (f"Status: {status}", (255, 220, 100)),
+            (f"Streamed: {self.stream.steps:,} steps x {BATCH} sequences", (230, 230, 230)),
+            (f"Truncation window: {self.window} steps (UP/DOWN)", (230, 230, 230)),
+            (f"Last window (both nets): {self.last_window_ms:.1f} ms", (160, 190, 185)),
+        ]
+        for i, (line, color) in enumerate(lines):
+            screen.blit(self.small_font.render(line, True, color), (rect.x + 12, rect.y + 10 + i * 24))
+
+        right = [
+            (f"RNN accuracy: {rnn.accuracy:.1%}", rnn.color),
+            (f"LSTM accuracy: {lstm.accuracy:.1%}", lstm.color),
+            (f"BPTT buffers: {buffer_bytes / 1024:,.0f} KB (fixed)", (230, 230, 230)),
+            (f"Full BPTT would need: {full_bytes / 2 ** 20:,.1f} MB", (180, 160, 150)),
+        ]
+        for i, (line, color) in enumerate(right):
+            screen.blit(self.small_font.render(line, True, color), (rect.centerx + 20, rect.y + 10 + i * 24))
@@ -8,6 +8,7 @@ import math
 from .base_challenge import BaseChallenge
 from ..visualization.neural_viz import NeuralNetworkVisualizer
 from ..game_story import GameStory
+from ..nn.layers import neuron_output
 try:
     from ..ui.responsive_layout import ResponsiveLayout, ResponsiveButton, ResponsiveSlider
 except ImportError:
@@ -179,8 +180,7 @@ class NeuronChallenge(BaseChallenge):
     
     def _compute_neuron_output(self):
         """Compute the current neuron output"""
-        weighted_sum = sum(w * x for w, x in zip(self.weights, self.input_values)) + self.bias
-        return weighted_sum
+        return neuron_output(self.input_values, self.weights, self.bias)
     
     def update(self, dt):
         self.visualizer.update_animation(dt)
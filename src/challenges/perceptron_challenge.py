@@ -2,6 +2,7 @@
 Perceptron implementation challenge
 """
 
+import asyncio
 import pygame
 import numpy as np
 from .base_challenge import BaseChallenge
@@ -13,6 +14,7 @@ class PerceptronChallenge(BaseChallenge):
         self.user_code = ""
         self.cursor_pos = 0
         self.test_results = []
+        self.grading_task = None
         
         # Sample data for testing
         self.training_data = np.array([
@@ -58,7 +60,12 @@ perceptron = Perceptron()
                     self.step = 1
             elif self.step == 1:  # Coding phase
                 if event.key == pygame.K_F5:  # Run code
-                    self.test_code()
+                    if self.game.loop is not None:
+                        # Test cases come in over the next frames instead of freezing this one
+                        self.test_results = []
+                        self.grading_task = self.game.start_task(self.grade(self.user_code))
+                    else:
+                        self.test_code()
                     self.step = 2
                 elif event.key == pygame.K_BACKSPACE:
                     if self.cursor_pos > 0:
@@ -71,7 +78,7 @@ perceptron = Perceptron()
                     self.user_code = self.user_code[:self.cursor_pos] + event.unicode + self.user_code[self.cursor_pos:]
                     self.cursor_pos += 1
             elif self.step == 2:  # Testing phase
-                if event.key == pygame.K_SPACE:
+                if event.key == pygame.K_SPACE and not self.grading:
                     if self.completed:
                         return "completed"
                     else:
@@ -82,8 +89,33 @@ perceptron = Perceptron()
         
         return None
     
+    @property
+    def grading(self):
+        return self.grading_task is not None and not self.grading_task.done()
+
     def test_code(self):
         """Test the user's perceptron implementation"""
+        self.check_solution(self.user_code)
+
+    def check_solution(self, code):
+        for _ in self._grade_steps(code):
+            pass
+        return self.completed
+
+    async def grade(self, code):
+        """Grade over several loop iterations, yielding after each stage and test case"""
+        for _ in self._grade_steps(code):
+            await asyncio.sleep(0)
+        return self.completed
+
+    def close(self):
+        """Stop a grading task that is still running, so it cannot finish against a closed challenge"""
+        if self.grading_task is not None and not self.grading_task.done():
+            self.grading_task.cancel()
+        self.grading_task = None
+
+    def _grade_steps(self, code):
+        """Run and test ``code``, filling ``test_results`` as it goes; yields between stages"""
         try:
             # Create a safe execution environment
             exec_globals = {
@@ -92,7 +124,8 @@ perceptron = Perceptron()
             }
             
             # Execute user code
-            exec(self.user_code, exec_globals)
+            exec(code, exec_globals)
+            yield
             
             # Test the implementation
             if 'Perceptron' in exec_globals:
@@ -100,6 +133,7 @@ perceptron = Perceptron()
                 
                 # Train the perceptron
                 perceptron.train(self.training_data, self.training_labels)
+                yield
                 
                 # Test predictions
                 correct = 0
@@ -115,6 +149,7 @@ perceptron = Perceptron()
                         'predicted': prediction,
                         'correct': is_correct
                     })
+                    yield
                 
                 if correct >= 3:  # Allow some tolerance
                     self.completed = True
@@ -168,7 +203,7 @@ perceptron = Perceptron()
                 screen.blit(text, (50, 80 + i * 20))
         
         elif self.step == 2:  # Testing
-            title = self.font.render("Test Results", True, (255, 255, 255))
+            title = self.font.render("Grading..." if self.grading else "Test Results", True, (255, 255, 255))
             screen.blit(title, (50, 50))
             
             y_offset = 100
@@ -191,7 +226,9 @@ perceptron = Perceptron()
                     screen.blit(text, (50, y_offset))
                     y_offset += 30
             
-            if self.completed:
+            if self.grading:
+                next_text = "Running your perceptron..."
+            elif self.completed:
                 next_text = "Press SPACE to continue to next level!"
             else:
                 next_text = "Press SPACE to go back and fix your code"
@@ -3,24 +3,51 @@ Neural Detective Agency - Perceptron Challenge
 Learn how perceptrons work by solving mysteries as a neural detective!
 """
 
+import functools
 import pygame
 import numpy as np
 import math
 import random
+from collections import deque
 try:
     from .base_challenge import BaseChallenge
+    from .perceptron_dataset import PerceptronDataset
+    from ..nn.landscape import LossLandscape, linear_losses
 except ImportError:
     # Fallback for testing
     from base_challenge import BaseChallenge
+    from perceptron_dataset import PerceptronDataset
+    from nn.landscape import LossLandscape, linear_losses
 try:
     from ..ui.modern_ui import ModernButton, ProgressBar, DialogueBox, ParticleSystem
     from ..ui.responsive_layout import ResponsiveLayout, ResponsiveButton, ResponsiveSlider
     from ..ui.clean_layout import CleanLayout
+    from ..visualization.decision_regions import DecisionRegionRenderer
+    from ..visualization.density_scatter import DensityScatterRenderer
+    from ..visualization.loss_landscape import LossLandscapeRenderer
+    from ..visualization.figure_service import FigureService
 except ImportError:
     # Fallback for testing
     from ui.modern_ui import ModernButton, ProgressBar, DialogueBox, ParticleSystem
     from ui.responsive_layout import ResponsiveLayout, ResponsiveButton, ResponsiveSlider
     from ui.clean_layout import CleanLayout
+    from visualization.decision_regions import DecisionRegionRenderer
+    from visualization.density_scatter import DensityScatterRenderer
+    from visualization.loss_landscape import LossLandscapeRenderer
+    from visualization.figure_service import FigureService
+
+# Display colors for each evidence class (0 = innocent, 1 = guilty)
+CLASS_COLORS = ((100, 255, 100), (255, 100, 100))
+
+# Large-data boss waves multiply every phase's point counts by this factor
+LARGE_DATA_SCALE = 12_500
+# Large waves are generated this many points per time-sliced task step
+WAVE_CHUNK = 16_384
+# Above this many points boss data is drawn as a density image
+DENSITY_THRESHOLD = 2_000
+# Loss landscape over (w1, w2) at the current bias, and how many weight updates its trail remembers
+LANDSCAPE_RANGE = (-3.0, 3.0)
+TRAIL_LENGTH = 200
 
 class PerceptronCompleteChallenge(BaseChallenge):
     def __init__(self, game):
@@ -53,7 +80,6 @@ class PerceptronCompleteChallenge(BaseChallenge):
         # Evidence Database (Training Data)
         self.current_case = self.generate_case()
         self.evidence_queue = []
-        self.classified_evidence = []
         self.current_evidence = None
         self.evidence_timer = 0
         
@@ -63,8 +89,11 @@ class PerceptronCompleteChallenge(BaseChallenge):
         self.boss_phase = 1  # 1: Basic separation, 2: Noise attack, 3: Non-linear challenge
         self.boss_attacks = []
         self.player_score = 0
-        self.boss_data_points = []
+        self.boss_data_points = PerceptronDataset()
         self.boss_challenge_active = False
+        self.large_boss_data = False
+        self.boss_wave = None
+        self.boss_wave_size = 0
         
         # Visual Effects
         self.scanner_active = False
@@ -72,6 +101,19 @@ class PerceptronCompleteChallenge(BaseChallenge):
         self.classification_feedback = None
         self.feedback_timer = 0
         self.particles = ParticleSystem()
+        self.region_renderer = DecisionRegionRenderer(CLASS_COLORS[0], CLASS_COLORS[1])
+        self.density_renderer = DensityScatterRenderer(CLASS_COLORS)
+        
+        # Loss landscape of the boss data, refined in the background while shown
+        self.show_landscape = False
+        self.landscape = None
+        self._landscape_key = None
+        self.landscape_renderer = LossLandscapeRenderer()
+        self.weight_trail = deque(maxlen=TRAIL_LENGTH)
+        self.accuracy_history = deque(maxlen=TRAIL_LENGTH)
+        
+        # Matplotlib charts, rendered in a worker process
+        self.figures = FigureService()
         
         # Tutorial
         self.show_tutorial = True
@@ -335,6 +377,10 @@ class PerceptronCompleteChallenge(BaseChallenge):
                     self._boss_train()
                 elif event.key == pygame.K_r:  # Reset perceptron
                     self._reset_perceptron()
+                elif event.key == pygame.K_m:  # Toggle massive boss data
+                    self._toggle_large_boss_data()
+                elif event.key == pygame.K_l:  # Toggle the loss landscape
+                    self.show_landscape = not self.show_landscape
             elif self.phase == "victory":
                 if event.key == pygame.K_SPACE:
                     return "completed"
@@ -480,9 +526,9 @@ class PerceptronCompleteChallenge(BaseChallenge):
             self.bias += self.learning_rate * error
             
             # Update sliders to reflect new weights
-            self.weight_sliders['w1']['value'] = self.weights[0]
-            self.weight_sliders['w2']['value'] = self.weights[1] 
-            self.weight_sliders['bias']['value'] = self.bias
+            self.weight_sliders['w1'].value = self.weights[0]
+            self.weight_sliders['w2'].value = self.weights[1]
+            self.weight_sliders['bias'].value = self.bias
             
             # Visual feedback for training
             training_text = "Neural scanner updated! Weights adjusted based on evidence."
@@ -528,74 +574,88 @@ class PerceptronCompleteChallenge(BaseChallenge):
         self._generate_boss_challenge()
         
     def _generate_boss_challenge(self):
-        """Generate boss challenge data based on current phase"""
-        self.boss_data_points = []
+        """Generate boss challenge data based on current phase.
+
+        Small waves are built on the spot. Large ones stream in as a
+        time-sliced task on ``game.tasks``, a chunk at a time in leftover
+        frame time, and the density image fills in as they land.
+        """
+        if self.boss_wave is not None:
+            self.boss_wave.cancel()
+        self.boss_data_points.clear()
+        parts = self._boss_wave_parts()
+        self.boss_wave_size = sum(count for count, _ in parts)
+        wave = self._boss_wave(parts)
+        if self.large_boss_data:
+            self.boss_wave = self.game.tasks.start(wave, owner=self)
+        else:
+            self.boss_wave = None
+            for _ in wave:
+                pass
+
+    @property
+    def _wave_loading(self):
+        return self.boss_wave is not None and not self.boss_wave.done
+
+    def _boss_wave_parts(self):
+        """(count, make) pieces of the current phase's wave; make(n) returns n (features, labels)"""
+        scale = LARGE_DATA_SCALE if self.large_boss_data else 1
+        uniform = np.random.uniform
         
         if self.boss_phase == 1:
             # Phase 1: Perfect linear separation
-            # Class 0: bottom-left region
-            for _ in range(8):
-                x = random.uniform(0.1, 0.4)
-                y = random.uniform(0.1, 0.4)
-                self.boss_data_points.append({'pos': [x, y], 'class': 0, 'color': (100, 255, 100)})
-            
-            # Class 1: top-right region  
-            for _ in range(8):
-                x = random.uniform(0.6, 0.9)
-                y = random.uniform(0.6, 0.9)
-                self.boss_data_points.append({'pos': [x, y], 'class': 1, 'color': (255, 100, 100)})
+            # Class 0: bottom-left region, class 1: top-right region
+            count = 8 * scale
+            return [(count, lambda n: (uniform(0.1, 0.4, (n, 2)), np.zeros(n))),
+                    (count, lambda n: (uniform(0.6, 0.9, (n, 2)), np.ones(n)))]
                 
         elif self.boss_phase == 2:
             # Phase 2: Add noise to make it harder
-            for _ in range(6):
-                x = random.uniform(0.1, 0.4) + random.uniform(-0.1, 0.1)
-                y = random.uniform(0.1, 0.4) + random.uniform(-0.1, 0.1)
-                self.boss_data_points.append({'pos': [max(0, min(1, x)), max(0, min(1, y))], 'class': 0, 'color': (100, 255, 100)})
-            
-            for _ in range(6):
-                x = random.uniform(0.6, 0.9) + random.uniform(-0.1, 0.1)
-                y = random.uniform(0.6, 0.9) + random.uniform(-0.1, 0.1)
-                self.boss_data_points.append({'pos': [max(0, min(1, x)), max(0, min(1, y))], 'class': 1, 'color': (255, 100, 100)})
-                
-            # Add some tricky points near the boundary
-            for _ in range(4):
-                x = random.uniform(0.4, 0.6)
-                y = random.uniform(0.4, 0.6)
-                true_class = 1 if x + y > 1.0 else 0
-                color = (255, 100, 100) if true_class == 1 else (100, 255, 100)
-                self.boss_data_points.append({'pos': [x, y], 'class': true_class, 'color': color})
+            count = 6 * scale
+            def noisy(low, high, label):
+                return lambda n: (np.clip(uniform(low, high, (n, 2)) + uniform(-0.1, 0.1, (n, 2)), 0, 1),
+                                  np.full(n, label))
+            def tricky(n):
+                # Some tricky points near the boundary
+                points = uniform(0.4, 0.6, (n, 2))
+                return points, points.sum(axis=1) > 1.0
+            return [(count, noisy(0.1, 0.4, 0)), (count, noisy(0.6, 0.9, 1)), (4 * scale, tricky)]
                 
-        elif self.boss_phase == 3:
+        else:
             # Phase 3: Nearly non-linear (still solvable by perceptron but very challenging)
-            for _ in range(12):
-                x = random.uniform(0.0, 1.0)
-                y = random.uniform(0.0, 1.0)
-                # Complex but still linear boundary: x + 2*y > 1.2
-                true_class = 1 if x + 2*y > 1.2 else 0
-                color = (255, 100, 100) if true_class == 1 else (100, 255, 100)
-                self.boss_data_points.append({'pos': [x, y], 'class': true_class, 'color': color})
+            # Complex but still linear boundary: x + 2*y > 1.2
+            def complex_boundary(n):
+                points = uniform(0.0, 1.0, (n, 2))
+                return points, points[:, 0] + 2 * points[:, 1] > 1.2
+            return [(12 * scale, complex_boundary)]
+
+    def _boss_wave(self, parts):
+        """Append the wave to boss_data_points in chunks, yielding the fraction done after each"""
+        done = 0
+        for count, make in parts:
+            for start in range(0, count, WAVE_CHUNK):
+                n = min(WAVE_CHUNK, count - start)
+                self.boss_data_points.extend(*make(n))
+                done += n
+                yield done / self.boss_wave_size
+    
+    def _toggle_large_boss_data(self):
+        """Switch boss waves between a handful of points and hundreds of thousands"""
+        self.large_boss_data = not self.large_boss_data
+        self._generate_boss_challenge()
+        if self.large_boss_data:
+            message = f"Massive data wave! {self.boss_wave_size:,} pieces of evidence! Can your perceptron keep up?"
+        else:
+            message = "The data wave recedes. Back to a handful of evidence."
+        self.dialogue_box.set_dialogue(message, "Linear Separatrix")
     
     def _boss_attack(self):
         """Player attempts to classify boss's challenge data"""
-        if not self.boss_data_points:
+        if not self.boss_data_points or self._wave_loading:
             return
             
-        correct_count = 0
-        total_count = len(self.boss_data_points)
-        
         # Test perceptron on all boss data points
-        for point in self.boss_data_points:
-            features = np.array(point['pos'])
-            true_class = point['class']
-            
-            # Perceptron prediction
-            activation = np.dot(self.weights, features) + self.bias
-            predicted_class = 1 if activation > 0 else 0
-            
-            if predicted_class == true_class:
-                correct_count += 1
-                
-        accuracy = correct_count / total_count
+        accuracy = self.boss_data_points.accuracy(self.weights, self.bias)
         
         # Calculate damage based on accuracy
         if accuracy >= 0.9:
@@ -637,29 +697,18 @@ class PerceptronCompleteChallenge(BaseChallenge):
             
     def _boss_train(self):
         """Train perceptron on boss's challenge data"""
-        if not self.boss_data_points:
+        if not self.boss_data_points or self._wave_loading:
             return
             
-        # Train on a random subset of boss data
-        training_points = random.sample(self.boss_data_points, min(4, len(self.boss_data_points)))
-        
-        for point in training_points:
-            features = np.array(point['pos'])
-            true_class = point['class']
-            
-            # Perceptron learning rule
-            activation = np.dot(self.weights, features) + self.bias
-            predicted_class = 1 if activation > 0 else 0
-            
-            if predicted_class != true_class:
-                error = true_class - predicted_class
-                self.weights += self.learning_rate * error * features
-                self.bias += self.learning_rate * error
+        # Train on a random subset of boss data (batched perceptron learning rule)
+        training_indices = self.boss_data_points.sample_indices(4)
+        self.weights, self.bias = self.boss_data_points.perceptron_update(
+            self.weights, self.bias, self.learning_rate, training_indices)
                 
         # Update sliders
-        self.weight_sliders['w1']['value'] = np.clip(self.weights[0], -1, 1)
-        self.weight_sliders['w2']['value'] = np.clip(self.weights[1], -1, 1)
-        self.weight_sliders['bias']['value'] = np.clip(self.bias, -1, 1)
+        self.weight_sliders['w1'].value = np.clip(self.weights[0], -1, 1)
+        self.weight_sliders['w2'].value = np.clip(self.weights[1], -1, 1)
+        self.weight_sliders['bias'].value = np.clip(self.bias, -1, 1)
         
         train_feedback = "Perceptron trained on boss data! Weights updated!"
         self.dialogue_box.set_dialogue(train_feedback, "Detective AI")
@@ -676,11 +725,7 @@ class PerceptronCompleteChallenge(BaseChallenge):
             attack_msg = "Bias Shift Attack! Your decision threshold is moved!"
         else:  # data_poison
             # Add misleading data points
-            for _ in range(2):
-                x, y = random.uniform(0, 1), random.uniform(0, 1)
-                wrong_class = random.choice([0, 1])
-                color = (255, 100, 100) if wrong_class == 1 else (100, 255, 100)
-                self.boss_data_points.append({'pos': [x, y], 'class': wrong_class, 'color': color})
+            self.boss_data_points.extend(np.random.uniform(0, 1, (2, 2)), np.random.randint(0, 2, 2))
             attack_msg = "Data Poisoning Attack! Fake evidence added to confuse you!"
             
         self.dialogue_box.set_dialogue(attack_msg, "Linear Separatrix")
@@ -707,9 +752,9 @@ class PerceptronCompleteChallenge(BaseChallenge):
         self.bias = np.random.uniform(-0.5, 0.5)
         
         # Update sliders
-        self.weight_sliders['w1']['value'] = self.weights[0]
-        self.weight_sliders['w2']['value'] = self.weights[1]
-        self.weight_sliders['bias']['value'] = self.bias
+        self.weight_sliders['w1'].value = self.weights[0]
+        self.weight_sliders['w2'].value = self.weights[1]
+        self.weight_sliders['bias'].value = self.bias
         
         reset_msg = "Perceptron reset! New random weights assigned."
         self.dialogue_box.set_dialogue(reset_msg, "Detective AI")
@@ -736,7 +781,39 @@ class PerceptronCompleteChallenge(BaseChallenge):
             if event.type == pygame.USEREVENT + 1:
                 self._spawn_evidence()
                 pygame.time.set_timer(pygame.USEREVENT + 1, 0)  # Cancel timer
+    
+    def frame_update(self):
+        if self.phase == "boss_fight":
+            self._update_landscape()
                 
+    def _update_landscape(self):
+        """Track the weight trail and keep refining the landscape while it is shown"""
+        position = (float(self.weights[0]), float(self.weights[1]))
+        if not self.weight_trail or self.weight_trail[-1] != position:
+            self.weight_trail.append(position)
+            self.accuracy_history.append(self.boss_data_points.accuracy(self.weights, self.bias))
+        if not self.show_landscape or self._wave_loading:
+            return
+        
+        # The landscape only depends on the data and the bias; moving w1/w2 just moves the marker
+        key = (self.boss_data_points.version, float(self.bias))
+        if key != self._landscape_key:
+            self._landscape_key = key
+            evaluate = functools.partial(linear_losses, self.boss_data_points.features.copy(),
+                                         self.boss_data_points.labels.copy(), bias=float(self.bias))
+            if self.landscape is None:
+                self.landscape = LossLandscape(evaluate, LANDSCAPE_RANGE, LANDSCAPE_RANGE,
+                                               cost_per_cell=len(self.boss_data_points))
+            else:
+                self.landscape.reset(evaluate, cost_per_cell=len(self.boss_data_points))
+        self.landscape.poll()
+    
+    def close(self):
+        """Shut down the landscape and chart worker processes"""
+        if self.landscape is not None:
+            self.landscape.close()
+        self.figures.close()
+    
     def render(self, screen):
         """Render the game with fully responsive layout"""
         # Update layout for current phase
@@ -769,7 +846,7 @@ class PerceptronCompleteChallenge(BaseChallenge):
         self._render_dialogue(screen)
         
         # Render particles
-        self.particles.render(screen)
+        self.particles.render(screen, self.game.interpolation)
     
     def _render_title(self, screen):
         """Render clean title"""
@@ -1202,6 +1279,14 @@ Bias: {self.bias:.2f}"""
                 
     def _render_boss_fight(self, screen):
         """Render boss fight with fully responsive layout"""
+        # The clean layout only has one main area; carve the boss header out of its top
+        if "main" in self.areas and "main_content" not in self.areas:
+            main_rect = self.areas["main"]
+            header_height = max(50, main_rect.height // 6)
+            self.areas["boss_header"] = pygame.Rect(main_rect.x, main_rect.y, main_rect.width, header_height)
+            self.areas["main_content"] = pygame.Rect(main_rect.x, main_rect.y + header_height + 10,
+                                                     main_rect.width, main_rect.height - header_height - 10)
+        
         # Boss header
         if "boss_header" in self.areas:
             self._render_boss_header(screen)
@@ -1304,7 +1389,10 @@ Bias: {self.bias:.2f}"""
         title_font_size = self.layout.get_font_size(0.025, min_size=12, max_size=18)
         title_font = pygame.font.Font(None, title_font_size)
         title_rect = pygame.Rect(viz_area.x, viz_area.y, viz_area.width, 25)
-        self.layout.render_text_block(screen, "Boss Challenge Data", title_font, title_rect,
+        title = "Boss Challenge Data"
+        if self.show_landscape and self.landscape is not None:
+            title = f"Perceptron Loss over (w1, w2), bias {self.bias:.2f} - {self.landscape.resolution}x{self.landscape.resolution}"
+        self.layout.render_text_block(screen, title, title_font, title_rect,
                                     (255, 255, 100), align="center", vertical_align="center")
         
         # Data area
@@ -1312,6 +1400,16 @@ Bias: {self.bias:.2f}"""
         data_area = pygame.Rect(viz_area.x + data_margin, viz_area.y + 30,
                                viz_area.width - 2 * data_margin, viz_area.height - 40)
         
+        if self.show_landscape and self.landscape is not None:
+            self.landscape_renderer.render(screen, data_area, self.landscape, self.weight_trail,
+                                           current=self.weights)
+            return
+        
+        # Shade decision regions (coarse while a slider is dragged)
+        dragging = any(getattr(slider, 'dragging', False) for slider in self.weight_sliders.values())
+        self.region_renderer.render(screen, data_area, self.weights[0], self.weights[1], self.bias,
+                                    dragging=dragging)
+        
         # Draw grid
         grid_color = (60, 70, 90)
         for i in range(1, 4):
@@ -1320,15 +1418,18 @@ Bias: {self.bias:.2f}"""
             pygame.draw.line(screen, grid_color, (x, data_area.y), (x, data_area.bottom), 1)
             pygame.draw.line(screen, grid_color, (data_area.x, y), (data_area.right, y), 1)
         
-        # Draw data points
+        # Draw data points (large waves as a density image)
+        if len(self.boss_data_points) > DENSITY_THRESHOLD:
+            self.density_renderer.render(screen, data_area, self.boss_data_points)
+            self._draw_decision_boundary(screen, data_area)
+            return
         point_size = max(3, int(size * 0.01))
-        for point in self.boss_data_points:
-            x, y = point['pos']
-            screen_x = data_area.x + x * data_area.width
-            screen_y = data_area.y + (1 - y) * data_area.height
-            
-            pygame.draw.circle(screen, point['color'], (int(screen_x), int(screen_y)), point_size + 1)
-            pygame.draw.circle(screen, (255, 255, 255), (int(screen_x), int(screen_y)), point_size + 1, 1)
+        features = self.boss_data_points.features
+        screen_x = (data_area.x + features[:, 0] * data_area.width).astype(int)
+        screen_y = (data_area.y + (1 - features[:, 1]) * data_area.height).astype(int)
+        for px, py, label in zip(screen_x.tolist(), screen_y.tolist(), self.boss_data_points.labels.tolist()):
+            pygame.draw.circle(screen, CLASS_COLORS[label], (px, py), point_size + 1)
+            pygame.draw.circle(screen, (255, 255, 255), (px, py), point_size + 1, 1)
         
         # Draw decision boundary
         self._draw_decision_boundary(screen, data_area)
@@ -1346,17 +1447,8 @@ Bias: {self.bias:.2f}"""
         self.layout.render_text_block(screen, "Battle Stats", title_font, title_rect,
                                     (255, 255, 100), align="center", vertical_align="center")
         
-        # Calculate accuracy
-        boss_accuracy = 0
-        if self.boss_data_points:
-            correct = 0
-            for point in self.boss_data_points:
-                features = np.array(point['pos'])
-                activation = np.dot(self.weights, features) + self.bias
-                predicted = 1 if activation > 0 else 0
-                if predicted == point['class']:
-                    correct += 1
-            boss_accuracy = correct / len(self.boss_data_points)
+        # Calculate accuracy (cached until the weights or bias change)
+        boss_accuracy = self.boss_data_points.accuracy(self.weights, self.bias)
         
         # Stats content
         stats_font_size = self.layout.get_font_size(0.02, min_size=10, max_size=14)
@@ -1365,7 +1457,7 @@ Bias: {self.bias:.2f}"""
         stats_text = f"""Accuracy: {boss_accuracy:.1%}
 Score: {self.player_score}
 Phase: {self.boss_phase}/3
-Data Points: {len(self.boss_data_points)}
+Data Points: {len(self.boss_data_points):,}{f" (summoning {self.boss_wave.progress:.0%})" if self._wave_loading else ""}
 
 Weights:
 W1: {self.weights[0]:.2f}
@@ -1388,6 +1480,34 @@ Bias: {self.bias:.2f}"""
                 color = (100, 255, 100) if "Accuracy" in line and boss_accuracy >= 0.9 else (255, 255, 255)
                 line_surface = stats_font.render(line, True, color)
                 screen.blit(line_surface, (content_rect.x, y_pos))
+        
+        # Charts fill the space under the stats text
+        chart_top = content_rect.y + len(lines) * line_height + 10
+        chart_area = pygame.Rect(content_rect.x, chart_top, content_rect.width, content_rect.bottom - chart_top)
+        if chart_area.height >= 80:
+            self._render_boss_charts(screen, chart_area)
+    
+    def _render_boss_charts(self, screen, area):
+        """Confusion matrix and accuracy-per-update curve of the boss data, drawn by matplotlib off-thread"""
+        if not self.figures.enabled:
+            return
+        matrix_rect = pygame.Rect(area.x, area.y, min(area.height, area.width // 2), area.height)
+        curve_rect = pygame.Rect(matrix_rect.right + 6, area.y, area.right - matrix_rect.right - 6, area.height)
+        
+        labels = self.boss_data_points.labels
+        predictions = self.boss_data_points.predict(self.weights, self.bias)
+        confusion = np.bincount(2 * labels.astype(np.intp) + predictions, minlength=4).reshape(2, 2)
+        charts = [
+            (matrix_rect, self.figures.request("confusion_matrix", matrix_rect.size, matrix=confusion,
+                                               labels=["innocent", "guilty"], title="Boss data")),
+        ]
+        if len(self.accuracy_history) > 1:
+            charts.append((curve_rect, self.figures.request(
+                "learning_curve", curve_rect.size, series={"accuracy": np.array(self.accuracy_history)},
+                xlabel="weight update", title="Accuracy per update")))
+        for rect, surface in charts:
+            if surface is not None:
+                screen.blit(surface, rect.topleft)
     
     def _render_boss_controls(self, screen):
         """Render boss fight controls"""
@@ -1410,7 +1530,7 @@ Bias: {self.bias:.2f}"""
             instruction_font_size = self.layout.get_font_size(0.018, min_size=10, max_size=14)
             instruction_font = pygame.font.Font(None, instruction_font_size)
             
-            instructions = "SPACE: Attack Boss | T: Train | R: Reset | Drag sliders to adjust weights"
+            instructions = "SPACE: Attack Boss | T: Train | R: Reset | M: Massive Data | L: Loss Landscape | Drag sliders to adjust weights"
             self.layout.render_text_block(screen, instructions, instruction_font, instruction_area,
                                         (200, 200, 200), align="center", vertical_align="top")
             
@@ -1434,16 +1554,14 @@ Bias: {self.bias:.2f}"""
         if abs(self.weights[1]) < 0.001:  # Avoid division by zero
             return
             
-        boundary_points = []
-        
         # Calculate boundary line: w1*x + w2*y + bias = 0
         # Solve for y: y = -(w1*x + bias) / w2
-        for x in np.linspace(0, 1, 50):
-            y = -(self.weights[0] * x + self.bias) / self.weights[1]
-            if 0 <= y <= 1:  # Only draw within bounds
-                screen_x = rect.x + x * rect.width
-                screen_y = rect.y + (1 - y) * rect.height
-                boundary_points.append((screen_x, screen_y))
+        xs = np.linspace(0, 1, 50)
+        ys = -(self.weights[0] * xs + self.bias) / self.weights[1]
+        inside = (ys >= 0) & (ys <= 1)  # Only draw within bounds
+        screen_xs = rect.x + xs[inside] * rect.width
+        screen_ys = rect.y + (1 - ys[inside]) * rect.height
+        boundary_points = list(zip(screen_xs.tolist(), screen_ys.tolist()))
                 
         # Draw the boundary line
         if len(boundary_points) >= 2:
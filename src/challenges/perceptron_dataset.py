@@ -0,0 +1,144 @@
+"""
+Struct-of-arrays storage for labelled 2D perceptron data
+"""
+
+import numpy as np
+
+class PerceptronDataset:
+    """Labelled 2D points stored as contiguous (N, 2) feature and (N,) label arrays"""
+
+    def __init__(self, capacity=64):
+        self._features = np.zeros((capacity, 2), dtype=np.float64)
+        self._labels = np.zeros(capacity, dtype=np.int8)
+        self._size = 0
+
+        # Predictions are cached until the data or the perceptron parameters change
+        self._version = 0
+        self._cache_key = None
+        self._predictions = None
+
+    @classmethod
+    def gaussian_blobs(cls, count, centers, spread, low=None, high=None, rng=None):
+        """Generate count points split evenly between one Gaussian blob per class.
+
+        centers[k] is the mean of class k; points are clipped to [low, high]
+        when given. Generation is a single vectorized draw, so hundreds of
+        thousands of points take milliseconds.
+        """
+        rng = rng or np.random.default_rng()
+        centers = np.asarray(centers, dtype=np.float64)
+        labels = rng.integers(0, len(centers), count).astype(np.int8)
+        features = centers[labels] + rng.normal(0.0, spread, (count, 2))
+        if low is not None or high is not None:
+            np.clip(features, low, high, out=features)
+        dataset = cls(capacity=count)
+        dataset.extend(features, labels)
+        return dataset
+
+    @classmethod
+    def load(cls, path):
+        """Load points from an .npz with "features"/"labels" arrays or an (N, 3) .npy of x, y, label"""
+        data = np.load(path)
+        if isinstance(data, np.ndarray):
+            features, labels = data[:, :2], data[:, 2]
+        else:
+            with data:
+                features, labels = data["features"], data["labels"]
+        dataset = cls(capacity=max(1, len(labels)))
+        dataset.extend(features, labels)
+        return dataset
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def version(self):
+        """Counter bumped on every change, for caches keyed on the data"""
+        return self._version
+
+    @property
+    def features(self):
+        """View of the (N, 2) feature array"""
+        return self._features[:self._size]
+
+    @property
+    def labels(self):
+        """View of the (N,) label array"""
+        return self._labels[:self._size]
+
+    def clear(self):
+        """Remove all points, keeping the allocated buffers"""
+        self._size = 0
+        self._version += 1
+
+    def append(self, x, y, label):
+        """Add a single labelled point"""
+        self._reserve(self._size + 1)
+        self._features[self._size] = (x, y)
+        self._labels[self._size] = label
+        self._size += 1
+        self._version += 1
+
+    def extend(self, features, labels):
+        """Add a block of points in one copy"""
+        features = np.asarray(features, dtype=np.float64).reshape(-1, 2)
+        labels = np.asarray(labels, dtype=np.int8).reshape(-1)
+        count = len(features)
+        if count == 0:
+            return
+        self._reserve(self._size + count)
+        self._features[self._size:self._size + count] = features
+        self._labels[self._size:self._size + count] = labels
+        self._size += count
+        self._version += 1
+
+    def _reserve(self, capacity):
+        """Grow the buffers geometrically so appends stay amortised O(1)"""
+        if capacity <= len(self._labels):
+            return
+        new_capacity = max(capacity, 2 * len(self._labels))
+        features = np.zeros((new_capacity, 2), dtype=np.float64)
+        labels = np.zeros(new_capacity, dtype=np.int8)
+        features[:self._size] = self._features[:self._size]
+        labels[:self._size] = self._labels[:self._size]
+        self._features = features
+        self._labels = labels
+
+    def predict(self, weights, bias):
+        """Classify every point at once, reusing the last result if nothing changed"""
+        key = (float(weights[0]), float(weights[1]), float(bias), self._version)
+        if key != self._cache_key:
+            activation = self.features @ np.asarray(weights, dtype=np.float64) + bias
+            self._predictions = (activation > 0).astype(np.int8)
+            self._cache_key = key
+        return self._predictions
+
+    def accuracy(self, weights, bias):
+        """Fraction of points classified correctly"""
+        if self._size == 0:
+            return 0.0
+        return float(np.count_nonzero(self.predict(weights, bias) == self.labels)) / self._size
+
+    def sample_indices(self, count):
+        """Random subset of point indices, without replacement"""
+        return np.random.choice(self._size, min(count, self._size), replace=False)
+
+    def perceptron_update(self, weights, bias, learning_rate, indices=None):
+        """Apply one batched perceptron learning step and return the new (weights, bias)"""
+        if self._size == 0:
+            return weights, bias
+        if indices is None:
+            features = self.features
+            labels = self.labels
+            predictions = self.predict(weights, bias)
+        else:
+            features = self._features[indices]
+            labels = self._labels[indices]
+            predictions = (features @ np.asarray(weights, dtype=np.float64) + bias > 0).astype(np.int8)
+
+        errors = (labels - predictions).astype(np.float64)
+        if not errors.any():
+            return weights, bias
+        weights = weights + learning_rate * (errors @ features)
+        bias = bias + learning_rate * errors.sum()
+        return weights, bias
@@ -11,10 +11,20 @@ import time
 
 try:
     from ..challenges.base_challenge import BaseChallenge
+    from ..challenges.perceptron_dataset import PerceptronDataset
     from ..ui.modern_ui import DialogueBox, ParticleSystem
+    from ..visualization.decision_regions import DecisionRegionRenderer
+    from ..visualization.density_scatter import DensityScatterRenderer
 except ImportError:
     from challenges.base_challenge import BaseChallenge
+    from challenges.perceptron_dataset import PerceptronDataset
     from ui.modern_ui import DialogueBox, ParticleSystem
+    from visualization.decision_regions import DecisionRegionRenderer
+    from visualization.density_scatter import DensityScatterRenderer
+
+# Large-data mode: point count, and the size above which points are drawn as a density image
+LARGE_DATASET_SIZE = 200_000
+DENSITY_THRESHOLD = 2_000
 
 class PerceptronSimple(BaseChallenge):
     """
@@ -53,7 +63,8 @@ class PerceptronSimple(BaseChallenge):
         self.line_angle = 45  # degrees
         self.line_position = 0  # -1 to 1, position along perpendicular
         
-        # Training data - clearly separable points
+        # Training data - clearly separable points (or a large noisy set in large-data mode)
+        self.large_data = False
         self.points = self._generate_clear_data()
         
         # Interaction
@@ -73,28 +84,34 @@ class PerceptronSimple(BaseChallenge):
         # Visualization area
         self.viz_rect = pygame.Rect(self.width // 2 - 200, 120, 400, 400)
         
+        # Class regions behind the points (data space spans +/-1.25 across the plot)
+        self.region_renderer = DecisionRegionRenderer(
+            self.error_color, self.success_color, background_color=(35, 40, 50),
+            x_range=(-1.25, 1.25), y_range=(-1.25, 1.25))
+        self.density_renderer = DensityScatterRenderer(
+            (self.error_color, self.success_color), x_range=(-1.25, 1.25), y_range=(-1.25, 1.25))
+        
         # Dialogue
         self.dialogue = DialogueBox(50, self.height - 120, self.width - 100, 80)
         self._start_learning()
     
     def _generate_clear_data(self):
         """Generate clearly separable training data"""
-        points = []
+        points = PerceptronDataset()
         
         # Green points (class 1) - upper right
-        for _ in range(8):
-            x = random.uniform(0.2, 0.8)
-            y = random.uniform(0.2, 0.8)
-            points.append({'pos': (x, y), 'label': 1, 'color': self.success_color})
+        points.extend(np.random.uniform(0.2, 0.8, (8, 2)), np.ones(8))
         
         # Red points (class 0) - lower left  
-        for _ in range(8):
-            x = random.uniform(-0.8, -0.2)
-            y = random.uniform(-0.8, -0.2)
-            points.append({'pos': (x, y), 'label': 0, 'color': self.error_color})
+        points.extend(np.random.uniform(-0.8, -0.2, (8, 2)), np.zeros(8))
         
         return points
     
+    def _generate_large_data(self):
+        """Generate a large, overlapping two-class dataset no line can separate perfectly"""
+        return PerceptronDataset.gaussian_blobs(
+            LARGE_DATASET_SIZE, [(-0.45, -0.45), (0.45, 0.45)], 0.35, low=-1.2, high=1.2)
+    
     def _start_learning(self):
         """Start the learning phase"""
         learn_text = "🎯 DRAG the yellow line to separate GREEN and RED dots! Try to get all green dots above the line and red dots below."
@@ -129,6 +146,8 @@ class PerceptronSimple(BaseChallenge):
                     self._check_solution()
             elif event.key == pygame.K_r:
                 self._reset_line()
+            elif event.key == pygame.K_d and self.phase != "complete":
+                self._toggle_large_data()
             elif event.key == pygame.K_ESCAPE:
                 if self.phase == "complete":
                     self.completed = True
@@ -188,16 +207,7 @@ class PerceptronSimple(BaseChallenge):
     
     def _check_solution(self):
         """Check if the current line correctly separates the points"""
-        correct = 0
-        total = len(self.points)
-        
-        for point in self.points:
-            x, y = point['pos']
-            predicted = self._classify_point(x, y)
-            if predicted == point['label']:
-                correct += 1
-        
-        accuracy = (correct / total) * 100
+        accuracy = self.points.accuracy(*self._line_params()) * 100
         self.attempts += 1
         
         if accuracy >= 90:
@@ -229,16 +239,19 @@ class PerceptronSimple(BaseChallenge):
         
         self.feedback_timer = 2.0
     
-    def _classify_point(self, x, y):
-        """Classify a point using the current line"""
+    def _line_params(self):
+        """Express the current line as perceptron (weights, bias)"""
         # Line equation: ax + by + c = 0
         angle_rad = math.radians(self.line_angle)
-        a = math.sin(angle_rad)
-        b = -math.cos(angle_rad)
-        c = self.line_position
+        weights = np.array([math.sin(angle_rad), -math.cos(angle_rad)])
+        return weights, self.line_position
+    
+    def _classify_point(self, x, y):
+        """Classify a point using the current line"""
+        weights, bias = self._line_params()
         
         # Point is above line if ax + by + c > 0
-        return 1 if (a * x + b * y + c) > 0 else 0
+        return 1 if (weights[0] * x + weights[1] * y + bias) > 0 else 0
     
     def _reset_line(self):
         """Reset line to default position"""
@@ -248,9 +261,19 @@ class PerceptronSimple(BaseChallenge):
         self.feedback_color = self.primary_color
         self.feedback_timer = 1.0
     
+    def _toggle_large_data(self):
+        """Switch between the hand-sized dataset and the large noisy one"""
+        self.large_data = not self.large_data
+        self._generate_new_points()
+        if self.large_data:
+            large_text = f"📈 {len(self.points):,} points! Real data overlaps, so no line is perfect. Aim for 90% and press SPACE to check. (D to switch back)"
+        else:
+            large_text = "Back to the small dataset. Separate GREEN and RED dots!"
+        self.dialogue.set_dialogue(large_text, "Perceptron Trainer")
+    
     def _generate_new_points(self):
         """Generate a new set of points for the next challenge"""
-        self.points = self._generate_clear_data()
+        self.points = self._generate_large_data() if self.large_data else self._generate_clear_data()
         self._reset_line()
     
     def _add_celebration_particles(self):
@@ -303,7 +326,7 @@ class PerceptronSimple(BaseChallenge):
             self._render_feedback(screen)
         
         # Render particles
-        self.particles.render(screen)
+        self.particles.render(screen, self.game.interpolation)
         
         # Render dialogue
         self.dialogue.render(screen, self.body_font, self.header_font)
@@ -325,17 +348,35 @@ class PerceptronSimple(BaseChallenge):
         """Render the interactive training visualization"""
         # Draw background
         pygame.draw.rect(screen, (35, 40, 50), self.viz_rect, border_radius=15)
+        
+        # Shade class regions (coarse while dragging, refined once released)
+        weights, bias = self._line_params()
+        region_rect = self.viz_rect.inflate(-10, -10)
+        screen.set_clip(region_rect)
+        self.region_renderer.render(screen, self.viz_rect, weights[0], weights[1], bias,
+                                    dragging=self.dragging_line)
+        screen.set_clip(None)
         pygame.draw.rect(screen, self.primary_color, self.viz_rect, 3, border_radius=15)
         
         # Draw coordinate grid
         self._draw_grid(screen)
         
+        # Large datasets are drawn as a density image under the line
+        dense = len(self.points) > DENSITY_THRESHOLD
+        if dense:
+            screen.set_clip(region_rect)
+            self.density_renderer.render(screen, self.viz_rect, self.points)
+            screen.set_clip(None)
+        
         # Draw decision line
         self._draw_decision_line(screen)
         
         # Draw training points
-        for point in self.points:
-            self._draw_point(screen, point)
+        if not dense:
+            predictions = self.points.predict(*self._line_params())
+            for (x, y), label, predicted in zip(self.points.features.tolist(),
+                                                self.points.labels.tolist(), predictions.tolist()):
+                self._draw_point(screen, x, y, label, predicted)
         
         # Draw instructions
         self._draw_instructions(screen)
@@ -358,13 +399,13 @@ class PerceptronSimple(BaseChallenge):
         # Calculate line endpoints
         angle_rad = math.radians(self.line_angle)
         
-        # Line direction vector
+        # Line direction vector (screen y points down)
         dx = math.cos(angle_rad)
-        dy = math.sin(angle_rad)
+        dy = -math.sin(angle_rad)
         
-        # Line center point (offset by position)
+        # Line center point (closest point of the boundary to the origin)
         offset_x = -self.line_position * math.sin(angle_rad)
-        offset_y = self.line_position * math.cos(angle_rad)
+        offset_y = -self.line_position * math.cos(angle_rad)
         
         center_x = self.viz_rect.centerx + offset_x * self.viz_rect.width * 0.4
         center_y = self.viz_rect.centery + offset_y * self.viz_rect.height * 0.4
@@ -376,24 +417,22 @@ class PerceptronSimple(BaseChallenge):
         x2 = center_x + dx * length
         y2 = center_y + dy * length
         
-        # Clip to visualization area
-        x1 = max(self.viz_rect.left, min(self.viz_rect.right, x1))
-        y1 = max(self.viz_rect.top, min(self.viz_rect.bottom, y1))
-        x2 = max(self.viz_rect.left, min(self.viz_rect.right, x2))
-        y2 = max(self.viz_rect.top, min(self.viz_rect.bottom, y2))
-        
-        # Draw line with glow effect if being dragged
+        # Clip to visualization area (keeping the line's slope)
         line_color = self.warning_color
         line_width = 4
-        
-        if self.dragging_line or self.line_glow > 0:
-            # Draw glow
-            glow_width = int(8 + self.line_glow * 4)
-            glow_color = tuple(int(c * 0.5) for c in line_color)
-            pygame.draw.line(screen, glow_color, (x1, y1), (x2, y2), glow_width)
-        
-        # Draw main line
-        pygame.draw.line(screen, line_color, (x1, y1), (x2, y2), line_width)
+        clipped = self.viz_rect.clipline(x1, y1, x2, y2)
+        if clipped:
+            (x1, y1), (x2, y2) = clipped
+            
+            # Draw line with glow effect if being dragged
+            if self.dragging_line or self.line_glow > 0:
+                # Draw glow
+                glow_width = int(8 + self.line_glow * 4)
+                glow_color = tuple(int(c * 0.5) for c in line_color)
+                pygame.draw.line(screen, glow_color, (x1, y1), (x2, y2), glow_width)
+            
+            # Draw main line
+            pygame.draw.line(screen, line_color, (x1, y1), (x2, y2), line_width)
         
         # Draw drag handle at center
         handle_size = 8 if not self.dragging_line else 12
@@ -446,18 +485,15 @@ class PerceptronSimple(BaseChallenge):
             pygame.draw.line(screen, (255, 255, 100), 
                            (x1_screen, y1_screen), (x2_screen, y2_screen), 3)
     
-    def _draw_point(self, screen, point_data):
+    def _draw_point(self, screen, x, y, label, predicted):
         """Draw a training point"""
-        x, y = point_data['pos']
-        label = point_data['label']
-        color = point_data['color']
+        color = self.success_color if label == 1 else self.error_color
         
         # Convert to screen coordinates
         screen_x = self.viz_rect.centerx + x * self.viz_rect.width * 0.4
         screen_y = self.viz_rect.centery - y * self.viz_rect.height * 0.4
         
         # Check if point is correctly classified
-        predicted = self._classify_point(x, y)
         is_correct = predicted == label
         
         # Choose visual style
@@ -516,8 +552,9 @@ class PerceptronSimple(BaseChallenge):
         pygame.draw.rect(screen, self.primary_color, stats_rect, 2, border_radius=8)
         
         # Calculate current accuracy
-        correct = sum(1 for point in self.points if self._classify_point(*point['pos']) == point['label'])
-        accuracy = (correct / len(self.points)) * 100 if self.points else 0
+        weights, bias = self._line_params()
+        correct = int(np.count_nonzero(self.points.predict(weights, bias) == self.points.labels))
+        accuracy = self.points.accuracy(weights, bias) * 100
         
         # Stats text
         stats = [
@@ -525,7 +562,7 @@ class PerceptronSimple(BaseChallenge):
             f"📊 Current Accuracy: {accuracy:.0f}% ({correct}/{len(self.points)})",
             f"🔄 Attempts: {self.attempts}",
             "",
-            "💡 Drag the yellow line to separate dots!"
+            "💡 Drag the line to separate dots! (D = large data)"
         ]
         
         for i, stat in enumerate(stats):
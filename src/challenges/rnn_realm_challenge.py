@@ -0,0 +1,353 @@
+"""
+RNN Realm Challenge - Level 10: The Memory Monarch
+Unroll a recurrent network over thousands of steps and keep a memory alive through time
+"""
+
+import time
+import pygame
+import numpy as np
+from .base_challenge import BaseChallenge
+from ..nn.recurrent import RNN
+from ..ui.modern_ui import DialogueBox, ParticleSystem
+
+SEQUENCE_STEPS = 3000
+# Half the sequences carry the memory rune at step 0, the other half are controls
+BATCH = 128
+HIDDEN = 32
+# The Monarch's whispers: input noise that slowly drowns the memory
+WHISPER_NOISE = 0.02
+RUNE_STRENGTH = 1.0
+# The memory must still be readable this many steps later
+GATE_STEP = 400
+MEMORY_TARGET = 1.5
+WARD_LENGTH = 40
+MAX_WARDS = 3
+# Seconds per frame spent unrolling stale steps
+UNROLL_BUDGET = 0.006
+
+class RNNChallenge(BaseChallenge):
+    def __init__(self, game):
+        super().__init__(game)
+        self.particles = ParticleSystem()
+        self.dialogue_box = DialogueBox(50, game.height - 150, game.width - 100, 120)
+
+        self.title_font = pygame.font.Font(None, 48)
+        self.header_font = pygame.font.Font(None, 28)
+        self.body_font = pygame.font.Font(None, 22)
+        self.small_font = pygame.font.Font(None, 18)
+
+        # Phases: intro -> tune -> victory
+        self.phase = "intro"
+        self.intro_step = 0
+        self.intro_lines = [
+            "The Memory Monarch rules the RNN Realm, where networks must remember the past.",
+            "A recurrent network feeds its hidden state back into itself at every time step.",
+            f"We plant a memory rune at step 0 in {BATCH // 2} sequences and none in {BATCH // 2} others, then listen for its echo.",
+            "Too little recurrent gain and the echo fades. Too much and the network drowns in chaos.",
+            f"Keep the memory readable at step {GATE_STEP} to pass the Monarch's gate!"
+        ]
+
+        rng = np.random.default_rng(10)
+        self.whispers = rng.normal(0.0, WHISPER_NOISE, (SEQUENCE_STEPS, BATCH, 1))
+        self.runes = np.zeros_like(self.whispers)
+        self.runes[0, :BATCH // 2, 0] = RUNE_STRENGTH
+        self.wards = []
+
+        self.gain = 0.9
+        self.rnn = RNN(1, HIDDEN, rng=np.random.default_rng(11))
+        self._orthogonal = self.rnn.recurrent_weights.copy()
+        self.rnn.recurrent_weights[...] = self._orthogonal * self.gain
+        self.rnn.set_sequences(self._sequence_inputs(0, SEQUENCE_STEPS))
+
+        # Memory strength (d') per step, filled in as steps are unrolled
+        self.memory = np.zeros(SEQUENCE_STEPS)
+        self._memory_valid = 0
+        self.cursor = GATE_STEP
+        self.last_unroll_ms = 0.0
+
+        self.timeline_rect = pygame.Rect(30, 105, game.width - 60, 170)
+        self.heatmap_rect = pygame.Rect(30, 295, game.width - 60, 120)
+        plot_width = self.timeline_rect.width - 20
+        # sqrt time axis: early steps, where memories live or die, get most of the width
+        self._column_steps = np.minimum(
+            (np.linspace(0, 1, plot_width) ** 2 * SEQUENCE_STEPS).astype(int), SEQUENCE_STEPS - 1)
+        self._heat_pixels = np.zeros((plot_width, HIDDEN, 3), dtype=np.uint8)
+        self._heat_surface = None
+        self._heat_valid = 0
+        self.scrubbing = False
+
+        self.boss_hp = 100
+        self.victory_celebration = False
+
+    def initialize(self):
+        self.phase = "intro"
+        self.intro_step = 0
+        self.dialogue_box.set_dialogue(self.intro_lines[0], "Tensor")
+
+    # Network edits
+
+    def _set_gain(self, gain):
+        self.gain = float(np.clip(round(gain, 2), 0.5, 1.6))
+        self.rnn.recurrent_weights[...] = self._orthogonal * self.gain
+        self._invalidate(0)
+
+    def _invalidate(self, step):
+        self.rnn.mark_dirty(step)
+        self._memory_valid = min(self._memory_valid, step)
+        self._heat_valid = min(self._heat_valid, step)
+
+    def _sequence_inputs(self, start, stop):
+        """Whispers with every ward applied, for steps [start, stop)"""
+        whispers = self.whispers[start:stop].copy()
+        for ward in self.wards:
+            lo, hi = max(start, ward), min(stop, ward + WARD_LENGTH)
+            if lo < hi:
+                whispers[lo - start:hi - start] = 0
+        # Wards silence the whispers, never the rune itself
+        return whispers + self.runes[start:stop]
+
+    def _toggle_ward(self):
+        """Place a ward at the cursor, or remove the one under it; only steps after it are recomputed"""
+        existing = [ward for ward in self.wards if ward <= self.cursor < ward + WARD_LENGTH]
+        if existing:
+            ward = existing[0]
+            self.wards.remove(ward)
+        elif len(self.wards) < MAX_WARDS:
+            ward = self.cursor
+            self.wards.append(ward)
+        else:
+            self.dialogue_box.set_dialogue(f"Only {MAX_WARDS} wards! Move the cursor onto one and press W to lift it.", "Tensor")
+            return
+        stop = min(SEQUENCE_STEPS, ward + WARD_LENGTH)
+        self.rnn.set_inputs(ward, self._sequence_inputs(ward, stop))
+        self._invalidate(ward)
+
+    # Events
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return "exit"
+
+            if self.phase == "intro":
+                if event.key == pygame.K_SPACE:
+                    self._advance_intro()
+            elif self.phase == "tune":
+                fast = pygame.key.get_mods() & pygame.KMOD_SHIFT
+                if event.key == pygame.K_UP:
+                    self._set_gain(self.gain + 0.05)
+                elif event.key == pygame.K_DOWN:
+                    self._set_gain(self.gain - 0.05)
+                elif event.key == pygame.K_LEFT:
+                    self.cursor = max(0, self.cursor - (100 if fast else 5))
+                elif event.key == pygame.K_RIGHT:
+                    self.cursor = min(SEQUENCE_STEPS - 1, self.cursor + (100 if fast else 5))
+                elif event.key == pygame.K_w:
+                    self._toggle_ward()
+            elif self.phase == "victory":
+                if event.key == pygame.K_SPACE:
+                    return "completed"
+
+        elif self.phase in ("tune", "victory"):
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and self.timeline_rect.collidepoint(event.pos):
+                self.scrubbing = True
+                self._scrub_to(event.pos[0])
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                self.scrubbing = False
+            elif event.type == pygame.MOUSEMOTION and self.scrubbing:
+                self._scrub_to(event.pos[0])
+
+        return None
+
+    def _scrub_to(self, x):
+        column = int(np.clip(x - self.timeline_rect.x - 10, 0, len(self._column_steps) - 1))
+        self.cursor = int(self._column_steps[column])
+
+    def _advance_intro(self):
+        self.intro_step += 1
+        if self.intro_step < len(self.intro_lines):
+            self.dialogue_box.set_dialogue(self.intro_lines[self.intro_step], "Tensor")
+        else:
+            self.phase = "tune"
+            self.dialogue_box.set_dialogue(
+                "UP/DOWN: recurrent gain. Drag the timeline or LEFT/RIGHT to scrub. W places a ward that silences the whispers.",
+                "Tensor")
+
+    # Incremental unrolling
+
+    def update(self, dt):
+        self.dialogue_box.update(dt)
+        self.particles.update(dt)
+
+        if self.phase == "tune" and self._memory_valid > GATE_STEP:
+            strength = self.memory[GATE_STEP]
+            self.boss_hp = int(np.clip(100 * (1 - strength / MEMORY_TARGET), 0, 100))
+            if strength >= MEMORY_TARGET:
+                self.phase = "victory"
+                self.victory_celebration = True
+                self.dialogue_box.set_dialogue(
+                    f"The rune still echoes at step {GATE_STEP} (memory {strength:.2f}) with gain {self.gain:.2f}. "
+                    "The Memory Monarch bows! SPACE to continue.", "Tensor")
+
+        if self.victory_celebration and np.random.random() < 0.2:
+            self.particles.create_explosion(np.random.randint(100, self.game.width - 100),
+                                            np.random.randint(100, 300),
+                                            (np.random.randint(150, 255), 120, 255), 12)
+
+    def frame_update(self):
+        rnn = self.rnn
+        if rnn.valid_steps < rnn.steps:
+            start = time.perf_counter()
+            rnn.unroll(budget=UNROLL_BUDGET)
+            self.last_unroll_ms = (time.perf_counter() - start) * 1000
+        self._update_memory(rnn.valid_steps)
+        self._update_heatmap(rnn.valid_steps)
+
+    def _update_memory(self, valid):
+        """d' between rune and control sequences, for newly unrolled steps only.
+
+        The readout direction is fitted on one half of each group and scored
+        on the other half, so chance separation in 32 dimensions does not
+        masquerade as memory.
+        """
+        start = self._memory_valid
+        if valid <= start:
+            return
+        states = self.rnn.states[start + 1:valid + 1]
+        half, quarter = BATCH // 2, BATCH // 4
+        rune_fit, rune_test = states[:, :quarter], states[:, quarter:half]
+        control_fit, control_test = states[:, half:half + quarter], states[:, half + quarter:]
+        direction = rune_fit.mean(axis=1) - control_fit.mean(axis=1)
+        direction /= np.maximum(np.linalg.norm(direction, axis=1), 1e-12)[:, None]
+        rune = np.einsum('tbh,th->tb', rune_test, direction)
+        control = np.einsum('tbh,th->tb', control_test, direction)
+        spread = np.sqrt((rune.var(axis=1) + control.var(axis=1)) / 2)
+        separation = (rune.mean(axis=1) - control.mean(axis=1)) / np.maximum(spread, 1e-6)
+        self.memory[start:valid] = np.clip(separation, 0, 99)
+        self._memory_valid = valid
+
+    def _update_heatmap(self, valid):
+        """Fill heatmap columns for steps unrolled since the last frame"""
+        start = self._heat_valid
+        if valid <= start and self._heat_surface is not None:
+            return
+        steps = self._column_steps
+        stale = (steps >= start)
+        fresh = stale & (steps < valid)
+        values = self.rnn.states[steps[fresh] + 1, 0]                     # (columns, hidden) of rune sequence 0
+        pixels = self._heat_pixels
+        pixels[stale] = (25, 20, 40)
+        pixels[fresh, :, 0] = np.clip(values * 255, 0, 255)
+        pixels[fresh, :, 2] = np.clip(-values * 255, 0, 255)
+        pixels[fresh, :, 1] = np.abs(values) * 80
+        surface = pygame.surfarray.make_surface(pixels)
+        self._heat_surface = pygame.transform.scale(surface, (pixels.shape[0], self.heatmap_rect.height - 20))
+        self._heat_valid = valid
+
+    # Rendering
+
+    def render(self, screen):
+        screen.fill((22, 16, 34))
+
+        title = self.title_font.render("RNN Realm", True, (220, 170, 255))
+        screen.blit(title, title.get_rect(center=(self.game.width // 2, 40)))
+
+        if self.phase in ("tune", "victory"):
+            hp_rect = pygame.Rect(self.game.width // 2 - 200, 68, 400, 14)
+            pygame.draw.rect(screen, (50, 20, 70), hp_rect)
+            pygame.draw.rect(screen, (200, 120, 255), (hp_rect.x, hp_rect.y, hp_rect.width * self.boss_hp // 100, hp_rect.height))
+            pygame.draw.rect(screen, (255, 255, 255), hp_rect, 1)
+            boss_text = self.small_font.render(f"Memory Monarch HP: {self.boss_hp}", True, (255, 255, 255))
+            screen.blit(boss_text, boss_text.get_rect(center=(hp_rect.centerx, hp_rect.bottom + 10)))
+
+            self._render_timeline(screen, self.timeline_rect)
+            self._render_heatmap(screen, self.heatmap_rect)
+            self._render_scrub_panel(screen, pygame.Rect(30, 430, self.game.width - 60, 175))
+
+        self.particles.render(screen, self.game.interpolation)
+        self.dialogue_box.render(screen, self.body_font, self.header_font)
+
+    def _step_x(self, step, plot):
+        return plot.x + np.sqrt(step / SEQUENCE_STEPS) * plot.width
+
+    def _render_timeline(self, screen, rect):
+        pygame.draw.rect(screen, (32, 24, 48), rect, border_radius=8)
+        pygame.draw.rect(screen, (170, 120, 230), rect, 2, border_radius=8)
+        plot = pygame.Rect(rect.x + 10, rect.y + 28, len(self._column_steps), rect.height - 48)
+        label = self.small_font.render("Memory of the rune (d') over time - sqrt time axis", True, (220, 200, 255))
+        screen.blit(label, (rect.x + 12, rect.y + 8))
+
+        for ward in self.wards:
+            x0, x1 = self._step_x(ward, plot), self._step_x(min(SEQUENCE_STEPS, ward + WARD_LENGTH), plot)
+            pygame.draw.rect(screen, (40, 70, 60), (x0, plot.top, max(2, x1 - x0), plot.height))
+
+        top = 4.0
+        target_y = plot.bottom - MEMORY_TARGET / top * plot.height
+        pygame.draw.line(screen, (120, 90, 150), (plot.left, target_y), (plot.right, target_y), 1)
+        gate_x = self._step_x(GATE_STEP, plot)
+        pygame.draw.line(screen, (255, 200, 120), (gate_x, plot.top), (gate_x, plot.bottom), 2)
+        screen.blit(self.small_font.render("gate", True, (255, 200, 120)), (gate_x + 4, plot.top))
+
+        valid = self._memory_valid
+        if valid > 1:
+            columns = self._column_steps < valid
+            xs = plot.x + np.flatnonzero(columns)
+            ys = plot.bottom - np.clip(self.memory[self._column_steps[columns]] / top, 0, 1) * plot.height
+            if len(xs) > 1:
+                pygame.draw.lines(screen, (200, 150, 255), False, np.column_stack((xs, ys)).tolist(), 2)
+
+        cursor_x = self._step_x(self.cursor, plot)
+        pygame.draw.line(screen, (255, 255, 255), (cursor_x, plot.top), (cursor_x, plot.bottom), 1)
+
+        # Unroll progress
+        progress = self.rnn.valid_steps / SEQUENCE_STEPS
+        bar = pygame.Rect(plot.x, plot.bottom + 8, plot.width, 4)
+        pygame.draw.rect(screen, (60, 50, 80), bar)
+        pygame.draw.rect(screen, (200, 150, 255), (bar.x, bar.y, int(bar.width * progress), bar.height))
+        for step in (0, 100, 500, 1000, 2000, SEQUENCE_STEPS):
+            x = self._step_x(step, plot)
+            tick = self.small_font.render(str(step), True, (150, 140, 170))
+            screen.blit(tick, tick.get_rect(midtop=(min(x, plot.right - 15), plot.bottom - 14)))
+
+    def _render_heatmap(self, screen, rect):
+        screen.blit(self.small_font.render("Hidden state of one rune sequence (32 units, red +, blue -)",
+                                           True, (200, 180, 230)), (rect.x + 10, rect.y))
+        if self._heat_surface is not None:
+            screen.blit(self._heat_surface, (rect.x + 10, rect.y + 18))
+        cursor_x = self._step_x(self.cursor, pygame.Rect(rect.x + 10, 0, len(self._column_steps), 0))
+        pygame.draw.line(screen, (255, 255, 255), (cursor_x, rect.y + 18), (cursor_x, rect.bottom), 1)
+
+    def _render_scrub_panel(self, screen, rect):
+        pygame.draw.rect(screen, (32, 24, 48), rect, border_radius=8)
+        pygame.draw.rect(screen, (170, 120, 230), rect, 2, border_radius=8)
+
+        step = self.cursor
+        computed = step < self.rnn.valid_steps
+        memory = f"{self.memory[step]:.2f}" if step < self._memory_valid else "computing..."
+        lines = [
+            (f"Step {step:,} / {SEQUENCE_STEPS:,}", (255, 255, 255)),
+            (f"Memory d': {memory}", (200, 150, 255)),
+            (f"Recurrent gain: {self.gain:.2f} (UP/DOWN)", (220, 220, 220)),
+            (f"Wards: {len(self.wards)}/{MAX_WARDS} (W at cursor)", (150, 230, 190)),
+            (f"Unrolled: {self.rnn.valid_steps:,} steps x {BATCH} sequences", (180, 180, 200)),
+            (f"Last unroll slice: {self.last_unroll_ms:.1f} ms", (150, 140, 170)),
+        ]
+        for i, (line, color) in enumerate(lines):
+            screen.blit(self.small_font.render(line, True, color), (rect.x + 12, rect.y + 10 + i * 24))
+
+        if not computed:
+            return
+        # Mean hidden state of rune vs control sequences at the cursor
+        states = self.rnn.states[step + 1]
+        groups = [(states[:BATCH // 2].mean(axis=0), (255, 140, 140), "rune"),
+                  (states[BATCH // 2:].mean(axis=0), (140, 180, 255), "control")]
+        chart = pygame.Rect(rect.x + 330, rect.y + 20, rect.width - 350, rect.height - 40)
+        mid = chart.centery
+        bar_width = chart.width / HIDDEN
+        pygame.draw.line(screen, (100, 90, 120), (chart.left, mid), (chart.right, mid), 1)
+        for g, (values, color, name) in enumerate(groups):
+            for unit, value in enumerate(values.tolist()):
+                height = value * chart.height / 2
+                x = chart.x + unit * bar_width + g * bar_width / 2
+                pygame.draw.rect(screen, color, (x, min(mid, mid - height), max(1, bar_width / 2 - 1), abs(height)))
+            screen.blit(self.small_font.render(name, True, color), (chart.right - 60, chart.y + g * 16))
@@ -0,0 +1,319 @@
+"""
+Training Grounds Challenge - Level 8: The Overfitting Ogre
+Split data into train/validation/test and run k-fold cross-validation in parallel worker processes
+"""
+
+import pygame
+import numpy as np
+from .base_challenge import BaseChallenge
+from ..nn.validation import CrossValidator, train_val_test_split
+from ..ui.modern_ui import DialogueBox, ParticleSystem
+
+DATASET_ROWS = 200
+TEST_SHARE = 0.2
+EPOCHS = 400
+RECORD_EVERY = 5
+# Deliberately oversized for 160 noisy points, so it will overfit
+LAYER_SIZES = (2, 64, 64, 2)
+ACTIVATIONS = ('relu', 'relu', 'linear')
+# A stopping epoch whose mean validation loss is within this share of the best one beats the Ogre
+STOPPING_TOLERANCE = 0.10
+
+FOLD_COLORS = [(255, 140, 120), (120, 200, 255), (150, 255, 150), (255, 220, 110),
+               (220, 150, 255), (120, 255, 230), (255, 170, 220), (200, 200, 140)]
+
+def _noisy_moons(rows, rng, noise=0.45):
+    """Two interleaved half-moons buried in noise, standardized to zero mean and unit variance"""
+    t = rng.random(rows) * np.pi
+    labels = rng.integers(0, 2, rows)
+    upper = np.column_stack((np.cos(t), np.sin(t)))
+    lower = np.column_stack((1 - np.cos(t), 0.5 - np.sin(t)))
+    features = np.where(labels[:, None] == 0, upper, lower) + rng.normal(0.0, noise, (rows, 2))
+    features = (features - features.mean(axis=0)) / features.std(axis=0)
+    return features, labels
+
+class TrainingGroundsChallenge(BaseChallenge):
+    def __init__(self, game):
+        super().__init__(game)
+        self.particles = ParticleSystem()
+        self.dialogue_box = DialogueBox(50, game.height - 150, game.width - 100, 120)
+
+        self.title_font = pygame.font.Font(None, 48)
+        self.header_font = pygame.font.Font(None, 28)
+        self.body_font = pygame.font.Font(None, 22)
+        self.small_font = pygame.font.Font(None, 18)
+
+        # Phases: intro -> split -> cross_validation -> results -> victory
+        self.phase = "intro"
+        self.intro_step = 0
+        self.intro_lines = [
+            "Welcome to the Training Grounds! Here the Overfitting Ogre feeds on memorized data.",
+            "A network that memorizes its training set looks perfect - until it meets new data.",
+            "So we split the data: a TEST set locked away, and the rest for training and validation.",
+            "K-fold cross-validation trains k networks, each validated on a different slice. All k train at once!",
+            "Watch the validation curves. When they turn upwards, the Ogre is winning. Find the right moment to stop!"
+        ]
+
+        rng = np.random.default_rng(8)
+        self.features, self.labels = _noisy_moons(DATASET_ROWS, rng)
+        _, _, self.test_idx = train_val_test_split(DATASET_ROWS, validation=0.0, test=TEST_SHARE, rng=rng)
+        self.k = 5
+        self.validator = None
+
+        # Results phase: the epoch the student chooses to stop at
+        self.cursor = 0
+        self.best_index = 0
+        self.ogre_strength = 0.0
+
+        self._plot_surface = None
+        self._plot_dirty = True
+        self.victory_celebration = False
+
+    def initialize(self):
+        self.phase = "intro"
+        self.intro_step = 0
+        self.dialogue_box.set_dialogue(self.intro_lines[0], "Tensor")
+
+    # Cross-validation
+
+    def _start_cross_validation(self):
+        self.validator = CrossValidator(self.features, self.labels, k=self.k, test_idx=self.test_idx,
+                                        layer_sizes=LAYER_SIZES, activations=ACTIVATIONS, epochs=EPOCHS,
+                                        learning_rate=0.02, batch_size=20, record_every=RECORD_EVERY)
+        self.validator.start()
+        self.phase = "cross_validation"
+        self._plot_dirty = True
+        self.dialogue_box.set_dialogue(
+            f"{self.k} folds are training in {self.validator.workers} worker process(es). Curves stream in as each fold learns...",
+            "Tensor")
+
+    def close(self):
+        """Stop the cross-validation workers"""
+        if self.validator is not None:
+            self.validator.cancel()
+
+    def _mean_val_loss(self):
+        return self.validator.mean_curve('val_loss')
+
+    def _finish_cross_validation(self):
+        errors = self.validator.errors
+        if errors:
+            self.phase = "split"
+            self.dialogue_box.set_dialogue(f"A fold failed: {next(iter(errors.values()))}. SPACE to retry.", "Tensor")
+            return
+        epochs, val_loss = self._mean_val_loss()
+        self.best_index = int(np.argmin(val_loss))
+        self.cursor = len(epochs) - 1
+        self.phase = "results"
+        self._plot_dirty = True
+        self.dialogue_box.set_dialogue(
+            "All folds done! Use LEFT/RIGHT to choose when training should have stopped, then ENTER.", "Tensor")
+
+    def _lock_in_epoch(self):
+        epochs, val_loss = self._mean_val_loss()
+        _, test_accuracy = self.validator.mean_curve('test_accuracy')
+        chosen, best = val_loss[self.cursor], val_loss[self.best_index]
+        self._plot_dirty = True
+        if chosen <= best * (1 + STOPPING_TOLERANCE):
+            self.phase = "victory"
+            self.victory_celebration = True
+            self.dialogue_box.set_dialogue(
+                f"Stopping at epoch {epochs[self.cursor]} scores {test_accuracy[self.cursor]:.1%} on the untouched test set, "
+                f"versus {test_accuracy[-1]:.1%} after all {epochs[-1]} epochs. The Ogre is defeated! SPACE to continue.",
+                "Tensor")
+        else:
+            excess = chosen / best - 1
+            self.dialogue_box.set_dialogue(
+                f"The Ogre laughs! Validation loss at epoch {epochs[self.cursor]} is {excess:.0%} above the best. Try again.",
+                "Tensor")
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return "exit"
+
+            if self.phase == "intro":
+                if event.key == pygame.K_SPACE:
+                    self._advance_intro()
+            elif self.phase == "split":
+                if event.key == pygame.K_UP:
+                    self.k = min(len(FOLD_COLORS), self.k + 1)
+                elif event.key == pygame.K_DOWN:
+                    self.k = max(3, self.k - 1)
+                elif event.key == pygame.K_SPACE:
+                    self._start_cross_validation()
+            elif self.phase == "results":
+                if event.key == pygame.K_LEFT:
+                    self.cursor = max(0, self.cursor - 1)
+                    self._plot_dirty = True
+                elif event.key == pygame.K_RIGHT:
+                    self.cursor = min(len(self._mean_val_loss()[0]) - 1, self.cursor + 1)
+                    self._plot_dirty = True
+                elif event.key == pygame.K_RETURN:
+                    self._lock_in_epoch()
+            elif self.phase == "victory":
+                if event.key == pygame.K_SPACE:
+                    return "completed"
+
+        return None
+
+    def _advance_intro(self):
+        self.intro_step += 1
+        if self.intro_step < len(self.intro_lines):
+            self.dialogue_box.set_dialogue(self.intro_lines[self.intro_step], "Tensor")
+        else:
+            self.phase = "split"
+            self.dialogue_box.set_dialogue(
+                f"The test set ({int(TEST_SHARE * 100)}%) is locked away. UP/DOWN chooses k, SPACE starts cross-validation.",
+                "Tensor")
+
+    def update(self, dt):
+        self.dialogue_box.update(dt)
+        self.particles.update(dt)
+
+        if self.phase == "cross_validation" and self.validator is not None:
+            if self.validator.poll():
+                self._plot_dirty = True
+                epochs, val_loss = self._mean_val_loss()
+                if len(val_loss):
+                    # How far the mean validation loss has climbed above its best so far
+                    self.ogre_strength = float(val_loss[-1] / val_loss.min() - 1)
+            if self.validator.finished:
+                self._finish_cross_validation()
+
+        if self.victory_celebration and np.random.random() < 0.2:
+            self.particles.create_explosion(np.random.randint(100, self.game.width - 100),
+                                            np.random.randint(100, 300),
+                                            (150, 255, np.random.randint(100, 200)), 12)
+
+    # Rendering
+
+    def render(self, screen):
+        screen.fill((20, 30, 22))
+
+        title = self.title_font.render("Training Grounds", True, (170, 255, 170))
+        screen.blit(title, title.get_rect(center=(self.game.width // 2, 40)))
+
+        if self.phase == "split":
+            self._render_split(screen, pygame.Rect(60, 100, self.game.width - 120, self.game.height - 270))
+        elif self.phase in ("cross_validation", "results", "victory") and self.validator is not None:
+            self._render_folds(screen, pygame.Rect(30, 80, 260, self.game.height - 250))
+            self._render_curves(screen, pygame.Rect(310, 80, self.game.width - 340, self.game.height - 250))
+
+        self.particles.render(screen, self.game.interpolation)
+        self.dialogue_box.render(screen, self.body_font, self.header_font)
+
+    def _render_split(self, screen, rect):
+        """One bar per fold: test vault, training slices and that fold's validation slice"""
+        pygame.draw.rect(screen, (28, 42, 32), rect, border_radius=8)
+        pygame.draw.rect(screen, (120, 200, 130), rect, 2, border_radius=8)
+
+        header = self.header_font.render(f"k = {self.k} folds (UP/DOWN)", True, (255, 255, 255))
+        screen.blit(header, (rect.x + 20, rect.y + 15))
+
+        bar_left = rect.x + 100
+        bar_width = rect.width - 130
+        test_width = int(bar_width * TEST_SHARE)
+        fold_width = (bar_width - test_width) / self.k
+        row_height = min(40, (rect.height - 110) // self.k)
+        for fold in range(self.k):
+            y = rect.y + 60 + fold * row_height
+            label = self.small_font.render(f"Fold {fold + 1}", True, FOLD_COLORS[fold])
+            screen.blit(label, (rect.x + 20, y + row_height // 2 - 6))
+            pygame.draw.rect(screen, (90, 90, 90), (bar_left, y, test_width - 2, row_height - 6))
+            for part in range(self.k):
+                x = bar_left + test_width + int(part * fold_width)
+                color = FOLD_COLORS[fold] if part == fold else (60, 100, 70)
+                pygame.draw.rect(screen, color, (x, y, int(fold_width) - 2, row_height - 6))
+
+        legend_y = rect.y + 70 + self.k * row_height
+        legend = [((90, 90, 90), "test (never trained on)"), ((60, 100, 70), "train"), (FOLD_COLORS[0], "validate")]
+        for i, (color, name) in enumerate(legend):
+            x = bar_left + i * 220
+            pygame.draw.rect(screen, color, (x, legend_y, 16, 16))
+            screen.blit(self.small_font.render(name, True, (220, 220, 220)), (x + 24, legend_y + 2))
+
+    def _render_folds(self, screen, rect):
+        pygame.draw.rect(screen, (28, 42, 32), rect, border_radius=8)
+        pygame.draw.rect(screen, (120, 200, 130), rect, 2, border_radius=8)
+        screen.blit(self.header_font.render("Folds", True, (255, 255, 255)), (rect.x + 15, rect.y + 12))
+
+        validator = self.validator
+        for fold in range(validator.k):
+            y = rect.y + 50 + fold * 44
+            curve = validator.curves[fold]
+            progress = curve[-1]['epoch'] / EPOCHS if curve else 0.0
+            if fold in validator.errors:
+                status = "failed"
+            elif validator.results[fold] is not None:
+                status = f"best @ epoch {validator.results[fold]['best']['epoch']}"
+            elif curve:
+                status = f"epoch {curve[-1]['epoch']}"
+            else:
+                status = "waiting for a worker"
+            screen.blit(self.small_font.render(f"Fold {fold + 1}: {status}", True, FOLD_COLORS[fold]), (rect.x + 15, y))
+            bar = pygame.Rect(rect.x + 15, y + 16, rect.width - 30, 8)
+            pygame.draw.rect(screen, (50, 60, 50), bar)
+            pygame.draw.rect(screen, FOLD_COLORS[fold], (bar.x, bar.y, int(bar.width * progress), bar.height))
+
+        ogre_y = rect.y + 60 + validator.k * 44
+        strength = self.small_font.render(f"Ogre strength: +{self.ogre_strength:.0%} val loss", True, (255, 160, 120))
+        screen.blit(strength, (rect.x + 15, ogre_y))
+
+    def _render_curves(self, screen, rect):
+        # Curves only change when new points arrive or the cursor moves
+        if self._plot_dirty or self._plot_surface is None or self._plot_surface.get_size() != rect.size:
+            self._plot_surface = self._draw_curves(rect.size)
+            self._plot_dirty = False
+        screen.blit(self._plot_surface, rect.topleft)
+
+    def _draw_curves(self, size):
+        surface = pygame.Surface(size)
+        surface.fill((20, 30, 22))
+        rect = surface.get_rect()
+        pygame.draw.rect(surface, (28, 42, 32), rect, border_radius=8)
+        pygame.draw.rect(surface, (120, 200, 130), rect, 2, border_radius=8)
+        surface.blit(self.small_font.render("loss per epoch: thin = train, bold = validation, white = mean validation",
+                                            True, (220, 220, 220)), (15, 10))
+
+        plot = rect.inflate(-50, -60)
+        plot.y += 10
+        validator = self.validator
+        losses = [point[key] for curve in validator.curves for point in curve for key in ('train_loss', 'val_loss')]
+        top = min(max(losses, default=1.0), 2.0)
+        bottom = min(min(losses, default=0.0), top) * 0.9
+        span = max(top - bottom, 1e-6)
+
+        def to_points(epochs, values):
+            xs = plot.left + np.asarray(epochs) / EPOCHS * plot.width
+            ys = plot.bottom - np.clip((np.asarray(values) - bottom) / span, 0, 1) * plot.height
+            return np.column_stack((xs, ys)).tolist()
+
+        for fold, curve in enumerate(validator.curves):
+            if len(curve) < 2:
+                continue
+            color = FOLD_COLORS[fold]
+            dim = tuple(c // 2 for c in color)
+            epochs = [point['epoch'] for point in curve]
+            pygame.draw.lines(surface, dim, False, to_points(epochs, [point['train_loss'] for point in curve]), 1)
+            pygame.draw.lines(surface, color, False, to_points(epochs, [point['val_loss'] for point in curve]), 2)
+
+        epochs, val_loss = validator.mean_curve('val_loss')
+        if len(epochs) > 1:
+            pygame.draw.lines(surface, (255, 255, 255), False, to_points(epochs, val_loss), 3)
+            if self.phase in ("results", "victory"):
+                best_x = to_points([epochs[self.best_index]], [0])[0][0]
+                cursor_x = to_points([epochs[self.cursor]], [0])[0][0]
+                if self.phase == "victory":
+                    pygame.draw.line(surface, (120, 255, 120), (best_x, plot.top), (best_x, plot.bottom), 1)
+                pygame.draw.line(surface, (255, 220, 100), (cursor_x, plot.top), (cursor_x, plot.bottom), 2)
+                label = self.small_font.render(f"stop at epoch {epochs[self.cursor]}: val loss {val_loss[self.cursor]:.3f}",
+                                               True, (255, 220, 100))
+                surface.blit(label, (plot.left + 5, plot.top))
+
+        pygame.draw.line(surface, (150, 150, 150), plot.bottomleft, plot.bottomright, 1)
+        pygame.draw.line(surface, (150, 150, 150), plot.bottomleft, plot.topleft, 1)
+        surface.blit(self.small_font.render(f"{top:.2f}", True, (180, 180, 180)), (5, plot.top - 6))
+        surface.blit(self.small_font.render(f"{bottom:.2f}", True, (180, 180, 180)), (5, plot.bottom - 6))
+        surface.blit(self.small_font.render(f"epoch {EPOCHS}", True, (180, 180, 180)), (plot.right - 60, plot.bottom + 5))
+        return surface
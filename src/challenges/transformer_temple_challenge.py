@@ -0,0 +1,362 @@
+"""
+Transformer Temple Challenge - Level 16: The Multi-Head Hydra
+Step through a full pre-LN transformer block and sever the Hydra's heads without changing what it says
+"""
+
+import time
+import pygame
+import numpy as np
+from .base_challenge import BaseChallenge
+from ..nn.transformer import TransformerBlock
+from ..ui.modern_ui import DialogueBox, ParticleSystem
+
+STEPS = 128
+D_MODEL = 64
+HEADS = 8
+D_FF = 256
+VOCABULARY = 32
+# How strongly each head writes into the residual stream; half of them barely matter
+HEAD_STRENGTHS = (1.3, 0.08, 0.9, 0.05, 0.12, 1.6, 0.1, 1.1)
+HEADS_TO_SEVER = 4
+# Largest allowed change of the block's update, relative to the update of the full Hydra
+TOLERANCE = 0.1
+STAGE_LABELS = {
+    "norm1": "LayerNorm 1",
+    "qkv": f"Fused QKV ({D_MODEL} -> {3 * D_MODEL})",
+    "attention": f"Attention ({HEADS} heads)",
+    "mix": "Mix heads + residual",
+    "norm2": "LayerNorm 2",
+    "mlp": f"MLP ({D_MODEL} -> {D_FF} -> {D_MODEL})",
+    "output": "+ residual = output",
+}
+
+def _token_inputs(tokens, embeddings):
+    """Token embeddings plus sinusoidal positions, (steps, d_model)"""
+    positions = np.arange(len(tokens))[:, None]
+    rates = 1.0 / 10000 ** (np.arange(0, D_MODEL, 2) / D_MODEL)
+    encoding = np.zeros((len(tokens), D_MODEL))
+    encoding[:, 0::2] = np.sin(positions * rates)
+    encoding[:, 1::2] = np.cos(positions * rates)
+    return embeddings[tokens] + encoding
+
+class TransformerChallenge(BaseChallenge):
+    def __init__(self, game):
+        super().__init__(game)
+        self.particles = ParticleSystem()
+        self.dialogue_box = DialogueBox(50, game.height - 150, game.width - 100, 120)
+
+        self.title_font = pygame.font.Font(None, 48)
+        self.header_font = pygame.font.Font(None, 28)
+        self.body_font = pygame.font.Font(None, 22)
+        self.small_font = pygame.font.Font(None, 18)
+
+        # Phases: intro -> sever -> victory
+        self.phase = "intro"
+        self.intro_step = 0
+        self.intro_lines = [
+            "The Multi-Head Hydra guards the Transformer Temple. Each of its heads is an attention head.",
+            "A transformer block is a stack of sublayers: normalise, attend, add back, normalise, think (MLP), add back.",
+            "Those 'add back' steps are residual connections: every sublayer only writes a correction into the stream.",
+            f"Not every head pulls its weight. Sever {HEADS_TO_SEVER} of the {HEADS} heads (keys 1-{HEADS})...",
+            f"...while the block's update changes by less than {TOLERANCE:.0%}. Choose wisely - the Hydra notices!"
+        ]
+
+        self._rng = np.random.default_rng(16)
+        self.block = TransformerBlock(D_MODEL, HEADS, D_FF)
+        self.block.initialize(np.random.default_rng(17))
+        # Scale each head's rows of the output projection by its strength
+        self.block.out_weights *= np.repeat(HEAD_STRENGTHS, D_MODEL // HEADS)[:, None].astype(np.float32)
+        self.embeddings = self._rng.standard_normal((VOCABULARY, D_MODEL))
+
+        self.view = "attention"
+        self.step_mode = False
+        self.last_forward_ms = 0.0
+        self.last_rerun = ()
+        self.change = 0.0
+        self._surfaces = {}
+        self._scaled = {}
+
+        self.boss_hp = 100
+        self.victory_celebration = False
+        self._new_sentence()
+
+    def initialize(self):
+        self.phase = "intro"
+        self.intro_step = 0
+        self.dialogue_box.set_dialogue(self.intro_lines[0], "Tensor")
+
+    # Hydra edits
+
+    @property
+    def severed(self):
+        return int(np.sum(~self.block.head_enabled))
+
+    def _new_sentence(self):
+        """New input tokens; the full Hydra's output becomes the reference to match"""
+        self.tokens = self._rng.integers(0, VOCABULARY, STEPS)
+        block = self.block
+        enabled = block.head_enabled.copy()
+        for head in range(HEADS):
+            block.set_head(head, True)
+        block.set_input(_token_inputs(self.tokens, self.embeddings))
+        start = time.perf_counter()
+        block.forward()
+        self.full_forward_ms = (time.perf_counter() - start) * 1000
+        self.reference = block.outputs[0].copy()
+        self._reference_update = float(np.linalg.norm(self.reference - block.inputs[0]))
+        for head in range(HEADS):
+            block.set_head(head, enabled[head])
+        self._run()
+
+    def _toggle_head(self, head):
+        self.block.set_head(head, not self.block.head_enabled[head])
+        if not self.step_mode:
+            self._run()
+
+    def _run(self, until="output"):
+        """Bring the block up to ``until``, timing the sublayers that actually reran"""
+        block = self.block
+        first = block.valid_sublayers
+        start = time.perf_counter()
+        block.forward(until)
+        self.last_forward_ms = (time.perf_counter() - start) * 1000
+        self.last_rerun = block.SUBLAYERS[first:block.valid_sublayers]
+        if block.valid_sublayers == len(block.SUBLAYERS):
+            self.change = float(np.linalg.norm(block.outputs[0] - self.reference)) / max(self._reference_update, 1e-12)
+            self._check_victory()
+
+    def _check_victory(self):
+        if self.phase != "sever":
+            return
+        within = self.change <= TOLERANCE
+        self.boss_hp = 100 - 100 * min(self.severed, HEADS_TO_SEVER) // HEADS_TO_SEVER if within else 100
+        if within and self.severed >= HEADS_TO_SEVER:
+            self.phase = "victory"
+            self.victory_celebration = True
+            self.dialogue_box.set_dialogue(
+                f"{self.severed} heads gone and the block barely noticed ({self.change:.1%})! "
+                "The Hydra has no heads to spare. SPACE to continue.", "Tensor")
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return "exit"
+
+            if self.phase == "intro":
+                if event.key == pygame.K_SPACE:
+                    self._advance_intro()
+            elif self.phase == "sever":
+                self._handle_sever_key(event.key)
+            elif self.phase == "victory":
+                if event.key == pygame.K_SPACE:
+                    return "completed"
+
+        return None
+
+    def _handle_sever_key(self, key):
+        sublayers = self.block.SUBLAYERS
+        if pygame.K_1 <= key < pygame.K_1 + HEADS:
+            self._toggle_head(key - pygame.K_1)
+        elif key in (pygame.K_UP, pygame.K_DOWN):
+            step = 1 if key == pygame.K_DOWN else -1
+            self.view = sublayers[int(np.clip(sublayers.index(self.view) + step, 0, len(sublayers) - 1))]
+        elif key == pygame.K_s:
+            self.step_mode = not self.step_mode
+            if not self.step_mode:
+                self._run()
+        elif key in (pygame.K_RIGHT, pygame.K_RETURN) and self.step_mode:
+            if self.block.valid_sublayers < len(sublayers):
+                # Run exactly one more sublayer and look at what it produced
+                self.view = sublayers[self.block.valid_sublayers]
+                self._run(self.view)
+        elif key == pygame.K_n:
+            self._new_sentence()
+            self.dialogue_box.set_dialogue("A new sentence enters the temple. The full Hydra's answer is the new reference.",
+                                           "Tensor")
+
+    def _advance_intro(self):
+        self.intro_step += 1
+        if self.intro_step < len(self.intro_lines):
+            self.dialogue_box.set_dialogue(self.intro_lines[self.intro_step], "Tensor")
+        else:
+            self.phase = "sever"
+            self._check_victory()
+            self.dialogue_box.set_dialogue(
+                f"1-{HEADS}: sever/restore a head. UP/DOWN: look at a sublayer. "
+                "S: step mode (RIGHT runs one sublayer). N: new sentence.", "Tensor")
+
+    def update(self, dt):
+        self.dialogue_box.update(dt)
+        self.particles.update(dt)
+
+        if self.victory_celebration and np.random.random() < 0.2:
+            self.particles.create_explosion(np.random.randint(100, self.game.width - 100),
+                                            np.random.randint(100, 300),
+                                            (255, np.random.randint(120, 220), 90), 12)
+
+    # Rendering
+
+    def render(self, screen):
+        screen.fill((30, 20, 30))
+
+        title = self.title_font.render("Transformer Temple", True, (255, 190, 120))
+        screen.blit(title, title.get_rect(center=(self.game.width // 2, 40)))
+
+        if self.phase in ("sever", "victory"):
+            hp_rect = pygame.Rect(self.game.width // 2 - 200, 68, 400, 14)
+            pygame.draw.rect(screen, (60, 35, 40), hp_rect)
+            pygame.draw.rect(screen, (240, 120, 90), (hp_rect.x, hp_rect.y, hp_rect.width * self.boss_hp // 100, hp_rect.height))
+            pygame.draw.rect(screen, (255, 255, 255), hp_rect, 1)
+            boss_text = self.small_font.render(f"Multi-Head Hydra HP: {self.boss_hp}", True, (255, 255, 255))
+            screen.blit(boss_text, boss_text.get_rect(center=(hp_rect.centerx, hp_rect.bottom + 10)))
+
+            self._render_diagram(screen, pygame.Rect(30, 100, 220, 340))
+            self._render_view(screen, pygame.Rect(260, 100, self.game.width - 290, 340))
+            self._render_heads(screen, pygame.Rect(30, 448, self.game.width - 60, 158))
+
+        self.particles.render(screen, self.game.interpolation)
+        self.dialogue_box.render(screen, self.body_font, self.header_font)
+
+    def _panel(self, screen, rect, label):
+        pygame.draw.rect(screen, (44, 30, 44), rect, border_radius=8)
+        pygame.draw.rect(screen, (200, 140, 110), rect, 2, border_radius=8)
+        screen.blit(self.small_font.render(label, True, (250, 230, 220)), (rect.x + 10, rect.y + 6))
+
+    def _render_diagram(self, screen, rect):
+        """The block's sublayers top to bottom; stale ones are dimmed until they rerun"""
+        self._panel(screen, rect, "Pre-LN block" + (" (step mode)" if self.step_mode else ""))
+        block = self.block
+        y = rect.y + 30
+        box_height = 36
+        for index, name in enumerate(block.SUBLAYERS):
+            box = pygame.Rect(rect.x + 14, y, rect.width - 28, box_height)
+            fresh = index < block.valid_sublayers
+            fill = (90, 60, 70) if name == self.view else (60, 42, 56)
+            pygame.draw.rect(screen, fill, box, border_radius=6)
+            edge = (255, 220, 120) if name in self.last_rerun and fresh else ((200, 140, 110) if fresh else (90, 80, 90))
+            pygame.draw.rect(screen, edge, box, 2, border_radius=6)
+            label = self.small_font.render(STAGE_LABELS[name], True, (250, 230, 220) if fresh else (130, 120, 130))
+            screen.blit(label, label.get_rect(center=box.center))
+            if index < len(block.SUBLAYERS) - 1:
+                pygame.draw.line(screen, (160, 120, 110), (box.centerx, box.bottom), (box.centerx, box.bottom + 8), 2)
+            y += box_height + 8
+
+    def _stage_matrix(self, name):
+        """(features, tokens) array shown for a sublayer"""
+        block = self.block
+        if name == "qkv":
+            return block.qkv[0].T
+        if name == "mix":
+            return block.mixed[0].T
+        if name == "mlp":
+            return block.hidden[0].T
+        if name == "output":
+            return (block.outputs[0] - self.reference).T
+        return getattr(block, name)[0].T
+
+    def _stage_surface(self, name, version):
+        key = (name, version)
+        if key not in self._surfaces:
+            matrix = self._stage_matrix(name)
+            scale = max(float(np.abs(self.reference - self.block.inputs[0]).max()), 1e-6) if name == "output" \
+                else max(float(np.abs(matrix).max()), 1e-6)
+            self._surfaces = {k: v for k, v in self._surfaces.items() if k[0] != name}
+            self._surfaces[key] = self._diverging(matrix.T / scale)
+        return self._surfaces[key]
+
+    def _diverging(self, values):
+        """(x, y) values in [-1, 1] -> surface, orange for positive and blue for negative"""
+        surface = pygame.Surface(values.shape)
+        positive = np.clip(values, 0, 1)
+        negative = np.clip(-values, 0, 1)
+        pixels = pygame.surfarray.pixels3d(surface)
+        for channel, (up, down) in enumerate(zip((255, 170, 60), (80, 160, 255))):
+            np.add(positive * up, negative * down, out=pixels[..., channel], casting='unsafe')
+        del pixels
+        return surface
+
+    def _attention_surface(self, head, version):
+        key = ("attention", head, version)
+        if key not in self._surfaces:
+            weights = self.block.attention[0, head]
+            brightness = weights * (1 / np.maximum(weights.max(axis=1, keepdims=True), 1e-12))
+            surface = pygame.Surface((STEPS, STEPS))
+            pixels = pygame.surfarray.pixels3d(surface)
+            for channel, value in enumerate((255, 200, 110)):
+                np.multiply(brightness.T, value, out=pixels[..., channel], casting='unsafe')
+            del pixels
+            self._surfaces = {k: v for k, v in self._surfaces.items() if k[:2] != ("attention", head)}
+            self._surfaces[key] = surface
+        return self._surfaces[key]
+
+    def _scaled_surface(self, key, surface, size):
+        cached = self._scaled.get(key)
+        if cached is None or cached[0] is not surface or cached[1].get_size() != size:
+            cached = (surface, pygame.transform.scale(surface, size))
+            self._scaled[key] = cached
+        return cached[1]
+
+    def _render_view(self, screen, rect):
+        block = self.block
+        name = self.view
+        fresh = block.SUBLAYERS.index(name) < block.valid_sublayers
+        label = {"mlp": "MLP hidden units", "output": "Output minus the full Hydra's output"}.get(name, STAGE_LABELS[name])
+        self._panel(screen, rect, f"{label} - tokens across, features down" if name != "attention"
+                    else "Attention maps of every head (query down, key across)")
+        plot = pygame.Rect(rect.x + 10, rect.y + 26, rect.width - 20, rect.height - 36)
+        version = block.versions[name]
+
+        if name == "attention":
+            columns = HEADS // 2
+            size = min((plot.width - (columns - 1) * 8) // columns, (plot.height - 20) // 2 - 6)
+            for head in range(HEADS):
+                cell = pygame.Rect(plot.x + (head % columns) * (size + 8), plot.y + (head // columns) * (size + 22), size, size)
+                screen.blit(self._scaled_surface(("attention", head), self._attention_surface(head, version), cell.size),
+                            cell.topleft)
+                if not block.head_enabled[head]:
+                    dim = pygame.Surface(cell.size, pygame.SRCALPHA)
+                    dim.fill((30, 20, 30, 190))
+                    screen.blit(dim, cell.topleft)
+                text = self.small_font.render(f"head {head + 1}" + ("" if block.head_enabled[head] else " (severed)"),
+                                              True, (250, 230, 220))
+                screen.blit(text, (cell.x, cell.bottom + 2))
+        else:
+            screen.blit(self._scaled_surface(name, self._stage_surface(name, version), plot.size), plot.topleft)
+
+        if not fresh:
+            dim = pygame.Surface(plot.size, pygame.SRCALPHA)
+            dim.fill((30, 20, 30, 170))
+            screen.blit(dim, plot.topleft)
+            stale = self.header_font.render("stale - press RIGHT to run the next sublayer", True, (255, 220, 120))
+            screen.blit(stale, stale.get_rect(center=plot.center))
+
+    def _render_heads(self, screen, rect):
+        self._panel(screen, rect, "The Hydra's heads")
+        block = self.block
+        spacing = 56
+        for head in range(HEADS):
+            center = (rect.x + 40 + head * spacing, rect.y + 56)
+            alive = block.head_enabled[head]
+            pygame.draw.circle(screen, (240, 120, 90) if alive else (70, 60, 70), center, 20)
+            pygame.draw.circle(screen, (255, 255, 255), center, 20, 2)
+            text = self.body_font.render(str(head + 1), True, (255, 255, 255))
+            screen.blit(text, text.get_rect(center=center))
+            if not alive:
+                pygame.draw.line(screen, (255, 80, 80), (center[0] - 14, center[1] - 14), (center[0] + 14, center[1] + 14), 3)
+
+        within = self.change <= TOLERANCE
+        left = [
+            (f"Severed: {self.severed}/{HEADS_TO_SEVER}", (255, 220, 120)),
+            (f"Change in the block's update: {self.change:.1%} (limit {TOLERANCE:.0%})",
+             (140, 255, 160) if within else (255, 120, 110)),
+        ]
+        rerun = ", ".join(self.last_rerun) or "nothing"
+        right = [
+            (f"Input: {STEPS} tokens x {D_MODEL} features, {HEADS} heads of {D_MODEL // HEADS}", (230, 210, 210)),
+            (f"Full block: {self.full_forward_ms:.2f} ms, buffers {block.nbytes / 1e6:.2f} MB", (230, 210, 210)),
+            (f"Last edit reran {rerun} in {self.last_forward_ms:.2f} ms", (180, 160, 170)),
+        ]
+        for i, (line, color) in enumerate(left):
+            screen.blit(self.small_font.render(line, True, color), (rect.x + 14, rect.y + 92 + i * 22))
+        for i, (line, color) in enumerate(right):
+            screen.blit(self.small_font.render(line, True, color), (rect.x + 500, rect.y + 36 + i * 24))
@@ -0,0 +1,305 @@
+"""
+Word2Vec Wasteland Challenge - Level 14: The Semantic Spider
+Train skip-gram embeddings on the game's own words and hunt through them with live similarity queries
+"""
+
+import math
+import time
+import pygame
+import numpy as np
+from .base_challenge import BaseChallenge
+from .game_corpus import game_texts
+from ..nn.embeddings import tokenize, Vocabulary, SkipGram, EmbeddingIndex
+from ..ui.modern_ui import DialogueBox, ParticleSystem
+
+MIN_COUNT = 3
+DIMENSIONS = 32
+WINDOW = 4
+EPOCHS = 10
+BATCH_SIZE = 1024
+LEARNING_RATE = 0.05
+# Seconds per frame spent training, and how often the index is rebuilt from the training vectors
+TRAIN_BUDGET = 0.006
+REINDEX_INTERVAL = 0.25
+LSH_BITS = 8
+TOP_K = 8
+# A riddle is solved when the target is among the top RIDDLE_K neighbours of the typed query
+RIDDLE_K = 5
+RIDDLES_TO_WIN = 3
+RIDDLE_WORDS = ("dragon", "gradient", "bias", "weight", "neuron", "training", "network", "boss",
+                "activation", "sigmoid", "loss", "layer", "memory", "data", "overfitting", "derivative",
+                "learning", "threshold", "output", "input")
+
+class Word2VecChallenge(BaseChallenge):
+    def __init__(self, game):
+        super().__init__(game)
+        self.particles = ParticleSystem()
+        self.dialogue_box = DialogueBox(50, game.height - 150, game.width - 100, 120)
+
+        self.title_font = pygame.font.Font(None, 48)
+        self.header_font = pygame.font.Font(None, 28)
+        self.body_font = pygame.font.Font(None, 22)
+        self.small_font = pygame.font.Font(None, 18)
+
+        # Phases: intro -> weave -> hunt -> victory
+        self.phase = "intro"
+        self.intro_step = 0
+        self.intro_lines = [
+            "The Semantic Spider has spun the Word2Vec Wasteland out of every word ever spoken in this realm.",
+            "A word is known by the company it keeps: words that share neighbours in the text get nearby vectors.",
+            f"We'll weave our own web - skip-gram with negative sampling, {DIMENSIONS} dimensions, on the game's own story.",
+            "Type any word (or sums like 'neuron - weight + bias') to see its nearest neighbours, answered as you type.",
+            f"The Spider will name a word. Find a DIFFERENT word whose {RIDDLE_K} closest strands catch it. Solve {RIDDLES_TO_WIN} riddles to win!"
+        ]
+
+        self._rng = np.random.default_rng(14)
+        tokens = [token for text in game_texts(game) for token in tokenize(text)]
+        self.corpus_size = len(tokens)
+        self.vocabulary = Vocabulary(tokens, min_count=MIN_COUNT)
+        self.ids = self.vocabulary.encode(tokens)
+        self.model = SkipGram(self.vocabulary, dimensions=DIMENSIONS, window=WINDOW, rng=np.random.default_rng(15))
+        self._training = None
+        self.progress = 0.0
+        self.loss = None
+        self.train_started = None
+        self.train_seconds = 0.0
+        self._next_reindex = 0.0
+        self.index = None
+
+        self.query = ""
+        self.results = []
+        self.unknown = []
+        self.query_us = 0.0
+        self.approximate = False
+
+        self.riddle = None
+        self.solved = 0
+        self.boss_hp = 100
+        self.victory_celebration = False
+
+    def initialize(self):
+        self.phase = "intro"
+        self.intro_step = 0
+        self.dialogue_box.set_dialogue(self.intro_lines[0], "Tensor")
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return "exit"
+
+            if self.phase == "intro":
+                if event.key == pygame.K_SPACE:
+                    self._advance_intro()
+            elif self.phase in ("weave", "hunt"):
+                if event.key == pygame.K_BACKSPACE:
+                    self.query = self.query[:-1]
+                    self._run_query()
+                elif event.key == pygame.K_RETURN:
+                    self._answer()
+                elif event.key == pygame.K_TAB:
+                    if self.phase == "hunt":
+                        self._new_riddle()
+                elif event.key == pygame.K_F2:
+                    self.approximate = not self.approximate
+                    self._run_query()
+                elif event.unicode and (event.unicode.isalnum() or event.unicode in " +-'") and len(self.query) < 40:
+                    self.query += event.unicode.lower()
+                    self._run_query()
+            elif self.phase == "victory":
+                if event.key == pygame.K_SPACE:
+                    return "completed"
+
+        return None
+
+    def _advance_intro(self):
+        self.intro_step += 1
+        if self.intro_step < len(self.intro_lines):
+            self.dialogue_box.set_dialogue(self.intro_lines[self.intro_step], "Tensor")
+        else:
+            self.phase = "weave"
+            self._training = self.model.fit(self.ids, epochs=EPOCHS, batch_size=BATCH_SIZE, learning_rate=LEARNING_RATE)
+            self.train_started = time.perf_counter()
+            self.dialogue_box.set_dialogue(
+                "Weaving the web... Type words to watch their neighbours settle. F2: exact / LSH search.", "Tensor")
+
+    # Training, spread over frames
+
+    def update(self, dt):
+        self.dialogue_box.update(dt)
+        self.particles.update(dt)
+
+        if self.victory_celebration and np.random.random() < 0.2:
+            self.particles.create_explosion(np.random.randint(100, self.game.width - 100),
+                                            np.random.randint(100, 300),
+                                            (np.random.randint(180, 255), 200, 120), 12)
+
+    def frame_update(self):
+        if self._training is not None:
+            self._train_slice()
+
+    def _train_slice(self):
+        start = time.perf_counter()
+        while time.perf_counter() - start < TRAIN_BUDGET:
+            progress, loss = next(self._training)
+            self.progress = progress
+            if loss is None:
+                self._finish_training()
+                return
+            self.loss = loss if self.loss is None else 0.95 * self.loss + 0.05 * loss
+        self.train_seconds = time.perf_counter() - self.train_started
+        if time.perf_counter() >= self._next_reindex:
+            self._reindex()
+            self._next_reindex = time.perf_counter() + REINDEX_INTERVAL
+
+    def _finish_training(self):
+        self._training = None
+        self.train_seconds = time.perf_counter() - self.train_started
+        self._reindex()
+        if self.phase == "weave":
+            self.phase = "hunt"
+            self._new_riddle()
+
+    def _reindex(self):
+        """Snapshot the current vectors into a pre-normalised (and hashed) index"""
+        self.index = EmbeddingIndex(self.model.input_vectors, self.vocabulary.words,
+                                    lsh_bits=LSH_BITS, rng=np.random.default_rng(16))
+        self._run_query()
+
+    # Queries and riddles
+
+    def _run_query(self):
+        if self.index is None or not self.query.strip():
+            self.results, self.unknown = [], []
+            return
+        start = time.perf_counter()
+        self.results, self.unknown = self.index.expression(self.query, TOP_K, approximate=self.approximate)
+        self.query_us = (time.perf_counter() - start) * 1e6
+
+    def _new_riddle(self):
+        choices = [word for word in RIDDLE_WORDS if word in self.vocabulary and word != self.riddle]
+        choices = choices or self.vocabulary.words[:50]
+        self.riddle = str(self._rng.choice(choices))
+        self.dialogue_box.set_dialogue(
+            f"The Spider hisses: 'Which word holds \"{self.riddle}\" within its {RIDDLE_K} nearest strands?' "
+            "Type it and press ENTER. TAB: another riddle.", "Tensor")
+
+    def _answer(self):
+        if self.phase != "hunt" or not self.query.strip():
+            return
+        results, unknown = self.index.expression(self.query, RIDDLE_K)
+        if unknown:
+            self.dialogue_box.set_dialogue(f"The web has no strand for: {', '.join(unknown)}.", "Tensor")
+        elif self.riddle in tokenize(self.query):
+            self.dialogue_box.set_dialogue(f"Naming \"{self.riddle}\" itself is cheating - the Spider laughs.", "Tensor")
+        elif self.riddle in [word for word, _ in results]:
+            self.solved += 1
+            self.boss_hp = max(0, 100 - self.solved * 100 // RIDDLES_TO_WIN)
+            self.particles.create_explosion(self.game.width // 4, 340, (255, 210, 120), 25)
+            self.query = ""
+            self._run_query()
+            if self.solved >= RIDDLES_TO_WIN:
+                self.phase = "victory"
+                self.victory_celebration = True
+                self.dialogue_box.set_dialogue(
+                    "The web unravels - you read meaning from vectors alone! The Semantic Spider flees. SPACE to continue.",
+                    "Tensor")
+            else:
+                self._new_riddle()
+        else:
+            self.dialogue_box.set_dialogue(
+                f"\"{self.riddle}\" is not among the {RIDDLE_K} strands of '{self.query.strip()}'. Try another word.", "Tensor")
+
+    # Rendering
+
+    def render(self, screen):
+        screen.fill((28, 22, 18))
+
+        title = self.title_font.render("Word2Vec Wasteland", True, (240, 200, 140))
+        screen.blit(title, title.get_rect(center=(self.game.width // 2, 40)))
+
+        if self.phase in ("weave", "hunt", "victory"):
+            hp_rect = pygame.Rect(self.game.width // 2 - 200, 68, 400, 14)
+            pygame.draw.rect(screen, (60, 40, 25), hp_rect)
+            pygame.draw.rect(screen, (220, 160, 90), (hp_rect.x, hp_rect.y, hp_rect.width * self.boss_hp // 100, hp_rect.height))
+            pygame.draw.rect(screen, (255, 255, 255), hp_rect, 1)
+            boss_text = self.small_font.render(f"Semantic Spider HP: {self.boss_hp}", True, (255, 255, 255))
+            screen.blit(boss_text, boss_text.get_rect(center=(hp_rect.centerx, hp_rect.bottom + 10)))
+
+            self._render_web(screen, pygame.Rect(30, 100, 560, 500))
+            self._render_query(screen, pygame.Rect(600, 100, self.game.width - 630, 290))
+            self._render_stats(screen, pygame.Rect(600, 398, self.game.width - 630, 202))
+
+        self.particles.render(screen, self.game.interpolation)
+        self.dialogue_box.render(screen, self.body_font, self.header_font)
+
+    def _panel(self, screen, rect, label):
+        pygame.draw.rect(screen, (40, 32, 26), rect, border_radius=8)
+        pygame.draw.rect(screen, (190, 150, 100), rect, 2, border_radius=8)
+        screen.blit(self.small_font.render(label, True, (240, 225, 200)), (rect.x + 12, rect.y + 6))
+
+    def _render_web(self, screen, rect):
+        """The query at the centre, one radial thread per neighbour; shorter thread = higher cosine"""
+        self._panel(screen, rect, "The web: thread length = 1 - cosine similarity")
+        center = (rect.centerx, rect.centery + 10)
+        reach = min(rect.width, rect.height) // 2 - 50
+        angles = [2 * math.pi * i / TOP_K - math.pi / 2 for i in range(TOP_K)]
+        for ring in (0.25, 0.5, 0.75, 1.0):
+            points = [(center[0] + ring * reach * math.cos(a), center[1] + ring * reach * math.sin(a)) for a in angles]
+            pygame.draw.polygon(screen, (70, 60, 50), points, 1)
+        for angle in angles:
+            pygame.draw.line(screen, (55, 48, 40), center,
+                             (center[0] + reach * math.cos(angle), center[1] + reach * math.sin(angle)), 1)
+
+        for angle, (word, cosine) in zip(angles, self.results):
+            length = reach * (0.15 + 0.85 * (1 - max(cosine, 0.0)))
+            end = (center[0] + length * math.cos(angle), center[1] + length * math.sin(angle))
+            color = (255, 215, 90) if word == self.riddle else (220, 200, 170)
+            pygame.draw.line(screen, color, center, end, 2)
+            pygame.draw.circle(screen, color, (int(end[0]), int(end[1])), 5)
+            label = self.small_font.render(f"{word} {cosine:.2f}", True, color)
+            screen.blit(label, label.get_rect(center=(end[0], end[1] + (14 if math.sin(angle) >= 0 else -14))))
+
+        pygame.draw.circle(screen, (200, 90, 60), center, 12)
+        core = self.body_font.render(self.query.strip() or "?", True, (255, 240, 220))
+        screen.blit(core, core.get_rect(center=(center[0], center[1] + 24)))
+
+    def _render_query(self, screen, rect):
+        self._panel(screen, rect, "Ask the web (ENTER answers the riddle)")
+        box = pygame.Rect(rect.x + 12, rect.y + 28, rect.width - 24, 30)
+        pygame.draw.rect(screen, (22, 18, 14), box, border_radius=4)
+        pygame.draw.rect(screen, (240, 200, 140), box, 1, border_radius=4)
+        cursor = "_" if int(time.perf_counter() * 2) % 2 == 0 else ""
+        screen.blit(self.body_font.render(self.query + cursor, True, (255, 240, 220)), (box.x + 8, box.y + 7))
+
+        y = box.bottom + 10
+        if self.riddle and self.phase == "hunt":
+            screen.blit(self.body_font.render(f"Riddle: catch \"{self.riddle}\"  ({self.solved}/{RIDDLES_TO_WIN})",
+                                              True, (255, 215, 90)), (rect.x + 12, y))
+            y += 26
+        if self.unknown:
+            screen.blit(self.small_font.render(f"Not in the web: {', '.join(self.unknown)}", True, (255, 130, 110)),
+                        (rect.x + 12, y))
+            y += 20
+        for rank, (word, cosine) in enumerate(self.results, 1):
+            color = (255, 215, 90) if word == self.riddle else (230, 215, 190)
+            screen.blit(self.small_font.render(f"{rank}. {word}", True, color), (rect.x + 16, y))
+            bar = pygame.Rect(rect.x + 150, y + 3, int((rect.width - 220) * max(cosine, 0.0)), 9)
+            pygame.draw.rect(screen, (200, 140, 80), bar)
+            screen.blit(self.small_font.render(f"{cosine:.3f}", True, color), (rect.right - 60, y))
+            y += 20
+
+    def _render_stats(self, screen, rect):
+        self._panel(screen, rect, "Skip-gram with negative sampling")
+        training = "done" if self._training is None else f"{self.progress:.0%}"
+        loss = f"{self.loss:.3f}" if self.loss is not None else "-"
+        mode = f"LSH ({LSH_BITS} bits, multi-probe)" if self.approximate else "exact (argpartition)"
+        lines = [
+            (f"Corpus: {self.corpus_size:,} tokens, {len(self.vocabulary):,} words", (220, 205, 180)),
+            (f"Training: {training} of {EPOCHS} epochs, {self.train_seconds:.1f} s", (240, 200, 140)),
+            (f"Loss (smoothed): {loss}", (240, 200, 140)),
+            (f"Search: {mode} (F2)", (200, 220, 255)),
+            (f"Last query: {self.query_us:.0f} us", (200, 220, 255)),
+            (f"Index: {self.index.unit.nbytes // 1024 if self.index else 0} KB, unit-length float32 rows", (170, 160, 140)),
+        ]
+        for i, (line, color) in enumerate(lines):
+            screen.blit(self.small_font.render(line, True, color), (rect.x + 12, rect.y + 30 + i * 26))
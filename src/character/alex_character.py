@@ -59,6 +59,9 @@ class AlexCharacter:
         self.y = 300
         self.target_x = 100
         self.target_y = 300
+        # Position before the last update, for interpolated rendering
+        self.previous_x = self.x
+        self.previous_y = self.y
         
         # Particle effects
         self.level_up_particles = []
@@ -165,6 +168,7 @@ class AlexCharacter:
                 'max_lifetime': random.uniform(1.0, 2.0),
                 'size': random.randint(3, 8)
             }
+            particle['px'], particle['py'] = particle['x'], particle['y']
             self.level_up_particles.append(particle)
     
     def _create_skill_particles(self, skill_name):
@@ -191,6 +195,7 @@ class AlexCharacter:
                 'max_lifetime': random.uniform(0.5, 1.5),
                 'size': random.randint(2, 5)
             }
+            particle['px'], particle['py'] = particle['x'], particle['y']
             self.skill_particles.append(particle)
     
     def move_to(self, x, y):
@@ -202,6 +207,7 @@ class AlexCharacter:
     def update(self, dt):
         """Update character state"""
         self.animation_time += dt
+        self.previous_x, self.previous_y = self.x, self.y
         
         # Move towards target position
         dx = self.target_x - self.x
@@ -233,6 +239,7 @@ class AlexCharacter:
         """Update all particle effects"""
         # Update level up particles
         for particle in self.level_up_particles[:]:
+            particle['px'], particle['py'] = particle['x'], particle['y']
             particle['x'] += particle['vx'] * dt
             particle['y'] += particle['vy'] * dt
             particle['vy'] += 200 * dt  # Gravity
@@ -243,6 +250,7 @@ class AlexCharacter:
         
         # Update skill particles
         for particle in self.skill_particles[:]:
+            particle['px'], particle['py'] = particle['x'], particle['y']
             particle['x'] += particle['vx'] * dt
             particle['y'] += particle['vy'] * dt
             particle['vy'] += 150 * dt  # Gravity
@@ -251,8 +259,10 @@ class AlexCharacter:
             if particle['lifetime'] <= 0:
                 self.skill_particles.remove(particle)
     
-    def render(self, screen):
-        """Render the character"""
+    def render(self, screen, interpolation=1.0):
+        """Render the character, ``interpolation`` of the way from its previous to its current position"""
+        x = self.previous_x + (self.x - self.previous_x) * interpolation
+        y = self.previous_y + (self.y - self.previous_y) * interpolation
         size = int(40 * self.appearance['size_multiplier'])
         
         # Draw aura if character has one
@@ -263,8 +273,8 @@ class AlexCharacter:
             pygame.draw.circle(aura_surface, self.appearance['aura_color'], 
                              (aura_size//2 + aura_pulse//2, aura_size//2 + aura_pulse//2), 
                              aura_size//2 + aura_pulse//2)
-            screen.blit(aura_surface, (self.x - aura_size//2 - aura_pulse//2, 
-                                     self.y - aura_size//2 - aura_pulse//2))
+            screen.blit(aura_surface, (x - aura_size//2 - aura_pulse//2, 
+                                     y - aura_size//2 - aura_pulse//2))
         
         # Animation offset
         bob_offset = 0
@@ -275,68 +285,68 @@ class AlexCharacter:
         elif self.current_animation == 'level_up':
             bob_offset = math.sin(self.animation_frame) * 10
         
-        char_y = self.y + bob_offset
+        char_y = y + bob_offset
         
         # Draw cape (if unlocked)
         if 'activation_cape' in self.appearance['accessories']:
             cape_points = [
-                (self.x - size//3, char_y - size//2),
-                (self.x - size//2, char_y + size//2),
-                (self.x - size//4, char_y + size//3),
-                (self.x + size//4, char_y + size//3),
-                (self.x + size//2, char_y + size//2),
-                (self.x + size//3, char_y - size//2)
+                (x - size//3, char_y - size//2),
+                (x - size//2, char_y + size//2),
+                (x - size//4, char_y + size//3),
+                (x + size//4, char_y + size//3),
+                (x + size//2, char_y + size//2),
+                (x + size//3, char_y - size//2)
             ]
             pygame.draw.polygon(screen, (150, 0, 150), cape_points)
         
         # Draw body (circle for simplicity)
         pygame.draw.circle(screen, self.appearance['body_color'], 
-                         (int(self.x), int(char_y)), size//2)
+                         (int(x), int(char_y)), size//2)
         
         # Draw head
         head_size = size//3
         pygame.draw.circle(screen, self.appearance['skin_color'], 
-                         (int(self.x), int(char_y - size//3)), head_size)
+                         (int(x), int(char_y - size//3)), head_size)
         
         # Draw hair
-        hair_rect = pygame.Rect(self.x - head_size, char_y - size//2, head_size*2, head_size)
+        hair_rect = pygame.Rect(x - head_size, char_y - size//2, head_size*2, head_size)
         pygame.draw.ellipse(screen, self.appearance['hair_color'], hair_rect)
         
         # Draw eyes
         eye_size = 3
-        left_eye = (int(self.x - head_size//3), int(char_y - size//3 - 3))
-        right_eye = (int(self.x + head_size//3), int(char_y - size//3 - 3))
+        left_eye = (int(x - head_size//3), int(char_y - size//3 - 3))
+        right_eye = (int(x + head_size//3), int(char_y - size//3 - 3))
         pygame.draw.circle(screen, self.appearance['eye_color'], left_eye, eye_size)
         pygame.draw.circle(screen, self.appearance['eye_color'], right_eye, eye_size)
         
         # Draw neural headband (if unlocked)
         if 'neural_headband' in self.appearance['accessories']:
-            headband_rect = pygame.Rect(self.x - head_size, char_y - size//2 + 5, head_size*2, 8)
+            headband_rect = pygame.Rect(x - head_size, char_y - size//2 + 5, head_size*2, 8)
             pygame.draw.rect(screen, (0, 255, 255), headband_rect)
             # Neural pattern on headband
             for i in range(3):
-                dot_x = self.x - head_size + 10 + i * 15
+                dot_x = x - head_size + 10 + i * 15
                 pygame.draw.circle(screen, (255, 255, 255), (int(dot_x), int(char_y - size//2 + 9)), 2)
         
         # Draw gradient gloves (if unlocked)
         if 'gradient_gloves' in self.appearance['accessories']:
             # Left glove
-            left_hand = (int(self.x - size//2), int(char_y))
+            left_hand = (int(x - size//2), int(char_y))
             pygame.draw.circle(screen, (255, 100, 0), left_hand, 8)
             # Right glove
-            right_hand = (int(self.x + size//2), int(char_y))
+            right_hand = (int(x + size//2), int(char_y))
             pygame.draw.circle(screen, (255, 100, 0), right_hand, 8)
         
         # Draw level indicator
         level_text = pygame.font.Font(None, 24).render(f"Lv.{self.level}", True, (255, 255, 255))
-        level_bg = pygame.Rect(self.x - 20, char_y - size - 20, 40, 20)
+        level_bg = pygame.Rect(x - 20, char_y - size - 20, 40, 20)
         pygame.draw.rect(screen, (0, 0, 0, 150), level_bg)
-        screen.blit(level_text, (self.x - 15, char_y - size - 18))
+        screen.blit(level_text, (x - 15, char_y - size - 18))
         
         # Render particles
-        self._render_particles(screen)
+        self._render_particles(screen, interpolation)
     
-    def _render_particles(self, screen):
+    def _render_particles(self, screen, interpolation=1.0):
         """Render all particle effects"""
         # Render level up particles
         for particle in self.level_up_particles:
@@ -353,7 +363,9 @@ class AlexCharacter:
                 alpha_value = max(0, min(255, int(alpha * 255)))
                 color_with_alpha = (*base_color, alpha_value)
                 pygame.draw.circle(particle_surface, color_with_alpha, (particle['size'], particle['size']), particle['size'])
-                screen.blit(particle_surface, (int(particle['x'] - particle['size']), int(particle['y'] - particle['size'])))
+                x = particle['px'] + (particle['x'] - particle['px']) * interpolation
+                y = particle['py'] + (particle['y'] - particle['py']) * interpolation
+                screen.blit(particle_surface, (int(x - particle['size']), int(y - particle['size'])))
             except (ValueError, TypeError) as e:
                 # Skip invalid particles
                 continue
@@ -373,7 +385,9 @@ class AlexCharacter:
                 alpha_value = max(0, min(255, int(alpha * 255)))
                 color_with_alpha = (*base_color, alpha_value)
                 pygame.draw.circle(particle_surface, color_with_alpha, (particle['size'], particle['size']), particle['size'])
-                screen.blit(particle_surface, (int(particle['x'] - particle['size']), int(particle['y'] - particle['size'])))
+                x = particle['px'] + (particle['x'] - particle['px']) * interpolation
+                y = particle['py'] + (particle['y'] - particle['py']) * interpolation
+                screen.blit(particle_surface, (int(x - particle['size']), int(y - particle['size'])))
             except (ValueError, TypeError) as e:
                 # Skip invalid particles
                 continue
@@ -2,6 +2,7 @@
 Game constants and enums
 """
 
+import os
 from enum import Enum
 
 class GameState(Enum):
@@ -14,6 +15,16 @@ class GameState(Enum):
 SCREEN_WIDTH = 1024
 SCREEN_HEIGHT = 768
 FPS = 60
+# Game logic advances in fixed steps of 1 / SIMULATION_HZ seconds, independent of the frame rate
+SIMULATION_HZ = 60
+# Steps run per frame at most; after a longer hitch the rest of the backlog is dropped
+MAX_CATCH_UP_STEPS = 5
+# Background job pools (src/jobs.py) and the main-thread seconds per frame for their callbacks
+JOB_THREADS = 4
+JOB_PROCESSES = max(1, (os.cpu_count() or 1) - 1)
+JOB_CALLBACK_BUDGET = 0.002
+# Seconds kept free before the next frame is due when running time-sliced tasks (src/tasks.py)
+TASK_DEADLINE_MARGIN = 0.002
 
 # Colors
 BLACK = (0, 0, 0)
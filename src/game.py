@@ -2,8 +2,12 @@
 Main game class that manages game states and flow
 """
 
+import time
 import pygame
-from .constants import GameState
+from .constants import (GameState, FPS, SIMULATION_HZ, MAX_CATCH_UP_STEPS, JOB_THREADS, JOB_PROCESSES,
+                        JOB_CALLBACK_BUDGET, TASK_DEADLINE_MARGIN)
+from .jobs import JobScheduler
+from .tasks import TaskRunner
 from .states.menu_state import MenuState
 from .states.world_map_state import WorldMapState
 from .states.level_state import LevelState
@@ -15,6 +19,22 @@ class Game:
         self.width = width
         self.height = height
         self.current_state = GameState.MENU
+
+        # Fixed-step simulation clock (see ``update``)
+        self.fixed_dt = 1.0 / SIMULATION_HZ
+        self.time = 0.0
+        self.interpolation = 1.0
+        self._accumulator = 0.0
+
+        # Event loop of the asyncio runner (main.py --asyncio); None under the blocking loop
+        self.loop = None
+        self._tasks = set()
+
+        # Shared background work; states and challenges submit with owner=self
+        self.jobs = JobScheduler(JOB_THREADS, JOB_PROCESSES, JOB_CALLBACK_BUDGET)
+        # Main-thread generator tasks resumed in leftover frame time (see ``run_tasks``)
+        self.tasks = TaskRunner()
+        self._frame_start = time.perf_counter()
         
         # Player progress tracking
         self.player_progress = {
@@ -43,19 +63,92 @@ class Game:
     def change_state(self, new_state):
         """Change the current game state"""
         if new_state in self.states:
+            previous = self.states[self.current_state]
+            previous.exit()
+            self.jobs.cancel_owner(previous)
+            self.tasks.cancel_owner(previous)
             self.current_state = new_state
             self.states[new_state].enter()
     
+    def shutdown(self):
+        """Leave the current state and stop background work when the game quits"""
+        self.states[self.current_state].exit()
+        self.jobs.shutdown()
+    
     def handle_event(self, event):
         """Handle pygame events"""
         self.states[self.current_state].handle_event(event)
     
     def update(self, dt):
-        """Update current state"""
-        self.states[self.current_state].update(dt)
-        # Update character
-        self.character.update(dt)
-    
+        """Advance the simulation by ``dt`` seconds of real time in fixed steps.
+
+        Finished background jobs are delivered first, once per frame. Real
+        time accumulates and is spent in whole ``fixed_dt`` steps, so
+        game logic sees the same dt at any frame rate. At most
+        MAX_CATCH_UP_STEPS run per frame; after a longer hitch the backlog is
+        dropped rather than chased. The leftover fraction of a step becomes
+        ``interpolation``, which renderers use to blend between the previous
+        and current positions. Time-budgeted work then runs once through the
+        state's ``frame_update``, so a catch-up frame doesn't spend its budget
+        once per step. Returns the number of steps taken.
+        """
+        self._frame_start = time.perf_counter()
+        self.jobs.poll()
+        self._accumulator += dt
+        steps = 0
+        while self._accumulator >= self.fixed_dt and steps < MAX_CATCH_UP_STEPS:
+            self.step()
+            self._accumulator -= self.fixed_dt
+            steps += 1
+        if self._accumulator >= self.fixed_dt:
+            self._accumulator %= self.fixed_dt
+        self.interpolation = self._accumulator / self.fixed_dt
+        self.states[self.current_state].frame_update()
+        return steps
+
+    def step(self):
+        """One fixed simulation step of the current state and the character"""
+        self.states[self.current_state].update(self.fixed_dt)
+        self.character.update(self.fixed_dt)
+        self.time += self.fixed_dt
+
+    def simulate(self, duration):
+        """Run ``duration`` seconds of game time as fast as possible (headless runs, tests)"""
+        for _ in range(int(round(duration / self.fixed_dt))):
+            self.jobs.poll()
+            self.step()
+            self.states[self.current_state].frame_update()
+            self.tasks.run(time.perf_counter())
+        self.interpolation = 1.0
+        self._accumulator = 0.0
+
+    def run_tasks(self):
+        """Resume time-sliced tasks after the frame is presented, until shortly before the next one is due"""
+        return self.tasks.run(self._frame_start + 1.0 / FPS - TASK_DEADLINE_MARGIN)
+
+    def start_task(self, awaitable):
+        """Run a coroutine on the asyncio runner's loop; returns its Task.
+
+        Only valid when ``loop`` is set - callers fall back to blocking work
+        otherwise. Tasks are cancelled when the game loop ends.
+        """
+        if self.loop is None:
+            raise RuntimeError("start_task needs the asyncio runner (main.py --asyncio)")
+        task = self.loop.create_task(awaitable)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"⚠️  Background task failed: {task.exception()}")
+
+    def cancel_tasks(self):
+        """Cancel every task still running"""
+        for task in list(self._tasks):
+            task.cancel()
+
     def render(self):
         """Render current state"""
         self.screen.fill((0, 0, 0))  # Clear screen
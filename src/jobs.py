@@ -0,0 +1,183 @@
+"""
+Central background job scheduler: bounded worker pools, priorities, per-owner cancellation
+"""
+
+import heapq
+import itertools
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+class Job:
+    """Handle for one submitted job.
+
+    ``result``/``error`` are filled in when it finishes; ``stop`` is set by
+    ``cancel`` so thread jobs submitted with ``pass_stop=True`` can wind
+    down between units of work. Cancelled jobs never get their callbacks.
+    """
+
+    def __init__(self, fn, args, kwargs, priority, kind, owner, on_done, on_error):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.kind = kind
+        self.owner = owner
+        self.on_done = on_done
+        self.on_error = on_error
+        self.stop = threading.Event()
+        self.result = None
+        self.error = None
+        self.cancelled = False
+        self.finished = False
+        self._future = None
+
+    @property
+    def running(self):
+        return self._future is not None and not self.finished
+
+    def cancel(self):
+        """Drop the job; a queued job never starts, a running one is told to stop"""
+        if self.finished or self.cancelled:
+            return
+        self.cancelled = True
+        self.stop.set()
+        if self._future is not None:
+            self._future.cancel()
+
+class JobScheduler:
+    """Runs background work for every state and challenge on two bounded pools.
+
+    ``submit`` queues a callable for the thread pool (I/O, NumPy, anything
+    sharing memory with the game) or the process pool (pure-Python CPU work;
+    spawned workers as in ``CrossValidator``, so the callable and its
+    arguments must be picklable). Only as many jobs as there are workers are
+    handed to the executors; the rest wait in a priority queue (higher
+    ``priority`` first, FIFO within a level), so an urgent job never sits
+    behind a backlog.
+
+    Callbacks run on the main thread from ``poll``, once per frame, in
+    priority order and only until ``budget`` seconds are used (always at
+    least one), so a burst of finished jobs is spread over frames instead of
+    causing a hitch. Jobs belong to an ``owner`` (a state or challenge) and
+    ``cancel_owner`` drops all of them when it goes away.
+    """
+
+    def __init__(self, threads=4, processes=1, budget=0.002):
+        self.threads = threads
+        self.processes = processes
+        self.budget = budget
+        self._executors = {}
+        self._queued = []
+        self._running = []
+        self._finished = []
+        self._order = itertools.count()
+
+    def submit(self, fn, *args, priority=0, kind="thread", owner=None, on_done=None, on_error=None,
+               pass_stop=False, **kwargs):
+        """Queue ``fn(*args, **kwargs)``; returns its Job.
+
+        ``on_done(result)`` / ``on_error(exception)`` run on the main thread.
+        With ``pass_stop`` (threads only) the job's stop Event is passed as
+        the ``stop`` keyword argument.
+        """
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown job kind {kind!r}")
+        if pass_stop and kind != "thread":
+            raise ValueError("Only thread jobs can watch a stop event")
+        job = Job(fn, args, kwargs, priority, kind, owner, on_done, on_error)
+        if pass_stop:
+            job.kwargs = dict(kwargs, stop=job.stop)
+        heapq.heappush(self._queued, (-priority, next(self._order), job))
+        self._start_queued()
+        return job
+
+    def cancel_owner(self, owner):
+        """Cancel every queued, running or undelivered job of owner"""
+        for entries in (self._queued, self._finished):
+            for _, _, job in entries:
+                if job.owner is owner:
+                    job.cancel()
+        for job in self._running:
+            if job.owner is owner:
+                job.cancel()
+
+    def pending(self, owner=None):
+        """Number of jobs not yet delivered (of owner, or of everyone)"""
+        jobs = [job for _, _, job in self._queued + self._finished] + self._running
+        return sum(1 for job in jobs if not job.cancelled and (owner is None or job.owner is owner))
+
+    def poll(self, budget=None):
+        """Main thread, once per frame: collect finished jobs, start queued ones, deliver callbacks"""
+        budget = self.budget if budget is None else budget
+        deadline = time.perf_counter() + budget
+
+        for job in [job for job in self._running if job._future.done()]:
+            self._running.remove(job)
+            if not job.cancelled:
+                try:
+                    job.result = job._future.result()
+                except Exception as e:
+                    job.error = e
+                heapq.heappush(self._finished, (-job.priority, next(self._order), job))
+        self._start_queued()
+
+        delivered = 0
+        while self._finished:
+            _, _, job = heapq.heappop(self._finished)
+            if job.cancelled:
+                continue
+            job.finished = True
+            if job.error is not None:
+                if job.on_error is not None:
+                    job.on_error(job.error)
+                else:
+                    print(f"⚠️  Background job {getattr(job.fn, '__name__', job.fn)} failed: {job.error}")
+            elif job.on_done is not None:
+                job.on_done(job.result)
+            delivered += 1
+            if time.perf_counter() >= deadline:
+                break
+        return delivered
+
+    def _start_queued(self):
+        """Hand queued jobs to executors with a free worker, highest priority first"""
+        busy = {"thread": 0, "process": 0}
+        for job in self._running:
+            busy[job.kind] += 1
+        limits = {"thread": self.threads, "process": self.processes}
+        waiting = []
+        while self._queued:
+            entry = heapq.heappop(self._queued)
+            job = entry[2]
+            if job.cancelled:
+                continue
+            if busy[job.kind] >= limits[job.kind]:
+                waiting.append(entry)
+                continue
+            job._future = self._executor(job.kind).submit(job.fn, *job.args, **job.kwargs)
+            self._running.append(job)
+            busy[job.kind] += 1
+        for entry in waiting:
+            heapq.heappush(self._queued, entry)
+
+    def _executor(self, kind):
+        if kind not in self._executors:
+            if kind == "thread":
+                self._executors[kind] = ThreadPoolExecutor(self.threads, thread_name_prefix="GameJob")
+            else:
+                context = multiprocessing.get_context('spawn')
+                self._executors[kind] = ProcessPoolExecutor(self.processes, mp_context=context)
+        return self._executors[kind]
+
+    def shutdown(self):
+        """Cancel everything and stop the pools without waiting for running jobs"""
+        for _, _, job in self._queued + self._finished:
+            job.cancel()
+        for job in self._running:
+            job.cancel()
+        self._queued, self._running, self._finished = [], [], []
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._executors = {}
@@ -0,0 +1 @@
+# Reusable neural network core
\ No newline at end of file
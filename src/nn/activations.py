@@ -0,0 +1,143 @@
+"""
+Numerically stable activation kernels and their gradients
+
+Every kernel takes an optional ``out`` array so layers can evaluate into
+preallocated buffers without allocating per call.
+"""
+
+import numpy as np
+
+def _output(x, out):
+    """Return the array a kernel should write into"""
+    if out is None:
+        return np.empty_like(x, dtype=np.result_type(np.asarray(x).dtype, np.float32))
+    return out
+
+def linear(x, out=None):
+    out = _output(x, out)
+    np.copyto(out, x)
+    return out
+
+def relu(x, out=None):
+    return np.maximum(x, 0, out=_output(x, out))
+
+def leaky_relu(x, out=None, slope=0.01):
+    # max(x, slope * x) is leaky ReLU for any slope below 1
+    out = _output(x, out)
+    np.multiply(x, slope, out=out)
+    return np.maximum(x, out, out=out)
+
+def sigmoid(x, out=None):
+    # sigmoid(x) = (1 + tanh(x / 2)) / 2 never overflows, unlike 1 / (1 + exp(-x))
+    out = _output(x, out)
+    np.multiply(x, 0.5, out=out)
+    np.tanh(out, out=out)
+    out += 1
+    out *= 0.5
+    return out
+
+def tanh(x, out=None):
+    return np.tanh(x, out=_output(x, out))
+
+def swish(x, out=None):
+    out = sigmoid(x, out)
+    out *= x
+    return out
+
+def softmax(x, out=None):
+    # Softmax over the last axis, shifted by the max so exp never overflows
+    out = _output(x, out)
+    np.subtract(x, np.max(x, axis=-1, keepdims=True), out=out)
+    np.exp(out, out=out)
+    out /= np.sum(out, axis=-1, keepdims=True)
+    return out
+
+def step(x, out=None):
+    out = _output(x, out)
+    out[...] = x > 0
+    return out
+
+# Gradients: given pre-activation z, activation a and upstream grad, return dL/dz
+
+def linear_grad(z, a, grad, out=None):
+    out = _output(grad, out)
+    np.copyto(out, grad)
+    return out
+
+def relu_grad(z, a, grad, out=None):
+    out = _output(grad, out)
+    np.multiply(grad, z > 0, out=out)
+    return out
+
+def leaky_relu_grad(z, a, grad, out=None, slope=0.01):
+    out = _output(grad, out)
+    np.multiply(grad, np.where(z > 0, 1.0, slope), out=out)
+    return out
+
+def sigmoid_grad(z, a, grad, out=None):
+    out = _output(grad, out)
+    np.subtract(1, a, out=out)
+    out *= a
+    out *= grad
+    return out
+
+def tanh_grad(z, a, grad, out=None):
+    out = _output(grad, out)
+    np.multiply(a, a, out=out)
+    np.subtract(1, out, out=out)
+    out *= grad
+    return out
+
+def swish_grad(z, a, grad, out=None):
+    # d/dz z*s(z) = s + z*s*(1 - s) = s + a*(1 - s)
+    out = sigmoid(z, _output(grad, out))
+    out += a * (1 - out)
+    out *= grad
+    return out
+
+def softmax_grad(z, a, grad, out=None):
+    # Jacobian-vector product: a * (g - sum(g * a))
+    out = _output(grad, out)
+    np.subtract(grad, np.sum(grad * a, axis=-1, keepdims=True), out=out)
+    out *= a
+    return out
+
+def step_grad(z, a, grad, out=None):
+    out = _output(grad, out)
+    out.fill(0)
+    return out
+
+ACTIVATIONS = {
+    'linear': (linear, linear_grad),
+    'relu': (relu, relu_grad),
+    'leaky_relu': (leaky_relu, leaky_relu_grad),
+    'sigmoid': (sigmoid, sigmoid_grad),
+    'tanh': (tanh, tanh_grad),
+    'swish': (swish, swish_grad),
+    'softmax': (softmax, softmax_grad),
+    'step': (step, step_grad),
+}
+
+def normalize_name(name):
+    """Map display names like "Leaky ReLU" to registry keys like "leaky_relu" """
+    return (name or 'linear').strip().lower().replace(' ', '_').replace('-', '_')
+
+def get_activation(name):
+    """Return the (forward, gradient) kernel pair for an activation name"""
+    key = normalize_name(name)
+    if key not in ACTIVATIONS:
+        raise ValueError(f"Unknown activation function: {name}")
+    return ACTIVATIONS[key]
+
+def activate(name, x):
+    """Apply an activation to a scalar or array, returning a float for scalar input"""
+    x = np.asarray(x, dtype=np.float64)
+    result = get_activation(name)[0](x)
+    return float(result) if result.ndim == 0 else result
+
+def derivative(name, z):
+    """Derivative of an activation at pre-activation z"""
+    z = np.asarray(z, dtype=np.float64)
+    forward, gradient = get_activation(name)
+    result = gradient(z, forward(z), np.ones_like(z))
+    return float(result) if result.ndim == 0 else result
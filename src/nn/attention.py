@@ -0,0 +1,113 @@
+"""
+Scaled dot-product attention for batches of sequences and multiple heads
+"""
+
+import time
+import numpy as np
+from .activations import softmax
+
+def causal_mask(steps, dtype=np.float32):
+    """(steps, steps) additive mask: 0 where a query may look, -inf at future keys"""
+    mask = np.zeros((steps, steps), dtype=dtype)
+    mask[np.triu_indices(steps, 1)] = -np.inf
+    return mask
+
+def scaled_dot_product_attention(queries, keys, values, mask=None, weights_out=None, out=None):
+    """softmax(Q Kᵀ / sqrt(d) + mask) V over the last two axes; returns (outputs, weights).
+
+    Leading axes (batch, heads, ...) are broadcast by ``np.matmul``, so a
+    whole batch of multi-head attention is three calls. ``weights_out`` and
+    ``out`` let callers keep the (..., Tq, Tk) weights and (..., Tq, dv)
+    outputs in preallocated buffers.
+    """
+    # Scaling the (Tq, d) queries is cheaper than scaling the (Tq, Tk) scores
+    scaled = queries * np.asarray(1.0 / np.sqrt(queries.shape[-1]), dtype=queries.dtype)
+    scores = np.matmul(scaled, np.swapaxes(keys, -1, -2), out=weights_out)
+    if mask is not None:
+        scores += mask
+    weights = softmax(scores, out=scores)
+    return np.matmul(weights, values, out=out), weights
+
+class AttentionHeads:
+    """Queries, keys, values and attention maps of every head for a batch of sequences.
+
+    All buffers are (batch, heads, steps, ...) and allocated once. Setting a
+    head's queries or keys marks its attention map stale; setting only its
+    values keeps the map and just marks its outputs stale. ``forward``
+    recomputes stale heads only, and bumps ``versions[head]`` so callers can
+    cache anything drawn from a head's map until it actually changes.
+    """
+
+    def __init__(self, batch, heads, steps, head_dim, value_dim=None, causal=False, dtype=np.float32):
+        self.batch = batch
+        self.heads = heads
+        self.steps = steps
+        self.head_dim = head_dim
+        self.value_dim = value_dim or head_dim
+        self.dtype = np.dtype(dtype)
+
+        self.queries = np.zeros((batch, heads, steps, head_dim), dtype=self.dtype)
+        self.keys = np.zeros((batch, heads, steps, head_dim), dtype=self.dtype)
+        self.values = np.zeros((batch, heads, steps, self.value_dim), dtype=self.dtype)
+        self.weights = np.zeros((batch, heads, steps, steps), dtype=self.dtype)
+        self.outputs = np.zeros((batch, heads, steps, self.value_dim), dtype=self.dtype)
+        self.mask = causal_mask(steps, self.dtype) if causal else None
+
+        self.versions = [0] * heads
+        self._stale_maps = set(range(heads))
+        self._stale_outputs = set(range(heads))
+
+    @property
+    def nbytes(self):
+        return sum(buffer.nbytes for buffer in (self.queries, self.keys, self.values, self.weights, self.outputs))
+
+    def set_queries(self, head, queries):
+        self.queries[:, head] = queries
+        self.mark_dirty(head)
+
+    def set_keys(self, head, keys):
+        self.keys[:, head] = keys
+        self.mark_dirty(head)
+
+    def set_values(self, head, values):
+        self.values[:, head] = values
+        self._stale_outputs.add(head)
+
+    def mark_dirty(self, head=None):
+        """Force a head's map (or every head's, with None) to be recomputed"""
+        heads = range(self.heads) if head is None else (head,)
+        self._stale_maps.update(heads)
+        self._stale_outputs.update(heads)
+
+    @property
+    def stale(self):
+        return bool(self._stale_maps or self._stale_outputs)
+
+    def is_stale(self, head):
+        return head in self._stale_maps
+
+    def forward(self, budget=None):
+        """Recompute stale heads; returns the heads whose attention maps changed.
+
+        With a ``budget`` in seconds, stops once it is used up (always
+        refreshing at least one head), so a full rebuild can span frames.
+        """
+        deadline = None if budget is None else time.perf_counter() + budget
+        refreshed = []
+        for head in sorted(self._stale_maps):
+            if refreshed and deadline is not None and time.perf_counter() >= deadline:
+                break
+            scaled_dot_product_attention(self.queries[:, head], self.keys[:, head], self.values[:, head],
+                                         self.mask, weights_out=self.weights[:, head], out=self.outputs[:, head])
+            self.versions[head] += 1
+            self._stale_maps.discard(head)
+            self._stale_outputs.discard(head)
+            refreshed.append(head)
+        for head in sorted(self._stale_outputs - self._stale_maps):
+            np.matmul(self.weights[:, head], self.values[:, head], out=self.outputs[:, head])
+            self._stale_outputs.discard(head)
+        return refreshed
+
+    def merged(self):
+        """Outputs of all heads concatenated per token: (batch, steps, heads * value_dim)"""
+        return self.outputs.transpose(0, 2, 1, 3).reshape(self.batch, self.steps, -1)
@@ -0,0 +1,142 @@
+"""
+Tape-based reverse-mode autodiff for deep chains of scalar units
+"""
+
+import math
+import numpy as np
+from .activations import get_activation, normalize_name
+
+# Unit kinds supported on the tape; anything else is rejected at record time
+CHAIN_UNITS = ('linear', 'sigmoid', 'relu', 'tanh')
+
+class ChainTape:
+    """Records a chain v_i = f_i(w_i * v_{i-1}) once and replays it in NumPy.
+
+    The forward replay walks the chain layer by layer (it is inherently
+    sequential) and evaluates a whole batch of inputs per step into
+    preallocated buffers; a single input takes a scalar fast path that avoids
+    per-layer NumPy call overhead. The backward replay is fully vectorized: every
+    local derivative dv_i/dv_{i-1} = w_i * f_i'(z_i) is computed at once from
+    the recorded values and chained with a reverse cumulative product, so a
+    chain of hundreds of layers costs a handful of NumPy calls. Gradients are
+    deliberately left unclamped so vanishing and exploding gradients show up
+    exactly as they would in a real network.
+    """
+
+    def __init__(self, activations, weights, batch_size=1, dtype=np.float64):
+        self.dtype = np.dtype(dtype)
+        self.batch_size = batch_size
+        self.record(activations, weights)
+
+    @classmethod
+    def random(cls, depth, units=CHAIN_UNITS[:3], weight_range=(0.5, 1.5), rng=None, **kwargs):
+        """Build a chain of depth units drawn from units with uniform random weights"""
+        rng = rng or np.random.default_rng()
+        activations = [units[i] for i in rng.integers(0, len(units), depth)]
+        weights = rng.uniform(weight_range[0], weight_range[1], depth)
+        return cls(activations, weights, **kwargs)
+
+    def record(self, activations, weights):
+        """Compile the chain into kind masks and preallocated value/gradient buffers"""
+        activations = [normalize_name(name) for name in activations]
+        for name in activations:
+            if name not in CHAIN_UNITS:
+                raise ValueError(f"Unsupported chain unit: {name}")
+        if len(activations) != len(weights):
+            raise ValueError("Need one weight per unit")
+
+        self.activations = activations
+        self.weights = np.array(weights, dtype=self.dtype)
+        kinds = np.array(activations)
+        self._masks = {name: kinds == name for name in CHAIN_UNITS if np.any(kinds == name)}
+        self._kernels = [get_activation(name)[0] for name in activations]
+        self._allocate(max(1, self.batch_size))
+
+    def _allocate(self, rows):
+        """Preallocate per-unit buffers for a batch of rows"""
+        depth = self.depth
+        self.batch_size = rows
+        self.values = np.zeros((depth + 1, rows), dtype=self.dtype)
+        self.pre_activations = np.zeros((depth, rows), dtype=self.dtype)
+        self.local_grads = np.zeros((depth, rows), dtype=self.dtype)
+        self.grad_values = np.zeros((depth + 1, rows), dtype=self.dtype)
+        self.grad_weights = np.zeros((depth, rows), dtype=self.dtype)
+        self._act_grads = np.zeros((depth, rows), dtype=self.dtype)
+
+    @property
+    def depth(self):
+        return len(self.activations)
+
+    @property
+    def output(self):
+        return self.values[-1]
+
+    def forward(self, inputs):
+        """Replay the chain for a scalar or (batch,) array of inputs; returns the outputs"""
+        inputs = np.asarray(inputs, dtype=self.dtype).reshape(-1)
+        if len(inputs) != self.values.shape[1]:
+            self._allocate(len(inputs))
+
+        if len(inputs) == 1:
+            self._forward_scalar(float(inputs[0]))
+            return self.values[-1]
+
+        values, z, weights = self.values, self.pre_activations, self.weights
+        values[0] = inputs
+        for i, kernel in enumerate(self._kernels):
+            np.multiply(values[i], weights[i], out=z[i])
+            kernel(z[i], out=values[i + 1])
+        return values[-1]
+
+    def _forward_scalar(self, value):
+        """Forward replay for a single input in plain float math"""
+        pre_activations = []
+        values = [value]
+        for name, weight in zip(self.activations, self.weights.tolist()):
+            z = weight * value
+            if name == 'sigmoid':
+                value = 0.5 * (1.0 + math.tanh(0.5 * z))
+            elif name == 'relu':
+                value = z if z > 0 else 0.0
+            elif name == 'tanh':
+                value = math.tanh(z)
+            else:
+                value = z
+            pre_activations.append(z)
+            values.append(value)
+        self.pre_activations[:, 0] = pre_activations
+        self.values[:, 0] = values
+
+    def backward(self, seed=1.0):
+        """Propagate d(output) = seed back through the recorded chain.
+
+        Fills ``grad_values`` (d out / d v_i) and ``grad_weights`` (d out / d w_i)
+        and returns d out / d input.
+        """
+        act_grads = self._act_grads
+        act_grads.fill(1.0)
+        outputs = self.values[1:]
+        for name, mask in self._masks.items():
+            if name == 'sigmoid':
+                act_grads[mask] = outputs[mask] * (1 - outputs[mask])
+            elif name == 'relu':
+                act_grads[mask] = self.pre_activations[mask] > 0
+            elif name == 'tanh':
+                act_grads[mask] = 1 - outputs[mask] ** 2
+
+        # dv_i/dv_{i-1} for every unit at once, then chained from the output backwards
+        np.multiply(act_grads, self.weights[:, None], out=self.local_grads)
+        grads = self.grad_values
+        grads[-1] = seed
+        with np.errstate(over='ignore', under='ignore', invalid='ignore'):
+            np.cumprod(self.local_grads[::-1], axis=0, out=grads[-2::-1])
+            grads[:-1] *= seed
+
+            # d out / d w_i = d out / d v_i * f_i'(z_i) * v_{i-1}
+            np.multiply(grads[1:], act_grads, out=self.grad_weights)
+            self.grad_weights *= self.values[:-1]
+        return grads[0]
+
+    def gradient_magnitudes(self, floor=1e-300):
+        """log10 |d out / d v_i| per layer for the first input, for plotting"""
+        return np.log10(np.maximum(np.abs(self.grad_values[:, 0]), floor))
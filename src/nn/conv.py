@@ -0,0 +1,120 @@
+"""
+Convolution and pooling layers built on strided window views and matrix multiplies
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+from .activations import get_activation, normalize_name
+
+def window_view(images, size, stride=1):
+    """Read-only (..., out_h, out_w, size, size) view of every size x size window of (..., H, W).
+
+    No data is copied: the view just reuses the image's own strides, stepping
+    ``stride`` pixels between windows and one pixel inside a window.
+    """
+    height, width = images.shape[-2:]
+    out_h = (height - size) // stride + 1
+    out_w = (width - size) // stride + 1
+    row_stride, col_stride = images.strides[-2:]
+    shape = images.shape[:-2] + (out_h, out_w, size, size)
+    strides = images.strides[:-2] + (row_stride * stride, col_stride * stride, row_stride, col_stride)
+    return as_strided(images, shape=shape, strides=strides, writeable=False)
+
+def im2col(images, size, stride=1):
+    """Unfold (batch, channels, H, W) into a (batch * out_h * out_w, channels * size * size) matrix.
+
+    Each row is one receptive field, so a convolution becomes a single
+    matrix multiply with the flattened kernels.
+    """
+    windows = window_view(images, size, stride)                  # (b, c, oh, ow, k, k)
+    batch, channels, out_h, out_w = windows.shape[:4]
+    columns = windows.transpose(0, 2, 3, 1, 4, 5).reshape(batch * out_h * out_w, channels * size * size)
+    return columns, (out_h, out_w)
+
+class Conv2D:
+    """2-D convolution (cross-correlation) of (batch, in_channels, H, W) images.
+
+    ``set_input`` pads the images into a reused buffer and unfolds them once
+    with ``im2col``. After that each output channel is one matrix-vector
+    product, so ``forward_channel`` can compute channels one at a time (for
+    progressive rendering, or to refresh only the channel whose kernel was
+    edited) while ``forward`` computes all of them in one matrix multiply.
+    """
+
+    def __init__(self, in_channels, out_channels, kernel_size, stride=1, padding=0,
+                 activation="linear", dtype=np.float64):
+        self.in_channels = in_channels
+        self.out_channels = out_channels
+        self.kernel_size = kernel_size
+        self.stride = stride
+        self.padding = padding
+        self.activation = normalize_name(activation)
+        self._forward, _ = get_activation(self.activation)
+        self.dtype = np.dtype(dtype)
+
+        self.kernels = np.zeros((out_channels, in_channels, kernel_size, kernel_size), dtype=self.dtype)
+        self.bias = np.zeros(out_channels, dtype=self.dtype)
+
+        self._padded = None
+        self._columns = None
+        self.output_size = None
+        self.z = None
+        self.outputs = None
+
+    def initialize(self, rng=None, weight_scale=0.5, bias_scale=0.0):
+        rng = rng or np.random.default_rng()
+        self.kernels[...] = rng.standard_normal(self.kernels.shape) * weight_scale
+        self.bias[...] = rng.standard_normal(self.bias.shape) * bias_scale
+
+    def set_input(self, images):
+        """Pad and unfold a (batch, in_channels, H, W) batch; returns (out_h, out_w)"""
+        images = np.asarray(images, dtype=self.dtype)
+        batch, channels, height, width = images.shape
+        if channels != self.in_channels:
+            raise ValueError(f"Expected {self.in_channels} input channels, got {channels}")
+
+        pad = self.padding
+        padded_shape = (batch, channels, height + 2 * pad, width + 2 * pad)
+        if self._padded is None or self._padded.shape != padded_shape:
+            self._padded = np.zeros(padded_shape, dtype=self.dtype)
+        self._padded[:, :, pad:pad + height, pad:pad + width] = images
+
+        self._columns, self.output_size = im2col(self._padded, self.kernel_size, self.stride)
+        out_shape = (batch, self.out_channels) + self.output_size
+        if self.outputs is None or self.outputs.shape != out_shape:
+            self.z = np.zeros(out_shape, dtype=self.dtype)
+            self.outputs = np.zeros(out_shape, dtype=self.dtype)
+        return self.output_size
+
+    def forward_channel(self, channel):
+        """Recompute one output channel from the unfolded input; returns its (batch, out_h, out_w) map"""
+        z = self.z[:, channel]
+        z[...] = (self._columns @ self.kernels[channel].ravel()).reshape(z.shape)
+        z += self.bias[channel]
+        return self._forward(z, out=self.outputs[:, channel])
+
+    def forward(self, images=None):
+        """Compute every output channel with one matrix multiply"""
+        if images is not None:
+            self.set_input(images)
+        batch = self.z.shape[0]
+        out_h, out_w = self.output_size
+        flat = self._columns @ self.kernels.reshape(self.out_channels, -1).T     # (b * oh * ow, out)
+        self.z[...] = flat.reshape(batch, out_h, out_w, self.out_channels).transpose(0, 3, 1, 2)
+        self.z += self.bias[:, None, None]
+        return self._forward(self.z, out=self.outputs)
+
+class Pool2D:
+    """Max or average pooling over non-overlapping (or strided) windows of the last two axes"""
+
+    def __init__(self, size=2, stride=None, mode="max"):
+        if mode not in ("max", "average"):
+            raise ValueError(f"Unknown pooling mode: {mode}")
+        self.size = size
+        self.stride = stride or size
+        self.mode = mode
+
+    def forward(self, maps, out=None):
+        windows = window_view(np.asarray(maps), self.size, self.stride)
+        reduce = np.max if self.mode == "max" else np.mean
+        return reduce(windows, axis=(-2, -1), out=out)
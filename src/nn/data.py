@@ -0,0 +1,124 @@
+"""
+On-disk datasets opened with memory mapping and streamed in shuffled mini-batches
+"""
+
+import os
+import zipfile
+import numpy as np
+
+def _memmap_npz_member(path, name):
+    """Memory-map one array of an uncompressed .npz; returns None if the member is compressed"""
+    with zipfile.ZipFile(path) as archive:
+        info = archive.getinfo(name + '.npy')
+        if info.compress_type != zipfile.ZIP_STORED:
+            return None
+
+    with open(path, 'rb') as handle:
+        # The local file header is 30 bytes plus the name and extra fields
+        handle.seek(info.header_offset + 26)
+        name_length = int.from_bytes(handle.read(2), 'little')
+        extra_length = int.from_bytes(handle.read(2), 'little')
+        handle.seek(info.header_offset + 30 + name_length + extra_length)
+
+        version = np.lib.format.read_magic(handle)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(handle)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(handle)
+        offset = handle.tell()
+
+    order = 'F' if fortran_order else 'C'
+    return np.memmap(path, dtype=dtype, mode='r', shape=shape, order=order, offset=offset)
+
+def open_npz(path, names=None):
+    """{name: array} of an .npz (all members by default), memory-mapped where possible.
+
+    ``np.load(..., mmap_mode='r')`` silently reads .npz members into memory,
+    so uncompressed members are mapped in place with ``_memmap_npz_member``
+    and only compressed ones are loaded.
+    """
+    if names is None:
+        with zipfile.ZipFile(path) as archive:
+            names = [name[:-4] for name in archive.namelist() if name.endswith('.npy')]
+    arrays = {}
+    for name in names:
+        array = _memmap_npz_member(path, name)
+        if array is None:
+            with np.load(path) as data:
+                array = data[name]
+        arrays[name] = array
+    return arrays
+
+def open_dataset(path):
+    """Open (features, labels) without reading them into RAM.
+
+    ``path`` is either a directory holding ``features.npy`` and ``labels.npy``
+    or an ``.npz`` with ``features`` and ``labels`` arrays. ``.npy`` files are
+    opened with ``mmap_mode='r'``; ``.npz`` members are memory-mapped in place
+    when stored uncompressed and only loaded into memory otherwise.
+    """
+    if os.path.isdir(path):
+        features = np.load(os.path.join(path, 'features.npy'), mmap_mode='r')
+        labels = np.load(os.path.join(path, 'labels.npy'), mmap_mode='r')
+    else:
+        arrays = open_npz(path, ('features', 'labels'))
+        features, labels = arrays['features'], arrays['labels']
+
+    if len(features) != len(labels):
+        raise ValueError(f"Dataset at {path} has {len(features)} feature rows but {len(labels)} labels")
+    return features, labels
+
+def write_dataset(path, chunks, rows, n_features, dtype=np.float32):
+    """Stream (features, labels) chunks into ``features.npy``/``labels.npy`` under path.
+
+    The files are created at full size up front with ``open_memmap`` and filled
+    chunk by chunk, so datasets larger than memory can be written. Yields the
+    number of rows written after each chunk so callers can report progress.
+    """
+    os.makedirs(path, exist_ok=True)
+    features = np.lib.format.open_memmap(os.path.join(path, 'features.npy'), mode='w+',
+                                         dtype=dtype, shape=(rows, n_features))
+    labels = np.lib.format.open_memmap(os.path.join(path, 'labels.npy'), mode='w+',
+                                       dtype=np.int8, shape=(rows,))
+    written = 0
+    for chunk_features, chunk_labels in chunks:
+        count = min(len(chunk_labels), rows - written)
+        features[written:written + count] = chunk_features[:count]
+        labels[written:written + count] = chunk_labels[:count]
+        written += count
+        yield written
+        if written >= rows:
+            break
+    features.flush()
+    labels.flush()
+    del features, labels
+
+def minibatches(features, labels, batch_size, rng=None, chunk_rows=65536, start=0, stop=None):
+    """Yield shuffled (features, labels) mini-batches from rows [start, stop), one epoch.
+
+    Rows are read in contiguous chunks of ``chunk_rows`` visited in random
+    order, and each chunk is shuffled in memory before being cut into
+    batches. Reads stay sequential on disk and at most one chunk is resident,
+    however large the memory-mapped arrays are.
+    """
+    rng = rng or np.random.default_rng()
+    stop = len(labels) if stop is None else stop
+    chunk_starts = np.arange(start, stop, chunk_rows)
+    rng.shuffle(chunk_starts)
+
+    for chunk_start in chunk_starts.tolist():
+        chunk_stop = min(chunk_start + chunk_rows, stop)
+        chunk_features = np.asarray(features[chunk_start:chunk_stop], dtype=np.float64)
+        chunk_labels = np.asarray(labels[chunk_start:chunk_stop])
+        order = rng.permutation(len(chunk_labels))
+        for batch_start in range(0, len(order), batch_size):
+            batch = order[batch_start:batch_start + batch_size]
+            yield chunk_features[batch], chunk_labels[batch]
+
+def iterate_chunks(features, labels, chunk_rows=65536, start=0, stop=None):
+    """Yield (features, labels) in file order, e.g. for streaming evaluation"""
+    stop = len(labels) if stop is None else stop
+    for chunk_start in range(start, stop, chunk_rows):
+        chunk_stop = min(chunk_start + chunk_rows, stop)
+        yield (np.asarray(features[chunk_start:chunk_stop], dtype=np.float64),
+               np.asarray(labels[chunk_start:chunk_stop]))
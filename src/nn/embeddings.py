@@ -0,0 +1,226 @@
+"""
+Word embeddings: skip-gram with negative sampling and a fast nearest-neighbour index
+"""
+
+import re
+from collections import Counter
+import numpy as np
+from .activations import sigmoid
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+def tokenize(text):
+    """Lower-case words (and numbers) of text, keeping contractions like "don't" whole"""
+    return _TOKEN.findall(text.lower())
+
+class Vocabulary:
+    """Words seen at least ``min_count`` times, most frequent first"""
+
+    def __init__(self, tokens, min_count=2):
+        counts = Counter(tokens)
+        ranked = sorted((word for word, count in counts.items() if count >= min_count),
+                        key=lambda word: (-counts[word], word))
+        self.words = ranked
+        self.index = {word: i for i, word in enumerate(ranked)}
+        self.counts = np.array([counts[word] for word in ranked], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return word in self.index
+
+    def encode(self, tokens):
+        """Token ids, dropping words outside the vocabulary"""
+        index = self.index
+        return np.array([index[token] for token in tokens if token in index], dtype=np.int64)
+
+def _scatter_add(matrix, rows, values):
+    """matrix[rows] += values, summing repeated rows.
+
+    Sorting the rows once and summing runs with ``np.add.reduceat`` is much
+    faster than ``np.add.at``, which handles every element separately.
+    """
+    order = np.argsort(rows)
+    rows = rows[order]
+    starts = np.flatnonzero(np.concatenate(([True], rows[1:] != rows[:-1])))
+    matrix[rows[starts]] += np.add.reduceat(values[order], starts, axis=0)
+
+class SkipGram:
+    """Skip-gram word2vec with negative sampling (SGNS), trained on mini-batches of word pairs.
+
+    Each (center, context) pair is scored against ``negatives`` noise words
+    drawn from the unigram distribution raised to 3/4. A whole mini-batch is
+    scored with one ``einsum`` and the sparse row updates are applied with a
+    sorted scatter-add, so nothing loops over individual pairs in Python.
+    """
+
+    def __init__(self, vocabulary, dimensions=32, window=4, negatives=5, subsample=1e-3,
+                 dtype=np.float32, rng=None):
+        self.vocabulary = vocabulary
+        self.dimensions = dimensions
+        self.window = window
+        self.negatives = negatives
+        self.subsample = subsample
+        self.rng = rng or np.random.default_rng()
+
+        size = len(vocabulary)
+        self.input_vectors = ((self.rng.random((size, dimensions)) - 0.5) / dimensions).astype(dtype)
+        self.output_vectors = np.zeros((size, dimensions), dtype=dtype)
+        noise = vocabulary.counts ** 0.75
+        self._noise_cdf = np.cumsum(noise) / noise.sum()
+        frequency = vocabulary.counts / vocabulary.counts.sum()
+        # word2vec's keep probability for frequent words
+        self._keep = np.minimum(1.0, np.sqrt(subsample / frequency) + subsample / frequency)
+
+    def pairs(self, ids):
+        """All (centers, contexts) of one shuffled epoch over token ids.
+
+        Frequent words are randomly dropped first, then every token gets a
+        random window size in 1..window, which weights near neighbours more.
+        """
+        rng = self.rng
+        ids = ids[rng.random(len(ids)) < self._keep[ids]]
+        reach = rng.integers(1, self.window + 1, len(ids))
+        centers, contexts = [], []
+        for offset in range(1, self.window + 1):
+            if offset >= len(ids):
+                break
+            forward = reach[:-offset] >= offset
+            backward = reach[offset:] >= offset
+            centers += [ids[:-offset][forward], ids[offset:][backward]]
+            contexts += [ids[offset:][forward], ids[:-offset][backward]]
+        centers, contexts = np.concatenate(centers), np.concatenate(contexts)
+        order = rng.permutation(len(centers))
+        return centers[order], contexts[order]
+
+    def train_batch(self, centers, contexts, learning_rate):
+        """One SGD step on a mini-batch of pairs; returns the mean loss"""
+        count = len(centers)
+        noise = np.searchsorted(self._noise_cdf, self.rng.random((count, self.negatives)))
+        targets = np.concatenate((contexts[:, None], noise), axis=1)               # (n, 1 + k)
+
+        center_vectors = self.input_vectors[centers]                               # (n, d)
+        target_vectors = self.output_vectors[targets]                              # (n, 1 + k, d)
+        probabilities = sigmoid(np.einsum('nd,nkd->nk', center_vectors, target_vectors))
+
+        # dL/dscore is p - 1 for the true context and p for each noise word
+        grad = probabilities
+        loss = -np.mean(np.log(probabilities[:, 0] + 1e-7) + np.log(1 - probabilities[:, 1:] + 1e-7).sum(axis=1))
+        grad[:, 0] -= 1
+        grad *= learning_rate
+
+        center_grad = np.einsum('nk,nkd->nd', grad, target_vectors)
+        target_grad = grad[..., None] * center_vectors[:, None, :]
+        _scatter_add(self.input_vectors, centers, -center_grad)
+        _scatter_add(self.output_vectors, targets.ravel(), -target_grad.reshape(-1, self.dimensions))
+        return float(loss)
+
+    def fit(self, ids, epochs=10, batch_size=512, learning_rate=0.05):
+        """Generator that trains one mini-batch per step and yields (progress, loss).
+
+        The learning rate decays linearly to nearly zero, as in word2vec.
+        Driving it with ``next`` lets callers spread training over frames.
+        """
+        epoch_pairs = None
+        for epoch in range(epochs):
+            centers, contexts = self.pairs(ids)
+            epoch_pairs = epoch_pairs or len(centers)
+            for start in range(0, len(centers), batch_size):
+                progress = (epoch + min(start / max(epoch_pairs, 1), 1.0)) / epochs
+                rate = learning_rate * max(1.0 - progress, 1e-4)
+                loss = self.train_batch(centers[start:start + batch_size], contexts[start:start + batch_size], rate)
+                yield progress, loss
+        yield 1.0, None
+
+class EmbeddingIndex:
+    """Top-k cosine neighbours over a pre-normalised embedding matrix.
+
+    Rows are scaled to unit length once, so a similarity query is one
+    matrix-vector product, and ``np.argpartition`` picks the k best in
+    linear time before only those k are sorted. With ``lsh_bits`` the rows
+    are also hashed by random hyperplanes; ``approximate=True`` queries then
+    only score the query's bucket and the buckets one bit away from it.
+    """
+
+    def __init__(self, vectors, words, lsh_bits=0, rng=None):
+        self.words = list(words)
+        self.index = {word: i for i, word in enumerate(self.words)}
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        self.unit = np.ascontiguousarray(vectors / np.maximum(norms, 1e-12))
+
+        self._planes = None
+        self._buckets = {}
+        if lsh_bits:
+            rng = rng or np.random.default_rng()
+            self._planes = rng.standard_normal((vectors.shape[1], lsh_bits)).astype(np.float32)
+            self._bit_values = 1 << np.arange(lsh_bits)
+            codes = self._hash(self.unit)
+            order = np.argsort(codes, kind='stable')
+            starts = np.flatnonzero(np.concatenate(([True], codes[order][1:] != codes[order][:-1])))
+            for start, stop in zip(starts, np.append(starts[1:], len(order))):
+                self._buckets[int(codes[order[start]])] = order[start:stop]
+
+    def __contains__(self, word):
+        return word in self.index
+
+    def _hash(self, vectors):
+        return ((vectors @ self._planes) > 0) @ self._bit_values
+
+    def _candidates(self, query):
+        code = int(self._hash(query[None])[0])
+        probes = [code] + [code ^ int(bit) for bit in self._bit_values]
+        found = [self._buckets[probe] for probe in probes if probe in self._buckets]
+        return np.concatenate(found) if found else np.zeros(0, dtype=np.int64)
+
+    def vector(self, word):
+        return self.unit[self.index[word]]
+
+    def nearest(self, query, k=10, exclude=(), approximate=False):
+        """[(word, cosine)] of the k rows closest to a query vector, best first"""
+        query = np.asarray(query, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        rows = None
+        if approximate and self._planes is not None:
+            rows = self._candidates(query)
+            if len(rows) < k + len(exclude):
+                rows = None
+        scores = self.unit @ query if rows is None else self.unit[rows] @ query
+        for word in exclude:
+            if word in self.index:
+                if rows is None:
+                    scores[self.index[word]] = -np.inf
+                else:
+                    scores[rows == self.index[word]] = -np.inf
+
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        ids = top if rows is None else rows[top]
+        return [(self.words[i], float(scores[j])) for i, j in zip(ids.tolist(), top.tolist()) if np.isfinite(scores[j])]
+
+    def similar(self, word, k=10, approximate=False):
+        return self.nearest(self.vector(word), k, exclude=(word,), approximate=approximate)
+
+    def analogy(self, a, b, c, k=10):
+        """Words d with a : b :: c : d, by 3CosAdd (b - a + c)"""
+        query = self.vector(b) - self.vector(a) + self.vector(c)
+        return self.nearest(query, k, exclude=(a, b, c))
+
+    def expression(self, text, k=10, approximate=False):
+        """Neighbours of a typed sum like "king - man + woman"; returns (results, unknown_words)"""
+        terms = re.findall(r"([+-]?)\s*([^\s+-]+)", text.lower())
+        query = np.zeros(self.unit.shape[1], dtype=np.float32)
+        used, unknown = [], []
+        for sign, word in terms:
+            if word not in self.index:
+                unknown.append(word)
+                continue
+            query += -self.vector(word) if sign == '-' else self.vector(word)
+            used.append(word)
+        if not used or not np.any(query):
+            return [], unknown
+        return self.nearest(query, k, exclude=used, approximate=approximate), unknown
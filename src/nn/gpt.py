@@ -0,0 +1,231 @@
+"""
+Tiny character-level GPT: training, memory-mapped .npz checkpoints and KV-cached sampling
+"""
+
+import numpy as np
+from .activations import softmax
+from .data import open_npz
+from .losses import softmax_cross_entropy
+from .transformer import TransformerBlock, layer_norm, layer_norm_backward
+
+class Adam:
+    """Adam over a {name: array} of parameters, updated in place from a matching {name: grad}"""
+
+    def __init__(self, parameters, learning_rate=3e-3, betas=(0.9, 0.99), eps=1e-8, max_norm=1.0):
+        self.parameters = parameters
+        self.learning_rate = learning_rate
+        self.betas = betas
+        self.eps = eps
+        self.max_norm = max_norm
+        self.steps = 0
+        self._moments = {name: (np.zeros_like(p), np.zeros_like(p)) for name, p in parameters.items()}
+
+    def step(self, grads, learning_rate=None):
+        """One update; gradients are first clipped to a global norm of ``max_norm``"""
+        rate = self.learning_rate if learning_rate is None else learning_rate
+        norm = np.sqrt(sum(float(np.sum(np.square(g))) for g in grads.values()))
+        scale = min(1.0, self.max_norm / max(norm, 1e-12)) if self.max_norm else 1.0
+        beta1, beta2 = self.betas
+        self.steps += 1
+        correction = np.sqrt(1 - beta2 ** self.steps) / (1 - beta1 ** self.steps)
+        for name, parameter in self.parameters.items():
+            first, second = self._moments[name]
+            grad = grads[name] * scale
+            first *= beta1
+            first += (1 - beta1) * grad
+            second *= beta2
+            second += (1 - beta2) * np.square(grad)
+            parameter -= rate * correction * first / (np.sqrt(second) + self.eps)
+        return norm
+
+class KVCache:
+    """Keys and values of every block for one sequence: (layers, heads, context, head_dim) each.
+
+    ``logits`` holds the model's scores for the token after the cached ones.
+    """
+
+    def __init__(self, model):
+        shape = (len(model.blocks), model.heads, model.context, model.d_model // model.heads)
+        self.keys = np.zeros(shape, dtype=model.dtype)
+        self.values = np.zeros(shape, dtype=model.dtype)
+        self.length = 0
+        self.logits = None
+
+    @property
+    def nbytes(self):
+        return self.keys.nbytes + self.values.nbytes
+
+class CharGPT:
+    """Decoder-only transformer over characters, with tied input/output embeddings.
+
+    Training runs whole (batch, steps) windows through the blocks' batched
+    forward and backward passes. Sampling is autoregressive with a
+    ``KVCache``: the prompt is prefilled in one batched pass, and every new
+    character then runs ``TransformerBlock.decode_step`` against the cached
+    keys and values, so it costs O(context) rather than re-running the
+    prefix. When the context window fills up, the newest half is prefilled
+    again and sampling continues.
+    """
+
+    def __init__(self, alphabet, d_model=64, heads=4, layers=2, context=64, d_ff=None, dtype=np.float32):
+        self.alphabet = alphabet
+        self.index = {char: i for i, char in enumerate(alphabet)}
+        self.d_model = d_model
+        self.heads = heads
+        self.context = context
+        self.dtype = np.dtype(dtype)
+
+        self.token_embeddings = np.zeros((len(alphabet), d_model), dtype=self.dtype)
+        self.position_embeddings = np.zeros((context, d_model), dtype=self.dtype)
+        self.final_gain = np.ones(d_model, dtype=self.dtype)
+        self.final_bias = np.zeros(d_model, dtype=self.dtype)
+        self.blocks = [TransformerBlock(d_model, heads, d_ff, causal=True, dtype=self.dtype) for _ in range(layers)]
+        self._grads = None
+
+    @property
+    def config(self):
+        return np.array([self.d_model, self.heads, len(self.blocks), self.context, self.blocks[0].d_ff])
+
+    def initialize(self, rng=None):
+        rng = rng or np.random.default_rng()
+        self.token_embeddings[...] = rng.standard_normal(self.token_embeddings.shape) * 0.1
+        self.position_embeddings[...] = rng.standard_normal(self.position_embeddings.shape) * 0.1
+        for block in self.blocks:
+            block.initialize(rng)
+            # Residual branches start small so the stream is dominated by the embeddings
+            block.out_weights *= 0.5
+            block.ff2_weights *= 0.5
+
+    def encode(self, text):
+        """Character ids; characters outside the alphabet become spaces"""
+        space = self.index.get(" ", 0)
+        return np.array([self.index.get(char, space) for char in text], dtype=np.int64)
+
+    def decode(self, ids):
+        return "".join(self.alphabet[i] for i in ids)
+
+    def parameters(self):
+        """{name: array} of every weight, block weights prefixed with ``block<i>_``"""
+        parameters = {"token_embeddings": self.token_embeddings, "position_embeddings": self.position_embeddings,
+                      "final_gain": self.final_gain, "final_bias": self.final_bias}
+        for i, block in enumerate(self.blocks):
+            parameters.update({f"block{i}_{name}": array for name, array in block.parameters().items()})
+        return parameters
+
+    # Training
+
+    def forward(self, ids):
+        """Logits (batch, steps, alphabet) for a (batch, steps) window of ids"""
+        steps = ids.shape[1]
+        x = self.token_embeddings[ids] + self.position_embeddings[:steps]
+        for block in self.blocks:
+            block.set_input(x)
+            x = block.forward()
+        self._final_inputs = x
+        self._normed = layer_norm(x, self.final_gain, self.final_bias)
+        return self._normed @ self.token_embeddings.T
+
+    def train_step(self, ids, targets, optimizer):
+        """Forward, backward and one optimizer step on (batch, steps) ids and next-char targets; returns the loss"""
+        if self._grads is None:
+            self._grads = {name: np.zeros_like(p) for name, p in self.parameters().items()}
+        grads = self._grads
+        logits = self.forward(ids)
+        batch, steps, vocabulary = logits.shape
+        loss, grad_logits = softmax_cross_entropy(logits.reshape(-1, vocabulary), targets.ravel())
+        grad_logits = grad_logits.astype(self.dtype).reshape(batch, steps, vocabulary)
+
+        # logits = LN(x) @ E^T: E gets a gradient from the output side here and from the lookup below
+        flat_normed = self._normed.reshape(-1, self.d_model)
+        np.matmul(grad_logits.reshape(-1, vocabulary).T, flat_normed, out=grads["token_embeddings"])
+        grad_x, grads["final_gain"][...], grads["final_bias"][...] = layer_norm_backward(
+            grad_logits @ self.token_embeddings, self._final_inputs, self.final_gain)
+        for i in reversed(range(len(self.blocks))):
+            block = self.blocks[i]
+            grad_x = block.backward(grad_x)
+            for name, grad in block.grads.items():
+                grads[f"block{i}_{name}"][...] = grad
+
+        one_hot = np.zeros((ids.size, vocabulary), dtype=self.dtype)
+        one_hot[np.arange(ids.size), ids.ravel()] = 1
+        grads["token_embeddings"] += one_hot.T @ grad_x.reshape(-1, self.d_model)
+        grads["position_embeddings"][...] = 0
+        grads["position_embeddings"][:steps] = grad_x.sum(axis=0)
+        optimizer.step(grads)
+        return loss
+
+    # Checkpoints
+
+    def save(self, path):
+        """Uncompressed .npz, so ``load`` can memory-map every array"""
+        alphabet = np.array([ord(char) for char in self.alphabet], dtype=np.int32)
+        np.savez(path, alphabet=alphabet, config=self.config, **self.parameters())
+
+    @classmethod
+    def load(cls, path):
+        """A model whose weights are read-only memory maps of the .npz at path"""
+        arrays = open_npz(path)
+        d_model, heads, layers, context, d_ff = (int(value) for value in arrays["config"])
+        alphabet = "".join(chr(code) for code in arrays["alphabet"])
+        model = cls(alphabet, d_model, heads, layers, context, d_ff, dtype=arrays["token_embeddings"].dtype)
+        for name in ("token_embeddings", "position_embeddings", "final_gain", "final_bias"):
+            setattr(model, name, arrays[name])
+        for i, block in enumerate(model.blocks):
+            block.load(arrays, prefix=f"block{i}_", copy=False)
+        return model
+
+    # Sampling
+
+    def _logits(self, x):
+        return layer_norm(x, self.final_gain, self.final_bias) @ self.token_embeddings.T
+
+    def prefill(self, ids, cache):
+        """Run ids through every block in one batched pass, filling the cache; returns the last logits"""
+        ids = np.asarray(ids[-self.context:])
+        steps = len(ids)
+        x = self.token_embeddings[ids] + self.position_embeddings[:steps]
+        for i, block in enumerate(self.blocks):
+            block.set_input(x)
+            x = block.forward()[0]
+            cache.keys[i, :, :steps] = block.head_view(1)[0]
+            cache.values[i, :, :steps] = block.head_view(2)[0]
+        cache.length = steps
+        cache.logits = self._logits(x[-1])
+        return cache.logits
+
+    def step(self, token, cache):
+        """Append one token to the cache; returns the logits for the next one"""
+        position = cache.length
+        x = self.token_embeddings[token] + self.position_embeddings[position]
+        for i, block in enumerate(self.blocks):
+            x = block.decode_step(x, cache.keys[i], cache.values[i], position)
+        cache.length += 1
+        cache.logits = self._logits(x)
+        return cache.logits
+
+    def generate(self, prompt, max_tokens, temperature=1.0, top_k=None, rng=None, cache=None):
+        """Generator of sampled characters continuing ``prompt``.
+
+        ``temperature`` 0 is greedy decoding. The (optional) cache is reused;
+        when a character is yielded its ``logits`` are still the scores that
+        character was drawn from.
+        """
+        rng = rng or np.random.default_rng()
+        cache = cache or KVCache(self)
+        history = list(self.encode(prompt or " "))
+        logits = self.prefill(history, cache)
+        for _ in range(max_tokens):
+            if temperature <= 0:
+                token = int(np.argmax(logits))
+            else:
+                scaled = logits / temperature
+                if top_k:
+                    scaled[scaled < np.partition(scaled, -top_k)[-top_k]] = -np.inf
+                token = int(rng.choice(len(scaled), p=softmax(scaled.astype(np.float64))))
+            yield self.alphabet[token]
+            history.append(token)
+            if cache.length == self.context:
+                # Window full: keep the newest half and rebuild the cache from it in one pass
+                logits = self.prefill(history[-(self.context // 2):], cache)
+            else:
+                logits = self.step(token, cache)
@@ -0,0 +1,179 @@
+"""
+Loss landscapes over a 2D grid of two weights, refined coarse-to-fine across a process pool
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+def linear_losses(features, labels, w1, w2, bias=0.0, loss="perceptron", block=1 << 18, points=4096):
+    """Mean loss of the classifier w1*x + w2*y + bias for every (w1[i], w2[j]); returns (len(w1), len(w2)).
+
+    ``loss`` is ``"perceptron"`` (mean max(0, -margin), the criterion the
+    perceptron rule descends) or ``"logistic"``. Margins of a block of grid
+    cells against a block of ``points`` label-signed features come from one
+    (cells, 2) @ (2, points) matmul in float32; blocks of about ``block``
+    margins stay in cache, so the cost is flat per margin however many
+    points there are.
+    """
+    features = np.asarray(features, dtype=np.float32)
+    signs = 2.0 * np.asarray(labels, dtype=np.float32) - 1.0
+    signed = np.ascontiguousarray((features * signs[:, None]).T)
+    signed_bias = signs * np.float32(bias)
+    grid = np.stack(np.meshgrid(w1, w2, indexing='ij'), axis=-1).reshape(-1, 2).astype(np.float32)
+
+    totals = np.zeros(len(grid))
+    count = len(signs)
+    points = max(1, min(points, count))
+    cells = max(1, block // points)
+    margins = np.empty((min(cells, len(grid)), points), dtype=np.float32)
+    for start in range(0, len(grid), cells):
+        chunk = grid[start:start + cells]
+        for first in range(0, count, points):
+            out = margins[:len(chunk), :min(points, count - first)]
+            np.matmul(chunk, signed[:, first:first + points], out=out)
+            out += signed_bias[first:first + points]
+            if loss == "logistic":
+                np.logaddexp(0.0, -out, out=out)
+                totals[start:start + len(chunk)] += out.sum(axis=1)
+            else:
+                # max(0, -m) summed is minus the sum of min(m, 0)
+                np.minimum(out, 0.0, out=out)
+                totals[start:start + len(chunk)] -= out.sum(axis=1)
+    return (totals / max(count, 1)).reshape(len(w1), len(w2))
+
+def _evaluate_band(evaluate, w1, w2):
+    return evaluate(w1, w2)
+
+class LossLandscape:
+    """Losses over a grid of two weights, filled in from coarse to fine.
+
+    ``evaluate(w1, w2)`` returns the (len(w1), len(w2)) losses for 1-D grids
+    of the two weights, e.g. ``functools.partial(linear_losses, features,
+    labels, bias=b)``. Every resolution in ``levels`` is computed as bands of
+    w1 rows; ``losses`` always holds the finest level completed so far, so a
+    coarse image exists after the first few bands and sharpens as finer
+    levels land.
+
+    Small levels run in-process inside ``poll``'s time budget. Levels whose
+    work (cells x ``cost_per_cell``) exceeds ``parallel_work`` are split
+    across a ``ProcessPoolExecutor`` (spawned workers, as in
+    ``CrossValidator``), so ``evaluate`` must then be picklable. ``reset``
+    starts over for new data; results of superseded bands are dropped.
+    """
+
+    def __init__(self, evaluate, w1_range, w2_range, levels=(16, 32, 64, 128), cost_per_cell=1,
+                 parallel_work=20_000_000, workers=None):
+        self.w1_range = w1_range
+        self.w2_range = w2_range
+        self.levels = tuple(levels)
+        self.parallel_work = parallel_work
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 1) - 1))
+        self._executor = None
+        self._futures = []
+        # Bumped whenever ``losses`` changes, for caches drawn from it
+        self.version = 0
+        self.reset(evaluate, cost_per_cell)
+
+    def reset(self, evaluate, cost_per_cell=1):
+        """Start over from the coarsest level with a new evaluate function"""
+        for _, future in self._futures:
+            future.cancel()
+        self.evaluate = evaluate
+        self.cost_per_cell = cost_per_cell
+        self.losses = None
+        self.resolution = 0
+        self.version += 1
+        self._level = -1
+        self._next_level()
+
+    @property
+    def finished(self):
+        return self._pending is None
+
+    def axes(self, resolution=None):
+        """The (w1, w2) grid coordinates of a level (the current one by default)"""
+        resolution = resolution or self.resolution
+        return np.linspace(*self.w1_range, resolution), np.linspace(*self.w2_range, resolution)
+
+    def _next_level(self):
+        self._level += 1
+        if self._level >= len(self.levels):
+            self._pending = None
+            return
+        resolution = self.levels[self._level]
+        w1, w2 = self.axes(resolution)
+        self._pending = np.empty((resolution, resolution))
+        self._pending_resolution = resolution
+        self._filled = 0
+
+        if resolution * resolution * self.cost_per_cell >= self.parallel_work:
+            executor = self._pool()
+            bands = np.array_split(np.arange(resolution), 2 * self.workers)
+            self._futures = [(band, executor.submit(_evaluate_band, self.evaluate, w1[band], w2))
+                             for band in bands if len(band)]
+            self._bands = []
+        else:
+            rows = max(1, resolution // 8)
+            self._bands = [np.arange(start, min(start + rows, resolution)) for start in range(0, resolution, rows)]
+            self._futures = []
+
+    def _pool(self):
+        if self._executor is None:
+            context = multiprocessing.get_context('spawn')
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=context)
+        return self._executor
+
+    def poll(self, budget=0.004):
+        """Advance the refinement; returns True when ``losses`` changed.
+
+        In-process bands run until ``budget`` seconds are used up (always at
+        least one); pooled bands are collected as they finish.
+        """
+        deadline = time.perf_counter() + budget
+        changed = False
+        while self._pending is not None:
+            if self._futures:
+                for entry in [entry for entry in self._futures if entry[1].done()]:
+                    band, future = entry
+                    self._futures.remove(entry)
+                    self._pending[band] = future.result()
+                    self._filled += len(band)
+            else:
+                w1, w2 = self.axes(self._pending_resolution)
+                while self._bands:
+                    band = self._bands.pop(0)
+                    self._pending[band] = self.evaluate(w1[band], w2)
+                    self._filled += len(band)
+                    if time.perf_counter() >= deadline:
+                        break
+
+            if self._filled < self._pending_resolution:
+                break
+            self.losses = self._pending
+            self.resolution = self._pending_resolution
+            self.version += 1
+            changed = True
+            self._next_level()
+            if time.perf_counter() >= deadline:
+                break
+        return changed
+
+    def minimum(self):
+        """(w1, w2, loss) of the lowest cell of the current level, or None before the first level lands"""
+        if self.losses is None:
+            return None
+        i, j = np.unravel_index(np.argmin(self.losses), self.losses.shape)
+        w1, w2 = self.axes()
+        return float(w1[i]), float(w2[j]), float(self.losses[i, j])
+
+    def close(self):
+        """Drop pending work and shut the worker processes down"""
+        for _, future in self._futures:
+            future.cancel()
+        self._futures = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,81 @@
+"""
+Dense layers with preallocated parameter, activation and gradient buffers
+"""
+
+import numpy as np
+from .activations import get_activation, normalize_name
+
+def neuron_output(inputs, weights, bias, activation="linear"):
+    """Output of a single neuron: activation(w · x + b)"""
+    weighted_sum = np.dot(np.asarray(weights, dtype=np.float64), np.asarray(inputs, dtype=np.float64)) + bias
+    forward, _ = get_activation(activation)
+    return float(forward(np.asarray(weighted_sum, dtype=np.float64)))
+
+class DenseLayer:
+    """Fully connected layer computing activation(x @ W + b) for a batch of rows.
+
+    Weights are stored as an (n_inputs, n_outputs) array so ``weights[i][j]``
+    is the connection from input neuron i to output neuron j. Pre-activations,
+    activations and gradients live in buffers sized for ``capacity`` rows that
+    are only reallocated when a larger batch arrives.
+    """
+
+    def __init__(self, n_inputs, n_outputs, activation="linear", dtype=np.float64, capacity=1):
+        self.n_inputs = n_inputs
+        self.n_outputs = n_outputs
+        self.activation = normalize_name(activation)
+        self._forward, self._gradient = get_activation(self.activation)
+        self.dtype = np.dtype(dtype)
+
+        self.weights = np.zeros((n_inputs, n_outputs), dtype=self.dtype)
+        self.bias = np.zeros(n_outputs, dtype=self.dtype)
+        self.grad_weights = np.zeros_like(self.weights)
+        self.grad_bias = np.zeros_like(self.bias)
+
+        self.batch_size = 0
+        self._inputs = None
+        self._allocate(max(1, capacity))
+
+    def _allocate(self, capacity):
+        """(Re)allocate per-row buffers for up to capacity rows"""
+        self.capacity = capacity
+        self.z = np.zeros((capacity, self.n_outputs), dtype=self.dtype)
+        self.outputs = np.zeros((capacity, self.n_outputs), dtype=self.dtype)
+        self._grad_z = np.zeros((capacity, self.n_outputs), dtype=self.dtype)
+        self._grad_inputs = np.zeros((capacity, self.n_inputs), dtype=self.dtype)
+
+    def reserve(self, rows):
+        """Make sure the buffers can hold a batch of rows"""
+        if rows > self.capacity:
+            self._allocate(max(rows, 2 * self.capacity))
+
+    def initialize(self, rng=None, weight_scale=0.5, bias_scale=0.1):
+        """Fill weights and bias with scaled Gaussian noise"""
+        rng = rng or np.random.default_rng()
+        self.weights[...] = rng.standard_normal(self.weights.shape) * weight_scale
+        self.bias[...] = rng.standard_normal(self.bias.shape) * bias_scale
+
+    def forward(self, inputs):
+        """Compute activations for a (batch, n_inputs) array; returns a view of the output buffer"""
+        rows = len(inputs)
+        self.reserve(rows)
+        self.batch_size = rows
+        self._inputs = inputs
+
+        z = self.z[:rows]
+        np.matmul(inputs, self.weights, out=z)
+        z += self.bias
+        return self._forward(z, out=self.outputs[:rows])
+
+    def backward(self, grad_outputs):
+        """Accumulate dL/dW, dL/db from dL/d(outputs) and return dL/d(inputs)"""
+        rows = self.batch_size
+        grad_z = self._gradient(self.z[:rows], self.outputs[:rows], grad_outputs, out=self._grad_z[:rows])
+        np.matmul(self._inputs.T, grad_z, out=self.grad_weights)
+        np.sum(grad_z, axis=0, out=self.grad_bias)
+        return np.matmul(grad_z, self.weights.T, out=self._grad_inputs[:rows])
+
+    def apply_gradients(self, learning_rate):
+        """Plain gradient-descent update"""
+        self.weights -= learning_rate * self.grad_weights
+        self.bias -= learning_rate * self.grad_bias
@@ -0,0 +1,26 @@
+"""
+Loss functions returning the loss value and its gradient with respect to the outputs
+"""
+
+import numpy as np
+
+def softmax_cross_entropy(logits, labels):
+    """Mean cross-entropy of softmax(logits) against integer labels; returns (loss, dL/dlogits)"""
+    rows = len(labels)
+    shifted = logits - np.max(logits, axis=1, keepdims=True)
+    exp = np.exp(shifted)
+    sums = exp.sum(axis=1, keepdims=True)
+    probabilities = exp / sums
+
+    picked = np.arange(rows), np.asarray(labels, dtype=np.intp)
+    loss = float(np.mean(np.log(sums[:, 0]) - shifted[picked]))
+
+    grad = probabilities
+    grad[picked] -= 1.0
+    grad /= rows
+    return loss, grad
+
+def mean_squared_error(outputs, targets):
+    """Mean squared error; returns (loss, dL/doutputs)"""
+    diff = outputs - targets
+    return float(np.mean(diff * diff)), diff * (2.0 / diff.size)
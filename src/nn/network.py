@@ -0,0 +1,186 @@
+"""
+Feedforward network built from preallocated dense layers
+"""
+
+import numpy as np
+from .layers import DenseLayer
+
+class Network:
+    """Stack of dense layers with batched forward and backward passes.
+
+    ``activations`` exposes the input buffer followed by every layer's output
+    buffer, so challenges can render and edit values in place instead of
+    copying them into lists.
+
+    The network also tracks which layers are up to date. Editing a weight of
+    layer k only invalidates layers k onward (see ``mark_dirty``), and
+    ``refresh`` recomputes just those layers.
+    """
+
+    def __init__(self, layer_sizes, activations, dtype=np.float64, capacity=1,
+                 rng=None, weight_scale=0.5, bias_scale=0.1):
+        if len(activations) != len(layer_sizes) - 1:
+            raise ValueError("Need one activation per non-input layer")
+
+        self.layer_sizes = list(layer_sizes)
+        self.dtype = np.dtype(dtype)
+        self.layers = [
+            DenseLayer(n_in, n_out, activation, self.dtype, capacity)
+            for n_in, n_out, activation in zip(layer_sizes[:-1], layer_sizes[1:], activations)
+        ]
+        rng = rng or np.random.default_rng()
+        for layer in self.layers:
+            layer.initialize(rng, weight_scale, bias_scale)
+
+        self._inputs = np.zeros((max(1, capacity), layer_sizes[0]), dtype=self.dtype)
+        self.batch_size = 1
+
+        # Layers [0, _valid) hold up-to-date outputs; [0, _target) have been requested
+        self._valid = 0
+        self._target = 0
+
+    @property
+    def weights(self):
+        return [layer.weights for layer in self.layers]
+
+    @property
+    def biases(self):
+        return [layer.bias for layer in self.layers]
+
+    @property
+    def activations(self):
+        """Input and per-layer output buffers for the current batch"""
+        rows = self.batch_size
+        return [self._inputs[:rows]] + [layer.outputs[:rows] for layer in self.layers]
+
+    @property
+    def output(self):
+        return self.layers[-1].outputs[:self.batch_size]
+
+    def set_input(self, inputs):
+        """Copy a (batch, n_inputs) or (n_inputs,) array into the input buffer"""
+        inputs = np.asarray(inputs, dtype=self.dtype)
+        if inputs.ndim == 1:
+            inputs = inputs[None, :]
+        rows = len(inputs)
+        if rows > len(self._inputs):
+            self._inputs = np.zeros((max(rows, 2 * len(self._inputs)), self.layer_sizes[0]), dtype=self.dtype)
+        self._inputs[:rows] = inputs
+        self.batch_size = rows
+        for layer in self.layers:
+            layer.reserve(rows)
+        self.mark_dirty(0)
+
+    def mark_dirty(self, index):
+        """Flag layer index (and every layer after it) as needing recomputation.
+
+        Call with 0 after editing the input buffer in place, or with k after
+        editing ``layers[k].weights`` / ``layers[k].bias``.
+        """
+        self._valid = min(self._valid, index)
+
+    def is_dirty(self):
+        return self._valid < self._target
+
+    def refresh(self):
+        """Recompute only stale layers among those already computed; returns their indices"""
+        stale = range(self._valid, self._target)
+        for index in stale:
+            self.forward_layer(index)
+        return stale
+
+    def forward_layer(self, index):
+        """Recompute layer index from the stored activations of the layer before it"""
+        previous = self._inputs[:self.batch_size] if index == 0 else self.layers[index - 1].outputs[:self.batch_size]
+        outputs = self.layers[index].forward(previous)
+        if index <= self._valid:
+            self._valid = index + 1
+        self._target = max(self._target, index + 1)
+        return outputs
+
+    def forward(self, inputs=None):
+        """Run the full forward pass; returns a 1-D output for 1-D input"""
+        squeeze = inputs is not None and np.ndim(inputs) == 1
+        if inputs is not None:
+            self.set_input(inputs)
+        for index in range(len(self.layers)):
+            self.forward_layer(index)
+        return self.output[0] if squeeze else self.output
+
+    def backward(self, grad_output):
+        """Backpropagate dL/d(output) through every layer; returns dL/d(input)"""
+        grad = np.asarray(grad_output, dtype=self.dtype).reshape(self.batch_size, -1)
+        for layer in reversed(self.layers):
+            grad = layer.backward(grad)
+        return grad
+
+    @property
+    def parameter_count(self):
+        return sum(layer.weights.size + layer.bias.size for layer in self.layers)
+
+    def flat_parameters(self, out=None):
+        """All weights and biases concatenated layer by layer into one vector"""
+        return np.concatenate([p.ravel() for layer in self.layers for p in (layer.weights, layer.bias)], out=out)
+
+    def set_flat_parameters(self, vector):
+        """Copy a vector laid out like ``flat_parameters`` back into the weights and biases"""
+        offset = 0
+        for layer in self.layers:
+            for p in (layer.weights, layer.bias):
+                p[...] = vector[offset:offset + p.size].reshape(p.shape)
+                offset += p.size
+        self.mark_dirty(0)
+
+    def flat_gradients(self, out=None):
+        """Gradients from the last backward pass, in the same order as ``flat_parameters``"""
+        return np.concatenate([g.ravel() for layer in self.layers for g in (layer.grad_weights, layer.grad_bias)], out=out)
+
+    def gradient_norms(self, out=None):
+        """L2 norm of each layer's weight gradient"""
+        if out is None:
+            out = np.empty(len(self.layers), dtype=self.dtype)
+        for index, layer in enumerate(self.layers):
+            out[index] = np.linalg.norm(layer.grad_weights)
+        return out
+
+    def weight_norms(self, out=None):
+        """L2 norm of each layer's weight matrix"""
+        if out is None:
+            out = np.empty(len(self.layers), dtype=self.dtype)
+        for index, layer in enumerate(self.layers):
+            out[index] = np.linalg.norm(layer.weights)
+        return out
+
+    def save(self, path, **metadata):
+        """Write weights, biases and any extra metadata arrays to an .npz checkpoint"""
+        arrays = dict(metadata)
+        arrays['layer_sizes'] = np.array(self.layer_sizes)
+        for index, layer in enumerate(self.layers):
+            arrays[f'weights_{index}'] = layer.weights
+            arrays[f'bias_{index}'] = layer.bias
+        np.savez(path, **arrays)
+
+    def load(self, path):
+        """Restore weights and biases in place from ``save``; returns the metadata arrays"""
+        with np.load(path) as data:
+            if list(data['layer_sizes']) != self.layer_sizes:
+                raise ValueError(f"Checkpoint layer sizes {list(data['layer_sizes'])} do not match {self.layer_sizes}")
+            for index, layer in enumerate(self.layers):
+                layer.weights[...] = data[f'weights_{index}']
+                layer.bias[...] = data[f'bias_{index}']
+            metadata = {key: data[key] for key in data.files
+                        if key != 'layer_sizes' and not key.startswith(('weights_', 'bias_'))}
+        self.mark_dirty(0)
+        return metadata
+
+    def apply_gradients(self, learning_rate):
+        for layer in self.layers:
+            layer.apply_gradients(learning_rate)
+
+    def reset_activations(self):
+        """Zero every layer's outputs (inputs are left untouched)"""
+        for layer in self.layers:
+            layer.z.fill(0)
+            layer.outputs.fill(0)
+        self._valid = 0
+        self._target = 0
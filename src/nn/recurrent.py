@@ -0,0 +1,534 @@
+"""
+Recurrent layers unrolled over batches of sequences with cached hidden states
+"""
+
+import time
+import numpy as np
+from .activations import get_activation, normalize_name, sigmoid
+
+def _orthogonal(rng, size, scale=1.0):
+    """Random orthogonal (size, size) matrix, which keeps a linear recurrence norm-preserving"""
+    orthogonal, _ = np.linalg.qr(rng.standard_normal((size, size)))
+    return orthogonal * scale
+
+class RNN:
+    """Elman RNN h_t = f(x_t W_x + h_{t-1} W_h + b), unrolled over a batch of sequences.
+
+    Sequences are stored time-major as ``(steps, batch, n_inputs)`` and every
+    hidden state is kept in ``states`` (``states[t]`` is the state *before*
+    step t, so ``states[0]`` is the initial state). Steps [0, valid_steps)
+    are up to date; editing the input of step t with ``set_input`` (or
+    calling ``mark_dirty(t)``) only invalidates steps t onward, and the next
+    ``unroll`` resumes from there instead of re-running the whole sequence.
+
+    The input projection x_t W_x + b is computed for a whole block of steps
+    in one matrix multiply; only the recurrence itself is stepped one time
+    step at a time, for every sequence in the batch at once. ``unroll`` also
+    takes a time budget, so long sequences can be brought up to date over
+    several frames.
+
+    For truncated backpropagation through time over a stream, size the
+    buffers to the truncation window, feed each window with
+    ``set_sequences(window, initial_state=rnn.states[-1])`` and call
+    ``backward``; memory then depends on the window, not the stream length.
+    """
+
+    PROJECTION_BLOCK = 256
+
+    def __init__(self, n_inputs, n_hidden, activation="tanh", dtype=np.float64, rng=None,
+                 weight_scale=1.0, recurrent_scale=1.0):
+        self.n_inputs = n_inputs
+        self.n_hidden = n_hidden
+        self.activation = normalize_name(activation)
+        self._forward, self._gradient = get_activation(self.activation)
+        self.dtype = np.dtype(dtype)
+
+        rng = rng or np.random.default_rng()
+        self.input_weights = rng.standard_normal((n_inputs, n_hidden)).astype(self.dtype) * weight_scale
+        self.recurrent_weights = _orthogonal(rng, n_hidden, recurrent_scale).astype(self.dtype)
+        self.bias = np.zeros(n_hidden, dtype=self.dtype)
+        self.grad_input_weights = np.zeros_like(self.input_weights)
+        self.grad_recurrent_weights = np.zeros_like(self.recurrent_weights)
+        self.grad_bias = np.zeros_like(self.bias)
+
+        self._allocate(0, 1)
+
+    def _allocate(self, steps, batch):
+        self.inputs = np.zeros((steps, batch, self.n_inputs), dtype=self.dtype)
+        self.states = np.zeros((steps + 1, batch, self.n_hidden), dtype=self.dtype)
+        # z[t] holds the input projection until step t is unrolled, then its full pre-activation
+        self.z = np.zeros((steps, batch, self.n_hidden), dtype=self.dtype)
+        self._grad_z = np.zeros_like(self.z)
+        self._grad_state = np.zeros((batch, self.n_hidden), dtype=self.dtype)
+        self.step_gradient_norms = np.zeros(steps, dtype=self.dtype)
+        # Steps [0, _valid) have up-to-date states[1:_valid + 1]; [0, _projected_valid) have projections
+        self._valid = 0
+        self._projected_valid = 0
+
+    @property
+    def steps(self):
+        return len(self.inputs)
+
+    @property
+    def batch_size(self):
+        return self.inputs.shape[1]
+
+    @property
+    def valid_steps(self):
+        return self._valid
+
+    @property
+    def nbytes(self):
+        """Bytes held by the per-step buffers"""
+        return sum(buffer.nbytes for buffer in (self.inputs, self.states, self.z, self._grad_z))
+
+    def set_sequences(self, inputs, initial_state=None):
+        """Copy (steps, batch, n_inputs) sequences into the input buffer and invalidate every step"""
+        inputs = np.asarray(inputs, dtype=self.dtype)
+        steps, batch, _ = inputs.shape
+        if initial_state is not None:
+            # Copy first: the caller may pass a view of the buffers about to be replaced
+            initial_state = np.array(initial_state, dtype=self.dtype)
+        if self.inputs.shape != inputs.shape:
+            self._allocate(steps, batch)
+        self.inputs[...] = inputs
+        self.states[0] = 0 if initial_state is None else initial_state
+        self.mark_dirty(0)
+
+    def set_input(self, step, values, rows=slice(None)):
+        """Edit the input of one step (for all or some sequences); only steps from there on go stale"""
+        self.inputs[step, rows] = values
+        self.mark_dirty(step)
+
+    def set_inputs(self, start, values):
+        """Overwrite a block of consecutive steps starting at start with (n_steps, batch, n_inputs) values"""
+        values = np.asarray(values, dtype=self.dtype)
+        self.inputs[start:start + len(values)] = values
+        self.mark_dirty(start)
+
+    def mark_dirty(self, step):
+        """Flag step (and every step after it) as needing recomputation.
+
+        Call with 0 after editing the weights, the bias or ``states[0]``.
+        """
+        self._valid = min(self._valid, step)
+        self._projected_valid = min(self._projected_valid, step)
+
+    def unroll(self, until=None, budget=None):
+        """Bring steps up to ``until`` (default: all) up to date; returns valid_steps.
+
+        With a ``budget`` in seconds, stops early once it is used up (always
+        making some progress), so callers can spread a long unroll over frames.
+        """
+        until = self.steps if until is None else min(until, self.steps)
+        deadline = None if budget is None else time.perf_counter() + budget
+        states, z = self.states, self.z
+        recurrent = self.recurrent_weights
+        forward = self._forward
+
+        while self._valid < until:
+            if self._projected_valid <= self._valid:
+                # Project a whole block of inputs at once
+                start = self._valid
+                end = min(self.steps, start + self.PROJECTION_BLOCK)
+                np.matmul(self.inputs[start:end], self.input_weights, out=z[start:end])
+                z[start:end] += self.bias
+                self._projected_valid = end
+
+            stop = min(until, self._projected_valid)
+            for step in range(self._valid, stop):
+                h = states[step + 1]
+                np.matmul(states[step], recurrent, out=h)
+                z[step] += h
+                forward(z[step], out=h)
+                if deadline is not None and step % 16 == 15 and time.perf_counter() > deadline:
+                    self._valid = step + 1
+                    return self._valid
+            self._valid = stop
+        return self._valid
+
+    def hidden(self, step):
+        """(batch, n_hidden) state after step (unrolling up to it first if needed)"""
+        self.unroll(step + 1)
+        return self.states[step + 1]
+
+    def backward(self, state_grads):
+        """Backpropagate through every step; returns dL/d(initial state).
+
+        ``state_grads`` is (steps, batch, n_hidden) dL/dh_t for ``states[1:]``
+        (zeros where a step has no loss). Fills the ``grad_*`` buffers, and
+        ``step_gradient_norms[t]`` with the norm of the total gradient reaching
+        h_t, which shows how far back the error signal survives.
+        """
+        self.unroll()
+        grad_h = self._grad_state
+        grad_h.fill(0)
+        for step in range(self.steps - 1, -1, -1):
+            grad_h += state_grads[step]
+            self.step_gradient_norms[step] = np.sqrt(np.vdot(grad_h, grad_h))
+            grad_z = self._gradient(self.z[step], self.states[step + 1], grad_h, out=self._grad_z[step])
+            np.matmul(grad_z, self.recurrent_weights.T, out=grad_h)
+
+        grad_z = self._grad_z.reshape(-1, self.n_hidden)
+        np.matmul(self.inputs.reshape(-1, self.n_inputs).T, grad_z, out=self.grad_input_weights)
+        np.matmul(self.states[:-1].reshape(-1, self.n_hidden).T, grad_z, out=self.grad_recurrent_weights)
+        np.sum(grad_z, axis=0, out=self.grad_bias)
+        return grad_h
+
+    def gradient_norm(self):
+        return np.sqrt(sum(np.vdot(g, g) for g in (self.grad_input_weights, self.grad_recurrent_weights, self.grad_bias)))
+
+    def apply_gradients(self, learning_rate, max_norm=None):
+        """Gradient-descent update, rescaling the gradient to at most ``max_norm`` if given"""
+        if max_norm is not None:
+            learning_rate *= min(1.0, max_norm / (self.gradient_norm() + 1e-12))
+        self.input_weights -= learning_rate * self.grad_input_weights
+        self.recurrent_weights -= learning_rate * self.grad_recurrent_weights
+        self.bias -= learning_rate * self.grad_bias
+        self.mark_dirty(0)
+
+class LSTM:
+    """LSTM over a batch of sequences, with all four gates computed by one fused multiply per step.
+
+    The gate weights are stacked into ``input_weights`` (n_inputs, 4H) and
+    ``recurrent_weights`` (H, 4H) in the order input, forget, output,
+    candidate. As in ``RNN``, the input half x_t W_x + b is projected for a
+    block of steps at once; each step then adds a single W_h^T h_{t-1}
+    product for all four gates and evaluates them in place in ``gates``.
+
+    Internally every buffer is hidden-major, ``(steps, units, batch)``, so
+    each gate is a contiguous block of rows of the fused product and the
+    three sigmoid gates are squashed in one call. ``states`` and ``cells``
+    are (steps + 1, batch, H) views of those buffers, matching ``RNN``.
+    Every buffer is allocated by ``set_sequences`` for a given (steps, batch)
+    and reused afterwards.
+
+    Used with window-sized buffers and ``set_sequences(window,
+    lstm.states[-1], lstm.cells[-1])`` it performs truncated backpropagation
+    through time over an endless stream in constant memory.
+    """
+
+    PROJECTION_BLOCK = 256
+
+    def __init__(self, n_inputs, n_hidden, dtype=np.float64, rng=None, weight_scale=None, forget_bias=1.0):
+        self.n_inputs = n_inputs
+        self.n_hidden = n_hidden
+        self.dtype = np.dtype(dtype)
+
+        rng = rng or np.random.default_rng()
+        if weight_scale is None:
+            weight_scale = 1.0 / np.sqrt(n_inputs + n_hidden)
+        self.input_weights = (rng.standard_normal((n_inputs, 4 * n_hidden)) * weight_scale).astype(self.dtype)
+        self.recurrent_weights = np.hstack([_orthogonal(rng, n_hidden) for _ in range(4)]).astype(self.dtype)
+        self.bias = np.zeros(4 * n_hidden, dtype=self.dtype)
+        # A positive forget bias starts the cell out remembering
+        self.bias[n_hidden:2 * n_hidden] = forget_bias
+        self.grad_input_weights = np.zeros_like(self.input_weights)
+        self.grad_recurrent_weights = np.zeros_like(self.recurrent_weights)
+        self.grad_bias = np.zeros_like(self.bias)
+
+        self._allocate(0, 1)
+
+    def _allocate(self, steps, batch):
+        hidden = self.n_hidden
+        self.inputs = np.zeros((steps, batch, self.n_inputs), dtype=self.dtype)
+        self._states = np.zeros((steps + 1, hidden, batch), dtype=self.dtype)
+        self._cells = np.zeros((steps + 1, hidden, batch), dtype=self.dtype)
+        self.states = self._states.transpose(0, 2, 1)
+        self.cells = self._cells.transpose(0, 2, 1)
+        # gates[t] holds the input projection until step t is unrolled, then the activated gates
+        self.gates = np.zeros((steps, 4 * hidden, batch), dtype=self.dtype)
+        self._cell_tanh = np.zeros((steps, hidden, batch), dtype=self.dtype)
+        self._grad_gates = np.zeros_like(self.gates)
+        self._recurrent = np.zeros((4 * hidden, batch), dtype=self.dtype)
+        self._scratch = np.zeros((3 * hidden, batch), dtype=self.dtype)
+        self._grad_state = np.zeros((hidden, batch), dtype=self.dtype)
+        self._grad_cell = np.zeros((hidden, batch), dtype=self.dtype)
+        self.step_gradient_norms = np.zeros(steps, dtype=self.dtype)
+        self._valid = 0
+        self._projected_valid = 0
+
+    @property
+    def steps(self):
+        return len(self.inputs)
+
+    @property
+    def batch_size(self):
+        return self.inputs.shape[1]
+
+    @property
+    def valid_steps(self):
+        return self._valid
+
+    @property
+    def nbytes(self):
+        """Bytes held by the per-step buffers"""
+        buffers = (self.inputs, self._states, self._cells, self.gates, self._cell_tanh, self._grad_gates)
+        return sum(buffer.nbytes for buffer in buffers)
+
+    def set_sequences(self, inputs, initial_state=None, initial_cell=None):
+        """Copy (steps, batch, n_inputs) sequences into the input buffer and invalidate every step"""
+        inputs = np.asarray(inputs, dtype=self.dtype)
+        steps, batch, _ = inputs.shape
+        if initial_state is not None:
+            initial_state = np.array(initial_state, dtype=self.dtype)
+        if initial_cell is not None:
+            initial_cell = np.array(initial_cell, dtype=self.dtype)
+        if self.inputs.shape != inputs.shape:
+            self._allocate(steps, batch)
+        self.inputs[...] = inputs
+        self.states[0] = 0 if initial_state is None else initial_state
+        self.cells[0] = 0 if initial_cell is None else initial_cell
+        self.mark_dirty(0)
+
+    def set_inputs(self, start, values):
+        """Overwrite a block of consecutive steps starting at start with (n_steps, batch, n_inputs) values"""
+        values = np.asarray(values, dtype=self.dtype)
+        self.inputs[start:start + len(values)] = values
+        self.mark_dirty(start)
+
+    def mark_dirty(self, step):
+        """Flag step (and every step after it) as needing recomputation"""
+        self._valid = min(self._valid, step)
+        self._projected_valid = min(self._projected_valid, step)
+
+    def unroll(self, until=None, budget=None):
+        """Bring steps up to ``until`` (default: all) up to date; returns valid_steps"""
+        until = self.steps if until is None else min(until, self.steps)
+        deadline = None if budget is None else time.perf_counter() + budget
+        hidden = self.n_hidden
+        states, cells, gates = self._states, self._cells, self.gates
+        recurrent, candidate = self._recurrent, self._scratch[:hidden]
+        recurrent_weights = self.recurrent_weights.T
+
+        while self._valid < until:
+            if self._projected_valid <= self._valid:
+                start = self._valid
+                end = min(self.steps, start + self.PROJECTION_BLOCK)
+                np.matmul(self.input_weights.T, self.inputs[start:end].transpose(0, 2, 1), out=gates[start:end])
+                gates[start:end] += self.bias[:, None]
+                self._projected_valid = end
+
+            stop = min(until, self._projected_valid)
+            for step in range(self._valid, stop):
+                gate = gates[step]
+                np.matmul(recurrent_weights, states[step], out=recurrent)
+                gate += recurrent
+                sigmoid(gate[:3 * hidden], out=gate[:3 * hidden])
+                np.tanh(gate[3 * hidden:], out=gate[3 * hidden:])
+
+                # c_t = f * c_{t-1} + i * g;  h_t = o * tanh(c_t)
+                cell = cells[step + 1]
+                np.multiply(gate[hidden:2 * hidden], cells[step], out=cell)
+                np.multiply(gate[:hidden], gate[3 * hidden:], out=candidate)
+                cell += candidate
+                np.tanh(cell, out=self._cell_tanh[step])
+                np.multiply(gate[2 * hidden:3 * hidden], self._cell_tanh[step], out=states[step + 1])
+                if deadline is not None and step % 16 == 15 and time.perf_counter() > deadline:
+                    self._valid = step + 1
+                    return self._valid
+            self._valid = stop
+        return self._valid
+
+    def hidden(self, step):
+        """(batch, n_hidden) state after step (unrolling up to it first if needed)"""
+        self.unroll(step + 1)
+        return self.states[step + 1]
+
+    def backward(self, state_grads):
+        """Backpropagate through every step; returns (dL/dh_0, dL/dc_0) as (batch, n_hidden).
+
+        Same contract as ``RNN.backward``: ``state_grads`` is dL/dh_t for
+        ``states[1:]`` and ``step_gradient_norms`` gets the norm of the total
+        gradient reaching each h_t.
+        """
+        self.unroll()
+        hidden = self.n_hidden
+        grad_h, grad_c = self._grad_state, self._grad_cell
+        grad_h.fill(0)
+        grad_c.fill(0)
+        scratch = self._scratch
+        tmp = scratch[:hidden]
+
+        for step in range(self.steps - 1, -1, -1):
+            grad_h += state_grads[step].T
+            self.step_gradient_norms[step] = np.sqrt(np.vdot(grad_h, grad_h))
+
+            gate, grad_gate = self.gates[step], self._grad_gates[step]
+            cell_tanh = self._cell_tanh[step]
+
+            # dL/dc_t is the carried gradient plus the path through h_t = o * tanh(c_t)
+            np.multiply(cell_tanh, cell_tanh, out=tmp)
+            np.subtract(1, tmp, out=tmp)
+            tmp *= gate[2 * hidden:3 * hidden]
+            tmp *= grad_h
+            grad_c += tmp
+
+            np.multiply(grad_c, gate[3 * hidden:], out=grad_gate[:hidden])                 # input
+            np.multiply(grad_c, self._cells[step], out=grad_gate[hidden:2 * hidden])      # forget
+            np.multiply(grad_h, cell_tanh, out=grad_gate[2 * hidden:3 * hidden])          # output
+            np.multiply(grad_c, gate[:hidden], out=grad_gate[3 * hidden:])                # candidate
+            grad_c *= gate[hidden:2 * hidden]
+
+            # Back through the gate nonlinearities to the fused pre-activation
+            np.subtract(1, gate[:3 * hidden], out=scratch)
+            scratch *= gate[:3 * hidden]
+            grad_gate[:3 * hidden] *= scratch
+            np.multiply(gate[3 * hidden:], gate[3 * hidden:], out=tmp)
+            np.subtract(1, tmp, out=tmp)
+            grad_gate[3 * hidden:] *= tmp
+
+            np.matmul(self.recurrent_weights, grad_gate, out=grad_h)
+
+        grad_gates = self._grad_gates
+        self.grad_input_weights[...] = np.tensordot(self.inputs, grad_gates, axes=([0, 1], [0, 2]))
+        self.grad_recurrent_weights[...] = np.tensordot(self._states[:-1], grad_gates, axes=([0, 2], [0, 2]))
+        np.sum(grad_gates, axis=(0, 2), out=self.grad_bias)
+        return grad_h.T, grad_c.T
+
+    def gradient_norm(self):
+        return np.sqrt(sum(np.vdot(g, g) for g in (self.grad_input_weights, self.grad_recurrent_weights, self.grad_bias)))
+
+    def apply_gradients(self, learning_rate, max_norm=None):
+        """Gradient-descent update, rescaling the gradient to at most ``max_norm`` if given"""
+        if max_norm is not None:
+            learning_rate *= min(1.0, max_norm / (self.gradient_norm() + 1e-12))
+        self.input_weights -= learning_rate * self.grad_input_weights
+        self.recurrent_weights -= learning_rate * self.grad_recurrent_weights
+        self.bias -= learning_rate * self.grad_bias
+        self.mark_dirty(0)
+
+class GRU:
+    """GRU over a batch of sequences, with the recurrent half of all three gates fused into one multiply.
+
+    Gates are stacked in the order update, reset, candidate, and the reset
+    gate is applied after the recurrent product (as cuDNN does), so
+    n_t = tanh(x_t W_xn + b_n + r_t * (h_{t-1} W_hn)) and one W_h^T h_{t-1}
+    per step serves all three gates. h_t = (1 - z_t) * n_t + z_t * h_{t-1}.
+    Buffers are hidden-major like ``LSTM``'s, with ``states`` exposed as a
+    (steps + 1, batch, H) view, and the same dirty-step bookkeeping as ``RNN``.
+
+    If ``gate_log`` is a ``RingBuffer`` with ``update`` and ``reset`` fields of
+    shape (H,), the update and reset gates of sequence ``log_row`` are
+    appended to it at every step unrolled, so a float16 ring can hold a long
+    gate history for display.
+    """
+
+    PROJECTION_BLOCK = 256
+
+    def __init__(self, n_inputs, n_hidden, dtype=np.float64, rng=None, weight_scale=None,
+                 recurrent_scale=1.0, gate_log=None, log_row=0):
+        self.n_inputs = n_inputs
+        self.n_hidden = n_hidden
+        self.dtype = np.dtype(dtype)
+        self.gate_log = gate_log
+        self.log_row = log_row
+
+        rng = rng or np.random.default_rng()
+        if weight_scale is None:
+            weight_scale = 1.0 / np.sqrt(n_inputs)
+        self.input_weights = (rng.standard_normal((n_inputs, 3 * n_hidden)) * weight_scale).astype(self.dtype)
+        self.recurrent_weights = np.hstack([_orthogonal(rng, n_hidden, recurrent_scale) for _ in range(3)]).astype(self.dtype)
+        self.bias = np.zeros(3 * n_hidden, dtype=self.dtype)
+
+        self._allocate(0, 1)
+
+    def _allocate(self, steps, batch):
+        hidden = self.n_hidden
+        self.inputs = np.zeros((steps, batch, self.n_inputs), dtype=self.dtype)
+        self._states = np.zeros((steps + 1, hidden, batch), dtype=self.dtype)
+        self.states = self._states.transpose(0, 2, 1)
+        # gates[t] holds the input projection until step t is unrolled, then z, r and n
+        self.gates = np.zeros((steps, 3 * hidden, batch), dtype=self.dtype)
+        self._recurrent = np.zeros((3 * hidden, batch), dtype=self.dtype)
+        self._valid = 0
+        self._projected_valid = 0
+
+    @property
+    def steps(self):
+        return len(self.inputs)
+
+    @property
+    def batch_size(self):
+        return self.inputs.shape[1]
+
+    @property
+    def valid_steps(self):
+        return self._valid
+
+    @property
+    def nbytes(self):
+        """Bytes held by the per-step buffers"""
+        return sum(buffer.nbytes for buffer in (self.inputs, self._states, self.gates))
+
+    def set_sequences(self, inputs, initial_state=None):
+        """Copy (steps, batch, n_inputs) sequences into the input buffer and invalidate every step"""
+        inputs = np.asarray(inputs, dtype=self.dtype)
+        steps, batch, _ = inputs.shape
+        if initial_state is not None:
+            initial_state = np.array(initial_state, dtype=self.dtype)
+        if self.inputs.shape != inputs.shape:
+            self._allocate(steps, batch)
+        self.inputs[...] = inputs
+        self.states[0] = 0 if initial_state is None else initial_state
+        self.mark_dirty(0)
+
+    def set_inputs(self, start, values):
+        """Overwrite a block of consecutive steps starting at start with (n_steps, batch, n_inputs) values"""
+        values = np.asarray(values, dtype=self.dtype)
+        self.inputs[start:start + len(values)] = values
+        self.mark_dirty(start)
+
+    def mark_dirty(self, step):
+        """Flag step (and every step after it) as needing recomputation"""
+        self._valid = min(self._valid, step)
+        self._projected_valid = min(self._projected_valid, step)
+
+    def unroll(self, until=None, budget=None):
+        """Bring steps up to ``until`` (default: all) up to date; returns valid_steps"""
+        until = self.steps if until is None else min(until, self.steps)
+        deadline = None if budget is None else time.perf_counter() + budget
+        hidden = self.n_hidden
+        states, gates = self._states, self.gates
+        recurrent = self._recurrent
+        recurrent_weights = self.recurrent_weights.T
+        log, row = self.gate_log, self.log_row
+
+        while self._valid < until:
+            if self._projected_valid <= self._valid:
+                start = self._valid
+                end = min(self.steps, start + self.PROJECTION_BLOCK)
+                np.matmul(self.input_weights.T, self.inputs[start:end].transpose(0, 2, 1), out=gates[start:end])
+                gates[start:end] += self.bias[:, None]
+                self._projected_valid = end
+
+            stop = min(until, self._projected_valid)
+            for step in range(self._valid, stop):
+                gate = gates[step]
+                update, reset, candidate = gate[:hidden], gate[hidden:2 * hidden], gate[2 * hidden:]
+                np.matmul(recurrent_weights, states[step], out=recurrent)
+                gate[:2 * hidden] += recurrent[:2 * hidden]
+                sigmoid(gate[:2 * hidden], out=gate[:2 * hidden])
+                recurrent[2 * hidden:] *= reset
+                candidate += recurrent[2 * hidden:]
+                np.tanh(candidate, out=candidate)
+
+                # h_t = n + z * (h_{t-1} - n)
+                h = states[step + 1]
+                np.subtract(states[step], candidate, out=h)
+                h *= update
+                h += candidate
+                if log is not None:
+                    log.slot('update')[...] = update[:, row]
+                    log.slot('reset')[...] = reset[:, row]
+                    log.commit()
+                if deadline is not None and step % 16 == 15 and time.perf_counter() > deadline:
+                    self._valid = step + 1
+                    return self._valid
+            self._valid = stop
+        return self._valid
+
+    def hidden(self, step):
+        """(batch, n_hidden) state after step (unrolling up to it first if needed)"""
+        self.unroll(step + 1)
+        return self.states[step + 1]
@@ -0,0 +1,133 @@
+"""
+Fixed-capacity ring buffer of NumPy records for one writer thread and one reader
+"""
+
+import numpy as np
+
+class RingBuffer:
+    """Preallocated single-producer / single-consumer ring of structured records.
+
+    Each field is a ``(capacity, *shape)`` array. The writer fills the next
+    slot in place and then bumps ``count``; the reader never takes a lock.
+    Instead it snapshots ``count``, copies the slots it wants, and re-reads
+    ``count`` afterwards: any record the writer could have started
+    overwriting during the copy is dropped, so readers only ever see whole
+    records. Reading is safe at any rate (e.g. 60 FPS) while the writer runs
+    thousands of steps per second.
+    """
+
+    def __init__(self, capacity, fields, dtype=np.float64):
+        self.capacity = int(capacity)
+        self.fields = {name: tuple(shape) for name, shape in fields.items()}
+        self._data = {name: np.zeros((self.capacity,) + shape, dtype=dtype)
+                      for name, shape in self.fields.items()}
+        # Total records ever committed; a single int assignment, atomic under the GIL
+        self._count = 0
+
+    @property
+    def count(self):
+        return self._count
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    def clear(self):
+        self._count = 0
+
+    def slot(self, field):
+        """Writer side: view of field in the slot the next commit will publish"""
+        # Indexing with an Ellipsis keeps scalar fields as writable 0-d views
+        return self._data[field][self._count % self.capacity, ...]
+
+    def commit(self):
+        """Writer side: publish the slot filled through ``slot``"""
+        self._count += 1
+
+    def append(self, **values):
+        """Writer side: fill every given field of the next slot and publish it"""
+        index = self._count % self.capacity
+        for name, value in values.items():
+            self._data[name][index] = value
+        self._count += 1
+
+    def read(self, field, since=0, limit=None):
+        """Copy records with sequence numbers >= since; returns (first_sequence, array).
+
+        At most ``limit`` of the newest records are returned. Records lost to
+        wrap-around (or overwritten while copying) are skipped, so
+        ``first_sequence`` may be larger than ``since``.
+        """
+        end = self._count
+        start = max(since, end - self.capacity)
+        if limit is not None:
+            start = max(start, end - limit)
+        if start >= end:
+            return end, self._data[field][:0].copy()
+
+        positions = np.arange(start, end) % self.capacity
+        values = self._data[field][positions]
+
+        # Drop anything the writer may have started overwriting meanwhile
+        safe_start = self._count - self.capacity + 1
+        if safe_start > start:
+            values = values[safe_start - start:]
+            start = safe_start
+        return start, values
+
+    def latest(self, field):
+        """Copy of the newest committed record of field, or None if empty"""
+        _, values = self.read(field, limit=1)
+        return values[-1] if len(values) else None
+
+class GrowableRingBuffer(RingBuffer):
+    """RingBuffer that starts small and doubles up to ``max_capacity`` before it wraps.
+
+    Long histories (a million training steps) only cost memory once they
+    exist, and appends stay amortised O(1): each growth copies the records
+    into arrays twice the size, which can only happen before the first
+    wrap-around. Growing swaps the arrays out from under a reader, so unlike
+    ``RingBuffer`` this is for one thread only (e.g. the UI keeping its own
+    copy of a trainer's telemetry).
+    """
+
+    def __init__(self, max_capacity, fields, dtype=np.float64, initial_capacity=1024):
+        self.max_capacity = int(max_capacity)
+        super().__init__(min(initial_capacity, self.max_capacity), fields, dtype)
+
+    def _reserve(self, rows):
+        """Grow until ``rows`` more records fit without wrapping, or the maximum is reached"""
+        needed = self._count + rows
+        if needed <= self.capacity or self.capacity >= self.max_capacity:
+            return
+        capacity = self.capacity
+        while capacity < needed and capacity < self.max_capacity:
+            capacity *= 2
+        capacity = min(capacity, self.max_capacity)
+        # Nothing has wrapped yet, so the records sit in slots 0..count-1
+        for name, data in self._data.items():
+            grown = np.zeros((capacity,) + data.shape[1:], dtype=data.dtype)
+            grown[:self._count] = data[:self._count]
+            self._data[name] = grown
+        self.capacity = capacity
+
+    def slot(self, field):
+        self._reserve(1)
+        return super().slot(field)
+
+    def append(self, **values):
+        self._reserve(1)
+        super().append(**values)
+
+    def extend(self, **columns):
+        """Append one record per row of the given equal-length arrays"""
+        rows = len(next(iter(columns.values())))
+        if rows == 0:
+            return
+        self._reserve(rows)
+        # Only the newest ``capacity`` rows can survive the write
+        skip = max(0, rows - self.capacity)
+        start = self._count + skip
+        positions = np.arange(start, self._count + rows) % self.capacity
+        for name, values in columns.items():
+            self._data[name][positions] = np.asarray(values)[skip:]
+        self._count += rows
@@ -0,0 +1,213 @@
+"""
+Background training loop that publishes progress for the UI to poll
+"""
+
+import threading
+import time
+import numpy as np
+from .losses import softmax_cross_entropy
+from .ring_buffer import RingBuffer
+
+class BackgroundTrainer:
+    """Trains a Network on a worker thread so the game loop never blocks.
+
+    ``batches`` is a callable returning a fresh iterator of (features, labels)
+    mini-batches for one epoch. The worker owns the network while running;
+    the UI only sees copies, through two channels:
+
+    * ``telemetry`` - a lock-free RingBuffer with one record per step (loss,
+      accuracy, per-layer gradient and weight norms, and optionally the flattened
+      parameters and gradients) that the render loop can sample every frame.
+    * ``drain`` - every ``publish_every`` steps the worker appends one
+      summary update (averaged loss and accuracy plus weight copies), so
+      screens that only need coarse progress refresh in batches.
+
+    Training can be paused, resumed and single-stepped, and checkpointed to
+    ``.npz`` at any time; checkpoints are taken between steps so they are
+    always consistent.
+    """
+
+    def __init__(self, network, batches, learning_rate=0.1, loss=softmax_cross_entropy,
+                 evaluate=None, publish_every=25, evaluate_every=500, max_epochs=None,
+                 telemetry_capacity=1024, record_parameters=False):
+        self.network = network
+        self.batches = batches
+        self.learning_rate = learning_rate
+        self.loss = loss
+        self.evaluate = evaluate
+        self.publish_every = publish_every
+        self.evaluate_every = evaluate_every
+        self.max_epochs = max_epochs
+
+        self.step = 0
+        self.epoch = 0
+        self.rows_seen = 0
+        self.error = None
+
+        fields = {'step': (), 'loss': (), 'accuracy': (), 'grad_norms': (len(network.layers),),
+                  'weight_norms': (len(network.layers),)}
+        if record_parameters:
+            fields['parameters'] = (network.parameter_count,)
+            fields['gradients'] = (network.parameter_count,)
+        self.telemetry = RingBuffer(telemetry_capacity, fields)
+
+        self._lock = threading.Lock()
+        self._outbox = []
+        self._stop = threading.Event()
+        self._thread = None
+
+        # Guards the network between steps; also used to park the worker while paused
+        self._condition = threading.Condition()
+        self._paused = False
+        self._pending_steps = 0
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def paused(self):
+        return self._paused
+
+    def start(self):
+        """Start (or continue) training on a daemon thread"""
+        if self.running:
+            if not self._stop.is_set():
+                return
+            # A stop was requested but the worker hasn't finished its step yet
+            self._thread.join()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="BackgroundTrainer", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait=True):
+        """Ask the worker to stop after the current step"""
+        self._stop.set()
+        with self._condition:
+            self._condition.notify_all()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def pause(self):
+        """Park the worker between steps"""
+        with self._condition:
+            self._paused = True
+
+    def resume(self):
+        with self._condition:
+            self._paused = False
+            self._pending_steps = 0
+            self._condition.notify_all()
+
+    def step_once(self, count=1):
+        """While paused, let the worker run exactly count more steps"""
+        with self._condition:
+            self._paused = True
+            self._pending_steps += count
+            self._condition.notify_all()
+        self.start()
+
+    def save_checkpoint(self, path):
+        """Write the network and training counters to an .npz between two steps"""
+        with self._condition:
+            self.network.save(path, step=self.step, epoch=self.epoch, rows_seen=self.rows_seen,
+                              learning_rate=self.learning_rate)
+
+    def load_checkpoint(self, path):
+        """Restore the network and training counters from save_checkpoint"""
+        with self._condition:
+            metadata = self.network.load(path)
+            self.step = int(metadata.get('step', 0))
+            self.epoch = int(metadata.get('epoch', 0))
+            self.rows_seen = int(metadata.get('rows_seen', 0))
+            if 'learning_rate' in metadata:
+                self.learning_rate = float(metadata['learning_rate'])
+        return metadata
+
+    def drain(self):
+        """Return and clear the updates published since the last call"""
+        with self._lock:
+            updates, self._outbox = self._outbox, []
+        return updates
+
+    def _publish(self, update):
+        with self._lock:
+            self._outbox.append(update)
+
+    def _run(self):
+        try:
+            self._train()
+        except Exception as e:
+            # Surface worker failures to the UI instead of dying silently
+            self.error = e
+            self._publish({'error': str(e)})
+
+    def _wait_for_turn(self):
+        """Block while paused with no pending single steps; returns False when stopping"""
+        with self._condition:
+            while self._paused and self._pending_steps == 0 and not self._stop.is_set():
+                self._condition.wait()
+            if self._stop.is_set():
+                return False
+            if self._paused:
+                self._pending_steps -= 1
+            return True
+
+    def _train(self):
+        losses = []
+        correct = 0
+        seen = 0
+        telemetry = self.telemetry
+        record_parameters = 'parameters' in telemetry.fields
+        while not self._stop.is_set():
+            for features, labels in self.batches():
+                if not self._wait_for_turn():
+                    return
+                with self._condition:
+                    outputs = self.network.forward(features)
+                    loss, grad = self.loss(outputs, labels)
+                    self.network.backward(grad)
+                    self.network.apply_gradients(self.learning_rate)
+
+                    self.step += 1
+                    self.rows_seen += len(labels)
+                    batch_correct = int(np.count_nonzero(np.argmax(outputs, axis=1) == labels))
+
+                    # One telemetry record per step, written in place
+                    self.network.gradient_norms(out=telemetry.slot('grad_norms'))
+                    self.network.weight_norms(out=telemetry.slot('weight_norms'))
+                    if record_parameters:
+                        self.network.flat_parameters(out=telemetry.slot('parameters'))
+                        self.network.flat_gradients(out=telemetry.slot('gradients'))
+                telemetry.slot('step')[...] = self.step
+                telemetry.slot('loss')[...] = loss
+                telemetry.slot('accuracy')[...] = batch_correct / len(labels)
+                telemetry.commit()
+
+                losses.append(loss)
+                correct += batch_correct
+                seen += len(labels)
+
+                if self.step % self.publish_every == 0:
+                    update = {
+                        'step': self.step,
+                        'epoch': self.epoch,
+                        'rows': self.rows_seen,
+                        'loss': float(np.mean(losses)),
+                        'accuracy': correct / max(1, seen),
+                        'weights': [w.copy() for w in self.network.weights],
+                        'biases': [b.copy() for b in self.network.biases],
+                        'time': time.perf_counter(),
+                    }
+                    if self.evaluate is not None and self.step % self.evaluate_every == 0:
+                        update['val_accuracy'] = self.evaluate(self.network)
+                    self._publish(update)
+                    losses.clear()
+                    correct = seen = 0
+
+                    # Give the render thread a turn at the GIL
+                    time.sleep(0)
+
+            self.epoch += 1
+            if self.max_epochs is not None and self.epoch >= self.max_epochs:
+                return
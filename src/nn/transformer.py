@@ -0,0 +1,290 @@
+"""
+Pre-LayerNorm transformer block with a fused QKV projection and cached sublayers
+"""
+
+import numpy as np
+from .activations import get_activation, normalize_name, softmax
+from .attention import causal_mask, scaled_dot_product_attention
+
+def layer_norm(x, gain, bias, out=None, eps=1e-5):
+    """(x - mean) / std over the last axis, then scaled by gain and shifted by bias"""
+    out = np.subtract(x, np.mean(x, axis=-1, keepdims=True), out=out)
+    variance = np.mean(np.square(out), axis=-1, keepdims=True)
+    out *= 1.0 / np.sqrt(variance + eps)
+    out *= gain
+    out += bias
+    return out
+
+def layer_norm_backward(grad, x, gain, eps=1e-5):
+    """dL/dx, dL/dgain and dL/dbias of ``layer_norm`` from the upstream gradient"""
+    centered = x - np.mean(x, axis=-1, keepdims=True)
+    inverse_std = 1.0 / np.sqrt(np.mean(np.square(centered), axis=-1, keepdims=True) + eps)
+    normalized = centered * inverse_std
+    axes = tuple(range(grad.ndim - 1))
+    grad_gain = np.sum(grad * normalized, axis=axes)
+    grad_bias = np.sum(grad, axis=axes)
+    grad_normalized = grad * gain
+    grad_x = grad_normalized - np.mean(grad_normalized, axis=-1, keepdims=True)
+    grad_x -= normalized * np.mean(grad_normalized * normalized, axis=-1, keepdims=True)
+    grad_x *= inverse_std
+    return grad_x, grad_gain, grad_bias
+
+class TransformerBlock:
+    """One pre-LN transformer block: x + Attn(LN(x)), then + MLP(LN(...)).
+
+    Queries, keys and values come from one fused (d, 3d) projection, so the
+    whole QKV step is a single matrix multiply. ``set_input`` sizes every
+    intermediate buffer once for a (batch, steps, d_model) input, and each
+    sublayer in ``SUBLAYERS`` writes into its own buffer. Sublayers are
+    recomputed from the first stale one only: switching a head on or off
+    with ``set_head`` keeps the attention maps and reruns just the head mix
+    and everything after it. ``forward(until=...)`` stops after a given
+    sublayer, so callers can step through the block one sublayer at a time.
+
+    ``backward`` fills ``grads`` for training, and ``decode_step`` runs one
+    new token against a key/value cache for autoregressive sampling.
+    """
+
+    SUBLAYERS = ("norm1", "qkv", "attention", "mix", "norm2", "mlp", "output")
+    PARAMETERS = ("ln1_gain", "ln1_bias", "qkv_weights", "qkv_bias", "out_weights", "out_bias",
+                  "ln2_gain", "ln2_bias", "ff1_weights", "ff1_bias", "ff2_weights", "ff2_bias")
+
+    def __init__(self, d_model, heads, d_ff=None, activation="relu", causal=False, dtype=np.float32):
+        if d_model % heads:
+            raise ValueError(f"d_model ({d_model}) must be divisible by heads ({heads})")
+        self.d_model = d_model
+        self.heads = heads
+        self.head_dim = d_model // heads
+        self.d_ff = d_ff or 4 * d_model
+        self.activation = normalize_name(activation)
+        self._activate, self._activation_grad = get_activation(self.activation)
+        self.causal = causal
+        self.dtype = np.dtype(dtype)
+
+        self.ln1_gain = np.ones(d_model, dtype=self.dtype)
+        self.ln1_bias = np.zeros(d_model, dtype=self.dtype)
+        self.qkv_weights = np.zeros((d_model, 3 * d_model), dtype=self.dtype)
+        self.qkv_bias = np.zeros(3 * d_model, dtype=self.dtype)
+        self.out_weights = np.zeros((d_model, d_model), dtype=self.dtype)
+        self.out_bias = np.zeros(d_model, dtype=self.dtype)
+        self.ln2_gain = np.ones(d_model, dtype=self.dtype)
+        self.ln2_bias = np.zeros(d_model, dtype=self.dtype)
+        self.ff1_weights = np.zeros((d_model, self.d_ff), dtype=self.dtype)
+        self.ff1_bias = np.zeros(self.d_ff, dtype=self.dtype)
+        self.ff2_weights = np.zeros((self.d_ff, d_model), dtype=self.dtype)
+        self.ff2_bias = np.zeros(d_model, dtype=self.dtype)
+
+        self.grads = {name: np.zeros_like(getattr(self, name)) for name in self.PARAMETERS}
+        self.head_enabled = np.ones(heads, dtype=bool)
+        self._head_scale = np.ones(d_model, dtype=self.dtype)
+        self.versions = dict.fromkeys(self.SUBLAYERS, 0)
+        self.shape = None
+        self._valid = 0
+
+    def initialize(self, rng=None, weight_scale=None):
+        """Gaussian weights scaled by 1/sqrt(fan_in); layer norms start as the identity"""
+        rng = rng or np.random.default_rng()
+        for name in ("qkv_weights", "out_weights", "ff1_weights", "ff2_weights"):
+            weights = getattr(self, name)
+            scale = weight_scale or 1.0 / np.sqrt(weights.shape[0])
+            weights[...] = rng.standard_normal(weights.shape) * scale
+        self.mark_dirty()
+
+    def parameters(self):
+        """{name: array} of every weight, e.g. for ``np.savez``"""
+        return {name: getattr(self, name) for name in self.PARAMETERS}
+
+    def load(self, parameters, prefix="", copy=True):
+        """Take weights from a mapping such as an ``np.load`` archive.
+
+        With ``copy=False`` the block uses the given arrays directly, so
+        read-only memory-mapped weights are never pulled into RAM up front.
+        """
+        for name in self.PARAMETERS:
+            if copy:
+                getattr(self, name)[...] = parameters[prefix + name]
+            else:
+                setattr(self, name, parameters[prefix + name])
+        self.mark_dirty()
+
+    # Buffers
+
+    def set_input(self, inputs):
+        """Copy a (batch, steps, d_model) input in, (re)allocating buffers only when its shape changes"""
+        inputs = np.asarray(inputs, dtype=self.dtype)
+        if inputs.ndim == 2:
+            inputs = inputs[None]
+        if inputs.shape[-1] != self.d_model:
+            raise ValueError(f"Expected inputs with {self.d_model} features, got {inputs.shape[-1]}")
+        if inputs.shape != self.shape:
+            self._allocate(*inputs.shape[:2])
+        self.inputs[...] = inputs
+        self.mark_dirty()
+
+    def _allocate(self, batch, steps):
+        d, dtype = self.d_model, self.dtype
+        self.shape = (batch, steps, d)
+        self.inputs = np.zeros(self.shape, dtype=dtype)
+        self.norm1 = np.zeros(self.shape, dtype=dtype)
+        self.qkv = np.zeros((batch, steps, 3 * d), dtype=dtype)
+        self.attention = np.zeros((batch, self.heads, steps, steps), dtype=dtype)
+        self.context = np.zeros((batch, self.heads, steps, self.head_dim), dtype=dtype)
+        self.mixed = np.zeros(self.shape, dtype=dtype)
+        self.residual = np.zeros(self.shape, dtype=dtype)
+        self.norm2 = np.zeros(self.shape, dtype=dtype)
+        self.hidden_z = np.zeros((batch, steps, self.d_ff), dtype=dtype)
+        self.hidden = np.zeros((batch, steps, self.d_ff), dtype=dtype)
+        self.mlp = np.zeros(self.shape, dtype=dtype)
+        self.outputs = np.zeros(self.shape, dtype=dtype)
+        self._merged = np.zeros(self.shape, dtype=dtype)
+        self._mask = causal_mask(steps, dtype) if self.causal else None
+
+    @property
+    def nbytes(self):
+        buffers = (self.inputs, self.norm1, self.qkv, self.attention, self.context, self.mixed,
+                   self.residual, self.norm2, self.hidden_z, self.hidden, self.mlp, self.outputs, self._merged)
+        return sum(buffer.nbytes for buffer in buffers) if self.shape else 0
+
+    def head_view(self, part):
+        """(batch, heads, steps, head_dim) view of the queries (0), keys (1) or values (2)"""
+        batch, steps, d = self.shape
+        return self.qkv[..., part * d:(part + 1) * d].reshape(batch, steps, self.heads, self.head_dim).transpose(0, 2, 1, 3)
+
+    # Staleness
+
+    @property
+    def valid_sublayers(self):
+        return self._valid
+
+    def mark_dirty(self, sublayer="norm1"):
+        """Everything from ``sublayer`` on must be recomputed"""
+        self._valid = min(self._valid, self.SUBLAYERS.index(sublayer))
+
+    def set_head(self, head, enabled):
+        """Switch one head on or off; the attention maps stay valid"""
+        self.head_enabled[head] = enabled
+        self._head_scale[...] = np.repeat(self.head_enabled, self.head_dim)
+        self.mark_dirty("mix")
+
+    # Sublayers
+
+    def forward(self, until="output"):
+        """Run stale sublayers up to and including ``until``; returns the block's output buffer"""
+        if self.shape is None:
+            raise ValueError("set_input must be called before forward")
+        stop = self.SUBLAYERS.index(until) + 1
+        while self._valid < stop:
+            name = self.SUBLAYERS[self._valid]
+            getattr(self, "_" + name)()
+            self.versions[name] += 1
+            self._valid += 1
+        return self.outputs
+
+    def _norm1(self):
+        layer_norm(self.inputs, self.ln1_gain, self.ln1_bias, out=self.norm1)
+
+    def _qkv(self):
+        np.matmul(self.norm1, self.qkv_weights, out=self.qkv)
+        self.qkv += self.qkv_bias
+
+    def _attention(self):
+        scaled_dot_product_attention(self.head_view(0), self.head_view(1), self.head_view(2), self._mask,
+                                     weights_out=self.attention, out=self.context)
+
+    def _mix(self):
+        # Heads back side by side per token, switched-off heads zeroed, then the output projection
+        batch, steps, d = self.shape
+        self._merged.reshape(batch, steps, self.heads, self.head_dim)[...] = self.context.transpose(0, 2, 1, 3)
+        self._merged *= self._head_scale
+        np.matmul(self._merged, self.out_weights, out=self.mixed)
+        self.mixed += self.out_bias
+        np.add(self.inputs, self.mixed, out=self.residual)
+
+    def _norm2(self):
+        layer_norm(self.residual, self.ln2_gain, self.ln2_bias, out=self.norm2)
+
+    def _mlp(self):
+        np.matmul(self.norm2, self.ff1_weights, out=self.hidden_z)
+        self.hidden_z += self.ff1_bias
+        self._activate(self.hidden_z, out=self.hidden)
+        np.matmul(self.hidden, self.ff2_weights, out=self.mlp)
+        self.mlp += self.ff2_bias
+
+    def _output(self):
+        np.add(self.residual, self.mlp, out=self.outputs)
+
+    # Training
+
+    def backward(self, grad_outputs):
+        """Fill ``grads`` from dL/d(outputs) of the last full forward; returns dL/d(inputs)"""
+        batch, steps, d = self.shape
+        grads = self.grads
+        rows = batch * steps
+
+        def flat(array):
+            return array.reshape(rows, -1)
+
+        # output = residual + MLP(LN2(residual))
+        grad_mlp = flat(grad_outputs)
+        np.matmul(flat(self.hidden).T, grad_mlp, out=grads["ff2_weights"])
+        np.sum(grad_mlp, axis=0, out=grads["ff2_bias"])
+        grad_hidden = grad_mlp @ self.ff2_weights.T
+        grad_hidden = self._activation_grad(flat(self.hidden_z), flat(self.hidden), grad_hidden)
+        np.matmul(flat(self.norm2).T, grad_hidden, out=grads["ff1_weights"])
+        np.sum(grad_hidden, axis=0, out=grads["ff1_bias"])
+        grad_norm2 = (grad_hidden @ self.ff1_weights.T).reshape(self.shape)
+        grad_residual, grads["ln2_gain"][...], grads["ln2_bias"][...] = layer_norm_backward(
+            grad_norm2, self.residual, self.ln2_gain)
+        grad_residual += grad_outputs
+
+        # residual = inputs + heads @ out_weights
+        grad_mixed = flat(grad_residual)
+        np.matmul(flat(self._merged).T, grad_mixed, out=grads["out_weights"])
+        np.sum(grad_mixed, axis=0, out=grads["out_bias"])
+        grad_merged = (grad_mixed @ self.out_weights.T) * self._head_scale
+        grad_context = grad_merged.reshape(batch, steps, self.heads, self.head_dim).transpose(0, 2, 1, 3)
+
+        # context = softmax(q k^T / sqrt(d)) v
+        queries, keys, values = self.head_view(0), self.head_view(1), self.head_view(2)
+        weights = self.attention
+        grad_qkv = np.empty((batch, steps, 3 * d), dtype=self.dtype)
+        grad_heads = [grad_qkv[..., part * d:(part + 1) * d].reshape(batch, steps, self.heads, self.head_dim)
+                      .transpose(0, 2, 1, 3) for part in range(3)]
+        np.matmul(np.swapaxes(weights, -1, -2), grad_context, out=grad_heads[2])
+        grad_scores = grad_context @ np.swapaxes(values, -1, -2)
+        grad_scores -= np.sum(grad_scores * weights, axis=-1, keepdims=True)
+        grad_scores *= weights
+        grad_scores *= 1.0 / np.sqrt(self.head_dim)
+        np.matmul(grad_scores, keys, out=grad_heads[0])
+        np.matmul(np.swapaxes(grad_scores, -1, -2), queries, out=grad_heads[1])
+
+        np.matmul(flat(self.norm1).T, flat(grad_qkv), out=grads["qkv_weights"])
+        np.sum(flat(grad_qkv), axis=0, out=grads["qkv_bias"])
+        grad_norm1 = (flat(grad_qkv) @ self.qkv_weights.T).reshape(self.shape)
+        grad_inputs, grads["ln1_gain"][...], grads["ln1_bias"][...] = layer_norm_backward(
+            grad_norm1, self.inputs, self.ln1_gain)
+        grad_inputs += grad_residual
+        return grad_inputs
+
+    # Autoregressive decoding
+
+    def decode_step(self, x, keys, values, position):
+        """Output for one new token x (d_model,) at ``position``.
+
+        ``keys`` and ``values`` are this block's (heads, context, head_dim)
+        cache. The token's key and value are written at ``position`` and its
+        query attends over positions 0..position only, so each new token
+        costs O(position) instead of a forward pass over the whole prefix.
+        """
+        normed = layer_norm(x, self.ln1_gain, self.ln1_bias)
+        qkv = normed @ self.qkv_weights + self.qkv_bias
+        d = self.d_model
+        query, key, value = (qkv[part * d:(part + 1) * d].reshape(self.heads, self.head_dim) for part in range(3))
+        keys[:, position] = key
+        values[:, position] = value
+        scores = np.matmul(keys[:, :position + 1], query[:, :, None])[..., 0] * (1.0 / np.sqrt(self.head_dim))
+        weights = softmax(scores, out=scores)
+        context = np.matmul(weights[:, None, :], values[:, :position + 1])[:, 0]
+        residual = x + (context.reshape(d) * self._head_scale) @ self.out_weights + self.out_bias
+        hidden = layer_norm(residual, self.ln2_gain, self.ln2_bias) @ self.ff1_weights + self.ff1_bias
+        return residual + self._activate(hidden) @ self.ff2_weights + self.ff2_bias
@@ -0,0 +1,187 @@
+"""
+Train/validation/test splits and k-fold cross-validation trained across a process pool
+"""
+
+import multiprocessing
+import os
+import queue
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .network import Network
+from .losses import softmax_cross_entropy
+
+def train_val_test_split(rows, validation=0.15, test=0.15, rng=None):
+    """Shuffle row indices once and cut them into (train, validation, test) index arrays"""
+    rng = rng or np.random.default_rng()
+    order = rng.permutation(rows)
+    n_test = int(round(rows * test))
+    n_val = int(round(rows * validation))
+    return order[n_test + n_val:], order[n_test:n_test + n_val], order[:n_test]
+
+def kfold_indices(rows, k, rng=None):
+    """k (train, validation) index pairs; every row is validated on exactly once"""
+    if not 2 <= k <= rows:
+        raise ValueError(f"k must be between 2 and {rows}, got {k}")
+    rng = rng or np.random.default_rng()
+    folds = np.array_split(rng.permutation(rows), k)
+    return [(np.concatenate(folds[:i] + folds[i + 1:]), folds[i]) for i in range(k)]
+
+# Set in each worker process by the pool initializer
+_progress = None
+_cancelled = None
+
+def _init_worker(progress, cancelled):
+    global _progress, _cancelled
+    _progress = progress
+    _cancelled = cancelled
+
+def _evaluate(network, features, labels):
+    outputs = network.forward(features)
+    loss, _ = softmax_cross_entropy(outputs.copy(), labels)
+    return loss, float(np.mean(np.argmax(outputs, axis=1) == labels))
+
+def train_fold(fold, features, labels, train_idx, val_idx, test_idx=None, layer_sizes=(2, 32, 2),
+               activations=('relu', 'linear'), epochs=200, learning_rate=0.05, batch_size=16,
+               record_every=5, seed=0):
+    """Train one fold with mini-batch SGD and return its learning curve.
+
+    Runs in a worker process. Every ``record_every`` epochs the train,
+    validation (and, if given, test) loss and accuracy are appended to the
+    curve and, when a progress queue was installed, streamed to the parent as
+    ``('point', fold, point)`` so the UI can draw the curve while the fold is
+    still training.
+    """
+    rng = np.random.default_rng(seed)
+    network = Network(list(layer_sizes), list(activations), capacity=max(batch_size, len(labels)), rng=rng)
+    train_x, train_y = features[train_idx], labels[train_idx]
+    val_x, val_y = features[val_idx], labels[val_idx]
+    curve = []
+
+    for epoch in range(1, epochs + 1):
+        if _cancelled is not None and _cancelled.is_set():
+            break
+        order = rng.permutation(len(train_y))
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            outputs = network.forward(train_x[batch])
+            _, grad = softmax_cross_entropy(outputs, train_y[batch])
+            network.backward(grad)
+            network.apply_gradients(learning_rate)
+
+        if epoch % record_every == 0 or epoch == epochs:
+            point = {'epoch': epoch}
+            point['train_loss'], point['train_accuracy'] = _evaluate(network, train_x, train_y)
+            point['val_loss'], point['val_accuracy'] = _evaluate(network, val_x, val_y)
+            if test_idx is not None:
+                point['test_loss'], point['test_accuracy'] = _evaluate(network, features[test_idx], labels[test_idx])
+            curve.append(point)
+            if _progress is not None:
+                _progress.put(('point', fold, point))
+
+    best = min(curve, key=lambda point: point['val_loss']) if curve else None
+    return {'fold': fold, 'curve': curve, 'best': best}
+
+class CrossValidator:
+    """Runs k-fold cross-validation with one fold per worker process.
+
+    Folds train in parallel in a ``ProcessPoolExecutor`` (spawned workers, so
+    the parent's threads and pygame state are never forked). Curve points
+    arrive through a multiprocessing queue; ``poll`` drains it without
+    blocking, so the render loop can call it every frame. A test index set,
+    if given, is scored by every fold but never used for training or model
+    selection.
+    """
+
+    def __init__(self, features, labels, k=5, test_idx=None, workers=None, seed=0, **train_options):
+        self.features = np.asarray(features)
+        self.labels = np.asarray(labels)
+        self.k = k
+        self.test_idx = test_idx
+        self.train_options = train_options
+        self.workers = workers or min(k, os.cpu_count() or 1)
+
+        rows = np.arange(len(self.labels))
+        if test_idx is not None:
+            rows = np.setdiff1d(rows, test_idx)
+        rng = np.random.default_rng(seed)
+        self.folds = [(rows[train], rows[val]) for train, val in kfold_indices(len(rows), k, rng)]
+        self._seeds = rng.integers(0, 2**31, k)
+
+        self.curves = [[] for _ in range(k)]
+        self.results = [None] * k
+        self.errors = {}
+        self._executor = None
+        self._futures = []
+        self._progress = None
+        self._cancelled = None
+
+    @property
+    def running(self):
+        return any(not future.done() for future in self._futures)
+
+    @property
+    def finished(self):
+        return bool(self._futures) and not self.running
+
+    def start(self):
+        context = multiprocessing.get_context('spawn')
+        self._progress = context.Queue()
+        self._cancelled = context.Event()
+        self._executor = ProcessPoolExecutor(self.workers, mp_context=context, initializer=_init_worker,
+                                             initargs=(self._progress, self._cancelled))
+        self._futures = [
+            self._executor.submit(train_fold, fold, self.features, self.labels, train_idx, val_idx,
+                                  self.test_idx, seed=int(self._seeds[fold]), **self.train_options)
+            for fold, (train_idx, val_idx) in enumerate(self.folds)
+        ]
+
+    def poll(self):
+        """Fold new curve points and finished folds into ``curves``/``results``; returns the folds that changed"""
+        changed = set()
+        if self._progress is not None:
+            while True:
+                try:
+                    _, fold, point = self._progress.get_nowait()
+                except queue.Empty:
+                    break
+                self.curves[fold].append(point)
+                changed.add(fold)
+
+        for fold, future in enumerate(self._futures):
+            if self.results[fold] is None and fold not in self.errors and future.done():
+                try:
+                    result = future.result()
+                except Exception as e:
+                    self.errors[fold] = str(e)
+                else:
+                    self.results[fold] = result
+                    # The returned curve is authoritative even if queued points were lost
+                    self.curves[fold] = result['curve']
+                changed.add(fold)
+
+        if self.finished and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        return changed
+
+    def mean_curve(self, key):
+        """(epochs, mean of key across folds) over the epochs every fold has reached"""
+        length = min((len(curve) for curve in self.curves), default=0)
+        if length == 0:
+            return np.zeros(0), np.zeros(0)
+        epochs = np.array([point['epoch'] for point in self.curves[0][:length]])
+        values = np.array([[point[key] for point in curve[:length]] for curve in self.curves])
+        return epochs, values.mean(axis=0)
+
+    def cancel(self):
+        """Stop every fold after its current epoch and drop queued work.
+
+        Waits for the workers to exit: one still bootstrapping has yet to
+        attach to the queue and event, and would crash if they were freed
+        under it.
+        """
+        if self._cancelled is not None:
+            self._cancelled.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
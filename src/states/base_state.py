@@ -22,6 +22,10 @@ class BaseState:
         """Update state logic"""
         pass
     
+    def frame_update(self):
+        """Time-budgeted work, once per rendered frame however many update steps it took"""
+        pass
+    
     def render(self, screen):
         """Render state graphics"""
         pass
\ No newline at end of file
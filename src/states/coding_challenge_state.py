@@ -13,6 +13,17 @@ from ..challenges.activation_challenge import ActivationChallenge
 from ..challenges.chain_rule_challenge import ChainRuleChallenge
 from ..challenges.perceptron_simple import PerceptronSimple
 from ..challenges.forward_pass_challenge import ForwardPassChallenge
+from ..challenges.data_dungeon_challenge import DataDungeonChallenge
+from ..challenges.backprop_challenge import BackpropChallenge
+from ..challenges.training_grounds_challenge import TrainingGroundsChallenge
+from ..challenges.cnn_castle_challenge import CNNChallenge
+from ..challenges.rnn_realm_challenge import RNNChallenge
+from ..challenges.lstm_labyrinth_challenge import LSTMChallenge
+from ..challenges.gru_gardens_challenge import GRUChallenge
+from ..challenges.word2vec_wasteland_challenge import Word2VecChallenge
+from ..challenges.attention_archipelago_challenge import AttentionChallenge
+from ..challenges.transformer_temple_challenge import TransformerChallenge
+from ..challenges.gpt_citadel_challenge import GPTCitadelChallenge
 
 class CodingChallengeState(BaseState):
     def __init__(self, game):
@@ -29,7 +40,18 @@ class CodingChallengeState(BaseState):
             "activation_functions": ActivationChallenge,
             "chain_rule_mastery": ChainRuleChallenge,
             "perceptron_complete": PerceptronSimple,
-            "forward_pass_flow": ForwardPassChallenge
+            "forward_pass_flow": ForwardPassChallenge,
+            "data_dungeons": DataDungeonChallenge,
+            "backprop_badlands": BackpropChallenge,
+            "training_grounds": TrainingGroundsChallenge,
+            "cnn_castle": CNNChallenge,
+            "rnn_realm": RNNChallenge,
+            "lstm_labyrinth": LSTMChallenge,
+            "gru_gardens": GRUChallenge,
+            "word2vec_wasteland": Word2VecChallenge,
+            "attention_archipelago": AttentionChallenge,
+            "transformer_temple": TransformerChallenge,
+            "gpt_citadel": GPTCitadelChallenge
         }
     
     def enter(self):
@@ -39,6 +61,13 @@ class CodingChallengeState(BaseState):
             self.current_challenge = self.challenges[challenge_name](self.game)
             self.current_challenge.initialize()
     
+    def exit(self):
+        """The challenge being left releases its workers; its background jobs and tasks are cancelled"""
+        if self.current_challenge:
+            self.current_challenge.close()
+            self.game.jobs.cancel_owner(self.current_challenge)
+            self.game.tasks.cancel_owner(self.current_challenge)
+
     def handle_event(self, event):
         if self.current_challenge:
             result = self.current_challenge.handle_event(event)
@@ -67,7 +96,18 @@ class CodingChallengeState(BaseState):
                         'activation_functions': 'activation_power',
                         'chain_rule_mastery': 'gradient_flow',
                         'perceptron_complete': 'network_building',
-                        'forward_pass_flow': 'weight_control'
+                        'forward_pass_flow': 'weight_control',
+                        'data_dungeons': 'network_building',
+                        'backprop_badlands': 'gradient_flow',
+                        'training_grounds': 'network_building',
+                        'cnn_castle': 'network_building',
+                        'rnn_realm': 'network_building',
+                        'lstm_labyrinth': 'gradient_flow',
+                        'gru_gardens': 'weight_control',
+                        'word2vec_wasteland': 'network_building',
+                        'attention_archipelago': 'activation_power',
+                        'transformer_temple': 'network_building',
+                        'gpt_citadel': 'network_building'
                     }
                     
                     skill_name = challenge_skills.get(getattr(self.game, 'current_challenge', ''), 'neuron_mastery')
@@ -84,6 +124,10 @@ class CodingChallengeState(BaseState):
         if self.current_challenge:
             self.current_challenge.update(dt)
     
+    def frame_update(self):
+        if self.current_challenge:
+            self.current_challenge.frame_update()
+    
     def render(self, screen):
         if self.current_challenge:
             self.current_challenge.render(screen)
@@ -2,6 +2,7 @@
 Individual level state with story and challenges
 """
 
+import asyncio
 import pygame
 from .base_state import BaseState
 from ..constants import GameState
@@ -16,6 +17,7 @@ class LevelState(BaseState):
         self.layout = ResponsiveLayout(game.width, game.height)
         self.current_dialogue = 0
         self.level_data = None
+        self.narration_task = None
         
         # Level content database
         self.level_content = {
@@ -85,6 +87,127 @@ class LevelState(BaseState):
                 "challenge": "forward_pass_flow",
                 "concept": "Master forward propagation through networks"
             },
+            "Backprop Badlands": {
+                "story": [
+                    "The ground cracks beneath you - welcome to the Backprop Badlands!",
+                    "The Gradient Golem is built from errors that flow backwards.",
+                    "Here a whole network learns at once, one gradient at a time.",
+                    "Forward pass, loss, backward pass, update - thousands of times!",
+                    "Train a network to untangle the spirals and shatter the Golem!"
+                ],
+                "challenge": "backprop_badlands",
+                "concept": "Train multi-layer networks with backpropagation"
+            },
+            "Training Grounds": {
+                "story": [
+                    "You arrive at the Training Grounds, where networks are put to the test!",
+                    "The Overfitting Ogre lurks here, growing fat on memorized examples.",
+                    "A network that only remembers its training data fails on anything new.",
+                    "Hold out a test set, cross-validate, and learn when to stop training.",
+                    "Prove your network generalizes and the Ogre will fall!"
+                ],
+                "challenge": "training_grounds",
+                "concept": "Split data and cross-validate to catch overfitting"
+            },
+            "Data Dungeons": {
+                "story": [
+                    "You descend into the Data Dungeons, where datasets grow beyond measure!",
+                    "Real data is too vast to hold in memory all at once.",
+                    "Stream it from disk, one shuffled mini-batch at a time.",
+                    "The Noise Nightmare has corrupted the labels down here.",
+                    "Train through the noise and banish it from the dungeon!"
+                ],
+                "challenge": "data_dungeons",
+                "concept": "Train on real datasets streamed from disk"
+            },
+            "RNN Realm": {
+                "story": [
+                    "Time flows strangely in the RNN Realm.",
+                    "The Memory Monarch remembers everything... or so it claims.",
+                    "Recurrent networks carry a hidden state from one step to the next.",
+                    "But memories fade, or explode into chaos, over long sequences.",
+                    "Tune the network so its memory survives the Monarch's gate!"
+                ],
+                "challenge": "rnn_realm",
+                "concept": "Carry memory through time with recurrent networks"
+            },
+            "CNN Castle": {
+                "story": [
+                    "The gates of CNN Castle creak open before you.",
+                    "The Feature Phantom haunts these halls, invisible to the naked eye.",
+                    "Convolution kernels slide across images, searching for patterns.",
+                    "Edges, blobs and textures each light up their own feature map.",
+                    "Craft the right kernel and the Phantom will be revealed!"
+                ],
+                "challenge": "cnn_castle",
+                "concept": "Detect image features with convolution and pooling"
+            },
+            "LSTM Labyrinth": {
+                "story": [
+                    "The walls of the LSTM Labyrinth stretch on forever.",
+                    "The Vanishing Gradient Vampire feeds on error signals that travel too far.",
+                    "Plain recurrent networks forget what happened a few dozen steps ago.",
+                    "Long Short-Term Memory cells guard their memories behind learned gates.",
+                    "Train an LSTM that remembers and drive the Vampire into the light!"
+                ],
+                "challenge": "lstm_labyrinth",
+                "concept": "Learn long-range memory with gated LSTM cells"
+            },
+            "GRU Gardens": {
+                "story": [
+                    "Hedges of gated cells line the paths of the GRU Gardens.",
+                    "The Gate Keeper decides which memories may stay and which must go.",
+                    "A GRU has just two gates: update keeps the old memory, reset hides it from the new one.",
+                    "Fewer gates than an LSTM, yet it can remember just as well.",
+                    "Master the gates and the Keeper will let you pass!"
+                ],
+                "challenge": "gru_gardens",
+                "concept": "Control memory with update and reset gates"
+            },
+            "Word2Vec Wasteland": {
+                "story": [
+                    "Silk threads stretch across the Word2Vec Wasteland, each tying one word to another.",
+                    "The Semantic Spider wove them from every word ever spoken in this realm.",
+                    "Words that keep the same company end up close together in the web.",
+                    "Train your own embeddings and read meaning from the vectors.",
+                    "Answer the Spider's riddles and the web will unravel!"
+                ],
+                "challenge": "word2vec_wasteland",
+                "concept": "Learn word embeddings with skip-gram and negative sampling"
+            },
+            "Attention Archipelago": {
+                "story": [
+                    "Hundreds of islands stretch to the horizon of the Attention Archipelago.",
+                    "The Focus Fiend scatters your gaze across all of them at once.",
+                    "Attention lets every island ask every other island: are you what I'm looking for?",
+                    "Queries meet keys, softmax picks the winners, and values carry their answers home.",
+                    "Aim each head at its quest and the Fiend will lose its grip!"
+                ],
+                "challenge": "attention_archipelago",
+                "concept": "Focus with scaled dot-product attention"
+            },
+            "Transformer Temple": {
+                "story": [
+                    "Pillars of stacked layers hold up the roof of the Transformer Temple.",
+                    "The Multi-Head Hydra watches every word through eight heads at once.",
+                    "A transformer block normalises, attends, thinks with an MLP - and adds every result back.",
+                    "Not every head matters equally; some can be cut without losing a thing.",
+                    "Find the heads the Hydra can spare and the temple is yours!"
+                ],
+                "challenge": "transformer_temple",
+                "concept": "Assemble attention, MLPs and residuals into a transformer block"
+            },
+            "GPT Citadel": {
+                "story": [
+                    "At the top of the world stands the GPT Citadel, built from every word ever spoken here.",
+                    "The GPT Overlord predicts the next character, then the next, then the next...",
+                    "It never re-reads what it has said: its keys and values wait in a cache.",
+                    "Its words are only probabilities - and a clever prompt can steer them.",
+                    "Make the Overlord speak your words and the realm is free!"
+                ],
+                "challenge": "gpt_citadel",
+                "concept": "Generate text one token at a time with a cached, causal transformer"
+            },
             "Perceptron Village": {
                 "story": [
                     "Welcome to Perceptron Village, traveler!",
@@ -108,8 +231,16 @@ class LevelState(BaseState):
         self.auto_advance_complete = False
         self.dialogue_speed = 5.0  # seconds per dialogue line (slower)
         self.speech_started = False
+        self.narration_task = None
         print("✅ Level state initialized successfully")
         
+        # Under the asyncio runner each line is awaited until it has been spoken
+        if self.game.loop is not None and self.level_data and self.level_data["name"] in self.level_content:
+            story = self.level_content[self.level_data["name"]]["story"]
+            if story:
+                self.narration_task = self.game.start_task(self._narrate(story))
+                return
+        
         # Start speech for first line (temporarily disabled to fix crash)
         if self.level_data and self.level_data["name"] in self.level_content:
             story = self.level_content[self.level_data["name"]]["story"]
@@ -132,6 +263,7 @@ class LevelState(BaseState):
                         self.game.change_state(GameState.CODING_CHALLENGE)
                 else:
                     # Skip to end of current dialogue
+                    self._stop_narration()
                     if self.level_data and self.level_data["name"] in self.level_content:
                         story = self.level_content[self.level_data["name"]]["story"]
                         self.current_dialogue = len(story) - 1
@@ -139,8 +271,30 @@ class LevelState(BaseState):
             elif event.key == pygame.K_ESCAPE:
                 self.game.change_state(GameState.WORLD_MAP)
     
+    def exit(self):
+        self._stop_narration()
+
+    async def _narrate(self, story):
+        """Speak each line and wait for it to finish before pausing and advancing"""
+        from ..audio.speech_system import speech_system
+        for index, line in enumerate(story):
+            self.current_dialogue = index
+            await speech_system.speak_async(line, "tensor")
+            if index < len(story) - 1:
+                await asyncio.sleep(3.0)
+        self.auto_advance_complete = True
+
+    def _stop_narration(self):
+        if self.narration_task is not None and not self.narration_task.done():
+            self.narration_task.cancel()
+            from ..audio.speech_system import speech_system
+            speech_system.stop_speech()
+        self.narration_task = None
+
     def update(self, dt):
         """Update auto-advancing dialogue"""
+        if self.narration_task is not None and not self.narration_task.done():
+            return
         if not self.auto_advance_complete and self.level_data and self.level_data["name"] in self.level_content:
             story = self.level_content[self.level_data["name"]]["story"]
             
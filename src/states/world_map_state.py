@@ -57,6 +57,11 @@ class WorldMapState(BaseState):
         self.cheat_sequence = ""
         self.target_cheats = ["unlock", "debugmode"]  # Type "unlock" or "debugmode" to unlock all levels
     
+    def _is_playable(self, index):
+        """A level is playable once the level state has story content for it"""
+        level_state = self.game.states.get(GameState.LEVEL)
+        return level_state is not None and self.levels[index]["name"] in level_state.level_content
+    
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_LEFT or event.key == pygame.K_a:
@@ -104,8 +109,8 @@ class WorldMapState(BaseState):
                     self.selected_level = best_level
                     
             elif event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
-                # Prevent entering levels beyond 6 (in development)
-                if self.selected_level >= 6:
+                # Prevent entering levels that have no content yet (in development)
+                if not self._is_playable(self.selected_level):
                     print("🚧 This level is still in development! Coming soon...")
                     return
                 
@@ -247,8 +252,8 @@ class WorldMapState(BaseState):
             # Level name with better positioning
             name_font = pygame.font.Font(None, 24)
             
-            # Show "In Development" for levels beyond 6
-            if i >= 6:
+            # Show "In Development" for levels without content yet
+            if not self._is_playable(i):
                 level_name = "🚧 In Development"
                 name_color = (255, 200, 100)
             else:
@@ -287,7 +292,7 @@ class WorldMapState(BaseState):
         
         # Update character position
         self.game.character.move_to(char_x, char_y)
-        self.game.character.render(screen)
+        self.game.character.render(screen, self.game.interpolation)
         
         # Draw UI with better styling
         # Title
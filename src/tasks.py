@@ -0,0 +1,103 @@
+"""
+Time-sliced cooperative tasks: generators resumed in the time left over at the end of each frame
+"""
+
+import time
+
+class Task:
+    """A generator run a slice at a time by ``TaskRunner``.
+
+    The generator does one unit of work per resume and yields its progress
+    (a fraction in [0, 1], or None); whatever it returns becomes ``result``.
+    Partial results live wherever the generator writes them, so a state can
+    draw them while the task is still going.
+    """
+
+    def __init__(self, generator, owner=None, on_done=None):
+        self.generator = generator
+        self.owner = owner
+        self.on_done = on_done
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.done = False
+        self.cancelled = False
+
+    def resume(self):
+        """Run one slice; returns True once the task has finished"""
+        if self.done:
+            return True
+        try:
+            progress = next(self.generator)
+            if progress is not None:
+                self.progress = progress
+            return False
+        except StopIteration as stop:
+            self.result = stop.value
+            self.progress = 1.0
+        except Exception as e:
+            self.error = e
+            print(f"⚠️  Task {getattr(self.generator, '__name__', self.generator)} failed: {e}")
+        self.done = True
+        if self.error is None and self.on_done is not None:
+            self.on_done(self.result)
+        return True
+
+    def finish(self):
+        """Run the remaining slices right now, for when the result is needed this frame"""
+        while not self.resume():
+            pass
+        return self.result
+
+    def cancel(self):
+        if not self.done:
+            self.cancelled = True
+            self.done = True
+            self.generator.close()
+
+class TaskRunner:
+    """Round-robin scheduler for ``Task`` generators on the main thread.
+
+    ``run(deadline)`` resumes tasks in turn until ``time.perf_counter()``
+    reaches the deadline, so they only use the part of the frame the game
+    didn't need. One resume always happens, so tasks still advance on a
+    machine that never finishes a frame early. Tasks belong to an ``owner``
+    and ``cancel_owner`` drops them when it goes away, as with jobs.
+    """
+
+    def __init__(self):
+        self._tasks = []
+        self._next = 0
+
+    def start(self, generator, owner=None, on_done=None):
+        """Schedule a generator; ``on_done(result)`` runs when it returns"""
+        task = Task(generator, owner, on_done)
+        self._tasks.append(task)
+        return task
+
+    def run(self, deadline):
+        """Resume tasks until the deadline; returns the number of resumes"""
+        resumes = 0
+        while self._tasks:
+            if self._next >= len(self._tasks):
+                self._next = 0
+            task = self._tasks[self._next]
+            if task.resume():
+                self._tasks.pop(self._next)
+            else:
+                self._next += 1
+            resumes += 1
+            if time.perf_counter() >= deadline:
+                break
+        return resumes
+
+    def cancel_owner(self, owner):
+        """Cancel every unfinished task of owner"""
+        for task in self._tasks:
+            if task.owner is owner:
+                task.cancel()
+        self._tasks = [task for task in self._tasks if not task.done]
+
+    def pending(self, owner=None):
+        """Number of unfinished tasks (of owner, or of everyone)"""
+        return sum(1 for task in self._tasks if not task.done and (owner is None or task.owner is owner))
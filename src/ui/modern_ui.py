@@ -269,6 +269,12 @@ class DialogueBox:
         self.character_portrait = portrait
         self.last_char_time = time.time()
     
+    def append_text(self, text):
+        """Extend the current dialogue, e.g. with tokens streamed in as they are generated"""
+        if self.char_index >= len(self.full_text):
+            self.last_char_time = time.time()
+        self.full_text += text
+    
     def update(self, dt):
         """Update typewriter effect"""
         current_time = time.time()
@@ -374,6 +380,8 @@ class ParticleSystem:
             'y': y,
             'vx': velocity[0],
             'vy': velocity[1],
+            'px': x,
+            'py': y,
             'color': color,
             'lifetime': lifetime,
             'max_lifetime': lifetime,
@@ -384,6 +392,7 @@ class ParticleSystem:
     def update(self, dt):
         """Update all particles"""
         for particle in self.particles[:]:
+            particle['px'], particle['py'] = particle['x'], particle['y']
             particle['x'] += particle['vx'] * dt
             particle['y'] += particle['vy'] * dt
             particle['lifetime'] -= dt
@@ -394,8 +403,8 @@ class ParticleSystem:
             if particle['lifetime'] <= 0:
                 self.particles.remove(particle)
     
-    def render(self, screen):
-        """Render all particles"""
+    def render(self, screen, interpolation=1.0):
+        """Render all particles, ``interpolation`` of the way from their previous to their current positions"""
         for particle in self.particles:
             alpha = particle['lifetime'] / particle['max_lifetime']
             color = (*particle['color'][:3], int(alpha * 255))
@@ -403,7 +412,9 @@ class ParticleSystem:
             # Create surface for alpha blending
             particle_surface = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
             pygame.draw.circle(particle_surface, color, (particle['size'], particle['size']), particle['size'])
-            screen.blit(particle_surface, (int(particle['x'] - particle['size']), int(particle['y'] - particle['size'])))
+            x = particle['px'] + (particle['x'] - particle['px']) * interpolation
+            y = particle['py'] + (particle['y'] - particle['py']) * interpolation
+            screen.blit(particle_surface, (int(x - particle['size']), int(y - particle['size'])))
     
     def create_explosion(self, x, y, color, count=20):
         """Create explosion effect"""
@@ -0,0 +1,93 @@
+"""
+Decision-region heatmap rendering for linear classifiers
+"""
+
+import pygame
+import numpy as np
+
+class DecisionRegionRenderer:
+    """Shades the two class regions of a linear boundary a*x + b*y + c = 0.
+
+    Regions are evaluated for every pixel of the plot rect at once with a NumPy
+    meshgrid and written into a cached surface through surfarray. While the
+    student is dragging, a reduced-resolution draft is rendered and scaled up;
+    once the drag stops the full-resolution image replaces it. Nothing is
+    recomputed unless the boundary, plot size or resolution actually changes.
+    """
+
+    def __init__(self, negative_color, positive_color, background_color=(25, 30, 45),
+                 x_range=(0.0, 1.0), y_range=(0.0, 1.0), draft_scale=4, margin_falloff=0.25):
+        self.negative_color = np.array(negative_color, dtype=np.float32)
+        self.positive_color = np.array(positive_color, dtype=np.float32)
+        self.background_color = np.array(background_color, dtype=np.float32)
+        self.x_range = x_range
+        self.y_range = y_range
+        self.draft_scale = max(1, int(draft_scale))
+        self.margin_falloff = margin_falloff
+
+        # Cached surfaces keyed by resolution ("draft" / "full")
+        self._cache = {}
+
+    def invalidate(self):
+        """Drop cached images (e.g. after changing colors or ranges)"""
+        self._cache.clear()
+
+    def render(self, screen, rect, a, b, c, dragging=False):
+        """Blit the region heatmap for boundary a*x + b*y + c = 0 into rect"""
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        resolution = "draft" if dragging else "full"
+        surface = self._get_surface(resolution, rect.size, (float(a), float(b), float(c)))
+        screen.blit(surface, rect.topleft)
+
+    def _get_surface(self, resolution, size, params):
+        """Return the cached surface for params, recomputing it only when stale"""
+        key = (size, params)
+        entry = self._cache.get(resolution)
+        if entry is not None and entry['key'] == key:
+            return entry['surface']
+
+        # A full-resolution image is also the best possible draft
+        full = self._cache.get("full")
+        if resolution == "draft" and full is not None and full['key'] == key:
+            return full['surface']
+
+        scale = self.draft_scale if resolution == "draft" else 1
+        grid_size = (max(1, size[0] // scale), max(1, size[1] // scale))
+
+        if entry is None or entry['grid'].get_size() != grid_size:
+            entry = {'grid': pygame.Surface(grid_size)}
+            self._cache[resolution] = entry
+
+        pygame.surfarray.blit_array(entry['grid'], self.compute_pixels(grid_size, *params))
+        if grid_size == tuple(size):
+            entry['surface'] = entry['grid']
+        else:
+            entry['surface'] = pygame.transform.smoothscale(entry['grid'], size)
+        entry['key'] = key
+        return entry['surface']
+
+    def compute_pixels(self, grid_size, a, b, c):
+        """Compute a (width, height, 3) uint8 image of class regions and margin intensity"""
+        width, height = grid_size
+
+        # Pixel centres in data space; y grows upwards on screen
+        x0, x1 = self.x_range
+        y0, y1 = self.y_range
+        xs = x0 + (np.arange(width, dtype=np.float32) + 0.5) * ((x1 - x0) / width)
+        ys = y1 - (np.arange(height, dtype=np.float32) + 0.5) * ((y1 - y0) / height)
+        grid_x, grid_y = np.meshgrid(xs, ys, indexing='ij', sparse=True)
+
+        norm = np.hypot(a, b)
+        activation = a * grid_x + b * grid_y + c
+        if norm > 1e-9:
+            distance = activation / norm
+        else:
+            distance = np.full((width, height), c, dtype=np.float32)
+
+        # Stronger tint further from the boundary, fading to the background at the margin
+        intensity = np.clip(np.abs(distance) / self.margin_falloff, 0.0, 1.0)
+        intensity = (0.15 + 0.45 * intensity)[..., None]
+        class_color = np.where((distance > 0)[..., None], self.positive_color, self.negative_color)
+        pixels = self.background_color + (class_color - self.background_color) * intensity
+        return pixels.astype(np.uint8)
@@ -0,0 +1,97 @@
+"""
+Density rendering for large labelled 2D point sets
+"""
+
+import pygame
+import numpy as np
+
+class DensityScatterRenderer:
+    """Draws hundreds of thousands of labelled points as a per-class density image.
+
+    Points are binned into one 2D histogram per class with a single
+    ``np.bincount`` over flattened (class, x, y) bin indices. Each bin is
+    colored by the class mix inside it, with opacity growing with the log of
+    the point count, and the image is written through surfarray. The binned
+    image only depends on the data, so it is cached until a different
+    dataset is drawn, its version changes or the plot size changes; moving
+    the decision boundary never touches it.
+    """
+
+    def __init__(self, class_colors, x_range=(0.0, 1.0), y_range=(0.0, 1.0), cell_size=2, min_alpha=70):
+        self.class_colors = np.array(class_colors, dtype=np.float32)
+        self.x_range = x_range
+        self.y_range = y_range
+        self.cell_size = max(1, int(cell_size))
+        self.min_alpha = min_alpha
+
+        self._cache_key = None
+        self._surface = None
+        # Held so the id in the cache key cannot be reused by a new dataset
+        self._dataset = None
+
+    def invalidate(self):
+        """Drop the cached image (e.g. after changing colors or ranges)"""
+        self._cache_key = None
+
+    def render(self, screen, rect, dataset):
+        """Blit the density image of a PerceptronDataset into rect"""
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        # Every new dataset starts at the same version, so its identity is part of the key
+        key = (rect.size, id(dataset), len(dataset), dataset.version)
+        if key != self._cache_key:
+            self._surface = self._build_surface(rect.size, dataset.features, dataset.labels)
+            self._cache_key = key
+            self._dataset = dataset
+        screen.blit(self._surface, rect.topleft)
+
+    def histograms(self, grid_size, features, labels):
+        """Count points per (class, x bin, y bin); y bins run top to bottom like the screen"""
+        width, height = grid_size
+        classes = len(self.class_colors)
+        x0, x1 = self.x_range
+        y0, y1 = self.y_range
+
+        xs, ys = features[:, 0], features[:, 1]
+        inside = (xs >= x0) & (xs < x1) & (ys > y0) & (ys <= y1) & (labels >= 0) & (labels < classes)
+        ix = ((xs[inside] - x0) * (width / (x1 - x0))).astype(np.intp)
+        iy = ((y1 - ys[inside]) * (height / (y1 - y0))).astype(np.intp)
+        np.minimum(ix, width - 1, out=ix)
+        np.minimum(iy, height - 1, out=iy)
+
+        flat = (labels[inside].astype(np.intp) * width + ix) * height + iy
+        counts = np.bincount(flat, minlength=classes * width * height)
+        return counts.reshape(classes, width, height)
+
+    def compute_pixels(self, grid_size, features, labels):
+        """Return (width, height, 3) uint8 colors and (width, height) uint8 alpha for the density image"""
+        counts = self.histograms(grid_size, features, labels).astype(np.float32)
+        total = counts.sum(axis=0)
+
+        # Color each bin by its class mix
+        share = counts / np.maximum(total, 1.0)
+        colors = np.tensordot(share, self.class_colors, axes=(0, 0))
+
+        # Log scale so a few stray points stay visible next to dense cores
+        peak = float(total.max())
+        if peak > 0:
+            density = np.log1p(total) / np.log1p(peak)
+        else:
+            density = total
+        alpha = np.where(total > 0, self.min_alpha + (255 - self.min_alpha) * density, 0.0)
+        return colors.astype(np.uint8), alpha.astype(np.uint8)
+
+    def _build_surface(self, size, features, labels):
+        """Bin the points at cell_size resolution and scale the image to the plot size"""
+        grid_size = (max(1, size[0] // self.cell_size), max(1, size[1] // self.cell_size))
+        colors, alpha = self.compute_pixels(grid_size, features, labels)
+
+        grid = pygame.Surface(grid_size, pygame.SRCALPHA)
+        pygame.surfarray.blit_array(grid, colors)
+        pixels_alpha = pygame.surfarray.pixels_alpha(grid)
+        pixels_alpha[...] = alpha
+        del pixels_alpha
+
+        if grid_size == tuple(size):
+            return grid
+        return pygame.transform.scale(grid, size)
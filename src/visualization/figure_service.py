@@ -0,0 +1,119 @@
+"""
+Matplotlib charts rendered in a worker process and handed back as pygame surfaces
+"""
+
+import hashlib
+import importlib.util
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import pygame
+import numpy as np
+
+# Checked without importing matplotlib, which stays out of the game process entirely
+MATPLOTLIB_AVAILABLE = importlib.util.find_spec("matplotlib") is not None
+
+def _render(name, size, params):
+    # Imported here so only the worker process ever loads matplotlib
+    from . import figures
+    return figures.render(name, size, params)
+
+def _freeze(value):
+    """Hashable stand-in for figure parameters; arrays are keyed by a digest of their bytes"""
+    if isinstance(value, np.ndarray):
+        return ("array", value.shape, value.dtype.str, hashlib.blake2b(np.ascontiguousarray(value).tobytes(),
+                                                                        digest_size=16).digest())
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in sorted(value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+class FigureService:
+    """Renders matplotlib figures (see ``figures.FIGURES``) off the main thread.
+
+    ``request(name, size, slot, **params)`` never blocks: it returns the
+    surface for exactly those parameters if it is cached, and otherwise
+    queues a render on a spawned worker process and returns the last surface
+    delivered to ``slot`` (or None), so a chart keeps showing its previous
+    state until the new one lands. Only one render per slot is queued at a
+    time; newer requests replace the waiting one.
+
+    Workers send back the Agg canvas as raw RGBA bytes, which
+    ``pygame.image.frombuffer`` wraps without copying. Finished surfaces are
+    kept in an LRU cache of ``capacity`` entries keyed on the figure name,
+    size and a digest of the parameters.
+    """
+
+    def __init__(self, capacity=32, workers=1):
+        self.capacity = capacity
+        self.workers = workers
+        self.enabled = MATPLOTLIB_AVAILABLE
+        self.error = None
+        self._cache = OrderedDict()
+        self._latest = {}
+        self._running = {}
+        self._waiting = {}
+        self._executor = None
+
+    def request(self, name, size, slot=None, **params):
+        """Surface for the figure, or the slot's previous one while it renders"""
+        slot = slot or name
+        if not self.enabled:
+            return None
+        self.poll()
+        size = (int(size[0]), int(size[1]))
+        key = (name, size, _freeze(params))
+        surface = self._cache.get(key)
+        if surface is not None:
+            self._cache.move_to_end(key)
+            self._latest[slot] = surface
+            return surface
+
+        running = self._running.get(slot)
+        if running is None:
+            self._submit(slot, key, name, size, params)
+        elif running[0] != key:
+            self._waiting[slot] = (key, name, size, params)
+        return self._latest.get(slot)
+
+    def _submit(self, slot, key, name, size, params):
+        if self._executor is None:
+            context = multiprocessing.get_context('spawn')
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=context)
+        self._running[slot] = (key, self._executor.submit(_render, name, size, params))
+
+    def poll(self):
+        """Wrap finished renders into cached surfaces and start waiting ones; returns the slots that changed"""
+        changed = []
+        for slot, (key, future) in list(self._running.items()):
+            if not future.done():
+                continue
+            del self._running[slot]
+            try:
+                size, pixels = future.result()
+            except Exception as e:
+                # A broken figure (or a missing matplotlib in the worker) disables the service
+                self.error = e
+                self.enabled = False
+                print(f"⚠️  Figure rendering failed: {e}")
+                continue
+            surface = pygame.image.frombuffer(pixels, size, "RGBA")
+            self._cache[key] = surface
+            while len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+            self._latest[slot] = surface
+            changed.append(slot)
+
+            waiting = self._waiting.pop(slot, None)
+            if waiting is not None and waiting[0] not in self._cache:
+                self._submit(slot, *waiting)
+        return changed
+
+    def close(self):
+        """Drop queued renders and shut the worker down"""
+        self._waiting.clear()
+        self._running.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
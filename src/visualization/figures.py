@@ -0,0 +1,78 @@
+"""
+Matplotlib figures rendered to RGBA with the Agg backend - imported only inside FigureService workers
+"""
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+BACKGROUND = "#141a28"
+FOREGROUND = "#dce4f0"
+ACCENTS = ("#64b4ff", "#ff7a90", "#7cf29a", "#ffd45c")
+
+def _figure(size, dpi=100):
+    figure = Figure(figsize=(size[0] / dpi, size[1] / dpi), dpi=dpi, facecolor=BACKGROUND)
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
+    axes.set_facecolor(BACKGROUND)
+    for spine in axes.spines.values():
+        spine.set_color(FOREGROUND)
+    axes.tick_params(colors=FOREGROUND, labelsize=8)
+    return figure, axes
+
+def _title(axes, title):
+    if title:
+        axes.set_title(title, color=FOREGROUND, fontsize=10)
+
+def learning_curve(axes, series, xlabel="step", ylabel="", title=""):
+    """series: {label: values} or {label: (steps, values)}, one line each"""
+    for (label, values), color in zip(series.items(), ACCENTS * len(series)):
+        if isinstance(values, tuple):
+            axes.plot(values[0], values[1], color=color, label=label, linewidth=1.5)
+        else:
+            axes.plot(np.arange(1, len(values) + 1), values, color=color, label=label, linewidth=1.5)
+    axes.set_xlabel(xlabel, color=FOREGROUND, fontsize=9)
+    axes.set_ylabel(ylabel, color=FOREGROUND, fontsize=9)
+    axes.grid(alpha=0.2)
+    if len(series) > 1:
+        axes.legend(fontsize=8, facecolor=BACKGROUND, labelcolor=FOREGROUND, edgecolor=FOREGROUND)
+    _title(axes, title)
+
+def weight_histogram(axes, weights, bins=20, title=""):
+    """weights: {label: array}, overlaid histograms of every array's values"""
+    for (label, values), color in zip(weights.items(), ACCENTS * len(weights)):
+        axes.hist(np.ravel(values), bins=bins, color=color, alpha=0.6, label=label)
+    axes.set_xlabel("weight", color=FOREGROUND, fontsize=9)
+    if len(weights) > 1:
+        axes.legend(fontsize=8, facecolor=BACKGROUND, labelcolor=FOREGROUND, edgecolor=FOREGROUND)
+    _title(axes, title)
+
+def confusion_matrix(axes, matrix, labels=None, title=""):
+    """(true, predicted) count matrix as an annotated heatmap"""
+    matrix = np.asarray(matrix)
+    axes.imshow(matrix, cmap="magma", vmin=0)
+    labels = labels or [str(i) for i in range(len(matrix))]
+    axes.set_xticks(range(len(labels)), labels)
+    axes.set_yticks(range(len(labels)), labels)
+    axes.set_xlabel("predicted", color=FOREGROUND, fontsize=9)
+    axes.set_ylabel("true", color=FOREGROUND, fontsize=9)
+    threshold = matrix.max() / 2 if matrix.size else 0
+    for (row, column), count in np.ndenumerate(matrix):
+        axes.text(column, row, f"{count:,}", ha="center", va="center", fontsize=9,
+                  color="black" if count > threshold else "white")
+    _title(axes, title)
+
+FIGURES = {
+    "learning_curve": learning_curve,
+    "weight_histogram": weight_histogram,
+    "confusion_matrix": confusion_matrix,
+}
+
+def render(name, size, params):
+    """Draw figure ``name`` at size (width, height) pixels; returns (size, RGBA bytes)"""
+    figure, axes = _figure(size)
+    FIGURES[name](axes, **params)
+    figure.tight_layout(pad=0.4)
+    canvas = figure.canvas
+    canvas.draw()
+    return canvas.get_width_height(), bytes(canvas.buffer_rgba())
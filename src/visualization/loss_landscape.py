@@ -0,0 +1,89 @@
+"""
+Loss-landscape heatmap with contours and an optimisation trajectory on top
+"""
+
+import pygame
+import numpy as np
+
+class LossLandscapeRenderer:
+    """Draws a ``LossLandscape`` as a heatmap with iso-loss contours.
+
+    The image is built at the landscape's own grid resolution through
+    surfarray (low loss dark, high loss bright, on a square-root scale so the
+    valley floor keeps its detail), contour pixels are where the quantised
+    loss changes band, and the result is smooth-scaled to the plot rect. It
+    is cached on the landscape's ``version`` and the rect size, so only a
+    newly landed level is redrawn. The trajectory and the current weights
+    are plain line draws on top every frame.
+    """
+
+    def __init__(self, low_color=(20, 30, 70), high_color=(250, 210, 90), contour_color=(235, 240, 255),
+                 trajectory_color=(255, 90, 120), contours=10):
+        self.low_color = np.array(low_color, dtype=np.float32)
+        self.high_color = np.array(high_color, dtype=np.float32)
+        self.contour_color = np.array(contour_color, dtype=np.float32)
+        self.trajectory_color = trajectory_color
+        self.contours = contours
+        self._key = None
+        self._surface = None
+
+    def render(self, screen, rect, landscape, trajectory=(), current=None):
+        """Blit the landscape into rect and overlay trajectory, a sequence of (w1, w2)"""
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        surface = self._get_surface(landscape, rect.size)
+        if surface is None:
+            pygame.draw.rect(screen, tuple(int(v) for v in self.low_color), rect)
+        else:
+            screen.blit(surface, rect.topleft)
+
+        minimum = landscape.minimum()
+        if minimum is not None:
+            x, y = self.to_screen(rect, landscape, minimum[:2])
+            pygame.draw.line(screen, (255, 255, 255), (x - 5, y), (x + 5, y), 2)
+            pygame.draw.line(screen, (255, 255, 255), (x, y - 5), (x, y + 5), 2)
+
+        points = [self.to_screen(rect, landscape, point) for point in trajectory]
+        if len(points) > 1:
+            previous_clip = screen.get_clip()
+            screen.set_clip(rect)
+            pygame.draw.lines(screen, self.trajectory_color, False, points, 2)
+            screen.set_clip(previous_clip)
+        if current is not None:
+            x, y = self.to_screen(rect, landscape, current)
+            if rect.collidepoint(x, y):
+                pygame.draw.circle(screen, self.trajectory_color, (x, y), 6)
+                pygame.draw.circle(screen, (255, 255, 255), (x, y), 6, 2)
+
+    def to_screen(self, rect, landscape, point):
+        """Pixel position of (w1, w2): w1 across, w2 upwards"""
+        (x0, x1), (y0, y1) = landscape.w1_range, landscape.w2_range
+        x = rect.x + (point[0] - x0) / (x1 - x0) * rect.width
+        y = rect.bottom - (point[1] - y0) / (y1 - y0) * rect.height
+        return int(round(x)), int(round(y))
+
+    def _get_surface(self, landscape, size):
+        if landscape.losses is None:
+            return None
+        key = (landscape.version, size)
+        if key != self._key:
+            grid = pygame.Surface(landscape.losses.shape)
+            pygame.surfarray.blit_array(grid, self.compute_pixels(landscape.losses))
+            self._surface = pygame.transform.smoothscale(grid, size)
+            self._key = key
+        return self._surface
+
+    def compute_pixels(self, losses):
+        """(w1, w2) losses -> (w1, w2, 3) uint8 image, w2 flipped so it grows upwards"""
+        values = losses[:, ::-1]
+        low, high = float(values.min()), float(values.max())
+        scaled = np.sqrt((values - low) / max(high - low, 1e-12)).astype(np.float32)
+
+        bands = np.minimum((scaled * self.contours).astype(np.int32), self.contours - 1)
+        edges = np.zeros(bands.shape, dtype=bool)
+        edges[1:] |= bands[1:] != bands[:-1]
+        edges[:, 1:] |= bands[:, 1:] != bands[:, :-1]
+
+        pixels = self.low_color + (self.high_color - self.low_color) * scaled[..., None]
+        pixels[edges] = 0.5 * pixels[edges] + 0.5 * self.contour_color
+        return pixels.astype(np.uint8)
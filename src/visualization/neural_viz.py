@@ -7,12 +7,38 @@ import numpy as np
 import math
 
 class NeuralNetworkVisualizer:
+    # Level of detail: a full-size neuron and the spacing it needs to stay readable
+    NEURON_RADIUS = 25
+    FULL_DETAIL_SPACING = 70
+    # Labels are skipped once the effective zoom drops below this
+    LABEL_ZOOM = 0.75
+    # Above this many edges, connections are drawn in batched color buckets
+    MAX_DETAIL_EDGES = 64
+    # Layers with more neurons than this are bundled into this many groups
+    MAX_BUNDLES = 24
+    # Magnitude buckets per weight sign for batched connections
+    WEIGHT_BUCKETS = 4
+    # Layers packed tighter than this are drawn as a single activation strip
+    MIN_NEURON_SPACING = 6
+    
     def __init__(self, screen_width, screen_height):
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.animation_time = 0
         
-    def draw_neuron(self, screen, x, y, radius, activation=0.0, label="", is_input=False, is_output=False):
+        # Cached fonts by size and cached edge layers for large networks
+        self._fonts = {}
+        self._edge_cache = {}
+    
+    def _font(self, size):
+        """Return a cached default font of the given size"""
+        font = self._fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            self._fonts[size] = font
+        return font
+        
+    def draw_neuron(self, screen, x, y, radius, activation=0.0, label="", is_input=False, is_output=False, show_text=True):
         """Draw a single neuron with activation visualization"""
         # Color based on activation level
         if is_input:
@@ -28,28 +54,30 @@ class NeuralNetworkVisualizer:
         
         # Draw neuron circle
         pygame.draw.circle(screen, color, (int(x), int(y)), radius)
-        pygame.draw.circle(screen, (255, 255, 255), (int(x), int(y)), radius, 2)
+        if radius >= 4:
+            pygame.draw.circle(screen, (255, 255, 255), (int(x), int(y)), radius, 2 if radius >= 10 else 1)
+        
+        if not show_text:
+            return
         
         # Draw activation value
         if abs(activation) > 0.01:
-            font = pygame.font.Font(None, 20)
-            text = font.render(f"{activation:.2f}", True, (255, 255, 255))
+            text = self._font(20).render(f"{activation:.2f}", True, (255, 255, 255))
             text_rect = text.get_rect(center=(x, y))
             screen.blit(text, text_rect)
         
         # Draw label
         if label:
-            font = pygame.font.Font(None, 24)
-            text = font.render(label, True, (255, 255, 255))
+            text = self._font(24).render(label, True, (255, 255, 255))
             text_rect = text.get_rect(center=(x, y - radius - 20))
             screen.blit(text, text_rect)
     
-    def draw_connection(self, screen, start_pos, end_pos, weight, animated=False, start_radius=25, end_radius=25):
+    def draw_connection(self, screen, start_pos, end_pos, weight, animated=False, start_radius=25, end_radius=25, show_label=True):
         """Draw connection between neurons with weight visualization - avoids overlapping neurons"""
         # Calculate connection points at edge of neurons instead of center
         dx = end_pos[0] - start_pos[0]
         dy = end_pos[1] - start_pos[1]
-        distance = math.sqrt(dx*dx + dy*dy)
+        distance = math.hypot(dx, dy)
         
         if distance == 0:
             return
@@ -83,6 +111,9 @@ class NeuralNetworkVisualizer:
         # Draw connection line
         pygame.draw.line(screen, color, connection_start, connection_end, thickness)
         
+        if not show_label:
+            return
+        
         # Draw weight value at midpoint, offset to avoid line overlap
         mid_x = (connection_start[0] + connection_end[0]) // 2
         mid_y = (connection_start[1] + connection_end[1]) // 2
@@ -94,8 +125,7 @@ class NeuralNetworkVisualizer:
         label_x = mid_x + perp_x
         label_y = mid_y + perp_y
         
-        font = pygame.font.Font(None, 16)
-        text = font.render(f"{weight:.2f}", True, (255, 255, 255))
+        text = self._font(16).render(f"{weight:.2f}", True, (255, 255, 255))
         text_rect = text.get_rect(center=(label_x, label_y))
         
         # Background for readability
@@ -103,46 +133,155 @@ class NeuralNetworkVisualizer:
         pygame.draw.rect(screen, (100, 120, 150), text_rect.inflate(4, 2), 1)
         screen.blit(text, text_rect)
     
-    def draw_simple_network(self, screen, x, y, width, height, weights, biases, activations, labels=None):
-        """Draw a simple feedforward network"""
+    def draw_simple_network(self, screen, x, y, width, height, weights, biases, activations, labels=None, zoom=1.0):
+        """Draw a simple feedforward network
+        
+        Small networks are drawn neuron by neuron with weight labels. As the
+        network grows (or ``zoom`` shrinks) the drawing degrades gracefully:
+        labels are dropped below ``LABEL_ZOOM``, neurons shrink to fit, edges
+        are batched into color buckets on a cached layer, and dense layers are
+        bundled into at most ``MAX_BUNDLES`` groups with averaged weights.
+        """
         layers = len(activations)
         if layers == 0:
             return
         
         layer_width = width // layers
-        positions = []
+        sizes = [len(layer) for layer in activations]
         
         # Calculate neuron positions
-        for layer_idx in range(layers):
-            layer_neurons = len(activations[layer_idx])
-            layer_x = x + layer_idx * layer_width + layer_width // 2
-            
-            layer_positions = []
-            for neuron_idx in range(layer_neurons):
-                neuron_y = y + (neuron_idx + 1) * height // (layer_neurons + 1)
-                layer_positions.append((layer_x, neuron_y))
-            positions.append(layer_positions)
+        layer_xs = [x + layer_idx * layer_width + layer_width // 2 for layer_idx in range(layers)]
+        layer_ys = [y + (np.arange(n) + 1) * height // (n + 1) for n in sizes]
+        
+        # Effective zoom shrinks as the most crowded layer gets denser
+        spacing = height / (max(sizes) + 1)
+        detail = zoom * min(1.0, spacing / self.FULL_DETAIL_SPACING)
+        radius = max(2, int(self.NEURON_RADIUS * min(1.0, detail)))
+        show_labels = detail >= self.LABEL_ZOOM
+        
+        weight_arrays = [self._weight_matrix(weights, layer_idx, sizes[layer_idx], sizes[layer_idx + 1])
+                         for layer_idx in range(layers - 1)]
+        edge_count = sum(w.size for w in weight_arrays)
         
         # Draw connections first (so they appear behind neurons)
-        for layer_idx in range(len(positions) - 1):
-            for i, start_pos in enumerate(positions[layer_idx]):
-                for j, end_pos in enumerate(positions[layer_idx + 1]):
-                    if layer_idx < len(weights) and i < len(weights[layer_idx]) and j < len(weights[layer_idx][i]):
-                        weight = weights[layer_idx][i][j] if isinstance(weights[layer_idx][i], list) else weights[layer_idx][j]
-                        self.draw_connection(screen, start_pos, end_pos, weight, animated=True)
+        if show_labels and edge_count <= self.MAX_DETAIL_EDGES:
+            for layer_idx, matrix in enumerate(weight_arrays):
+                for i, start_y in enumerate(layer_ys[layer_idx].tolist()):
+                    for j, end_y in enumerate(layer_ys[layer_idx + 1].tolist()):
+                        self.draw_connection(screen, (layer_xs[layer_idx], start_y), (layer_xs[layer_idx + 1], end_y),
+                                             matrix[i, j], True, radius, radius)
+        else:
+            self._draw_edge_layer(screen, pygame.Rect(x, y, width, height), layer_xs, layer_ys, weight_arrays, radius)
         
         # Draw neurons
-        for layer_idx, layer_positions in enumerate(positions):
-            for neuron_idx, pos in enumerate(layer_positions):
-                activation = activations[layer_idx][neuron_idx] if neuron_idx < len(activations[layer_idx]) else 0
+        for layer_idx, layer_positions in enumerate(layer_ys):
+            is_input = layer_idx == 0
+            is_output = layer_idx == layers - 1
+            values = activations[layer_idx]
+            if height / (len(values) + 1) < self.MIN_NEURON_SPACING:
+                self._draw_neuron_strip(screen, layer_xs[layer_idx], y, height, values, is_input, is_output)
+                continue
+            for neuron_idx, neuron_y in enumerate(layer_positions.tolist()):
+                activation = values[neuron_idx]
                 label = ""
-                if labels and layer_idx < len(labels) and neuron_idx < len(labels[layer_idx]):
+                if show_labels and labels and layer_idx < len(labels) and neuron_idx < len(labels[layer_idx]):
                     label = labels[layer_idx][neuron_idx]
                 
-                is_input = layer_idx == 0
-                is_output = layer_idx == len(positions) - 1
+                self.draw_neuron(screen, layer_xs[layer_idx], neuron_y, radius, activation, label,
+                                 is_input, is_output, show_text=show_labels)
+    
+    def _draw_neuron_strip(self, screen, center_x, y, height, values, is_input, is_output, width=8):
+        """Draw a crowded layer as one column of activation colors instead of individual circles"""
+        if is_input:
+            base_color = (100, 150, 255)
+        elif is_output:
+            base_color = (255, 150, 100)
+        else:
+            base_color = (150, 255, 150)
+        intensity = np.minimum(1.0, np.abs(np.asarray(values, dtype=np.float64)))
+        colors = (0.3 + 0.7 * intensity)[:, None] * np.array(base_color, dtype=np.float64)
+        
+        column = pygame.surfarray.make_surface(colors.astype(np.uint8)[None, :, :])
+        strip_rect = pygame.Rect(center_x - width // 2, y, width, height)
+        screen.blit(pygame.transform.scale(column, strip_rect.size), strip_rect)
+        pygame.draw.rect(screen, (255, 255, 255), strip_rect, 1)
+    
+    @staticmethod
+    def _weight_matrix(weights, layer_idx, n_in, n_out):
+        """Weights between two layers as an (n_in, n_out) array, zero-filled where missing"""
+        matrix = np.zeros((n_in, n_out))
+        if layer_idx >= len(weights):
+            return matrix
+        layer_weights = np.asarray(weights[layer_idx], dtype=np.float64)
+        if layer_weights.ndim == 1:
+            # One weight per output neuron, shared by every input
+            cols = min(n_out, len(layer_weights))
+            matrix[:, :cols] = layer_weights[:cols]
+        else:
+            rows, cols = min(n_in, layer_weights.shape[0]), min(n_out, layer_weights.shape[1])
+            matrix[:rows, :cols] = layer_weights[:rows, :cols]
+        return matrix
+    
+    def _bundle(self, ys, matrix, axis):
+        """Group a layer into at most MAX_BUNDLES contiguous blocks; returns block centers and averaged weights"""
+        n = len(ys)
+        if n <= self.MAX_BUNDLES:
+            return ys, matrix
+        starts = np.linspace(0, n, self.MAX_BUNDLES + 1).astype(int)[:-1]
+        counts = np.diff(np.append(starts, n))
+        centers = np.add.reduceat(ys, starts) / counts
+        shape = [1, 1]
+        shape[axis] = len(counts)
+        return centers, np.add.reduceat(matrix, starts, axis=axis) / counts.reshape(shape)
+    
+    def _draw_edge_layer(self, screen, rect, layer_xs, layer_ys, weight_arrays, radius):
+        """Draw every connection in batched color buckets onto a cached transparent layer"""
+        key = (tuple(rect), radius, tuple(len(ys) for ys in layer_ys),
+               tuple(hash(matrix.tobytes()) for matrix in weight_arrays))
+        surface = self._edge_cache.get(key)
+        if surface is None:
+            self._edge_cache.clear()
+            surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+            segments = []
+            strengths = []
+            for layer_idx, matrix in enumerate(weight_arrays):
+                ys_in, matrix = self._bundle(np.asarray(layer_ys[layer_idx], dtype=np.float64), matrix, 0)
+                ys_out, matrix = self._bundle(np.asarray(layer_ys[layer_idx + 1], dtype=np.float64), matrix, 1)
                 
-                self.draw_neuron(screen, pos[0], pos[1], 25, activation, label, is_input, is_output)
+                # Trim each edge to the neuron rims, all edges of the layer pair at once
+                dx = float(layer_xs[layer_idx + 1] - layer_xs[layer_idx])
+                dy = ys_out[None, :] - ys_in[:, None]
+                distance = np.maximum(np.hypot(dx, dy), 1e-9)
+                trim_x, trim_y = dx / distance * radius, dy / distance * radius
+                start_x = layer_xs[layer_idx] - rect.x + trim_x
+                end_x = layer_xs[layer_idx + 1] - rect.x - trim_x
+                start_y = ys_in[:, None] - rect.y + trim_y
+                end_y = ys_out[None, :] - rect.y - trim_y
+                segments.append(np.stack(np.broadcast_arrays(start_x, start_y, end_x, end_y), axis=-1).reshape(-1, 4))
+                strengths.append(matrix.reshape(-1))
+            
+            if segments:
+                self._draw_bucketed_segments(surface, np.concatenate(segments), np.concatenate(strengths))
+            self._edge_cache[key] = surface
+        
+        # No pulse here: modulating a full-size alpha layer every frame costs more than drawing it
+        screen.blit(surface, rect.topleft)
+    
+    def _draw_bucketed_segments(self, surface, segments, weights):
+        """Quantize edges into sign/magnitude buckets and draw each bucket with one color and width"""
+        levels = self.WEIGHT_BUCKETS
+        scale = max(float(np.max(np.abs(weights))), 1e-9)
+        magnitude = np.minimum(levels - 1, (np.abs(weights) / scale * levels).astype(int))
+        buckets = magnitude + levels * (weights > 0)
+        
+        # Weak buckets first so strong edges stay on top
+        for bucket in sorted(np.unique(buckets).tolist(), key=lambda b: b % levels):
+            level = bucket % levels
+            base = (120, 220, 120) if bucket >= levels else (220, 120, 120)
+            color = (*base, int(60 + 195 * level / max(1, levels - 1)))
+            width = 1 + level // 2
+            for x0, y0, x1, y1 in segments[buckets == bucket].tolist():
+                pygame.draw.line(surface, color, (x0, y0), (x1, y1), width)
     
     def draw_activation_function(self, screen, x, y, width, height, func_name, input_val=0):
         """Draw activation function graph with current input highlighted"""
@@ -151,7 +290,7 @@ class NeuralNetworkVisualizer:
         pygame.draw.rect(screen, (255, 255, 255), (x, y, width, height), 2)
         
         # Title
-        font = pygame.font.Font(None, 24)
+        font = self._font(24)
         title = font.render(f"{func_name} Activation", True, (255, 255, 255))
         screen.blit(title, (x + 10, y + 10))
         
@@ -212,7 +351,7 @@ class NeuralNetworkVisualizer:
         pygame.draw.rect(screen, (20, 20, 40), (x, y, width, height))
         pygame.draw.rect(screen, (255, 255, 255), (x, y, width, height), 2)
         
-        font = pygame.font.Font(None, 24)
+        font = self._font(24)
         title = font.render("Gradient Flow", True, (255, 255, 255))
         screen.blit(title, (x + 10, y + 10))
         
@@ -235,7 +374,7 @@ class NeuralNetworkVisualizer:
                 ])
                 
                 # Label
-                grad_text = pygame.font.Font(None, 18).render(f"∇{i}: {grad:.3f}", True, (255, 255, 255))
+                grad_text = self._font(18).render(f"∇{i}: {grad:.3f}", True, (255, 255, 255))
                 screen.blit(grad_text, (end_x + 10, arrow_y - 8))
                 
                 arrow_y += 30
@@ -0,0 +1,265 @@
+"""
+Training telemetry panel: whole-run curves downsampled with Largest-Triangle-Three-Buckets
+"""
+
+import pygame
+import numpy as np
+from ..nn.ring_buffer import GrowableRingBuffer
+
+def _largest_triangles(x, y, edges, next_x, next_y, ax, ay):
+    """For each bucket [edges[i], edges[i + 1]) the index of the point forming the largest
+    triangle with the previously chosen point (starting from (ax, ay)) and (next_x[i], next_y[i])"""
+    buckets = len(edges) - 1
+    chosen = np.empty(buckets, dtype=np.int64)
+    if len(x) < 32 * buckets:
+        # Buckets of a few points: plain floats beat per-bucket array overhead
+        xs, ys, nx, ny = x.tolist(), y.tolist(), next_x.tolist(), next_y.tolist()
+        bounds = edges.tolist()
+        for i in range(buckets):
+            cx, cy = nx[i], ny[i]
+            best, pick = -1.0, bounds[i]
+            for j in range(bounds[i], bounds[i + 1]):
+                area = abs((ax - cx) * (ys[j] - ay) - (ax - xs[j]) * (cy - ay))
+                if area > best:
+                    best, pick = area, j
+            chosen[i] = pick
+            ax, ay = xs[pick], ys[pick]
+        return chosen
+    for i in range(buckets):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((ax - next_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[i] - ay))
+        chosen[i] = lo + int(np.argmax(area))
+        ax, ay = x[chosen[i]], y[chosen[i]]
+    return chosen
+
+def lttb(x, y, threshold):
+    """Indices of ``threshold`` points that keep the visual shape of the line (x, y).
+
+    Largest-Triangle-Three-Buckets: the first and last points are always
+    kept, the rest are split into ``threshold - 2`` buckets, and each bucket
+    keeps the point forming the largest triangle with the point kept before
+    it and the mean of the next bucket. Spikes survive, unlike with striding.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    # Bucket means via reduceat; the "next bucket" of the last one is the final point
+    next_x = np.append((np.add.reduceat(x[:-1], edges[:-1]) / sizes)[1:], x[-1])
+    next_y = np.append((np.add.reduceat(y[:-1], edges[:-1]) / sizes)[1:], y[-1])
+    chosen = _largest_triangles(x, y, edges, next_x, next_y, x[0], y[0])
+    return np.concatenate(([0], chosen, [n - 1]))
+
+class DecimatedSeries:
+    """A line of unbounded length kept as at most ``capacity`` LTTB-selected points.
+
+    Raw samples arrive through ``extend``. Every ``bucket`` of them becomes
+    one kept point, chosen as in ``lttb`` against the last kept point and
+    the mean of the following bucket, so a bucket settles once the next one
+    is full. When the kept points fill up they are LTTB-downsampled to half
+    and the bucket doubles, so the cost per sample stays amortised O(1) for
+    any run length. ``version`` changes whenever kept points are rewritten
+    rather than appended; ``last`` is the newest raw sample.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.x = np.empty(capacity)
+        self.y = np.empty(capacity)
+        self.count = 0
+        self.bucket = 1
+        self.version = 0
+        self.last = None
+        # Raw samples not yet settled, always fewer than two buckets
+        self._pending_x = np.empty(0)
+        self._pending_y = np.empty(0)
+
+    def clear(self):
+        self.count = 0
+        self.bucket = 1
+        self.version += 1
+        self.last = None
+        self._pending_x = np.empty(0)
+        self._pending_y = np.empty(0)
+
+    def extend(self, xs, ys):
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        if len(xs) == 0:
+            return
+        self.last = (float(xs[-1]), float(ys[-1]))
+        if self.count == 0:
+            # LTTB always keeps the first point
+            self.x[0], self.y[0] = xs[0], ys[0]
+            self.count = 1
+            xs, ys = xs[1:], ys[1:]
+
+        px = np.concatenate((self._pending_x, xs))
+        py = np.concatenate((self._pending_y, ys))
+        while True:
+            b = self.bucket
+            # Every bucket whose successor is complete can settle
+            settle = min(len(px) // b - 1, self.capacity - self.count)
+            if settle <= 0:
+                break
+            used = (settle + 1) * b
+            means_x = px[b:used].reshape(settle, b).mean(axis=1)
+            means_y = py[b:used].reshape(settle, b).mean(axis=1)
+            chosen = _largest_triangles(px, py, np.arange(settle + 1) * b, means_x, means_y,
+                                        self.x[self.count - 1], self.y[self.count - 1])
+            self.x[self.count:self.count + settle] = px[chosen]
+            self.y[self.count:self.count + settle] = py[chosen]
+            self.count += settle
+            px, py = px[settle * b:], py[settle * b:]
+            if self.count == self.capacity:
+                self._compact()
+        self._pending_x, self._pending_y = px, py
+
+    def _compact(self):
+        kept = lttb(self.x, self.y, self.capacity // 2)
+        self.count = len(kept)
+        self.x[:self.count] = self.x[kept]
+        self.y[:self.count] = self.y[kept]
+        self.bucket *= 2
+        self.version += 1
+
+class TelemetryPanel:
+    """Live training curves over a whole run, however long it gets.
+
+    ``series`` is a sequence of (name, color, scale) where scale is
+    ``"log"`` (log10, auto range), ``"linear"`` (auto range) or a fixed
+    (low, high). ``extend(steps, **values)`` records one row per step into
+    ``history``, a GrowableRingBuffer at full resolution, and feeds each
+    series' DecimatedSeries. Every series is scaled to the full plot height.
+
+    Lines live on a cached surface. Each frame only the points settled
+    since the last frame are drawn onto it; it is redrawn from the (at most
+    ``points``) kept points only when the axes change - the step axis
+    doubles when the run outgrows it, auto ranges widen with headroom - or
+    a series compacts. The raw tail since the last kept point is one live
+    segment drawn straight to the screen. Per-frame work therefore follows
+    the new samples, never the length of the history.
+    """
+
+    def __init__(self, series, points=1024, max_history=1 << 20, initial_span=64):
+        self.series = [(name, tuple(color), scale) for name, color, scale in series]
+        self.points = points
+        self.initial_span = initial_span
+        fields = {'step': ()}
+        fields.update({name: () for name, _, _ in self.series})
+        self.history = GrowableRingBuffer(max_history, fields)
+        self.lines = {name: DecimatedSeries(points) for name, _, _ in self.series}
+        self._surface = None
+        self.reset()
+
+    def reset(self):
+        self.history.clear()
+        for line in self.lines.values():
+            line.clear()
+        self._origin = None
+        self._span = self.initial_span
+        self._ranges = {name: scale if isinstance(scale, tuple) else None for name, _, scale in self.series}
+        self._drawn = {}
+        self._dirty = True
+
+    def latest(self, name):
+        return self.history.latest(name)
+
+    def extend(self, steps, **values):
+        """Record equal-length arrays of steps and of every series' values"""
+        steps = np.asarray(steps, dtype=np.float64)
+        if len(steps) == 0:
+            return
+        self.history.extend(step=steps, **values)
+        if self._origin is None:
+            self._origin = float(steps[0])
+        while steps[-1] - self._origin > self._span:
+            self._span *= 2
+            self._dirty = True
+
+        for name, _, scale in self.series:
+            line = self.lines[name]
+            ys = np.asarray(values[name], dtype=np.float64)
+            if scale == "log":
+                ys = np.log10(np.maximum(ys, 1e-12))
+            settled = line.count
+            line.extend(steps, ys)
+            if not isinstance(scale, tuple):
+                self._widen(name, line.y[settled:line.count], line.last[1])
+
+    def _widen(self, name, ys, last):
+        low, high = min(float(ys.min(initial=last)), last), max(float(ys.max(initial=last)), last)
+        current = self._ranges[name]
+        if current is not None:
+            if current[0] <= low and high <= current[1]:
+                return
+            low, high = min(low, current[0]), max(high, current[1])
+        # Headroom so a slowly drifting curve doesn't force a redraw every frame
+        margin = max(0.25 * (high - low), 1e-3)
+        self._ranges[name] = (low - margin, high + margin)
+        self._dirty = True
+
+    def _to_plot(self, name, xs, ys, size):
+        width, height = size
+        low, high = self._ranges[name]
+        px = (xs - self._origin) / self._span * (width - 1)
+        py = (height - 1) * (1 - np.clip((ys - low) / (high - low), 0, 1))
+        return np.column_stack((px, py))
+
+    def _draw_lines(self, size):
+        if self._surface is None or self._surface.get_size() != size:
+            self._surface = pygame.Surface(size, pygame.SRCALPHA)
+            self._dirty = True
+        # A compacted series no longer matches what was drawn
+        if any(self._drawn.get(name, (0, line.version))[1] != line.version for name, line in self.lines.items()):
+            self._dirty = True
+        if self._dirty:
+            self._surface.fill((0, 0, 0, 0))
+            self._drawn = {}
+            self._dirty = False
+
+        for name, color, _ in self.series:
+            line = self.lines[name]
+            drawn = self._drawn.get(name, (0, line.version))[0]
+            if line.count > drawn:
+                # Continue from the last drawn point so the new segments join up
+                start = max(0, drawn - 1)
+                points = self._to_plot(name, line.x[start:line.count], line.y[start:line.count], size)
+                if len(points) >= 2:
+                    pygame.draw.lines(self._surface, color, False, points.tolist(), 2)
+            self._drawn[name] = (line.count, line.version)
+
+    def render(self, screen, rect, font, background=(40, 30, 25), border=(220, 160, 100)):
+        pygame.draw.rect(screen, background, rect, border_radius=8)
+        pygame.draw.rect(screen, border, rect, 2, border_radius=8)
+
+        x = rect.x + 12
+        for name, color, scale in self.series:
+            value = self.latest(name)
+            text = f"{name.replace('_', ' ')}: {value:.3g}" if value is not None else name.replace('_', ' ')
+            if scale == "log":
+                text += " (log)"
+            label = font.render(text, True, color)
+            screen.blit(label, (x, rect.y + 8))
+            x += label.get_width() + 18
+
+        plot = rect.inflate(-24, -44)
+        plot.y += 10
+        if self._origin is None or plot.width < 2 or plot.height < 2:
+            return
+        self._draw_lines(plot.size)
+        screen.blit(self._surface, plot.topleft)
+
+        for name, color, _ in self.series:
+            line = self.lines[name]
+            if line.last is None or line.count == 0:
+                continue
+            tail = self._to_plot(name, np.array([line.x[line.count - 1], line.last[0]]),
+                                 np.array([line.y[line.count - 1], line.last[1]]), plot.size)
+            tail += plot.topleft
+            pygame.draw.line(screen, color, tail[0].tolist(), tail[1].tolist(), 2)
+
+        step = self.latest('step')
+        caption = font.render(f"step {int(step):,} ({self.lines[self.series[0][0]].bucket}/pt)", True, (180, 160, 150))
+        screen.blit(caption, caption.get_rect(topright=(rect.right - 12, rect.y + 8)))
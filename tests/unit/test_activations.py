@@ -0,0 +1,75 @@
+"""
+Unit tests for the activation kernels and their gradients
+"""
+
+import numpy as np
+import pytest
+from src.nn.activations import ACTIVATIONS, activate, derivative, get_activation, normalize_name
+
+REFERENCE = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0),
+    'leaky_relu': lambda x: np.where(x > 0, x, 0.01 * x),
+    'sigmoid': lambda x: 1 / (1 + np.exp(-x)),
+    'tanh': np.tanh,
+    'swish': lambda x: x / (1 + np.exp(-x)),
+    'step': lambda x: (x > 0).astype(np.float64),
+}
+
+# Avoid the kinks of relu/leaky_relu/step, where finite differences are meaningless
+POINTS = np.array([-3.0, -1.2, -0.4, 0.3, 0.9, 2.5])
+
+@pytest.mark.parametrize("name", sorted(REFERENCE))
+def test_forward_matches_reference(name):
+    forward, _ = get_activation(name)
+    np.testing.assert_allclose(forward(POINTS), REFERENCE[name](POINTS), rtol=1e-12, atol=1e-12)
+
+@pytest.mark.parametrize("name", sorted(REFERENCE))
+def test_gradient_matches_finite_differences(name):
+    h = 1e-6
+    numeric = (REFERENCE[name](POINTS + h) - REFERENCE[name](POINTS - h)) / (2 * h)
+    np.testing.assert_allclose(derivative(name, POINTS), numeric, rtol=1e-5, atol=1e-8)
+
+def test_sigmoid_does_not_overflow():
+    with np.errstate(over='raise'):
+        values = activate('sigmoid', np.array([-1000.0, 0.0, 1000.0]))
+    np.testing.assert_allclose(values, [0.0, 0.5, 1.0])
+
+def test_softmax_rows_sum_to_one_and_survive_large_inputs():
+    x = np.array([[1000.0, 1001.0, 1002.0], [-5.0, 0.0, 5.0]])
+    with np.errstate(over='raise'):
+        out = activate('softmax', x)
+    np.testing.assert_allclose(out.sum(axis=1), 1.0)
+    shifted = np.exp(x[1] - x[1].max())
+    np.testing.assert_allclose(out[1], shifted / shifted.sum())
+
+def test_softmax_gradient_is_the_jacobian_vector_product():
+    rng = np.random.default_rng(0)
+    z = rng.normal(size=4)
+    grad = rng.normal(size=4)
+    forward, gradient = get_activation('softmax')
+    a = forward(z)
+    jacobian = np.diag(a) - np.outer(a, a)
+    np.testing.assert_allclose(gradient(z, a, grad), jacobian @ grad)
+
+def test_kernels_write_into_out():
+    x = np.linspace(-2, 2, 9)
+    for name, (forward, gradient) in ACTIVATIONS.items():
+        out = np.empty_like(x)
+        assert forward(x, out=out) is out
+        grad_out = np.empty_like(x)
+        assert gradient(x, out, np.ones_like(x), out=grad_out) is grad_out
+
+def test_scalar_input_returns_float():
+    assert isinstance(activate('relu', 2.0), float)
+    assert activate('relu', -2.0) == 0.0
+    assert derivative('tanh', 0.0) == pytest.approx(1.0)
+
+def test_names_are_normalized():
+    assert normalize_name("Leaky ReLU") == "leaky_relu"
+    assert normalize_name(None) == "linear"
+    assert get_activation("Leaky-ReLU") is ACTIVATIONS['leaky_relu']
+
+def test_unknown_activation_raises():
+    with pytest.raises(ValueError):
+        get_activation("gelu")
@@ -0,0 +1,187 @@
+"""
+Unit tests for awaitable grading and Game's asyncio task helpers
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+import pygame
+import pytest
+from src.audio.speech_system import SpeechSystem, _resolve
+from src.challenges.base_challenge import BaseChallenge
+from src.challenges.perceptron_challenge import PerceptronChallenge
+from src.constants import GameState
+from src.game import Game
+
+# The grading sandbox provides np and only print, len and range as builtins (no imports or
+# class statements), so the solution builds its perceptron from functions
+SOLUTION = '''def Perceptron():
+    state = {'weights': np.zeros(2), 'bias': 0.0}
+
+    def forward(x):
+        return 1 if np.dot(state['weights'], x) + state['bias'] > 0 else 0
+
+    def train(X, y, epochs=20):
+        for _ in range(epochs):
+            for i in range(len(X)):
+                error = y[i] - forward(X[i])
+                state['weights'] = state['weights'] + 0.1 * error * X[i]
+                state['bias'] += 0.1 * error
+
+    forward.forward, forward.train = forward, train
+    return forward
+'''
+
+class _Challenge(BaseChallenge):
+    def check_solution(self, code):
+        self.thread = threading.get_ident()
+        return code == "ok"
+
+def _game():
+    return SimpleNamespace(width=800, height=600, loop=None)
+
+def test_grade_runs_on_the_loop_thread():
+    challenge = _Challenge(_game())
+    assert asyncio.run(challenge.grade("ok")) is True
+    assert challenge.thread == threading.get_ident()
+
+def test_perceptron_grading_yields_between_stages():
+    challenge = PerceptronChallenge(_game())
+    seen = []
+
+    async def watch(task):
+        while not task.done():
+            seen.append(len(challenge.test_results))
+            await asyncio.sleep(0)
+
+    async def run():
+        task = asyncio.ensure_future(challenge.grade(SOLUTION))
+        await watch(task)
+        return task.result()
+
+    assert asyncio.run(run()) is True
+    # exec, training and each of the four test cases hand the loop back
+    assert len(seen) >= 6
+    assert {1, 2, 3} <= set(seen)
+
+def test_close_cancels_a_running_grade():
+    challenge = PerceptronChallenge(_game())
+
+    async def run():
+        challenge.grading_task = asyncio.ensure_future(challenge.grade(SOLUTION))
+        await asyncio.sleep(0)
+        task = challenge.grading_task
+        challenge.close()
+        await asyncio.gather(task, return_exceptions=True)
+        return task
+
+    task = asyncio.run(run())
+    assert task.cancelled() and challenge.grading_task is None
+    assert not challenge.completed
+
+def test_perceptron_grading_passes_a_working_solution():
+    challenge = PerceptronChallenge(_game())
+    assert asyncio.run(challenge.grade(SOLUTION)) is True
+    assert challenge.completed
+    assert sum(1 for result in challenge.test_results if result.get('correct')) == 4
+    assert challenge.test_results[-1]['message'].startswith('SUCCESS')
+
+def test_perceptron_grading_reports_errors():
+    challenge = PerceptronChallenge(_game())
+    assert asyncio.run(challenge.grade("this is not python")) is False
+    assert challenge.test_results[0]['message'].startswith('Error')
+    asyncio.run(challenge.grade("x = 1"))
+    assert challenge.test_results == [{'message': 'Error: Perceptron class not found'}]
+
+def test_async_and_blocking_grading_agree():
+    blocking, awaited = PerceptronChallenge(_game()), PerceptronChallenge(_game())
+    blocking.check_solution(SOLUTION)
+    asyncio.run(awaited.grade(SOLUTION))
+    assert [r.get('correct') for r in blocking.test_results] == [r.get('correct') for r in awaited.test_results]
+
+@pytest.fixture
+def game():
+    game = Game(pygame.Surface((1024, 768)), 1024, 768)
+    yield game
+    game.jobs.shutdown()
+
+def test_start_task_needs_the_asyncio_runner(game):
+    coroutine = asyncio.sleep(0)
+    with pytest.raises(RuntimeError):
+        game.start_task(coroutine)
+    coroutine.close()
+
+def test_start_task_tracks_tasks_until_done(game, capsys):
+    async def broken():
+        raise ValueError("grading exploded")
+
+    async def run():
+        game.loop = asyncio.get_running_loop()
+        ok = game.start_task(asyncio.sleep(0, result=7))
+        failing = game.start_task(broken())
+        pending = game.start_task(asyncio.sleep(10))
+        assert len(game._tasks) == 3
+        assert await ok == 7
+        await asyncio.gather(failing, return_exceptions=True)
+        await asyncio.sleep(0)
+        game.cancel_tasks()
+        await asyncio.gather(pending, return_exceptions=True)
+        return pending
+
+    pending = asyncio.run(run())
+    assert pending.cancelled()
+    assert game._tasks == set()
+    assert "grading exploded" in capsys.readouterr().out
+
+def test_speak_async_waits_for_the_speech_thread():
+    speech = SpeechSystem()
+    speech.enabled = True
+
+    async def run():
+        task = asyncio.ensure_future(speech.speak_async("Hello there"))
+        await asyncio.sleep(0)
+        assert not task.done()
+        # What the speech thread does once the line has been spoken
+        text, character, future = speech.speech_queue.get_nowait()
+        assert (text, character) == ("Hello there", "narrator")
+        threading.Thread(target=_resolve, args=(future,)).start()
+        await asyncio.wait_for(task, 5)
+
+    asyncio.run(run())
+
+def test_priority_speech_releases_earlier_waiters():
+    speech = SpeechSystem()
+    speech.enabled = True
+
+    async def run():
+        first = asyncio.ensure_future(speech.speak_async("first"))
+        second = asyncio.ensure_future(speech.speak_async("second", priority=True))
+        await asyncio.wait_for(first, 5)
+        assert not second.done()
+        assert speech.speech_queue.qsize() == 1
+        second.cancel()
+
+    asyncio.run(run())
+
+def test_disabled_speech_returns_at_once():
+    speech = SpeechSystem()
+    speech.enabled = False
+    asyncio.run(asyncio.wait_for(speech.speak_async("unheard"), 1))
+
+def test_level_narration_is_a_task_cancelled_on_exit(game):
+    async def run():
+        game.loop = asyncio.get_running_loop()
+        game.current_level_data = {"name": "Neuron Academy"}
+        level = game.states[GameState.LEVEL]
+        level.enter()
+        task = level.narration_task
+        await asyncio.sleep(0.05)
+        # The first line has been spoken and the pause before the next one is being awaited
+        level.update(10.0)
+        assert level.current_dialogue == 0 and not task.done()
+        level.exit()
+        await asyncio.gather(task, return_exceptions=True)
+        return level, task
+
+    level, task = asyncio.run(run())
+    assert task.cancelled() and level.narration_task is None
@@ -0,0 +1,105 @@
+"""
+Unit tests for scaled dot-product attention and cached multi-head attention maps
+"""
+
+import numpy as np
+from src.nn.attention import AttentionHeads, causal_mask, scaled_dot_product_attention
+
+def _naive_attention(queries, keys, values, causal=False):
+    """Per-query softmax attention for one (steps, d) head"""
+    outputs, weights = [], []
+    for t, query in enumerate(queries):
+        scores = keys @ query / np.sqrt(len(query))
+        if causal:
+            scores[t + 1:] = -np.inf
+        w = np.exp(scores - scores.max())
+        w /= w.sum()
+        weights.append(w)
+        outputs.append(w @ values)
+    return np.array(outputs), np.array(weights)
+
+def _qkv(shape, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.normal(size=shape) for _ in range(3))
+
+def test_causal_mask():
+    mask = causal_mask(3)
+    assert mask.dtype == np.float32
+    np.testing.assert_array_equal(mask, [[0, -np.inf, -np.inf], [0, 0, -np.inf], [0, 0, 0]])
+
+def test_batched_heads_match_naive_attention():
+    queries, keys, values = _qkv((2, 3, 5, 4))
+    outputs, weights = scaled_dot_product_attention(queries, keys, values)
+    for b in range(2):
+        for h in range(3):
+            expected_outputs, expected_weights = _naive_attention(queries[b, h], keys[b, h], values[b, h])
+            np.testing.assert_allclose(outputs[b, h], expected_outputs)
+            np.testing.assert_allclose(weights[b, h], expected_weights)
+
+def test_causal_attention_ignores_future_tokens():
+    queries, keys, values = _qkv((6, 4), seed=1)
+    mask = causal_mask(6, np.float64)
+    outputs, weights = scaled_dot_product_attention(queries, keys, values, mask)
+    np.testing.assert_allclose(outputs, _naive_attention(queries, keys, values, causal=True)[0])
+    assert not np.triu(weights, 1).any()
+
+    # Changing the last token leaves every earlier output unchanged
+    keys[-1] += 5.0
+    values[-1] -= 5.0
+    changed, _ = scaled_dot_product_attention(queries, keys, values, mask)
+    np.testing.assert_allclose(changed[:-1], outputs[:-1])
+    assert not np.allclose(changed[-1], outputs[-1])
+
+def test_attention_writes_into_the_given_buffers():
+    queries, keys, values = _qkv((5, 3), seed=2)
+    weights_out, out = np.empty((5, 5)), np.empty((5, 3))
+    outputs, weights = scaled_dot_product_attention(queries, keys, values, weights_out=weights_out, out=out)
+    assert outputs is out and weights is weights_out
+    np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+
+def _heads(causal=False):
+    heads = AttentionHeads(2, 3, 4, 5, value_dim=2, causal=causal, dtype=np.float64)
+    rng = np.random.default_rng(3)
+    for head in range(3):
+        heads.set_queries(head, rng.normal(size=(2, 4, 5)))
+        heads.set_keys(head, rng.normal(size=(2, 4, 5)))
+        heads.set_values(head, rng.normal(size=(2, 4, 2)))
+    return heads
+
+def test_forward_recomputes_only_stale_heads():
+    heads = _heads()
+    assert heads.forward() == [0, 1, 2]
+    assert not heads.stale
+    assert heads.versions == [1, 1, 1]
+
+    heads.set_keys(1, np.zeros((2, 4, 5)))
+    assert heads.is_stale(1) and not heads.is_stale(0)
+    assert heads.forward() == [1]
+    assert heads.versions == [1, 2, 1]
+    np.testing.assert_allclose(heads.weights[:, 1], 0.25)
+
+def test_new_values_keep_the_map():
+    heads = _heads(causal=True)
+    heads.forward()
+    weights = heads.weights.copy()
+    values = np.ones((2, 4, 2))
+    heads.set_values(2, values)
+    assert heads.stale and not heads.is_stale(2)
+    assert heads.forward() == []
+    assert heads.versions == [1, 1, 1]
+    np.testing.assert_array_equal(heads.weights, weights)
+    np.testing.assert_allclose(heads.outputs[:, 2], 1.0)
+
+def test_budgeted_forward_refreshes_at_least_one_head():
+    heads = _heads()
+    assert heads.forward(budget=0.0) == [0]
+    assert heads.forward() == [1, 2]
+
+def test_merged_concatenates_heads_per_token():
+    heads = _heads()
+    heads.forward()
+    merged = heads.merged()
+    assert merged.shape == (2, 4, 6)
+    np.testing.assert_array_equal(merged[1, 3, 2:4], heads.outputs[1, 1, 3])
+    # queries, keys, values, weights and outputs, as float64
+    assert heads.nbytes == 8 * 2 * 3 * 4 * (5 + 5 + 2 + 4 + 2)
@@ -0,0 +1,79 @@
+"""
+Unit tests for the ChainTape autodiff engine
+"""
+
+import numpy as np
+import pytest
+from src.nn.activations import activate
+from src.nn.autodiff import ChainTape
+
+ACTIVATIONS = ['sigmoid', 'tanh', 'relu', 'linear', 'tanh', 'sigmoid']
+WEIGHTS = [1.3, -0.7, 0.9, 1.1, 0.8, -1.2]
+
+def _chain(x, activations=ACTIVATIONS, weights=WEIGHTS):
+    for name, weight in zip(activations, weights):
+        x = activate(name, weight * x)
+    return x
+
+def test_forward_matches_a_plain_chain():
+    tape = ChainTape(ACTIVATIONS, WEIGHTS)
+    inputs = np.array([-1.5, 0.2, 0.7, 2.0])
+    np.testing.assert_allclose(tape.forward(inputs), [_chain(x) for x in inputs])
+
+def test_scalar_fast_path_matches_batched_path():
+    tape = ChainTape(ACTIVATIONS, WEIGHTS)
+    scalar = float(tape.forward(0.7)[0])
+    batched = ChainTape(ACTIVATIONS, WEIGHTS).forward([0.7, 0.7])
+    assert scalar == pytest.approx(batched[0])
+    assert scalar == pytest.approx(_chain(0.7))
+
+@pytest.mark.parametrize("inputs", [[0.7], [-1.5, 0.2, 0.7, 2.0]])
+def test_input_gradient_matches_finite_differences(inputs):
+    tape = ChainTape(ACTIVATIONS, WEIGHTS)
+    tape.forward(inputs)
+    analytic = tape.backward().copy()
+    h = 1e-6
+    numeric = [(_chain(x + h) - _chain(x - h)) / (2 * h) for x in inputs]
+    np.testing.assert_allclose(analytic, numeric, rtol=1e-5, atol=1e-9)
+
+def test_weight_gradients_match_finite_differences():
+    tape = ChainTape(ACTIVATIONS, WEIGHTS)
+    tape.forward([0.4, -0.9])
+    tape.backward()
+    h = 1e-6
+    for i in range(len(WEIGHTS)):
+        plus, minus = list(WEIGHTS), list(WEIGHTS)
+        plus[i] += h
+        minus[i] -= h
+        for row, x in enumerate([0.4, -0.9]):
+            numeric = (_chain(x, weights=plus) - _chain(x, weights=minus)) / (2 * h)
+            assert tape.grad_weights[i, row] == pytest.approx(numeric, rel=1e-5, abs=1e-9)
+
+def test_seed_scales_every_gradient():
+    tape = ChainTape(ACTIVATIONS, WEIGHTS)
+    tape.forward(0.3)
+    unit = tape.backward(1.0).copy()
+    weights = tape.grad_weights.copy()
+    np.testing.assert_allclose(tape.backward(2.5), 2.5 * unit)
+    np.testing.assert_allclose(tape.grad_weights, 2.5 * weights)
+
+def test_deep_sigmoid_chain_vanishes_without_overflow():
+    tape = ChainTape(['sigmoid'] * 400, [1.0] * 400)
+    tape.forward(0.5)
+    with np.errstate(all='raise'):
+        tape.backward()
+        magnitudes = tape.gradient_magnitudes()
+    # Each sigmoid scales the gradient by at most 1/4
+    assert magnitudes[0] < 400 * np.log10(0.25) + 1
+    assert magnitudes[-1] == pytest.approx(0.0)
+
+def test_random_chain_uses_the_given_units():
+    tape = ChainTape.random(50, units=('tanh', 'relu'), rng=np.random.default_rng(0))
+    assert tape.depth == 50
+    assert set(tape.activations) <= {'tanh', 'relu'}
+
+def test_invalid_chains_raise():
+    with pytest.raises(ValueError):
+        ChainTape(['softmax'], [1.0])
+    with pytest.raises(ValueError):
+        ChainTape(['relu', 'relu'], [1.0])
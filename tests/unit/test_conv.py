@@ -0,0 +1,105 @@
+"""
+Unit tests for the im2col convolution engine and the CNN Castle feature-map cache
+"""
+
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from src.challenges.cnn_castle_challenge import CHANNELS, PHANTOM_KERNEL, CNNChallenge
+from src.nn.conv import Conv2D, Pool2D, im2col, window_view
+
+def _naive_conv(images, kernels, bias, stride, padding):
+    images = np.pad(images, ((0, 0), (0, 0), (padding, padding), (padding, padding)))
+    batch, _, height, width = images.shape
+    out_channels, _, size, _ = kernels.shape
+    out_h = (height - size) // stride + 1
+    out_w = (width - size) // stride + 1
+    out = np.zeros((batch, out_channels, out_h, out_w))
+    for b in range(batch):
+        for c in range(out_channels):
+            for i in range(out_h):
+                for j in range(out_w):
+                    patch = images[b, :, i * stride:i * stride + size, j * stride:j * stride + size]
+                    out[b, c, i, j] = np.sum(patch * kernels[c]) + bias[c]
+    return out
+
+def test_window_view_is_a_read_only_view():
+    image = np.arange(25.0).reshape(5, 5)
+    windows = window_view(image, 3, stride=2)
+    assert windows.shape == (2, 2, 3, 3)
+    assert np.shares_memory(windows, image)
+    np.testing.assert_array_equal(windows[1, 0], image[2:5, 0:3])
+    with pytest.raises(ValueError):
+        windows[0, 0, 0, 0] = 1.0
+
+def test_im2col_rows_are_flattened_receptive_fields():
+    images = np.random.default_rng(0).normal(size=(2, 3, 6, 5))
+    columns, (out_h, out_w) = im2col(images, 3)
+    assert (out_h, out_w) == (4, 3)
+    assert columns.shape == (2 * 4 * 3, 3 * 3 * 3)
+    # Row order is (batch, row, column); each row holds every channel's window
+    np.testing.assert_array_equal(columns[out_h * out_w + 1 * out_w + 2], images[1, :, 1:4, 2:5].ravel())
+
+@pytest.mark.parametrize("stride, padding", [(1, 0), (1, 2), (2, 1)])
+def test_forward_matches_naive_convolution(stride, padding):
+    rng = np.random.default_rng(1)
+    images = rng.normal(size=(2, 3, 9, 8))
+    conv = Conv2D(3, 4, 3, stride=stride, padding=padding)
+    conv.initialize(rng, bias_scale=0.5)
+    expected = _naive_conv(images, conv.kernels, conv.bias, stride, padding)
+    np.testing.assert_allclose(conv.forward(images), expected, atol=1e-12)
+
+def test_forward_channel_matches_forward():
+    rng = np.random.default_rng(2)
+    images = rng.normal(size=(3, 1, 12, 12))
+    conv = Conv2D(1, 3, 5, padding=2, activation="relu")
+    conv.initialize(rng, bias_scale=0.1)
+    expected = conv.forward(images).copy()
+    conv.outputs[...] = 0
+    conv.set_input(images)
+    for channel in range(3):
+        np.testing.assert_allclose(conv.forward_channel(channel), expected[:, channel])
+    assert expected.min() == 0.0
+
+def test_set_input_reuses_buffers_and_rejects_wrong_channels():
+    conv = Conv2D(1, 2, 3, padding=1)
+    conv.set_input(np.ones((2, 1, 8, 8)))
+    padded, outputs = conv._padded, conv.outputs
+    assert conv.set_input(np.zeros((2, 1, 8, 8))) == (8, 8)
+    assert conv._padded is padded and conv.outputs is outputs
+    assert not conv._padded.any()
+    with pytest.raises(ValueError):
+        conv.set_input(np.ones((2, 3, 8, 8)))
+
+def test_pooling():
+    maps = np.arange(16.0).reshape(1, 4, 4)
+    np.testing.assert_array_equal(Pool2D(2).forward(maps), [[[5, 7], [13, 15]]])
+    np.testing.assert_array_equal(Pool2D(2, mode="average").forward(maps), [[[2.5, 4.5], [10.5, 12.5]]])
+    with pytest.raises(ValueError):
+        Pool2D(mode="median")
+
+def _challenge():
+    return CNNChallenge(SimpleNamespace(width=1024, height=768))
+
+def test_challenge_recomputes_only_stale_channels():
+    challenge = _challenge()
+    challenge._compute_stale_channels()
+    while challenge.stale_channels:
+        challenge._compute_stale_channels()
+    cached = list(challenge._map_cache)
+    assert all(entry is not None for entry in cached)
+
+    challenge.selected_channel = 2
+    challenge._paint((challenge.kernel_rect.x + 1, challenge.kernel_rect.y + 1), 1)
+    assert challenge.stale_channels == [2]
+    challenge.frame_update()
+    assert challenge.stale_channels == []
+    assert [entry is cached[c] for c, entry in enumerate(challenge._map_cache)] == [True, True, False, True]
+
+def test_phantom_kernel_reaches_full_similarity():
+    challenge = _challenge()
+    challenge.conv.kernels[0, 0] = PHANTOM_KERNEL
+    while challenge.stale_channels:
+        challenge._compute_stale_channels()
+    assert challenge.similarities[0] == pytest.approx(1.0)
+    assert challenge.similarities.shape == (CHANNELS,)
@@ -0,0 +1,171 @@
+"""
+Unit tests for memory-mapped datasets, losses and the background trainer
+"""
+
+import time
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from src.challenges import data_dungeon_challenge
+from src.challenges.data_dungeon_challenge import DataDungeonChallenge
+from src.nn.data import iterate_chunks, minibatches, open_dataset, open_npz, write_dataset
+from src.nn.losses import mean_squared_error, softmax_cross_entropy
+from src.nn.network import Network
+from src.nn.trainer import BackgroundTrainer
+
+def _arrays(rows=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(rows, 3)).astype(np.float32), rng.integers(0, 2, rows).astype(np.int8)
+
+def test_uncompressed_npz_members_are_memory_mapped(tmp_path):
+    features, labels = _arrays()
+    path = tmp_path / "data.npz"
+    np.savez(path, features=features, labels=labels)
+    opened_features, opened_labels = open_dataset(str(path))
+    assert isinstance(opened_features, np.memmap)
+    np.testing.assert_array_equal(opened_features, features)
+    np.testing.assert_array_equal(opened_labels, labels)
+
+def test_compressed_npz_members_are_loaded(tmp_path):
+    features, labels = _arrays()
+    path = tmp_path / "data.npz"
+    np.savez_compressed(path, features=features, labels=labels)
+    arrays = open_npz(str(path))
+    assert sorted(arrays) == ['features', 'labels']
+    assert not isinstance(arrays['features'], np.memmap)
+    np.testing.assert_array_equal(arrays['labels'], labels)
+
+def test_write_dataset_streams_chunks_to_disk(tmp_path):
+    features, labels = _arrays(rows=250)
+    chunks = ((features[i:i + 100], labels[i:i + 100]) for i in range(0, 250, 100))
+    progress = list(write_dataset(str(tmp_path / "set"), chunks, 250, 3))
+    assert progress == [100, 200, 250]
+
+    opened_features, opened_labels = open_dataset(str(tmp_path / "set"))
+    np.testing.assert_array_equal(opened_features, features)
+    np.testing.assert_array_equal(opened_labels, labels)
+
+def test_mismatched_lengths_raise(tmp_path):
+    np.save(tmp_path / "features.npy", np.zeros((3, 2)))
+    np.save(tmp_path / "labels.npy", np.zeros(4))
+    with pytest.raises(ValueError):
+        open_dataset(str(tmp_path))
+
+def test_minibatches_visit_every_row_once():
+    features = np.arange(1000, dtype=np.float64)[:, None]
+    labels = np.arange(1000)
+    batches = list(minibatches(features, labels, 32, rng=np.random.default_rng(0), chunk_rows=128))
+    seen = np.concatenate([batch_labels for _, batch_labels in batches])
+    assert sorted(seen.tolist()) == list(range(1000))
+    assert all(len(batch) <= 32 for batch, _ in batches)
+    for batch_features, batch_labels in batches:
+        np.testing.assert_array_equal(batch_features[:, 0], batch_labels)
+    # Shuffled, not in file order
+    assert seen.tolist() != list(range(1000))
+
+def test_minibatches_respect_row_range():
+    labels = np.arange(100)
+    seen = np.concatenate([b for _, b in minibatches(labels[:, None], labels, 7, start=20, stop=50, chunk_rows=8)])
+    assert sorted(seen.tolist()) == list(range(20, 50))
+
+def test_iterate_chunks_keeps_file_order():
+    labels = np.arange(10)
+    chunks = list(iterate_chunks(labels[:, None], labels, chunk_rows=4))
+    assert [c.tolist() for _, c in chunks] == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+def test_softmax_cross_entropy_matches_reference_and_finite_differences():
+    rng = np.random.default_rng(1)
+    logits = rng.normal(size=(5, 3))
+    labels = np.array([0, 2, 1, 1, 0])
+    loss, grad = softmax_cross_entropy(logits.copy(), labels)
+
+    probabilities = np.exp(logits) / np.exp(logits).sum(axis=1, keepdims=True)
+    assert loss == pytest.approx(-np.mean(np.log(probabilities[np.arange(5), labels])))
+
+    h = 1e-6
+    numeric = np.empty_like(logits)
+    for index in np.ndindex(logits.shape):
+        plus, minus = logits.copy(), logits.copy()
+        plus[index] += h
+        minus[index] -= h
+        numeric[index] = (softmax_cross_entropy(plus, labels)[0] - softmax_cross_entropy(minus, labels)[0]) / (2 * h)
+    np.testing.assert_allclose(grad, numeric, rtol=1e-5, atol=1e-8)
+
+def test_softmax_cross_entropy_is_stable_for_large_logits():
+    with np.errstate(over='raise'):
+        loss, _ = softmax_cross_entropy(np.array([[1000.0, 0.0]]), np.array([0]))
+    assert loss == pytest.approx(0.0)
+
+def test_mean_squared_error():
+    outputs = np.array([[1.0, 2.0], [3.0, 4.0]])
+    targets = np.zeros((2, 2))
+    loss, grad = mean_squared_error(outputs, targets)
+    assert loss == pytest.approx(7.5)
+    np.testing.assert_allclose(grad, outputs / 2)
+
+def test_background_trainer_learns_and_publishes_updates():
+    rng = np.random.default_rng(2)
+    features = rng.normal(size=(512, 2))
+    labels = (features[:, 0] + features[:, 1] > 0).astype(np.int64)
+    network = Network([2, 8, 2], ['tanh', 'linear'], capacity=64, rng=rng)
+
+    trainer = BackgroundTrainer(network, lambda: minibatches(features, labels, 64, rng=rng),
+                                learning_rate=0.5, publish_every=8, max_epochs=20)
+    trainer.start()
+    deadline = time.perf_counter() + 30
+    while trainer.running and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    trainer.stop()
+
+    assert trainer.error is None
+    assert trainer.epoch == 20
+    assert trainer.step == 20 * 8
+    assert trainer.rows_seen == 20 * 512
+    updates = trainer.drain()
+    assert len(updates) == 20
+    assert updates[-1]['accuracy'] > 0.9
+    assert updates[-1]['loss'] < updates[0]['loss']
+    assert trainer.drain() == []
+
+def test_background_trainer_reports_worker_errors():
+    network = Network([2, 2], ['linear'])
+
+    def broken():
+        raise RuntimeError("disk on fire")
+        yield
+
+    trainer = BackgroundTrainer(network, broken)
+    trainer.start()
+    trainer._thread.join(5)
+    assert isinstance(trainer.error, RuntimeError)
+    assert trainer.drain() == [{'error': 'disk on fire'}]
+
+def _dungeon(tmp_path, rows=2000):
+    features, labels = _arrays(rows)
+    chunks = iter([(features, labels)])
+    for _ in write_dataset(str(tmp_path / "dungeon"), chunks, rows, 3):
+        pass
+    challenge = DataDungeonChallenge(SimpleNamespace(width=1024, height=768))
+    challenge.dataset_path = str(tmp_path / "dungeon")
+    challenge._open_dataset()
+    return challenge
+
+def test_dungeon_close_stops_the_trainer(tmp_path):
+    DataDungeonChallenge(SimpleNamespace(width=1024, height=768)).close()
+    challenge = _dungeon(tmp_path)
+    challenge._toggle_training()
+    assert challenge.trainer.running
+    challenge.close()
+    challenge.trainer._thread.join(5)
+    assert not challenge.trainer.running
+
+def test_dungeon_evaluates_a_fixed_slice_of_the_held_out_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_dungeon_challenge, "VALIDATION_ROWS", 40)
+    challenge = _dungeon(tmp_path)
+    assert (challenge.train_stop, challenge.validation_stop) == (1900, 1940)
+
+    seen = []
+    network = SimpleNamespace(forward=lambda features: seen.append(len(features)) or np.zeros((len(features), 2)))
+    expected = np.mean(challenge.labels[1900:1940] == 0)
+    assert challenge._evaluate(network) == pytest.approx(expected)
+    assert sum(seen) == 40
@@ -0,0 +1,65 @@
+"""
+Unit tests for the decision-region heatmap renderer
+"""
+
+import numpy as np
+import pygame
+from src.visualization.decision_regions import DecisionRegionRenderer
+
+NEGATIVE = (0, 0, 255)
+POSITIVE = (255, 0, 0)
+BACKGROUND = (0, 0, 0)
+
+def _renderer():
+    return DecisionRegionRenderer(NEGATIVE, POSITIVE, BACKGROUND)
+
+def test_pixels_take_the_color_of_their_side():
+    # Boundary x = 0.5: the right half is positive
+    pixels = _renderer().compute_pixels((40, 10), 1.0, 0.0, -0.5)
+    assert pixels.shape == (40, 10, 3)
+    assert pixels.dtype == np.uint8
+    assert pixels[-1, 5, 0] > 0 and pixels[-1, 5, 2] == 0
+    assert pixels[0, 5, 2] > 0 and pixels[0, 5, 0] == 0
+
+def test_y_axis_points_up():
+    # Boundary y = 0.5 with positive above it; row 0 is the top of the surface
+    pixels = _renderer().compute_pixels((10, 40), 0.0, 1.0, -0.5)
+    assert pixels[5, 0, 0] > 0
+    assert pixels[5, -1, 2] > 0
+
+def test_tint_grows_with_distance_from_the_boundary():
+    pixels = _renderer().compute_pixels((100, 1), 1.0, 0.0, -0.5)
+    red = pixels[50:, 0, 0].astype(int)
+    assert np.all(np.diff(red) >= 0)
+    assert red[-1] > red[0]
+
+def test_degenerate_boundary_fills_one_class():
+    pixels = _renderer().compute_pixels((8, 8), 0.0, 0.0, 1.0)
+    assert np.all(pixels[..., 0] > 0)
+    assert np.all(pixels[..., 2] == 0)
+
+def test_render_reuses_the_cached_surface():
+    renderer = _renderer()
+    screen = pygame.Surface((64, 48))
+    rect = pygame.Rect(0, 0, 64, 48)
+    renderer.render(screen, rect, 1.0, 1.0, -1.0)
+    surface = renderer._cache["full"]['surface']
+    renderer.render(screen, rect, 1.0, 1.0, -1.0)
+    assert renderer._cache["full"]['surface'] is surface
+
+    # A draft for the same boundary is served by the full-resolution image
+    renderer.render(screen, rect, 1.0, 1.0, -1.0, dragging=True)
+    assert "draft" not in renderer._cache
+
+def test_draft_renders_at_reduced_resolution():
+    renderer = _renderer()
+    screen = pygame.Surface((64, 48))
+    renderer.render(screen, pygame.Rect(0, 0, 64, 48), 1.0, -1.0, 0.0, dragging=True)
+    entry = renderer._cache["draft"]
+    assert entry['grid'].get_size() == (16, 12)
+    assert entry['surface'].get_size() == (64, 48)
+
+def test_empty_rect_draws_nothing():
+    renderer = _renderer()
+    renderer.render(pygame.Surface((10, 10)), pygame.Rect(0, 0, 0, 10), 1.0, 0.0, 0.0)
+    assert renderer._cache == {}
@@ -0,0 +1,98 @@
+"""
+Unit tests for the density scatter renderer and large perceptron datasets
+"""
+
+import numpy as np
+import pygame
+from src.challenges.perceptron_dataset import PerceptronDataset
+from src.visualization.density_scatter import DensityScatterRenderer
+
+COLORS = ((0, 255, 0), (255, 0, 0))
+
+def test_histograms_match_histogram2d():
+    rng = np.random.default_rng(0)
+    features = rng.uniform(0, 1, (5000, 2))
+    labels = rng.integers(0, 2, 5000)
+    counts = DensityScatterRenderer(COLORS).histograms((16, 12), features, labels)
+
+    assert counts.shape == (2, 16, 12)
+    assert counts.sum() == 5000
+    for label in range(2):
+        points = features[labels == label]
+        # Screen rows run top to bottom, so flip y
+        expected, _, _ = np.histogram2d(points[:, 0], 1 - points[:, 1], bins=(16, 12), range=((0, 1), (0, 1)))
+        np.testing.assert_array_equal(counts[label], expected)
+
+def test_points_outside_the_ranges_or_classes_are_dropped():
+    features = np.array([[0.5, 0.5], [1.5, 0.5], [0.5, -0.2], [0.5, 0.5]])
+    labels = np.array([0, 0, 1, 5])
+    counts = DensityScatterRenderer(COLORS).histograms((4, 4), features, labels)
+    assert counts.sum() == 1
+
+def test_pixels_mix_class_colors_and_scale_alpha_by_count():
+    renderer = DensityScatterRenderer(COLORS, min_alpha=70)
+    # Top-left bin: 9 of class 0 and 1 of class 1; bottom-right bin: a single class 1 point
+    features = np.array([[0.1, 0.9]] * 10 + [[0.9, 0.1]])
+    labels = np.array([0] * 9 + [1] + [1])
+    colors, alpha = renderer.compute_pixels((2, 2), features, labels)
+
+    np.testing.assert_array_equal(colors[0, 0], [25, 229, 0])
+    np.testing.assert_array_equal(colors[1, 1], [255, 0, 0])
+    assert alpha[0, 0] == 255
+    assert 70 <= alpha[1, 1] < 255
+    assert alpha[0, 1] == 0 and alpha[1, 0] == 0
+
+def test_render_is_cached_on_the_dataset_version():
+    renderer = DensityScatterRenderer(COLORS)
+    dataset = PerceptronDataset.gaussian_blobs(1000, [[0.3, 0.3], [0.7, 0.7]], 0.1, 0.0, 1.0,
+                                               rng=np.random.default_rng(1))
+    screen = pygame.Surface((100, 80))
+    rect = pygame.Rect(0, 0, 100, 80)
+    renderer.render(screen, rect, dataset)
+    surface = renderer._surface
+    renderer.render(screen, rect, dataset)
+    assert renderer._surface is surface
+
+    dataset.append(0.5, 0.5, 0)
+    renderer.render(screen, rect, dataset)
+    assert renderer._surface is not surface
+    assert renderer._surface.get_size() == (100, 80)
+
+def test_render_redraws_for_a_new_dataset_of_the_same_size():
+    renderer = DensityScatterRenderer(COLORS)
+    screen = pygame.Surface((100, 80))
+    rect = pygame.Rect(0, 0, 100, 80)
+    first = PerceptronDataset.gaussian_blobs(1000, [[0.3, 0.3], [0.7, 0.7]], 0.1, 0.0, 1.0,
+                                             rng=np.random.default_rng(1))
+    renderer.render(screen, rect, first)
+    surface = renderer._surface
+
+    # A fresh dataset has the same size and version as the one it replaces
+    second = PerceptronDataset.gaussian_blobs(1000, [[0.7, 0.3], [0.3, 0.7]], 0.1, 0.0, 1.0,
+                                              rng=np.random.default_rng(2))
+    assert (len(second), second.version) == (len(first), first.version)
+    renderer.render(screen, rect, second)
+    assert renderer._surface is not surface
+    expected = DensityScatterRenderer(COLORS)
+    expected.render(screen, rect, second)
+    np.testing.assert_array_equal(pygame.surfarray.pixels_alpha(renderer._surface),
+                                  pygame.surfarray.pixels_alpha(expected._surface))
+
+def test_gaussian_blobs_are_clipped_and_centered():
+    dataset = PerceptronDataset.gaussian_blobs(20000, [[0.25, 0.25], [0.75, 0.75]], 0.05, 0.0, 1.0,
+                                               rng=np.random.default_rng(2))
+    assert len(dataset) == 20000
+    assert dataset.features.min() >= 0.0 and dataset.features.max() <= 1.0
+    for label, center in enumerate((0.25, 0.75)):
+        np.testing.assert_allclose(dataset.features[dataset.labels == label].mean(axis=0), center, atol=0.01)
+
+def test_load_npz_and_npy(tmp_path):
+    features = np.array([[0.1, 0.2], [0.3, 0.4]])
+    labels = np.array([0, 1])
+    np.savez(tmp_path / "points.npz", features=features, labels=labels)
+    np.save(tmp_path / "points.npy", np.column_stack((features, labels)))
+
+    for name in ("points.npz", "points.npy"):
+        dataset = PerceptronDataset.load(tmp_path / name)
+        np.testing.assert_array_equal(dataset.features, features)
+        np.testing.assert_array_equal(dataset.labels, labels)
@@ -0,0 +1,122 @@
+"""
+Unit tests for tokenization, skip-gram training and the embedding index
+"""
+
+import numpy as np
+import pytest
+from src.nn.embeddings import EmbeddingIndex, SkipGram, Vocabulary, _scatter_add, tokenize
+
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+def test_tokenize_keeps_contractions():
+    assert tokenize("Don't PANIC, it's 42!") == ["don't", "panic", "it's", "42"]
+
+def test_vocabulary_ranks_by_count_then_word():
+    vocabulary = Vocabulary("b a c a b a d".split(), min_count=2)
+    assert vocabulary.words == ["a", "b"]
+    assert "c" not in vocabulary and len(vocabulary) == 2
+    np.testing.assert_array_equal(vocabulary.counts, [3, 2])
+    np.testing.assert_array_equal(vocabulary.encode("a c b".split()), [0, 1])
+
+def test_scatter_add_sums_repeated_rows():
+    matrix = np.zeros((4, 2))
+    rows = np.array([3, 1, 3, 0, 3])
+    values = np.arange(10.0).reshape(5, 2)
+    _scatter_add(matrix, rows, values)
+    expected = np.zeros((4, 2))
+    np.add.at(expected, rows, values)
+    np.testing.assert_array_equal(matrix, expected)
+
+def _model(seed=0):
+    vocabulary = Vocabulary([str(i) for i in range(6) for _ in range(i + 1)], min_count=1)
+    model = SkipGram(vocabulary, dimensions=3, negatives=2, dtype=np.float64, rng=np.random.default_rng(seed))
+    model.output_vectors[...] = np.random.default_rng(seed + 1).normal(size=model.output_vectors.shape) * 0.5
+    return model
+
+def test_train_batch_follows_the_sgns_gradient():
+    model = _model()
+    centers = np.array([0, 1, 1, 4])
+    contexts = np.array([2, 3, 0, 1])
+    # Replay the model's noise draws
+    noise = np.searchsorted(model._noise_cdf, np.random.default_rng(7).random((4, 2)))
+    targets = np.concatenate((contexts[:, None], noise), axis=1)
+    model.rng = np.random.default_rng(7)
+
+    def total_loss(inputs, outputs):
+        scores = np.einsum('nd,nkd->nk', inputs[centers], outputs[targets])
+        return -np.sum(np.log(_sigmoid(scores[:, 0])) + np.log(1 - _sigmoid(scores[:, 1:])).sum(axis=1))
+
+    inputs, outputs = model.input_vectors.copy(), model.output_vectors.copy()
+    h = 1e-6
+    numeric = []
+    for matrix in (inputs, outputs):
+        grad = np.zeros_like(matrix)
+        for index in np.ndindex(matrix.shape):
+            original = matrix[index]
+            matrix[index] = original + h
+            plus = total_loss(inputs, outputs)
+            matrix[index] = original - h
+            minus = total_loss(inputs, outputs)
+            matrix[index] = original
+            grad[index] = (plus - minus) / (2 * h)
+        numeric.append(grad)
+
+    loss = model.train_batch(centers, contexts, learning_rate=0.1)
+    assert loss == pytest.approx(total_loss(inputs, outputs) / 4, rel=1e-5)
+    np.testing.assert_allclose((inputs - model.input_vectors) / 0.1, numeric[0], rtol=1e-4, atol=1e-7)
+    np.testing.assert_allclose((outputs - model.output_vectors) / 0.1, numeric[1], rtol=1e-4, atol=1e-7)
+
+def test_pairs_stay_within_the_window():
+    model = _model()
+    model.window = 2
+    model._keep[:] = 1.0
+    ids = np.arange(6)
+    centers, contexts = model.pairs(ids)
+    assert len(centers) == len(contexts) > 0
+    assert np.all(np.abs(centers - contexts) <= 2)
+    assert np.all(centers != contexts)
+
+def test_fit_decays_the_rate_and_finishes():
+    model = _model()
+    ids = np.random.default_rng(2).integers(0, 6, 200)
+    steps = list(model.fit(ids, epochs=2, batch_size=64))
+    assert steps[-1] == (1.0, None)
+    progress = [p for p, _ in steps]
+    assert progress == sorted(progress)
+    assert all(np.isfinite(loss) for _, loss in steps[:-1])
+
+def _index(**kwargs):
+    rng = np.random.default_rng(3)
+    vectors = rng.normal(size=(300, 8))
+    return vectors, EmbeddingIndex(vectors, [f"w{i}" for i in range(300)], **kwargs)
+
+def test_nearest_matches_a_full_sort():
+    vectors, index = _index()
+    query = vectors[5] + 0.1
+    cosines = vectors @ query / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(query))
+    expected = np.argsort(-cosines)[:10]
+    results = index.nearest(query, k=10)
+    assert [word for word, _ in results] == [f"w{i}" for i in expected]
+    np.testing.assert_allclose([score for _, score in results], cosines[expected], rtol=1e-5)
+
+def test_similar_excludes_the_word_itself():
+    _, index = _index()
+    words = [word for word, _ in index.similar("w7", k=5)]
+    assert "w7" not in words and len(words) == 5
+
+def test_approximate_queries_score_a_subset():
+    vectors, index = _index(lsh_bits=6, rng=np.random.default_rng(4))
+    assert sum(len(rows) for rows in index._buckets.values()) == 300
+    results = index.nearest(vectors[9], k=3, approximate=True)
+    assert results[0][0] == "w9"
+    assert results[0][1] == pytest.approx(1.0)
+
+def test_expression_and_analogy():
+    vectors = np.array([[1, 0, 0], [1, 1, 0], [0, 0, 1], [0, 1, 1]], dtype=np.float64)
+    index = EmbeddingIndex(vectors, ["man", "king", "woman", "queen"])
+    assert index.analogy("man", "king", "woman", k=1)[0][0] == "queen"
+    results, unknown = index.expression("king - man + woman + dragon", k=1)
+    assert results[0][0] == "queen"
+    assert unknown == ["dragon"]
+    assert index.expression("man - man") == ([], [])
@@ -0,0 +1,74 @@
+"""
+Unit tests for the matplotlib figure service and its figures
+"""
+
+import time
+import numpy as np
+import pytest
+from src.visualization import figure_service
+from src.visualization.figure_service import FigureService, _freeze
+
+requires_matplotlib = pytest.mark.skipif(not figure_service.MATPLOTLIB_AVAILABLE, reason="matplotlib not installed")
+
+def test_freeze_keys_arrays_by_content():
+    a = np.arange(6.0).reshape(2, 3)
+    assert _freeze(a) == _freeze(a.copy())
+    assert _freeze(a) != _freeze(a.T)
+    assert _freeze(a) != _freeze(a.astype(np.float32))
+    params = {"series": {"loss": [1.0, 0.5], "acc": (np.ones(3),)}, "title": "t"}
+    frozen = _freeze(params)
+    hash(frozen)
+    assert frozen == _freeze({"title": "t", "series": {"acc": (np.ones(3),), "loss": [1.0, 0.5]}})
+
+def test_disabled_service_never_starts_a_worker():
+    service = FigureService()
+    service.enabled = False
+    assert service.request("learning_curve", (100, 80), series={"loss": [1, 2]}) is None
+    assert service._executor is None
+
+def _wait_for(service, slot, timeout=60):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if slot in service.poll() or not service.enabled:
+            return
+        time.sleep(0.02)
+
+@requires_matplotlib
+def test_renders_in_a_worker_and_caches_the_surface():
+    service = FigureService(capacity=2)
+    try:
+        params = {"series": {"loss": np.linspace(1, 0, 20)}}
+        assert service.request("learning_curve", (160, 120), slot="chart", **params) is None
+        _wait_for(service, "chart")
+        surface = service.request("learning_curve", (160, 120), slot="chart", **params)
+        assert surface is not None and surface.get_size() == (160, 120)
+        assert service._running == {}
+
+        # New parameters keep showing the previous surface until they land
+        assert service.request("learning_curve", (160, 120), slot="chart", series={"loss": [3, 2, 1]}) is surface
+        _wait_for(service, "chart")
+        assert service.request("learning_curve", (160, 120), slot="chart", series={"loss": [3, 2, 1]}) is not surface
+        assert len(service._cache) == 2
+    finally:
+        service.close()
+    assert service._executor is None
+
+@requires_matplotlib
+def test_a_broken_figure_disables_the_service(capsys):
+    service = FigureService()
+    try:
+        service.request("no_such_figure", (50, 50))
+        _wait_for(service, "no_such_figure")
+        assert not service.enabled
+        assert isinstance(service.error, KeyError)
+    finally:
+        service.close()
+    assert "Figure rendering failed" in capsys.readouterr().out
+
+def test_figures_render_rgba_bytes():
+    figures = pytest.importorskip("src.visualization.figures")
+    size, pixels = figures.render("confusion_matrix", (120, 100), {"matrix": [[5, 1], [2, 7]]})
+    assert size == (120, 100)
+    assert len(pixels) == 120 * 100 * 4
+    size, _ = figures.render("weight_histogram", (80, 60), {"weights": {"w": np.ones(10)}})
+    assert size == (80, 60)
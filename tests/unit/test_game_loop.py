@@ -0,0 +1,88 @@
+"""
+Unit tests for Game's fixed-step update loop
+"""
+
+import pygame
+import pytest
+from src.constants import MAX_CATCH_UP_STEPS
+from src.game import Game
+from src.states.coding_challenge_state import CodingChallengeState
+
+class _RecordingState:
+    def __init__(self):
+        self.steps = []
+        self.frames = 0
+        self.exits = 0
+
+    def update(self, dt):
+        self.steps.append(dt)
+
+    def frame_update(self):
+        self.frames += 1
+
+    def exit(self):
+        self.exits += 1
+
+@pytest.fixture
+def game():
+    game = Game(pygame.Surface((1024, 768)), 1024, 768)
+    game.states[game.current_state] = _RecordingState()
+    yield game
+    game.jobs.shutdown()
+
+def test_real_time_is_spent_in_fixed_steps(game):
+    state = game.states[game.current_state]
+    dt = game.fixed_dt
+    assert game.update(2.5 * dt) == 2
+    assert state.steps == [dt, dt]
+    assert game.interpolation == pytest.approx(0.5)
+    assert game.time == pytest.approx(2 * dt)
+
+    # The leftover half step carries over into the next frame
+    assert game.update(0.6 * dt) == 1
+    assert game.interpolation == pytest.approx(0.1)
+
+def test_short_frames_take_no_step(game):
+    state = game.states[game.current_state]
+    assert game.update(0.25 * game.fixed_dt) == 0
+    assert state.steps == []
+    assert game.interpolation == pytest.approx(0.25)
+    assert state.frames == 1
+
+def test_a_long_hitch_is_clamped_and_its_backlog_dropped(game):
+    state = game.states[game.current_state]
+    dt = game.fixed_dt
+    assert game.update(100.25 * dt) == MAX_CATCH_UP_STEPS
+    assert len(state.steps) == MAX_CATCH_UP_STEPS
+    assert game._accumulator < dt
+    assert game.interpolation == pytest.approx(0.25)
+    # The next normal frame is not spent catching up
+    assert game.update(dt) == 1
+
+def test_frame_update_runs_once_per_frame_not_per_step(game):
+    state = game.states[game.current_state]
+    game.update(4 * game.fixed_dt)
+    assert len(state.steps) == 4
+    assert state.frames == 1
+
+def test_simulate_runs_whole_steps(game):
+    state = game.states[game.current_state]
+    game.update(0.5 * game.fixed_dt)
+    game.simulate(0.5)
+    assert len(state.steps) == 30
+    assert state.frames == 31
+    assert game.interpolation == 1.0 and game._accumulator == 0.0
+
+def test_shutdown_leaves_the_current_state(game):
+    state = game.states[game.current_state]
+    game.shutdown()
+    assert state.exits == 1
+
+def test_challenges_get_one_frame_update_per_frame(game):
+    challenge = _RecordingState()
+    state = CodingChallengeState(game)
+    state.current_challenge = challenge
+    game.states[game.current_state] = state
+    game.update(3 * game.fixed_dt)
+    assert len(challenge.steps) == 3
+    assert challenge.frames == 1
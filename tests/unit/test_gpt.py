@@ -0,0 +1,187 @@
+"""
+Unit tests for transformer training, KV-cached decoding and the character-level GPT
+"""
+
+import time
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from src.challenges import gpt_citadel_challenge
+from src.challenges.game_corpus import character_text, game_texts
+from src.challenges.gpt_citadel_challenge import GPTCitadelChallenge
+from src.jobs import JobScheduler
+from src.nn.gpt import Adam, CharGPT, KVCache
+from src.nn.transformer import TransformerBlock, layer_norm, layer_norm_backward
+
+ALPHABET = " abcdefgh"
+
+def _numeric_gradient(array, loss, h=1e-6):
+    """Central differences of loss() with respect to every entry of array, perturbed in place"""
+    numeric = np.empty_like(array)
+    for index in np.ndindex(array.shape):
+        original = array[index]
+        array[index] = original + h
+        plus = loss()
+        array[index] = original - h
+        minus = loss()
+        array[index] = original
+        numeric[index] = (plus - minus) / (2 * h)
+    return numeric
+
+def _model(seed=0, context=12):
+    model = CharGPT(ALPHABET, d_model=8, heads=2, layers=2, context=context, d_ff=16, dtype=np.float64)
+    model.initialize(np.random.default_rng(seed))
+    return model
+
+def test_layer_norm_backward_matches_finite_differences():
+    rng = np.random.default_rng(0)
+    x, gain, bias = rng.normal(size=(3, 5)), rng.normal(size=5), rng.normal(size=5)
+    upstream = rng.normal(size=(3, 5))
+    loss = lambda: float(np.sum(layer_norm(x, gain, bias) * upstream))
+    grad_x, grad_gain, grad_bias = layer_norm_backward(upstream, x, gain)
+    np.testing.assert_allclose(grad_x, _numeric_gradient(x, loss), rtol=1e-5, atol=1e-8)
+    np.testing.assert_allclose(grad_gain, _numeric_gradient(gain, loss), rtol=1e-5, atol=1e-8)
+    np.testing.assert_allclose(grad_bias, _numeric_gradient(bias, loss), rtol=1e-5, atol=1e-8)
+
+@pytest.mark.parametrize("causal", [False, True])
+def test_block_backward_matches_finite_differences(causal):
+    rng = np.random.default_rng(1)
+    block = TransformerBlock(4, 2, d_ff=6, activation="tanh", causal=causal, dtype=np.float64)
+    block.initialize(rng)
+    x = rng.normal(size=(2, 3, 4))
+    upstream = rng.normal(size=(2, 3, 4))
+    block.set_head(0, False)
+
+    def loss():
+        block.set_input(x)
+        return float(np.sum(block.forward() * upstream))
+
+    loss()
+    grad_inputs = block.backward(upstream).copy()
+    analytic = {name: grad.copy() for name, grad in block.grads.items()}
+    for name in block.PARAMETERS:
+        np.testing.assert_allclose(analytic[name], _numeric_gradient(getattr(block, name), loss),
+                                   rtol=1e-5, atol=1e-8, err_msg=name)
+    np.testing.assert_allclose(grad_inputs, _numeric_gradient(x, loss), rtol=1e-5, atol=1e-8)
+
+def test_decode_step_matches_the_causal_forward_pass():
+    rng = np.random.default_rng(2)
+    block = TransformerBlock(8, 2, d_ff=16, causal=True, dtype=np.float64)
+    block.initialize(rng)
+    block.set_head(1, False)
+    x = rng.normal(size=(6, 8))
+    block.set_input(x)
+    expected = block.forward()[0]
+
+    keys = np.zeros((2, 6, 4))
+    values = np.zeros((2, 6, 4))
+    for position in range(6):
+        np.testing.assert_allclose(block.decode_step(x[position], keys, values, position), expected[position])
+
+def test_prefill_and_step_match_forward():
+    model = _model()
+    ids = model.encode("bad cafe")
+    logits = model.forward(ids[None])[0]
+    cache = KVCache(model)
+    np.testing.assert_allclose(model.prefill(ids[:3], cache), logits[2])
+    for position in range(3, len(ids)):
+        np.testing.assert_allclose(model.step(ids[position], cache), logits[position], rtol=1e-10, atol=1e-12)
+    assert cache.length == len(ids)
+    assert cache.nbytes == 2 * 2 * 2 * 12 * 4 * 8
+
+def test_greedy_generation_matches_the_full_forward_pass():
+    model = _model()
+    text = "ace"
+    generated = "".join(model.generate(text, 5, temperature=0))
+    for char in generated:
+        logits = model.forward(model.encode(text)[None])[0, -1]
+        assert char == ALPHABET[int(np.argmax(logits))]
+        text += char
+
+def test_generation_continues_past_the_context_window():
+    model = _model(context=8)
+    cache = KVCache(model)
+    generated = list(model.generate("abc", 20, rng=np.random.default_rng(3), top_k=3, cache=cache))
+    assert len(generated) == 20 and set(generated) <= set(ALPHABET)
+    assert cache.length <= model.context
+
+def test_encode_maps_unknown_characters_to_spaces():
+    model = _model()
+    assert model.decode(model.encode("abZc")) == "ab c"
+
+def test_training_reduces_the_loss():
+    model = _model()
+    ids = model.encode("abcdefgh abcdefgh abcdefgh")
+    windows = np.stack([ids[i:i + 9] for i in range(0, 16, 2)])
+    optimizer = Adam(model.parameters(), learning_rate=1e-2)
+    first = model.train_step(windows[:, :-1], windows[:, 1:], optimizer)
+    for _ in range(60):
+        last = model.train_step(windows[:, :-1], windows[:, 1:], optimizer)
+    assert optimizer.steps == 61
+    assert last < 0.5 * first
+
+def test_adam_clips_the_global_norm():
+    parameter = np.zeros(2)
+    optimizer = Adam({"p": parameter}, learning_rate=0.1, max_norm=1.0)
+    assert optimizer.step({"p": np.array([30.0, 40.0])}) == pytest.approx(50.0)
+    # The first bias-corrected Adam step moves every coordinate by the learning rate
+    np.testing.assert_allclose(parameter, [-0.1, -0.1], rtol=1e-6)
+
+def test_checkpoint_is_memory_mapped(tmp_path):
+    model = _model()
+    path = tmp_path / "gpt.npz"
+    model.save(path)
+    loaded = CharGPT.load(path)
+    assert loaded.alphabet == ALPHABET
+    assert isinstance(loaded.token_embeddings, np.memmap)
+    assert isinstance(loaded.blocks[1].ff1_weights, np.memmap)
+    ids = model.encode("face")[None]
+    np.testing.assert_allclose(loaded.forward(ids), model.forward(ids))
+
+def test_character_text_cleans_the_corpus():
+    assert character_text(["Hello,  World!", "abc\n"], "abcdehlorw ") == "hello world abc"
+
+def test_game_texts_include_the_story():
+    texts = game_texts(SimpleNamespace(states={}))
+    assert texts and all(isinstance(text, str) for text in texts)
+
+@pytest.fixture
+def citadel():
+    game = SimpleNamespace(width=1024, height=768, states={}, jobs=JobScheduler(threads=2))
+    challenge = GPTCitadelChallenge(game)
+    yield challenge
+    game.jobs.shutdown()
+
+def _poll_until(jobs, condition, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        jobs.poll()
+        time.sleep(0.005)
+    return condition()
+
+def test_citadel_forges_through_the_job_scheduler(citadel, tmp_path, monkeypatch):
+    monkeypatch.setattr(gpt_citadel_challenge, "CHECKPOINT_PATH", str(tmp_path / "gpt.npz"))
+    monkeypatch.setattr(gpt_citadel_challenge, "FORGE_STEPS", 2)
+    citadel.intro_step = len(citadel.intro_lines) - 1
+    citadel._advance_intro()
+    assert citadel.phase == "forge"
+    assert citadel.game.jobs.pending(citadel) == 1
+    assert _poll_until(citadel.game.jobs, lambda: citadel.phase == "command", timeout=120)
+    assert citadel.forge_job is None and citadel.model is not None
+
+def test_speaking_again_cancels_the_old_generation(citadel):
+    citadel.model = _model()
+    citadel.phase = "command"
+    citadel.target = "zzzzz"
+    citadel._speak()
+    first = citadel._generation
+    assert _poll_until(citadel.game.jobs, lambda: first.running)
+
+    citadel._speak()
+    assert first.cancelled and first.stop.is_set()
+    assert citadel._generation is not first
+
+    # Leaving the challenge cancels whatever it still has running
+    second = citadel._generation
+    citadel.game.jobs.cancel_owner(citadel)
+    assert second.cancelled and second.stop.is_set()
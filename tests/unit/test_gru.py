@@ -0,0 +1,76 @@
+"""
+Unit tests for the batched GRU layer and its gate log
+"""
+
+import numpy as np
+from src.nn.recurrent import GRU
+from src.nn.ring_buffer import RingBuffer
+
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+def _gru(steps=8, batch=3, n_inputs=2, n_hidden=4, seed=0, **kwargs):
+    rng = np.random.default_rng(seed)
+    gru = GRU(n_inputs, n_hidden, rng=rng, recurrent_scale=0.8, **kwargs)
+    gru.bias[...] = rng.normal(size=gru.bias.shape) * 0.1
+    gru.set_sequences(rng.normal(size=(steps, batch, n_inputs)), initial_state=rng.normal(size=(batch, n_hidden)) * 0.1)
+    return gru
+
+def _reference(gru):
+    """(states, update gates, reset gates) from a plain per-step loop"""
+    n = gru.n_hidden
+    w_x, w_h, b = gru.input_weights, gru.recurrent_weights, gru.bias
+    h = gru.states[0].copy()
+    states, updates, resets = [h], [], []
+    for x in gru.inputs:
+        z = _sigmoid(x @ w_x[:, :n] + h @ w_h[:, :n] + b[:n])
+        r = _sigmoid(x @ w_x[:, n:2 * n] + h @ w_h[:, n:2 * n] + b[n:2 * n])
+        # The reset gate scales the recurrent product, not h_{t-1}
+        candidate = np.tanh(x @ w_x[:, 2 * n:] + b[2 * n:] + r * (h @ w_h[:, 2 * n:]))
+        h = (1 - z) * candidate + z * h
+        states.append(h)
+        updates.append(z)
+        resets.append(r)
+    return np.array(states), np.array(updates), np.array(resets)
+
+def test_unroll_matches_a_plain_loop():
+    gru = _gru()
+    assert gru.unroll() == 8
+    states, updates, resets = _reference(gru)
+    np.testing.assert_allclose(gru.states, states)
+    np.testing.assert_allclose(gru.gates[:, :4].transpose(0, 2, 1), updates)
+    np.testing.assert_allclose(gru.gates[:, 4:8].transpose(0, 2, 1), resets)
+
+def test_editing_inputs_recomputes_only_later_steps():
+    gru = _gru(steps=40)
+    gru.unroll()
+    before = gru.states.copy()
+    gru.set_inputs(30, np.zeros((5, 3, 2)))
+    assert gru.valid_steps == 30
+    gru.unroll()
+    np.testing.assert_array_equal(gru.states[:31], before[:31])
+    np.testing.assert_allclose(gru.states, _reference(gru)[0])
+
+def test_budgeted_unroll_makes_progress():
+    gru = _gru(steps=100)
+    assert 0 < gru.unroll(budget=0.0) < 100
+    np.testing.assert_allclose(gru.hidden(99), _reference(gru)[0][100])
+
+def test_gate_log_records_the_chosen_sequence():
+    log = RingBuffer(64, {'update': (4,), 'reset': (4,)}, dtype=np.float16)
+    gru = _gru(gate_log=log, log_row=2)
+    gru.unroll()
+    assert log.count == 8
+    _, updates, resets = _reference(gru)
+    first, logged = log.read('update')
+    np.testing.assert_allclose(logged, updates[first:, 2], atol=1e-3)
+    np.testing.assert_allclose(log.read('reset', since=first)[1], resets[first:, 2], atol=1e-3)
+
+def test_initial_state_is_copied_before_reallocating():
+    gru = _gru()
+    gru.unroll()
+    last = gru.states[-1].copy()
+    gru.set_sequences(np.zeros((3, 3, 2)), initial_state=gru.states[-1])
+    assert gru.steps == 3
+    np.testing.assert_array_equal(gru.states[0], last)
+    assert gru.nbytes == sum(b.nbytes for b in (gru.inputs, gru._states, gru.gates))
@@ -0,0 +1,100 @@
+"""
+Unit tests for the background JobScheduler
+"""
+
+import math
+import threading
+import time
+import pytest
+from src.jobs import JobScheduler
+
+@pytest.fixture
+def scheduler():
+    scheduler = JobScheduler(threads=1, processes=1, budget=1.0)
+    yield scheduler
+    scheduler.shutdown()
+
+def _poll_until(scheduler, condition, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        scheduler.poll()
+        time.sleep(0.005)
+    return condition()
+
+def _blocker(scheduler, **kwargs):
+    """Occupy the only thread worker until the returned event is set"""
+    release = threading.Event()
+    job = scheduler.submit(release.wait, 10, **kwargs)
+    return release, job
+
+def test_queued_jobs_start_by_priority_then_fifo(scheduler):
+    release, _ = _blocker(scheduler)
+    order = []
+    for name, priority in (("low", 0), ("high", 5), ("mid", 1), ("high again", 5)):
+        scheduler.submit(lambda name=name: name, priority=priority, on_done=order.append)
+    assert scheduler.pending() == 5
+    release.set()
+    assert _poll_until(scheduler, lambda: len(order) == 4)
+    assert order == ["high", "high again", "mid", "low"]
+    assert scheduler.pending() == 0
+
+def test_poll_delivers_at_least_one_callback_within_budget(scheduler):
+    scheduler.threads = 4
+    done = []
+    jobs = [scheduler.submit(lambda i=i: i, on_done=done.append) for i in range(4)]
+    while not all(job._future.done() for job in jobs):
+        time.sleep(0.005)
+    assert scheduler.poll(budget=0.0) == 1
+    assert scheduler.poll(budget=0.0) == 1
+    assert scheduler.poll() == 2
+    assert sorted(done) == [0, 1, 2, 3]
+    assert all(job.finished and not job.running for job in jobs)
+
+def test_cancel_owner_drops_queued_running_and_finished_jobs(scheduler):
+    owner, other = object(), object()
+    stopped = threading.Event()
+
+    def work(stop):
+        if stop.wait(10):
+            stopped.set()
+
+    running = scheduler.submit(work, owner=owner, pass_stop=True)
+    queued = scheduler.submit(lambda: 1, owner=owner, on_done=pytest.fail)
+    kept = []
+    scheduler.submit(lambda: 2, owner=other, on_done=kept.append)
+    assert scheduler.pending(owner) == 2 and scheduler.pending(other) == 1
+
+    scheduler.cancel_owner(owner)
+    assert running.cancelled and queued.cancelled
+    assert stopped.wait(5)
+    assert scheduler.pending(owner) == 0
+    assert _poll_until(scheduler, lambda: kept == [2])
+
+def test_errors_go_to_on_error_or_are_printed(scheduler, capsys):
+    errors = []
+    scheduler.submit(math.sqrt, -1, on_error=errors.append)
+    scheduler.submit(math.sqrt, -1)
+    assert _poll_until(scheduler, lambda: scheduler.pending() == 0)
+    assert len(errors) == 1 and isinstance(errors[0], ValueError)
+    assert "Background job sqrt failed" in capsys.readouterr().out
+
+def test_process_jobs_run_in_a_worker(scheduler):
+    results = []
+    scheduler.submit(math.factorial, 20, kind="process", on_done=results.append)
+    assert _poll_until(scheduler, lambda: results, timeout=60)
+    assert results == [math.factorial(20)]
+
+def test_invalid_submissions_raise(scheduler):
+    with pytest.raises(ValueError):
+        scheduler.submit(print, kind="fiber")
+    with pytest.raises(ValueError):
+        scheduler.submit(print, kind="process", pass_stop=True)
+
+def test_shutdown_cancels_everything():
+    scheduler = JobScheduler(threads=1)
+    release, running = _blocker(scheduler)
+    queued = scheduler.submit(lambda: 1)
+    scheduler.shutdown()
+    release.set()
+    assert running.cancelled and queued.cancelled
+    assert scheduler.pending() == 0 and scheduler.poll() == 0
@@ -0,0 +1,100 @@
+"""
+Unit tests for loss landscapes and releasing challenge workers on exit
+"""
+
+import functools
+import time
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from src.challenges.base_challenge import BaseChallenge
+from src.nn.landscape import LossLandscape, linear_losses
+from src.states.coding_challenge_state import CodingChallengeState
+
+def _points(rows=300, seed=0):
+    rng = np.random.default_rng(seed)
+    features = rng.normal(size=(rows, 2))
+    labels = (features[:, 0] - 0.5 * features[:, 1] > 0.2).astype(np.int64)
+    return features, labels
+
+def _brute_force(features, labels, w1, w2, bias, loss):
+    signs = 2.0 * labels - 1.0
+    out = np.empty((len(w1), len(w2)))
+    for i, a in enumerate(w1):
+        for j, b in enumerate(w2):
+            margins = signs * (a * features[:, 0] + b * features[:, 1] + bias)
+            out[i, j] = np.mean(np.maximum(0, -margins) if loss == "perceptron" else np.logaddexp(0, -margins))
+    return out
+
+@pytest.mark.parametrize("loss", ["perceptron", "logistic"])
+def test_linear_losses_match_brute_force(loss):
+    features, labels = _points()
+    w1, w2 = np.linspace(-2, 2, 7), np.linspace(-1, 3, 5)
+    expected = _brute_force(features, labels, w1, w2, -0.3, loss)
+    # Tiny blocks force several grid and point chunks, including ragged last ones
+    for block, points in ((1 << 18, 4096), (64, 17)):
+        losses = linear_losses(features, labels, w1, w2, bias=-0.3, loss=loss, block=block, points=points)
+        np.testing.assert_allclose(losses, expected, rtol=1e-5, atol=1e-6)
+
+def _wait(landscape, timeout=60):
+    deadline = time.perf_counter() + timeout
+    while not landscape.finished and time.perf_counter() < deadline:
+        landscape.poll(budget=0.01)
+        time.sleep(0.01)
+
+def test_levels_refine_from_coarse_to_fine():
+    features, labels = _points()
+    evaluate = functools.partial(linear_losses, features, labels)
+    landscape = LossLandscape(evaluate, (-2, 2), (-2, 2), levels=(4, 8, 16))
+    assert landscape.losses is None and landscape.minimum() is None
+
+    resolutions = []
+    while not landscape.finished:
+        version = landscape.version
+        if landscape.poll(budget=0.0):
+            assert landscape.version == version + 1
+            resolutions.append(landscape.resolution)
+    assert resolutions == [4, 8, 16]
+    np.testing.assert_allclose(landscape.losses, evaluate(*landscape.axes()))
+    w1, w2, loss = landscape.minimum()
+    assert loss == landscape.losses.min()
+    assert -2 <= w1 <= 2 and -2 <= w2 <= 2
+
+def test_reset_starts_over():
+    features, labels = _points()
+    landscape = LossLandscape(functools.partial(linear_losses, features, labels), (-1, 1), (-1, 1), levels=(4, 8))
+    _wait(landscape)
+    landscape.reset(functools.partial(linear_losses, features, 1 - labels))
+    assert landscape.losses is None and not landscape.finished
+    _wait(landscape)
+    np.testing.assert_allclose(landscape.losses, linear_losses(features, 1 - labels, *landscape.axes()))
+
+def test_large_levels_run_on_the_process_pool():
+    features, labels = _points()
+    evaluate = functools.partial(linear_losses, features, labels)
+    landscape = LossLandscape(evaluate, (-2, 2), (-2, 2), levels=(8, 12), parallel_work=0, workers=1)
+    try:
+        assert landscape._executor is not None
+        _wait(landscape)
+        assert landscape.finished and landscape.resolution == 12
+        np.testing.assert_allclose(landscape.losses, evaluate(*landscape.axes()))
+    finally:
+        landscape.close()
+    assert landscape._executor is None
+
+class _Challenge(BaseChallenge):
+    closed = 0
+
+    def close(self):
+        self.closed += 1
+
+def test_leaving_a_challenge_closes_it_and_cancels_its_work():
+    cancelled = []
+    owner = SimpleNamespace(cancel_owner=cancelled.append)
+    game = SimpleNamespace(width=800, height=600, jobs=owner, tasks=owner)
+    state = CodingChallengeState(game)
+    challenge = _Challenge(game)
+    state.current_challenge = challenge
+    state.exit()
+    assert challenge.closed == 1
+    assert cancelled == [challenge, challenge]
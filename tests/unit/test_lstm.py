@@ -0,0 +1,131 @@
+"""
+Unit tests for the fused-gate LSTM layer and truncated backpropagation through time
+"""
+
+import numpy as np
+from src.nn.recurrent import LSTM
+
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+def _lstm(steps=6, batch=3, n_inputs=2, n_hidden=3, seed=0):
+    rng = np.random.default_rng(seed)
+    lstm = LSTM(n_inputs, n_hidden, rng=rng)
+    lstm.bias += rng.normal(size=lstm.bias.shape) * 0.1
+    lstm.set_sequences(rng.normal(size=(steps, batch, n_inputs)),
+                       initial_state=rng.normal(size=(batch, n_hidden)) * 0.1,
+                       initial_cell=rng.normal(size=(batch, n_hidden)) * 0.1)
+    return lstm
+
+def _reference(lstm):
+    """(states, cells) from a plain per-step loop with separately sliced gates"""
+    n = lstm.n_hidden
+    h, c = lstm.states[0].copy(), lstm.cells[0].copy()
+    states, cells = [h], [c]
+    for x in lstm.inputs:
+        pre = x @ lstm.input_weights + h @ lstm.recurrent_weights + lstm.bias
+        i, f, o = _sigmoid(pre[:, :n]), _sigmoid(pre[:, n:2 * n]), _sigmoid(pre[:, 2 * n:3 * n])
+        g = np.tanh(pre[:, 3 * n:])
+        c = f * c + i * g
+        h = o * np.tanh(c)
+        states.append(h)
+        cells.append(c)
+    return np.array(states), np.array(cells)
+
+def _numeric_gradient(array, loss, h=1e-6):
+    """Central differences of loss() with respect to every entry of array, perturbed in place"""
+    numeric = np.empty_like(array)
+    for index in np.ndindex(array.shape):
+        original = array[index]
+        array[index] = original + h
+        plus = loss()
+        array[index] = original - h
+        minus = loss()
+        array[index] = original
+        numeric[index] = (plus - minus) / (2 * h)
+    return numeric
+
+def test_forget_bias_and_buffer_layout():
+    lstm = LSTM(2, 3, forget_bias=2.0, rng=np.random.default_rng(0))
+    np.testing.assert_array_equal(lstm.bias, [0, 0, 0, 2, 2, 2, 0, 0, 0, 0, 0, 0])
+    lstm.set_sequences(np.zeros((4, 5, 2)))
+    assert lstm.states.shape == lstm.cells.shape == (5, 5, 3)
+    assert np.shares_memory(lstm.states, lstm._states)
+
+def test_unroll_matches_a_plain_loop():
+    lstm = _lstm()
+    lstm.unroll()
+    states, cells = _reference(lstm)
+    np.testing.assert_allclose(lstm.states, states)
+    np.testing.assert_allclose(lstm.cells, cells)
+
+def test_editing_inputs_recomputes_only_later_steps():
+    lstm = _lstm(steps=20)
+    np.testing.assert_allclose(lstm.hidden(9), _reference(lstm)[0][10])
+    assert lstm.valid_steps == 10
+    lstm.unroll()
+    before = lstm.states.copy()
+    lstm.set_inputs(12, np.ones((2, 3, 2)))
+    assert lstm.valid_steps == 12
+    lstm.unroll(budget=0.0)
+    lstm.unroll()
+    np.testing.assert_array_equal(lstm.states[:13], before[:13])
+    np.testing.assert_allclose(lstm.states, _reference(lstm)[0])
+
+def test_backward_matches_finite_differences():
+    lstm = _lstm()
+    targets = np.random.default_rng(1).normal(size=lstm.states[1:].shape)
+
+    def loss():
+        lstm.mark_dirty(0)
+        lstm.unroll()
+        return float(np.sum(lstm.states[1:] * targets))
+
+    grad_h0, grad_c0 = (g.copy() for g in lstm.backward(targets))
+    analytic = [lstm.grad_input_weights.copy(), lstm.grad_recurrent_weights.copy(), lstm.grad_bias.copy()]
+    for parameter, expected in zip((lstm.input_weights, lstm.recurrent_weights, lstm.bias), analytic):
+        np.testing.assert_allclose(expected, _numeric_gradient(parameter, loss), rtol=1e-5, atol=1e-8)
+    np.testing.assert_allclose(grad_h0, _numeric_gradient(lstm.states[0], loss), rtol=1e-5, atol=1e-8)
+    np.testing.assert_allclose(grad_c0, _numeric_gradient(lstm.cells[0], loss), rtol=1e-5, atol=1e-8)
+
+def test_step_gradient_norms_record_the_carried_gradient():
+    lstm = _lstm(steps=10)
+    grads = np.zeros(lstm.states[1:].shape)
+    grads[-1] = 1.0
+    lstm.backward(grads)
+    assert lstm.step_gradient_norms[-1] == np.sqrt(grads[-1].size)
+    assert np.all(lstm.step_gradient_norms[:-1] < lstm.step_gradient_norms[-1])
+
+def test_truncated_windows_carry_state_and_cell():
+    rng = np.random.default_rng(2)
+    stream = rng.normal(size=(15, 2, 2))
+    full = LSTM(2, 4, rng=np.random.default_rng(3))
+    full.set_sequences(stream)
+    full.unroll()
+
+    windowed = LSTM(2, 4, rng=np.random.default_rng(3))
+    windowed.set_sequences(stream[:5])
+    nbytes = windowed.nbytes
+    for start in (5, 10):
+        windowed.unroll()
+        windowed.set_sequences(stream[start:start + 5], windowed.states[-1], windowed.cells[-1])
+    windowed.unroll()
+    np.testing.assert_allclose(windowed.states[-1], full.states[-1])
+    np.testing.assert_allclose(windowed.cells[-1], full.cells[-1])
+    assert windowed.nbytes == nbytes
+
+def test_training_reduces_the_loss():
+    lstm = _lstm(steps=8, batch=4)
+    targets = np.full(lstm.states[1:].shape, 0.5)
+
+    def loss():
+        lstm.unroll()
+        return float(np.sum((lstm.states[1:] - targets) ** 2))
+
+    start = loss()
+    for _ in range(50):
+        loss()
+        lstm.backward(2 * (lstm.states[1:] - targets))
+        lstm.apply_gradients(0.05, max_norm=5.0)
+        assert lstm.valid_steps == 0
+    assert loss() < 0.5 * start
@@ -0,0 +1,100 @@
+"""
+Unit tests for DenseLayer and Network forward/backward passes
+"""
+
+import numpy as np
+import pytest
+from src.nn.layers import DenseLayer, neuron_output
+from src.nn.network import Network
+
+def _network(sizes=(3, 5, 4, 2), activations=('tanh', 'sigmoid', 'linear'), capacity=1, seed=0):
+    return Network(list(sizes), list(activations), capacity=capacity, rng=np.random.default_rng(seed))
+
+def _loss(network, inputs, targets):
+    outputs = network.forward(inputs)
+    return 0.5 * np.sum((outputs - targets) ** 2)
+
+def test_neuron_output():
+    assert neuron_output([1.0, 2.0], [0.5, -0.25], 0.1) == pytest.approx(0.1)
+    assert neuron_output([1.0, 2.0], [0.5, -0.5], -0.1, "relu") == 0.0
+
+def test_dense_layer_forward_matches_matmul():
+    rng = np.random.default_rng(1)
+    layer = DenseLayer(4, 3, "relu")
+    layer.initialize(rng)
+    inputs = rng.normal(size=(6, 4))
+    expected = np.maximum(inputs @ layer.weights + layer.bias, 0)
+    np.testing.assert_allclose(layer.forward(inputs), expected)
+    assert layer.capacity >= 6
+
+def test_forward_matches_a_manual_pass():
+    network = _network()
+    inputs = np.random.default_rng(2).normal(size=(7, 3))
+    hidden = np.tanh(inputs @ network.weights[0] + network.biases[0])
+    hidden = 1 / (1 + np.exp(-(hidden @ network.weights[1] + network.biases[1])))
+    expected = hidden @ network.weights[2] + network.biases[2]
+    np.testing.assert_allclose(network.forward(inputs), expected)
+
+def test_one_dimensional_input_gives_one_dimensional_output():
+    network = _network()
+    assert network.forward(np.ones(3)).shape == (2,)
+
+def test_activations_expose_input_and_layer_buffers():
+    network = _network()
+    network.forward(np.ones((2, 3)))
+    shapes = [a.shape for a in network.activations]
+    assert shapes == [(2, 3), (2, 5), (2, 4), (2, 2)]
+
+def test_backward_matches_finite_differences():
+    rng = np.random.default_rng(3)
+    network = _network()
+    inputs = rng.normal(size=(4, 3))
+    targets = rng.normal(size=(4, 2))
+
+    outputs = network.forward(inputs)
+    grad_inputs = network.backward(outputs - targets).copy()
+
+    h = 1e-6
+    for layer in network.layers:
+        for parameter, analytic in ((layer.weights, layer.grad_weights.copy()), (layer.bias, layer.grad_bias.copy())):
+            numeric = np.empty_like(parameter)
+            for index in np.ndindex(parameter.shape):
+                original = parameter[index]
+                parameter[index] = original + h
+                up = _loss(network, inputs, targets)
+                parameter[index] = original - h
+                down = _loss(network, inputs, targets)
+                parameter[index] = original
+                numeric[index] = (up - down) / (2 * h)
+            np.testing.assert_allclose(analytic, numeric, rtol=1e-5, atol=1e-7)
+
+    numeric_inputs = np.empty_like(inputs)
+    for index in np.ndindex(inputs.shape):
+        plus, minus = inputs.copy(), inputs.copy()
+        plus[index] += h
+        minus[index] -= h
+        numeric_inputs[index] = (_loss(network, plus, targets) - _loss(network, minus, targets)) / (2 * h)
+    np.testing.assert_allclose(grad_inputs, numeric_inputs, rtol=1e-5, atol=1e-7)
+
+def test_gradient_descent_reduces_the_loss():
+    rng = np.random.default_rng(4)
+    network = _network(activations=('tanh', 'tanh', 'linear'))
+    inputs = rng.normal(size=(16, 3))
+    targets = rng.normal(size=(16, 2)) * 0.5
+    before = _loss(network, inputs, targets)
+    for _ in range(50):
+        outputs = network.forward(inputs)
+        network.backward((outputs - targets) / len(inputs))
+        network.apply_gradients(0.1)
+    assert _loss(network, inputs, targets) < before
+
+def test_buffers_grow_for_larger_batches():
+    network = _network(capacity=2)
+    small = network.forward(np.ones((2, 3))).copy()
+    large = network.forward(np.ones((9, 3)))
+    assert large.shape == (9, 2)
+    np.testing.assert_allclose(large[:2], small)
+
+def test_mismatched_activations_raise():
+    with pytest.raises(ValueError):
+        Network([2, 3, 1], ['relu'])
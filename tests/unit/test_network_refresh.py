@@ -0,0 +1,64 @@
+"""
+Unit tests for Network's dirty-layer tracking and partial recomputation
+"""
+
+import numpy as np
+from src.nn.network import Network
+
+def _network():
+    network = Network([3, 4, 4, 4, 2], ['relu', 'tanh', 'sigmoid', 'linear'], rng=np.random.default_rng(0))
+    network.forward(np.array([0.5, -0.2, 0.8]))
+    return network
+
+def _fresh_output(network):
+    """Output of an untouched full forward pass with the same parameters"""
+    clone = Network(network.layer_sizes, [layer.activation for layer in network.layers])
+    for source, target in zip(network.layers, clone.layers):
+        target.weights[...] = source.weights
+        target.bias[...] = source.bias
+    return clone.forward(network.activations[0][0])
+
+def test_forward_leaves_nothing_dirty():
+    network = _network()
+    assert not network.is_dirty()
+    assert list(network.refresh()) == []
+
+def test_weight_edit_refreshes_only_downstream_layers():
+    network = _network()
+    upstream = network.layers[0].outputs.copy()
+    network.layers[2].weights[0, 0] += 1.0
+    network.mark_dirty(2)
+
+    assert network.is_dirty()
+    assert list(network.refresh()) == [2, 3]
+    assert not network.is_dirty()
+    np.testing.assert_array_equal(network.layers[0].outputs, upstream)
+    np.testing.assert_allclose(network.output[0], _fresh_output(network))
+
+def test_earliest_dirty_layer_wins():
+    network = _network()
+    network.mark_dirty(3)
+    network.mark_dirty(1)
+    assert list(network.refresh()) == [1, 2, 3]
+
+def test_input_edit_in_place_refreshes_everything():
+    network = _network()
+    network.activations[0][0, 1] = 2.0
+    network.mark_dirty(0)
+    assert list(network.refresh()) == [0, 1, 2, 3]
+    np.testing.assert_allclose(network.output[0], _fresh_output(network))
+
+def test_refresh_only_covers_layers_already_computed():
+    network = Network([2, 3, 3, 1], ['relu', 'relu', 'linear'], rng=np.random.default_rng(1))
+    network.set_input(np.array([1.0, -1.0]))
+    network.forward_layer(0)
+    network.forward_layer(1)
+    network.mark_dirty(0)
+    # Layer 2 was never requested, so stepping through the pass stays incremental
+    assert list(network.refresh()) == [0, 1]
+
+def test_reset_activations_clears_outputs_and_validity():
+    network = _network()
+    network.reset_activations()
+    assert not network.is_dirty()
+    assert all(not layer.outputs.any() for layer in network.layers)
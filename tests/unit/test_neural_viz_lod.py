@@ -0,0 +1,78 @@
+"""
+Unit tests for NeuralNetworkVisualizer's level-of-detail rendering
+"""
+
+import numpy as np
+import pygame
+from src.visualization.neural_viz import NeuralNetworkVisualizer
+
+def _network(sizes, seed=0):
+    rng = np.random.default_rng(seed)
+    weights = [rng.normal(size=(n_in, n_out)) for n_in, n_out in zip(sizes[:-1], sizes[1:])]
+    biases = [rng.normal(size=n) for n in sizes[1:]]
+    activations = [rng.uniform(-1, 1, n) for n in sizes]
+    return weights, biases, activations
+
+def test_weight_matrix_pads_and_broadcasts():
+    matrix = NeuralNetworkVisualizer._weight_matrix([np.ones((2, 2))], 0, 3, 4)
+    assert matrix.shape == (3, 4)
+    assert matrix[:2, :2].sum() == 4 and matrix.sum() == 4
+
+    shared = NeuralNetworkVisualizer._weight_matrix([[0.5, -1.0]], 0, 3, 2)
+    np.testing.assert_array_equal(shared, [[0.5, -1.0]] * 3)
+
+    assert not NeuralNetworkVisualizer._weight_matrix([], 2, 2, 2).any()
+
+def test_bundle_caps_groups_and_averages_weights():
+    viz = NeuralNetworkVisualizer(800, 600)
+    n = 100
+    ys = np.arange(n, dtype=np.float64)
+    matrix = np.random.default_rng(1).normal(size=(n, 3))
+
+    centers, bundled = viz._bundle(ys, matrix, 0)
+    assert len(centers) == viz.MAX_BUNDLES
+    assert bundled.shape == (viz.MAX_BUNDLES, 3)
+    starts = np.linspace(0, n, viz.MAX_BUNDLES + 1).astype(int)
+    np.testing.assert_allclose(bundled[0], matrix[starts[0]:starts[1]].mean(axis=0))
+    np.testing.assert_allclose(centers[0], ys[starts[0]:starts[1]].mean())
+
+    small_ys = np.arange(5.0)
+    assert viz._bundle(small_ys, matrix[:5], 0)[0] is small_ys
+
+def test_small_network_is_drawn_in_full_detail():
+    viz = NeuralNetworkVisualizer(800, 600)
+    screen = pygame.Surface((800, 600))
+    viz.draw_simple_network(screen, 0, 0, 800, 600, *_network([2, 3, 1]))
+    # Detailed edges are drawn directly, never through the cached edge layer
+    assert viz._edge_cache == {}
+
+def test_large_network_uses_a_cached_edge_layer():
+    viz = NeuralNetworkVisualizer(800, 600)
+    screen = pygame.Surface((800, 600))
+    network = _network([64, 256, 256, 10])
+    viz.draw_simple_network(screen, 0, 0, 800, 600, *network)
+    assert len(viz._edge_cache) == 1
+    surface = next(iter(viz._edge_cache.values()))
+
+    viz.draw_simple_network(screen, 0, 0, 800, 600, *network)
+    assert next(iter(viz._edge_cache.values())) is surface
+
+    network[0][1][0, 0] += 1.0
+    viz.draw_simple_network(screen, 0, 0, 800, 600, *network)
+    assert len(viz._edge_cache) == 1
+    assert next(iter(viz._edge_cache.values())) is not surface
+
+def test_zooming_out_drops_labels_and_batches_edges():
+    viz = NeuralNetworkVisualizer(800, 600)
+    screen = pygame.Surface((800, 600))
+    viz.draw_simple_network(screen, 0, 0, 800, 600, *_network([2, 3, 1]), zoom=0.5)
+    assert len(viz._edge_cache) == 1
+
+def test_crowded_layer_is_drawn_as_a_strip():
+    viz = NeuralNetworkVisualizer(800, 600)
+    screen = pygame.Surface((400, 300))
+    weights, biases, activations = _network([1000, 4])
+    activations[0][:] = 1.0
+    viz.draw_simple_network(screen, 0, 0, 400, 300, weights, biases, activations)
+    # The input strip is a solid column of full-intensity input color at the first layer's x
+    assert screen.get_at((100, 150))[:3] == (100, 150, 255)
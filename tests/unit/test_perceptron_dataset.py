@@ -0,0 +1,103 @@
+"""
+Unit tests for the struct-of-arrays PerceptronDataset
+"""
+
+import numpy as np
+import pytest
+from src.challenges.perceptron_dataset import PerceptronDataset
+
+def _reference_update(features, labels, weights, bias, learning_rate):
+    """Batched perceptron step written out point by point"""
+    weights = np.array(weights, dtype=np.float64)
+    predictions = [1 if np.dot(weights, x) + bias > 0 else 0 for x in features]
+    new_weights, new_bias = weights.copy(), bias
+    for x, label, predicted in zip(features, labels, predictions):
+        new_weights += learning_rate * (label - predicted) * x
+        new_bias += learning_rate * (label - predicted)
+    return new_weights, new_bias
+
+def test_append_and_extend_grow_past_capacity():
+    dataset = PerceptronDataset(capacity=2)
+    dataset.append(0.1, 0.2, 1)
+    dataset.extend(np.arange(10.0).reshape(5, 2), [0, 1, 0, 1, 0])
+
+    assert len(dataset) == 6
+    np.testing.assert_array_equal(dataset.features[0], [0.1, 0.2])
+    np.testing.assert_array_equal(dataset.features[1:], np.arange(10.0).reshape(5, 2))
+    np.testing.assert_array_equal(dataset.labels, [1, 0, 1, 0, 1, 0])
+
+def test_empty_extend_is_a_no_op():
+    dataset = PerceptronDataset()
+    version = dataset.version
+    dataset.extend(np.zeros((0, 2)), [])
+    assert len(dataset) == 0
+    assert dataset.version == version
+
+def test_clear_keeps_buffers_and_bumps_version():
+    dataset = PerceptronDataset()
+    dataset.extend(np.ones((3, 2)), [1, 1, 1])
+    version = dataset.version
+    dataset.clear()
+    assert len(dataset) == 0
+    assert not dataset
+    assert dataset.version > version
+
+def test_predict_matches_dot_product_and_is_cached():
+    rng = np.random.default_rng(0)
+    dataset = PerceptronDataset()
+    dataset.extend(rng.uniform(-1, 1, (50, 2)), rng.integers(0, 2, 50))
+    weights, bias = np.array([0.7, -0.3]), 0.1
+
+    predictions = dataset.predict(weights, bias)
+    expected = (dataset.features @ weights + bias > 0).astype(np.int8)
+    np.testing.assert_array_equal(predictions, expected)
+    assert dataset.predict(weights, bias) is predictions
+
+    dataset.append(0.5, 0.5, 1)
+    assert len(dataset.predict(weights, bias)) == 51
+
+def test_accuracy():
+    dataset = PerceptronDataset()
+    assert dataset.accuracy([1.0, 1.0], 0.0) == 0.0
+    dataset.extend([[1.0, 1.0], [-1.0, -1.0], [1.0, 0.5], [-1.0, 0.5]], [1, 0, 0, 0])
+    # Predictions with w=(1, 1), b=0: 1, 0, 1, 0
+    assert dataset.accuracy([1.0, 1.0], 0.0) == pytest.approx(0.75)
+
+def test_perceptron_update_matches_reference():
+    rng = np.random.default_rng(1)
+    dataset = PerceptronDataset()
+    dataset.extend(rng.uniform(-1, 1, (40, 2)), rng.integers(0, 2, 40))
+    weights, bias = np.array([0.2, -0.4]), 0.05
+
+    new_weights, new_bias = dataset.perceptron_update(weights, bias, 0.1)
+    expected_weights, expected_bias = _reference_update(dataset.features, dataset.labels, weights, bias, 0.1)
+    np.testing.assert_allclose(new_weights, expected_weights)
+    assert new_bias == pytest.approx(expected_bias)
+
+def test_perceptron_update_on_a_batch_only_uses_those_points():
+    rng = np.random.default_rng(2)
+    dataset = PerceptronDataset()
+    dataset.extend(rng.uniform(-1, 1, (40, 2)), rng.integers(0, 2, 40))
+    weights, bias = np.array([0.3, 0.3]), -0.2
+    batch = np.array([3, 7, 11, 19])
+
+    new_weights, new_bias = dataset.perceptron_update(weights, bias, 0.5, indices=batch)
+    expected_weights, expected_bias = _reference_update(dataset.features[batch], dataset.labels[batch],
+                                                        weights, bias, 0.5)
+    np.testing.assert_allclose(new_weights, expected_weights)
+    assert new_bias == pytest.approx(expected_bias)
+
+def test_perceptron_update_leaves_a_perfect_fit_alone():
+    dataset = PerceptronDataset()
+    dataset.extend([[1.0, 1.0], [-1.0, -1.0]], [1, 0])
+    weights = np.array([1.0, 1.0])
+    new_weights, new_bias = dataset.perceptron_update(weights, 0.0, 0.1)
+    assert new_weights is weights
+    assert new_bias == 0.0
+
+def test_sample_indices_are_unique_and_bounded():
+    dataset = PerceptronDataset()
+    dataset.extend(np.zeros((10, 2)), np.zeros(10))
+    indices = dataset.sample_indices(25)
+    assert len(indices) == 10
+    assert len(set(indices.tolist())) == 10
@@ -0,0 +1,162 @@
+"""
+Unit tests for RingBuffer and BackgroundTrainer telemetry, stepping and checkpoints
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from src.challenges.backprop_challenge import BackpropChallenge
+from src.nn.network import Network
+from src.nn.ring_buffer import RingBuffer
+from src.nn.trainer import BackgroundTrainer
+
+def test_read_returns_records_in_order():
+    ring = RingBuffer(8, {'step': (), 'norms': (2,)})
+    for i in range(5):
+        ring.append(step=i, norms=[i, -i])
+    first, steps = ring.read('step')
+    assert first == 0
+    np.testing.assert_array_equal(steps, [0, 1, 2, 3, 4])
+    _, norms = ring.read('norms', since=3)
+    np.testing.assert_array_equal(norms, [[3, -3], [4, -4]])
+
+def test_wraparound_keeps_the_newest_records():
+    ring = RingBuffer(4, {'step': ()})
+    for i in range(10):
+        ring.append(step=i)
+    assert len(ring) == 4
+    assert ring.count == 10
+    # The oldest slot is the one the writer fills next, so readers never get it
+    first, steps = ring.read('step')
+    assert first == 7
+    np.testing.assert_array_equal(steps, [7, 8, 9])
+    # Asking for records that were overwritten starts at the oldest safe one
+    assert ring.read('step', since=2)[0] == 7
+
+def test_since_and_limit():
+    ring = RingBuffer(16, {'step': ()})
+    for i in range(10):
+        ring.append(step=i)
+    first, steps = ring.read('step', since=2, limit=3)
+    assert first == 7
+    np.testing.assert_array_equal(steps, [7, 8, 9])
+    first, steps = ring.read('step', since=10)
+    assert first == 10 and len(steps) == 0
+
+def test_slot_and_commit_write_in_place():
+    ring = RingBuffer(4, {'loss': (), 'norms': (3,)})
+    ring.slot('loss')[...] = 0.5
+    ring.slot('norms')[:] = [1, 2, 3]
+    assert ring.latest('loss') is None
+    ring.commit()
+    assert ring.latest('loss') == 0.5
+    np.testing.assert_array_equal(ring.latest('norms'), [1, 2, 3])
+
+def test_clear():
+    ring = RingBuffer(4, {'step': ()})
+    ring.append(step=1)
+    ring.clear()
+    assert len(ring) == 0 and ring.latest('step') is None
+
+def test_concurrent_reader_only_sees_whole_records():
+    ring = RingBuffer(64, {'a': (), 'b': ()})
+    stop = threading.Event()
+
+    def write():
+        i = 0
+        while not stop.is_set():
+            ring.append(a=i, b=i)
+            i += 1
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        for _ in range(500):
+            first, a = ring.read('a')
+            # Records are numbered by their sequence, so every survivor must match its position
+            np.testing.assert_array_equal(a, np.arange(first, first + len(a)))
+    finally:
+        stop.set()
+        writer.join()
+
+def _trainer(**kwargs):
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(64, 2))
+    labels = (features[:, 0] > 0).astype(np.int64)
+    network = Network([2, 4, 2], ['tanh', 'linear'], capacity=16, rng=rng)
+    batches = lambda: ((features[i:i + 16], labels[i:i + 16]) for i in range(0, 64, 16))
+    return BackgroundTrainer(network, batches, **kwargs)
+
+def _wait_for(condition, timeout=10):
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+def test_trainer_writes_one_telemetry_record_per_step():
+    trainer = _trainer(max_epochs=3, record_parameters=True)
+    trainer.start()
+    assert _wait_for(lambda: not trainer.running)
+    telemetry = trainer.telemetry
+    assert telemetry.count == 12
+    _, steps = telemetry.read('step')
+    np.testing.assert_array_equal(steps, np.arange(1, 13))
+    np.testing.assert_allclose(telemetry.latest('parameters'), trainer.network.flat_parameters())
+    np.testing.assert_allclose(telemetry.latest('weight_norms'), trainer.network.weight_norms())
+
+def test_step_once_runs_exactly_that_many_steps():
+    trainer = _trainer()
+    trainer.step_once(3)
+    assert _wait_for(lambda: trainer.step == 3)
+    time.sleep(0.05)
+    assert trainer.step == 3
+    assert trainer.paused
+    trainer.resume()
+    assert _wait_for(lambda: trainer.step > 10)
+    trainer.stop()
+    assert not trainer.running
+
+def test_checkpoint_round_trip(tmp_path):
+    trainer = _trainer(max_epochs=2)
+    trainer.start()
+    assert _wait_for(lambda: not trainer.running)
+    path = tmp_path / "checkpoint.npz"
+    trainer.save_checkpoint(path)
+    saved = trainer.network.flat_parameters()
+
+    restored = _trainer()
+    metadata = restored.load_checkpoint(path)
+    assert restored.step == 8 and restored.epoch == 2 and restored.rows_seen == 128
+    assert float(metadata['learning_rate']) == pytest.approx(0.1)
+    np.testing.assert_array_equal(restored.network.flat_parameters(), saved)
+
+def test_checkpoint_for_another_shape_is_rejected(tmp_path):
+    network = Network([2, 3, 2], ['tanh', 'linear'])
+    network.save(tmp_path / "other.npz")
+    with pytest.raises(ValueError):
+        _trainer().load_checkpoint(tmp_path / "other.npz")
+
+def test_flat_parameters_round_trip_and_match_gradients_layout():
+    network = Network([3, 4, 2], ['relu', 'linear'], rng=np.random.default_rng(1))
+    vector = network.flat_parameters()
+    assert len(vector) == network.parameter_count == 3 * 4 + 4 + 4 * 2 + 2
+    network.set_flat_parameters(np.arange(len(vector), dtype=np.float64))
+    np.testing.assert_array_equal(network.layers[0].weights.ravel(), np.arange(12))
+    np.testing.assert_array_equal(network.layers[1].bias, [24, 25])
+
+    network.forward(np.ones((2, 3)))
+    network.backward(np.ones((2, 2)))
+    gradients = network.flat_gradients()
+    np.testing.assert_array_equal(gradients[:12], network.layers[0].grad_weights.ravel())
+    np.testing.assert_allclose(network.gradient_norms(),
+                               [np.linalg.norm(layer.grad_weights) for layer in network.layers])
+
+def test_backprop_challenge_close_stops_the_trainer():
+    challenge = BackpropChallenge(SimpleNamespace(width=1024, height=768))
+    challenge.trainer.start()
+    assert _wait_for(lambda: challenge.trainer.step > 0)
+    challenge.close()
+    challenge.trainer._thread.join(5)
+    assert not challenge.trainer.running
@@ -0,0 +1,123 @@
+"""
+Unit tests for the RNN layer: cached incremental unrolling and backpropagation through time
+"""
+
+import numpy as np
+import pytest
+from src.nn.recurrent import RNN
+
+def _rnn(steps=7, batch=3, n_inputs=2, n_hidden=4, seed=0):
+    rng = np.random.default_rng(seed)
+    rnn = RNN(n_inputs, n_hidden, rng=rng, weight_scale=0.5, recurrent_scale=0.9)
+    rnn.bias[...] = rng.normal(size=n_hidden) * 0.1
+    rnn.set_sequences(rng.normal(size=(steps, batch, n_inputs)), initial_state=rng.normal(size=(batch, n_hidden)) * 0.1)
+    return rnn
+
+def _reference_states(rnn):
+    h = rnn.states[0].copy()
+    states = [h]
+    for x in rnn.inputs:
+        h = np.tanh(x @ rnn.input_weights + h @ rnn.recurrent_weights + rnn.bias)
+        states.append(h)
+    return np.array(states)
+
+def _numeric_gradient(array, loss, h=1e-6):
+    """Central differences of loss() with respect to every entry of array, perturbed in place"""
+    numeric = np.empty_like(array)
+    for index in np.ndindex(array.shape):
+        original = array[index]
+        array[index] = original + h
+        plus = loss()
+        array[index] = original - h
+        minus = loss()
+        array[index] = original
+        numeric[index] = (plus - minus) / (2 * h)
+    return numeric
+
+def test_unroll_matches_a_plain_loop():
+    rnn = _rnn()
+    assert rnn.valid_steps == 0
+    assert rnn.unroll() == 7
+    np.testing.assert_allclose(rnn.states, _reference_states(rnn))
+
+def test_editing_one_step_only_recomputes_from_there():
+    rnn = _rnn()
+    rnn.unroll()
+    before = rnn.states.copy()
+    rnn.set_input(4, [1.0, -1.0], rows=1)
+    assert rnn.valid_steps == 4
+    rnn.unroll()
+    np.testing.assert_array_equal(rnn.states[:5], before[:5])
+    np.testing.assert_allclose(rnn.states, _reference_states(rnn))
+    assert not np.allclose(rnn.states[5, 1], before[5, 1])
+
+def test_partial_unroll_and_hidden():
+    rnn = _rnn(steps=40)
+    assert rnn.unroll(10) == 10
+    np.testing.assert_allclose(rnn.hidden(20), _reference_states(rnn)[21])
+    assert rnn.valid_steps == 21
+    # A spent budget still makes progress
+    assert 21 < rnn.unroll(budget=0.0) <= 40
+
+def test_set_sequences_reallocates_on_new_shape():
+    rnn = _rnn()
+    rnn.set_sequences(np.zeros((3, 5, 2)))
+    assert (rnn.steps, rnn.batch_size) == (3, 5)
+    assert rnn.states.shape == (4, 5, 4)
+    assert rnn.nbytes > 0
+
+def test_backward_matches_finite_differences():
+    rnn = _rnn()
+    targets = np.random.default_rng(1).normal(size=rnn.states[1:].shape)
+
+    def loss():
+        rnn.mark_dirty(0)
+        rnn.unroll()
+        return float(np.sum(rnn.states[1:] * targets))
+
+    grad_initial = rnn.backward(targets).copy()
+    analytic = [rnn.grad_input_weights.copy(), rnn.grad_recurrent_weights.copy(), rnn.grad_bias.copy()]
+    for parameter, expected in zip((rnn.input_weights, rnn.recurrent_weights, rnn.bias), analytic):
+        np.testing.assert_allclose(expected, _numeric_gradient(parameter, loss), rtol=1e-5, atol=1e-8)
+    np.testing.assert_allclose(grad_initial, _numeric_gradient(rnn.states[0], loss), rtol=1e-5, atol=1e-8)
+
+def test_step_gradient_norms_fade_for_a_contracting_recurrence():
+    rnn = _rnn(steps=30)
+    rnn.recurrent_weights *= 0.3 / 0.9
+    rnn.mark_dirty(0)
+    grads = np.zeros(rnn.states[1:].shape)
+    grads[-1] = 1.0
+    rnn.backward(grads)
+    assert rnn.step_gradient_norms[0] < 1e-6 * rnn.step_gradient_norms[-1]
+
+def test_apply_gradients_clips_and_invalidates():
+    rnn = _rnn()
+    rnn.backward(np.ones(rnn.states[1:].shape))
+    norm = rnn.gradient_norm()
+    bias = rnn.bias.copy()
+    rnn.apply_gradients(1.0, max_norm=norm / 10)
+    assert rnn.valid_steps == 0
+    np.testing.assert_allclose(bias - rnn.bias, rnn.grad_bias / 10)
+
+def test_truncated_windows_carry_the_state():
+    rng = np.random.default_rng(2)
+    stream = rng.normal(size=(12, 1, 2))
+    full = RNN(2, 3, rng=np.random.default_rng(3))
+    full.set_sequences(stream)
+    full.unroll()
+
+    windowed = RNN(2, 3, rng=np.random.default_rng(3))
+    windowed.set_sequences(stream[:4])
+    for start in (4, 8):
+        windowed.unroll()
+        windowed.set_sequences(stream[start:start + 4], initial_state=windowed.states[-1])
+    windowed.unroll()
+    np.testing.assert_allclose(windowed.states[-1], full.states[-1])
+    assert windowed.steps == 4
+
+@pytest.mark.parametrize("activation", ["relu", "sigmoid"])
+def test_other_activations_unroll(activation):
+    rnn = RNN(2, 3, activation=activation, rng=np.random.default_rng(4))
+    rnn.set_sequences(np.ones((5, 2, 2)))
+    rnn.unroll()
+    assert rnn.states[1:].min() >= 0
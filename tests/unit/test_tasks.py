@@ -0,0 +1,123 @@
+"""
+Unit tests for time-sliced TaskRunner tasks and the boss waves streamed through them
+"""
+
+import time
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from src.challenges.perceptron_complete_challenge import LARGE_DATA_SCALE, PerceptronCompleteChallenge
+from src.tasks import TaskRunner
+
+def _counter(name, steps, log):
+    for i in range(steps):
+        log.append((name, i))
+        yield (i + 1) / steps
+    return name
+
+def test_run_resumes_round_robin_until_tasks_finish():
+    runner = TaskRunner()
+    log, done = [], []
+    runner.start(_counter("a", 2, log), on_done=done.append)
+    runner.start(_counter("b", 3, log), on_done=done.append)
+    assert runner.pending() == 2
+    runner.run(time.perf_counter() + 10)
+    assert log == [("a", 0), ("b", 0), ("a", 1), ("b", 1), ("b", 2)]
+    assert done == ["a", "b"]
+    assert runner.pending() == 0
+
+def test_a_passed_deadline_still_resumes_once():
+    runner = TaskRunner()
+    log = []
+    task = runner.start(_counter("a", 3, log))
+    assert runner.run(0.0) == 1
+    assert log == [("a", 0)]
+    assert task.progress == pytest.approx(1 / 3)
+    assert not task.done
+
+def test_finish_runs_the_rest_now():
+    log = []
+    task = TaskRunner().start(_counter("a", 4, log))
+    assert task.finish() == "a"
+    assert task.done and task.progress == 1.0 and len(log) == 4
+    assert task.resume()
+
+def test_cancel_owner_closes_the_generators():
+    runner = TaskRunner()
+    owner, closed = object(), []
+
+    def work():
+        try:
+            while True:
+                yield None
+        finally:
+            closed.append(True)
+
+    task = runner.start(work(), owner=owner)
+    other = runner.start(_counter("b", 5, []))
+    runner.run(0.0)
+    runner.run(0.0)
+    runner.cancel_owner(owner)
+    assert task.cancelled and closed == [True]
+    assert runner.pending(owner) == 0 and runner.pending() == 1
+    assert not other.done
+
+def test_failing_tasks_report_without_calling_on_done(capsys):
+    def broken():
+        yield 0.5
+        raise RuntimeError("wave collapsed")
+
+    done = []
+    task = TaskRunner().start(broken(), on_done=done.append)
+    task.finish()
+    assert isinstance(task.error, RuntimeError) and done == []
+    assert "wave collapsed" in capsys.readouterr().out
+
+def _challenge():
+    game = SimpleNamespace(width=1280, height=800, tasks=TaskRunner(), interpolation=1.0)
+    challenge = PerceptronCompleteChallenge(game)
+    challenge.phase = "boss_fight"
+    challenge._update_layout_for_phase()
+    challenge._start_boss_fight()
+    return challenge
+
+def test_small_boss_waves_are_built_at_once():
+    challenge = _challenge()
+    assert challenge.boss_wave is None
+    assert len(challenge.boss_data_points) == challenge.boss_wave_size == 16
+
+def test_large_boss_waves_stream_in_and_block_training_until_loaded():
+    challenge = _challenge()
+    challenge._toggle_large_boss_data()
+    wave = challenge.boss_wave
+    assert challenge.boss_wave_size == 16 * LARGE_DATA_SCALE
+    assert challenge.game.tasks.pending(challenge) == 1
+
+    challenge.game.tasks.run(0.0)
+    assert 0 < len(challenge.boss_data_points) < challenge.boss_wave_size
+    assert challenge._wave_loading
+
+    weights, bias = challenge.weights.copy(), challenge.bias
+    challenge._boss_train()
+    np.testing.assert_array_equal(challenge.weights, weights)
+    assert challenge.bias == bias
+
+    wave.finish()
+    assert not challenge._wave_loading
+    assert len(challenge.boss_data_points) == challenge.boss_wave_size
+    # A boundary that gets every phase-one point wrong, so any sample moves it
+    challenge.weights[...] = [-1.0, -1.0]
+    challenge.bias = 0.9
+    challenge._boss_train()
+    assert not np.array_equal(challenge.weights, [-1.0, -1.0])
+
+def test_a_new_wave_cancels_the_one_still_loading():
+    challenge = _challenge()
+    challenge._toggle_large_boss_data()
+    first = challenge.boss_wave
+    challenge.game.tasks.run(0.0)
+    challenge._generate_boss_challenge()
+    assert first.cancelled
+    assert challenge.game.tasks.pending(challenge) == 1
+    challenge.boss_wave.finish()
+    assert len(challenge.boss_data_points) == challenge.boss_wave_size
@@ -0,0 +1,127 @@
+"""
+Unit tests for GrowableRingBuffer, LTTB downsampling and the telemetry panel
+"""
+
+import numpy as np
+import pygame
+import pytest
+from src.nn.ring_buffer import GrowableRingBuffer
+from src.visualization.telemetry_panel import DecimatedSeries, TelemetryPanel, lttb
+
+def _reference_lttb(x, y, threshold):
+    """Textbook LTTB, one bucket at a time"""
+    n = len(x)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    kept = [0]
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            cx, cy = x[hi:edges[i + 2]].mean(), y[hi:edges[i + 2]].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        ax, ay = x[kept[-1]], y[kept[-1]]
+        area = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+        kept.append(lo + int(np.argmax(area)))
+    return np.array(kept + [n - 1])
+
+def test_growable_ring_buffer_doubles_then_wraps():
+    ring = GrowableRingBuffer(16, {'step': (), 'pair': (2,)}, initial_capacity=2)
+    for i in range(5):
+        ring.append(step=i, pair=[i, -i])
+    assert ring.capacity == 8
+    np.testing.assert_array_equal(ring.read('step')[1], np.arange(5))
+    np.testing.assert_array_equal(ring.read('pair', since=4)[1], [[4, -4]])
+
+    ring.extend(step=np.arange(5, 30), pair=np.zeros((25, 2)))
+    assert ring.capacity == 16 and ring.count == 30
+    first, steps = ring.read('step')
+    np.testing.assert_array_equal(steps, np.arange(first, 30))
+    assert first == 30 - 16 + 1
+
+def test_growable_ring_buffer_extend_beyond_capacity_keeps_the_newest():
+    ring = GrowableRingBuffer(4, {'step': ()}, initial_capacity=4)
+    ring.extend(step=np.arange(10))
+    assert ring.latest('step') == 9
+    np.testing.assert_array_equal(ring.read('step')[1], [7, 8, 9])
+    ring.extend(step=np.array([]))
+    assert ring.count == 10
+
+@pytest.mark.parametrize("n, threshold", [(200, 50), (20_000, 100)])
+def test_lttb_matches_the_reference(n, threshold):
+    rng = np.random.default_rng(0)
+    x = np.arange(n, dtype=np.float64)
+    y = np.cumsum(rng.normal(size=n))
+    np.testing.assert_array_equal(lttb(x, y, threshold), _reference_lttb(x, y, threshold))
+
+def test_lttb_keeps_endpoints_and_spikes():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.zeros(1000)
+    y[617] = 50.0
+    kept = lttb(x, y, 20)
+    assert len(kept) == 20
+    assert kept[0] == 0 and kept[-1] == 999 and 617 in kept
+    assert np.all(np.diff(kept) > 0)
+    np.testing.assert_array_equal(lttb(x[:10], y[:10], 20), np.arange(10))
+
+def test_decimated_series_stays_within_capacity():
+    series = DecimatedSeries(capacity=64)
+    x = np.arange(10_000, dtype=np.float64)
+    y = np.sin(x / 300)
+    y[4321] = 10.0
+    for start in range(0, 10_000, 137):
+        series.extend(x[start:start + 137], y[start:start + 137])
+        assert series.count <= 64
+    assert series.bucket > 1 and series.version > 0
+    assert series.x[0] == 0 and series.last == (9999.0, y[-1])
+    assert 10.0 in series.y[:series.count]
+    assert np.all(np.diff(series.x[:series.count]) > 0)
+
+def test_decimated_series_does_not_depend_on_chunking():
+    x = np.arange(3000, dtype=np.float64)
+    y = np.cos(x / 50) + np.random.default_rng(1).normal(size=3000) * 0.1
+    whole, pieces = DecimatedSeries(128), DecimatedSeries(128)
+    whole.extend(x, y)
+    for start in range(0, 3000, 7):
+        pieces.extend(x[start:start + 7], y[start:start + 7])
+    assert whole.count == pieces.count
+    np.testing.assert_array_equal(whole.x[:whole.count], pieces.x[:pieces.count])
+
+def _panel():
+    return TelemetryPanel([("loss", (255, 100, 100), "log"), ("accuracy", (100, 255, 100), (0, 1))],
+                          points=64, initial_span=16)
+
+def test_panel_records_history_and_widens_axes():
+    panel = _panel()
+    steps = np.arange(1, 101)
+    panel.extend(steps, loss=1.0 / steps, accuracy=np.linspace(0.5, 1, 100))
+    assert panel.history.count == 100
+    assert panel.latest('step') == 100 and panel.latest('loss') == pytest.approx(0.01)
+    assert panel._span == 128
+    low, high = panel._ranges['loss']
+    assert low < -2 < 0 < high
+    assert panel._ranges['accuracy'] == (0, 1)
+
+def test_panel_redraws_only_when_the_axes_change():
+    panel = _panel()
+    screen = pygame.Surface((400, 200))
+    rect = pygame.Rect(0, 0, 400, 200)
+    font = pygame.font.Font(None, 18)
+    panel.render(screen, rect, font)
+    assert panel._surface is None
+
+    panel.extend(np.arange(1, 11), loss=np.full(10, 0.5), accuracy=np.full(10, 0.5))
+    panel.render(screen, rect, font)
+    surface = panel._surface
+    assert not panel._dirty
+    panel.extend(np.arange(11, 15), loss=np.full(4, 0.5), accuracy=np.full(4, 0.6))
+    assert not panel._dirty
+    panel.render(screen, rect, font)
+    assert panel._surface is surface
+
+    panel.extend(np.arange(15, 40), loss=np.full(25, 0.5), accuracy=np.full(25, 0.6))
+    assert panel._dirty
+    panel.render(screen, rect, font)
+    assert not panel._dirty
+
+    panel.reset()
+    assert panel.history.count == 0 and panel.latest('loss') is None
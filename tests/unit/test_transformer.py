@@ -0,0 +1,114 @@
+"""
+Unit tests for the pre-LN transformer block: forward pass, causal masking and sublayer caching
+"""
+
+import numpy as np
+import pytest
+from src.nn.transformer import TransformerBlock, layer_norm
+
+def _block(causal=False, seed=0, **kwargs):
+    block = TransformerBlock(8, 2, d_ff=16, causal=causal, dtype=np.float64, **kwargs)
+    rng = np.random.default_rng(seed)
+    block.initialize(rng)
+    for name in block.PARAMETERS:
+        if "bias" in name or "gain" in name:
+            getattr(block, name)[...] += rng.normal(size=getattr(block, name).shape) * 0.1
+    return block
+
+def _inputs(batch=2, steps=5, seed=1):
+    return np.random.default_rng(seed).normal(size=(batch, steps, 8))
+
+def _reference(block, x):
+    """Straightforward per-head forward pass of one block"""
+    def norm(v, gain, bias):
+        centered = v - v.mean(axis=-1, keepdims=True)
+        return centered / np.sqrt((centered ** 2).mean(axis=-1, keepdims=True) + 1e-5) * gain + bias
+
+    steps, d, heads = x.shape[1], block.d_model, block.heads
+    qkv = norm(x, block.ln1_gain, block.ln1_bias) @ block.qkv_weights + block.qkv_bias
+    q, k, v = qkv[..., :d], qkv[..., d:2 * d], qkv[..., 2 * d:]
+    size = d // heads
+    contexts = []
+    for h in range(heads):
+        part = slice(h * size, (h + 1) * size)
+        scores = q[..., part] @ np.swapaxes(k[..., part], -1, -2) / np.sqrt(size)
+        if block.causal:
+            scores = scores + np.triu(np.full((steps, steps), -np.inf), 1)
+        weights = np.exp(scores - scores.max(axis=-1, keepdims=True))
+        weights /= weights.sum(axis=-1, keepdims=True)
+        contexts.append(weights @ v[..., part] * block.head_enabled[h])
+    residual = x + np.concatenate(contexts, axis=-1) @ block.out_weights + block.out_bias
+    hidden = np.maximum(norm(residual, block.ln2_gain, block.ln2_bias) @ block.ff1_weights + block.ff1_bias, 0)
+    return residual + hidden @ block.ff2_weights + block.ff2_bias
+
+def test_layer_norm():
+    x = np.random.default_rng(0).normal(size=(3, 6)) * 4 + 2
+    out = layer_norm(x, np.ones(6), np.zeros(6))
+    np.testing.assert_allclose(out.mean(axis=-1), 0, atol=1e-12)
+    np.testing.assert_allclose(out.std(axis=-1), 1, rtol=1e-4)
+    np.testing.assert_allclose(layer_norm(x, np.full(6, 2.0), np.ones(6)), 2 * out + 1)
+
+@pytest.mark.parametrize("causal", [False, True])
+def test_forward_matches_reference(causal):
+    block = _block(causal)
+    x = _inputs()
+    block.set_input(x)
+    np.testing.assert_allclose(block.forward(), _reference(block, x), rtol=1e-10, atol=1e-12)
+
+def test_causal_block_ignores_future_tokens():
+    block = _block(causal=True)
+    x = _inputs()
+    block.set_input(x)
+    before = block.forward().copy()
+    assert not np.triu(block.attention, 1).any()
+
+    x[:, 3:] += 10.0
+    block.set_input(x)
+    after = block.forward()
+    np.testing.assert_allclose(after[:, :3], before[:, :3], rtol=1e-12)
+    assert not np.allclose(after[:, 3:], before[:, 3:])
+
+def test_switching_heads_reruns_from_the_mix():
+    block = _block()
+    x = _inputs()
+    block.set_input(x)
+    block.forward()
+    versions = dict(block.versions)
+
+    block.set_head(1, False)
+    assert block.valid_sublayers == block.SUBLAYERS.index("mix")
+    block.forward()
+    for name in ("norm1", "qkv", "attention"):
+        assert block.versions[name] == versions[name]
+    for name in ("mix", "norm2", "mlp", "output"):
+        assert block.versions[name] == versions[name] + 1
+    np.testing.assert_allclose(block.outputs, _reference(block, x), rtol=1e-10, atol=1e-12)
+
+def test_forward_can_stop_after_any_sublayer():
+    block = _block()
+    block.set_input(_inputs())
+    block.forward(until="attention")
+    assert block.valid_sublayers == 3
+    assert block.versions["mix"] == 0
+    np.testing.assert_allclose(block.attention.sum(axis=-1), 1.0)
+    # Nothing up to date is recomputed
+    block.forward(until="qkv")
+    assert block.versions["qkv"] == 1
+
+def test_set_input_reuses_buffers():
+    block = _block()
+    block.set_input(_inputs())
+    buffer, nbytes = block.qkv, block.nbytes
+    block.set_input(_inputs(seed=5))
+    assert block.qkv is buffer and block.nbytes == nbytes
+    block.set_input(_inputs(batch=1, steps=3)[0])
+    assert block.shape == (1, 3, 8)
+
+def test_invalid_configuration_raises():
+    with pytest.raises(ValueError):
+        TransformerBlock(10, 3)
+    block = TransformerBlock(8, 2)
+    with pytest.raises(ValueError):
+        block.forward()
+    with pytest.raises(ValueError):
+        block.set_input(np.zeros((1, 4, 6)))
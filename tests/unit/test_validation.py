@@ -0,0 +1,83 @@
+"""
+Unit tests for data splits and process-parallel k-fold cross-validation
+"""
+
+import time
+import numpy as np
+import pytest
+from src.nn.validation import CrossValidator, kfold_indices, train_fold, train_val_test_split
+
+def _blobs(rows=120, seed=0):
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(0, 2, rows)
+    features = rng.normal(size=(rows, 2)) * 0.5 + labels[:, None] * 2.0
+    return features, labels
+
+def test_train_val_test_split_partitions_rows():
+    train, val, test = train_val_test_split(100, validation=0.2, test=0.1, rng=np.random.default_rng(0))
+    assert (len(train), len(val), len(test)) == (70, 20, 10)
+    assert sorted(np.concatenate((train, val, test)).tolist()) == list(range(100))
+
+def test_kfold_validates_every_row_exactly_once():
+    folds = kfold_indices(23, 5, rng=np.random.default_rng(0))
+    assert len(folds) == 5
+    validated = np.concatenate([val for _, val in folds])
+    assert sorted(validated.tolist()) == list(range(23))
+    for train, val in folds:
+        assert not set(train.tolist()) & set(val.tolist())
+        assert len(train) + len(val) == 23
+    assert sorted(len(val) for _, val in folds) == [4, 4, 5, 5, 5]
+
+@pytest.mark.parametrize("k", [1, 11])
+def test_kfold_rejects_bad_k(k):
+    with pytest.raises(ValueError):
+        kfold_indices(10, k)
+
+def test_cross_validator_folds_never_touch_the_test_rows():
+    features, labels = _blobs()
+    test_idx = np.arange(0, 120, 6)
+    validator = CrossValidator(features, labels, k=4, test_idx=test_idx)
+    held_out = set(test_idx.tolist())
+    validated = []
+    for train, val in validator.folds:
+        assert not held_out & set(train.tolist())
+        assert not held_out & set(val.tolist())
+        validated.extend(val.tolist())
+    assert sorted(validated) == sorted(set(range(120)) - held_out)
+
+def test_train_fold_records_a_curve_in_process():
+    features, labels = _blobs()
+    train, val = kfold_indices(len(labels), 3, rng=np.random.default_rng(1))[0]
+    result = train_fold(0, features, labels, train, val, layer_sizes=(2, 8, 2), epochs=20,
+                        learning_rate=0.1, record_every=5)
+    assert [point['epoch'] for point in result['curve']] == [5, 10, 15, 20]
+    assert result['best'] in result['curve']
+    assert result['curve'][-1]['val_accuracy'] > 0.9
+
+def test_cross_validator_runs_every_fold():
+    features, labels = _blobs()
+    validator = CrossValidator(features, labels, k=3, workers=1, layer_sizes=(2, 8, 2), epochs=10,
+                               learning_rate=0.1, record_every=5)
+    validator.start()
+    deadline = time.perf_counter() + 120
+    while not validator.finished and time.perf_counter() < deadline:
+        validator.poll()
+        time.sleep(0.05)
+    validator.poll()
+
+    assert validator.errors == {}
+    assert all(result is not None for result in validator.results)
+    assert all(len(curve) == 2 for curve in validator.curves)
+    epochs, mean = validator.mean_curve('val_loss')
+    np.testing.assert_array_equal(epochs, [5, 10])
+    expected = np.mean([[point['val_loss'] for point in curve] for curve in validator.curves], axis=0)
+    np.testing.assert_allclose(mean, expected)
+
+def test_cancel_right_after_start_waits_for_the_workers():
+    features, labels = _blobs()
+    validator = CrossValidator(features, labels, k=3, workers=2, epochs=500)
+    validator.start()
+    validator.cancel()
+    # The pool is gone only once every worker has exited, so the queue can be freed safely
+    assert validator._executor is None
+    assert not any(future.running() for future in validator._futures)